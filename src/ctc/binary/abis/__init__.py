@@ -3,5 +3,6 @@ from .block_coding import *
 from .contract_parsing import *
 from .event_coding import *
 from .event_parsing import *
+from .function_codecs import *
 from .function_coding import *
 from .function_parsing import *
@@ -200,6 +200,155 @@ def normalize_event(
     return normalized
 
 
+def decode_events_columns(
+    events: typing.Sequence[spec.RawLog],
+    event_abi: spec.EventABI,
+    *,
+    arg_prefix: str = 'arg__',
+) -> dict[str, typing.Any]:
+    """decode many raw logs of one event type into columns
+
+    - output has the same columns and values as normalize_event() of each log
+    - static value types (address, bool, bytesN, intN, uintN) are decoded for
+      all logs at once by slicing a single concatenated byte buffer
+    - dynamic types are decoded log by log
+    """
+
+    n_events = len(events)
+    columns: dict[str, typing.Any] = {}
+
+    # metadata columns
+    remove_keys = ['data', 'topics', 'removed']
+    if n_events > 0:
+        for key in events[0].keys():
+            if key not in remove_keys:
+                columns[key] = [event[key] for event in events]  # type: ignore
+        columns['contract_address'] = columns['address']
+        columns['event_name'] = [event_abi['name']] * n_events
+        columns['event_hash'] = [event['topics'][0] for event in events]
+
+    # indexed args, one 32 byte word per topic
+    indexed_names = event_parsing.get_event_indexed_names(event_abi)
+    indexed_types = event_parsing.get_event_indexed_types(event_abi)
+    n_topics = len(indexed_types) + 1
+    if any(len(event['topics']) != n_topics for event in events):
+        raise Exception('number of topics does not match event_abi')
+    for t, (name, indexed_type) in enumerate(zip(indexed_names, indexed_types)):
+        topics = [event['topics'][t + 1] for event in events]
+        if _is_static_word_type(indexed_type):
+            topic_words = _hex_to_words(topics, n_words=1)
+            column = _decode_words(topic_words, indexed_type)
+        else:
+            # dynamic indexed values are only stored as their hash
+            column = topics
+        _add_arg_column(columns, key=arg_prefix + name, column=column)
+
+    # unindexed args, each static head word can be sliced directly
+    unindexed_names = event_parsing.get_event_unindexed_names(event_abi)
+    unindexed_types = event_parsing.get_event_unindexed_types(event_abi)
+    n_heads = len(unindexed_types)
+    datas = [event['data'] for event in events]
+    heads_are_words = all(
+        _is_static_word_type(unindexed_type)
+        or _is_dynamic_type(unindexed_type)
+        for unindexed_type in unindexed_types
+    )
+    head_words: typing.Optional[spec.NumpyArray] = None
+    if heads_are_words and all(len(data) >= 2 + 64 * n_heads for data in datas):
+        head_words = _hex_to_words(
+            [data[: 2 + 64 * n_heads] for data in datas], n_words=n_heads
+        )
+
+    per_row = None
+    for d, (name, unindexed_type) in enumerate(
+        zip(unindexed_names, unindexed_types)
+    ):
+        if head_words is not None and _is_static_word_type(unindexed_type):
+            column = _decode_words(
+                head_words[:, 32 * d : 32 * (d + 1)], unindexed_type
+            )
+        else:
+            if per_row is None:
+                per_row = [
+                    decode_event_unindexed_data(
+                        data,
+                        unindexed_types=unindexed_types,
+                        use_names=False,
+                    )
+                    for data in datas
+                ]
+            column = [row[d] for row in per_row]
+        _add_arg_column(columns, key=arg_prefix + name, column=column)
+
+    return columns
+
+
+def _add_arg_column(
+    columns: dict[str, typing.Any],
+    *,
+    key: str,
+    column: typing.Any,
+) -> None:
+    if key in columns:
+        raise Exception('event key collision: ' + str(key))
+    columns[key] = column
+
+
+def _is_static_word_type(abi_type: str) -> bool:
+    """whether type is a value type that occupies exactly one word"""
+    if abi_type in ['address', 'bool', 'uint', 'int']:
+        return True
+    for prefix in ['uint', 'int', 'bytes']:
+        if abi_type.startswith(prefix) and abi_type[len(prefix) :].isdigit():
+            return True
+    return False
+
+
+def _is_dynamic_type(abi_type: str) -> bool:
+    """whether type is encoded in tail, with only an offset word in head"""
+    return abi_type in ['bytes', 'string'] or abi_type.endswith('[]')
+
+
+def _hex_to_words(
+    hex_values: typing.Sequence[str], n_words: int
+) -> spec.NumpyArray:
+    """convert equal-length prefix hex strings to rows of a uint8 array"""
+    import numpy as np
+
+    joined = ''.join([hex_value[2:] for hex_value in hex_values])
+    as_array = np.frombuffer(bytes.fromhex(joined), dtype=np.uint8)
+    return as_array.reshape(len(hex_values), 32 * n_words)
+
+
+def _decode_words(
+    words: spec.NumpyArray,
+    abi_type: str,
+) -> typing.Any:
+    """decode (n, 32) uint8 array of words into a column of values"""
+    import numpy as np
+
+    words = np.ascontiguousarray(words)
+    n = words.shape[0]
+
+    if abi_type == 'address':
+        as_hex = words[:, 12:].tobytes().hex()
+        return [
+            '0x' + as_hex[i * 40 : (i + 1) * 40] for i in range(n)
+        ]
+
+    elif abi_type == 'bool':
+        return words[:, 31] != 0
+
+    elif abi_type.startswith('bytes'):
+        n_bytes = int(abi_type[5:])
+        return [row.tobytes() for row in words[:, :n_bytes]]
+
+    else:
+        # use int64 when possible, otherwise python ints
+        signed = abi_type.startswith('int')
+        return formats.decode_big_endian_rows(words, signed=signed)
+
+
 #
 # # dataframes
 #
@@ -0,0 +1,420 @@
+"""precompiled codecs for encoding function calls and decoding their outputs
+
+- a codec is compiled once per function abi, caching its selector, types,
+  and names so that repeated calls skip abi parsing and selector hashing
+- functions whose types are all single-word static types (address, bool,
+  intN, uintN, bytesN) are encoded and decoded directly as 32 byte words
+- other types, and values that the fast path does not accept, use the
+  generic eth_abi codec
+- outputs of many calls to a function with a single integer output can be
+  decoded together into a numpy array
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import threading
+import typing
+
+from typing_extensions import TypedDict
+
+from ctc import spec
+
+from . import function_parsing
+
+
+class FunctionCodec(TypedDict):
+    function_abi: spec.FunctionABI
+    function_selector: str
+    parameter_types: list[spec.ABIDatumType]
+    parameter_names: list[typing.Optional[str]]
+    parameters_type_str: str
+    static_parameters: bool
+    output_types: list[spec.ABIDatumType]
+    output_names: list[typing.Optional[str]]
+    outputs_type_str: str
+    static_outputs: bool
+
+
+_max_codecs = 4096
+
+# codecs are looked up by identity of abi first, then by abi contents
+_codecs_by_id: collections.OrderedDict[
+    int, typing.Tuple[spec.FunctionABI, FunctionCodec]
+] = collections.OrderedDict()
+_codecs_by_json: collections.OrderedDict[
+    str, FunctionCodec
+] = collections.OrderedDict()
+_codecs_lock = threading.Lock()
+
+
+def get_function_codec(function_abi: spec.FunctionABI) -> FunctionCodec:
+    """get compiled codec of function abi, compiling it if not yet cached"""
+
+    entry = _codecs_by_id.get(id(function_abi))
+    if entry is not None and entry[0] is function_abi:
+        return entry[1]
+
+    as_json = json.dumps(function_abi, sort_keys=True)
+    codec = _codecs_by_json.get(as_json)
+    if codec is None:
+        codec = compile_function_codec(function_abi)
+
+    with _codecs_lock:
+        _codecs_by_json[as_json] = codec
+        _codecs_by_id[id(function_abi)] = (function_abi, codec)
+        while len(_codecs_by_json) > _max_codecs:
+            _codecs_by_json.popitem(last=False)
+        while len(_codecs_by_id) > _max_codecs:
+            _codecs_by_id.popitem(last=False)
+
+    return codec
+
+
+def compile_function_codec(function_abi: spec.FunctionABI) -> FunctionCodec:
+    parameter_types = function_parsing.get_function_parameter_types(
+        function_abi
+    )
+    output_types = function_parsing.get_function_output_types(function_abi)
+    selector = function_parsing.get_function_selector(function_abi)
+    return {
+        'function_abi': function_abi,
+        'function_selector': '0x' + selector,
+        'parameter_types': parameter_types,
+        'parameter_names': function_parsing.get_function_parameter_names(
+            function_abi
+        ),
+        'parameters_type_str': '(' + ','.join(parameter_types) + ')',
+        'static_parameters': all(
+            _is_static_word_type(datatype) for datatype in parameter_types
+        ),
+        'output_types': output_types,
+        'output_names': function_parsing.get_function_output_names(
+            function_abi
+        ),
+        'outputs_type_str': '(' + ','.join(output_types) + ')',
+        'static_outputs': all(
+            _is_static_word_type(datatype) for datatype in output_types
+        ),
+    }
+
+
+def _is_static_word_type(datatype: spec.ABIDatumType) -> bool:
+    if datatype in ('address', 'bool'):
+        return True
+    for prefix, max_bits in (('uint', 256), ('int', 256), ('bytes', 32)):
+        if datatype.startswith(prefix):
+            size = datatype[len(prefix) :]
+            return size.isdigit() and 0 < int(size) <= max_bits
+    return False
+
+
+#
+# # encoding
+#
+
+
+def encode_codec_call_data(
+    codec: FunctionCodec,
+    parameters: typing.Optional[
+        typing.Sequence[typing.Any] | typing.Mapping[str, typing.Any]
+    ] = None,
+) -> str:
+    """encode call data of function as prefix hex"""
+    if parameters is None:
+        return codec['function_selector']
+    return codec['function_selector'] + encode_codec_parameters(
+        codec, parameters
+    ).hex()
+
+
+def encode_codec_parameters(
+    codec: FunctionCodec,
+    parameters: typing.Sequence[typing.Any] | typing.Mapping[str, typing.Any],
+) -> bytes:
+    from .. import formats
+    from . import abi_coding
+
+    # convert parameter dict to list
+    if isinstance(parameters, typing.Mapping):
+        names = codec['parameter_names']
+        if any(name is None for name in names):
+            raise Exception('function abi does not specify names')
+        parameters = [parameters[typing.cast(str, name)] for name in names]
+
+    parameter_types = codec['parameter_types']
+    if len(parameters) != len(parameter_types):
+        raise Exception('improper number of arguments for function, cannot encode')
+
+    if codec['static_parameters']:
+        words = []
+        for datatype, parameter in zip(parameter_types, parameters):
+            word = _encode_static_word(datatype, parameter)
+            if word is None:
+                break
+            words.append(word)
+        else:
+            return b''.join(words)
+
+    # generic path, converting prefix_hex bytes32 to bytes
+    new_parameters = []
+    for datatype, parameter in zip(parameter_types, parameters):
+        if (
+            datatype == 'bytes32'
+            and formats.get_binary_format(parameter) != 'binary'
+        ):
+            parameter = formats.convert(parameter, 'binary')
+        new_parameters.append(parameter)
+    return abi_coding.encode_types(
+        new_parameters, codec['parameters_type_str']
+    )
+
+
+def _encode_static_word(
+    datatype: spec.ABIDatumType,
+    value: typing.Any,
+) -> bytes | None:
+    """encode value as 32 byte word, or None if value needs generic encoder"""
+
+    if datatype == 'address':
+        if isinstance(value, str) and len(value) == 42 and value[:2] == '0x':
+            if value != value.lower() and value != '0x' + value[2:].upper():
+                # mixed case addresses need checksum validation
+                return None
+            try:
+                return bytes(12) + bytes.fromhex(value[2:])
+            except ValueError:
+                return None
+        elif isinstance(value, bytes) and len(value) == 20:
+            return bytes(12) + value
+        else:
+            return None
+
+    elif datatype == 'bool':
+        if isinstance(value, bool):
+            return bytes(31) + (b'\x01' if value else b'\x00')
+        else:
+            return None
+
+    elif datatype.startswith('uint'):
+        if isinstance(value, int) and not isinstance(value, bool):
+            if 0 <= value < 2 ** int(datatype[4:]):
+                return value.to_bytes(32, 'big')
+        return None
+
+    elif datatype.startswith('int'):
+        if isinstance(value, int) and not isinstance(value, bool):
+            half = 2 ** (int(datatype[3:]) - 1)
+            if -half <= value < half:
+                return value.to_bytes(32, 'big', signed=True)
+        return None
+
+    elif datatype.startswith('bytes'):
+        size = int(datatype[5:])
+        if isinstance(value, str) and size == 32:
+            from .. import formats
+
+            value = formats.convert(value, 'binary')
+        if isinstance(value, bytes) and len(value) <= size:
+            return value + bytes(32 - len(value))
+        else:
+            return None
+
+    else:
+        return None
+
+
+#
+# # decoding
+#
+
+
+def decode_codec_output(
+    codec: FunctionCodec,
+    encoded_output: spec.BinaryData,
+    *,
+    delist_single_outputs: bool = True,
+    package_named_outputs: bool = False,
+) -> typing.Any:
+    """decode output of function call"""
+    from .. import formats
+    from . import abi_coding
+
+    output_types = codec['output_types']
+    if not isinstance(encoded_output, bytes):
+        encoded_output = formats.convert(encoded_output, 'binary')
+
+    decoded_output: list[typing.Any] | None = None
+    if codec['static_outputs'] and len(encoded_output) >= 32 * len(
+        output_types
+    ):
+        try:
+            decoded_output = [
+                _decode_static_word(
+                    datatype, encoded_output[32 * i : 32 * i + 32]
+                )
+                for i, datatype in enumerate(output_types)
+            ]
+        except ValueError:
+            # invalid padding, let generic decoder raise appropriate error
+            decoded_output = None
+    if decoded_output is None:
+        decoded = abi_coding.decode_types(
+            encoded_output, codec['outputs_type_str']
+        )
+        decoded_output = []
+        for datatype, item in zip(output_types, decoded):
+            if datatype == 'bytes32':
+                item = formats.convert(item, 'prefix_hex')
+            decoded_output.append(item)
+
+    # delist
+    if delist_single_outputs and len(output_types) == 1:
+        return decoded_output[0]
+
+    # repackage
+    elif package_named_outputs and len(output_types) > 1:
+        names = codec['output_names']
+        if all(name is not None for name in names):
+            return dict(zip(names, decoded_output))
+
+    return decoded_output
+
+
+def _decode_static_word(datatype: spec.ABIDatumType, word: bytes) -> typing.Any:
+    """decode 32 byte word, raising ValueError if word has invalid padding"""
+    if datatype == 'address':
+        if any(word[:12]):
+            raise ValueError('invalid address padding')
+        return '0x' + word[12:].hex()
+    elif datatype == 'bool':
+        if any(word[:31]) or word[31] > 1:
+            raise ValueError('invalid bool')
+        return word[31] == 1
+    elif datatype.startswith('uint'):
+        value = int.from_bytes(word, 'big')
+        if value >= 2 ** int(datatype[4:]):
+            raise ValueError('invalid uint padding')
+        return value
+    elif datatype.startswith('int'):
+        value = int.from_bytes(word, 'big', signed=True)
+        half = 2 ** (int(datatype[3:]) - 1)
+        if value < -half or value >= half:
+            raise ValueError('invalid int padding')
+        return value
+    elif datatype.startswith('bytes'):
+        size = int(datatype[5:])
+        if any(word[size:]):
+            raise ValueError('invalid bytes padding')
+        if size == 32:
+            return '0x' + word.hex()
+        return word[:size]
+    else:
+        raise Exception('not a static word type: ' + str(datatype))
+
+
+#
+# # array decoding
+#
+
+
+def decode_codec_outputs_array(
+    codec: FunctionCodec,
+    encoded_outputs: typing.Sequence[str | None],
+    *,
+    as_float: bool = False,
+    fill_empty: bool = False,
+    empty_token: typing.Any = None,
+) -> spec.NumpyArray:
+    """decode outputs of many calls to a function with one integer output
+
+    - uint outputs are decoded in a single vectorized pass over 64 bit limbs
+    - returns object array of python ints, or float64 array if as_float
+    - empty outputs, and None outputs of reverted calls, are filled with
+      empty_token if fill_empty or if empty_token is not None, otherwise
+      they raise an error
+    """
+    import numpy as np
+
+    output_types = codec['output_types']
+    if len(output_types) != 1 or not (
+        _is_static_word_type(output_types[0])
+        and output_types[0].startswith(('uint', 'int'))
+    ):
+        raise Exception('array decoding requires a single integer output')
+    datatype = output_types[0]
+    values: spec.NumpyArray
+
+    # separate empty outputs from full outputs
+    fill = fill_empty or empty_token is not None
+    is_full = np.array(
+        [output is not None and len(output) != 2 for output in encoded_outputs],
+        dtype=bool,
+    )
+    if not fill and not is_full.all():
+        if any(output is None for output in encoded_outputs):
+            raise spec.RpcException('call reverted, cannot decode output')
+        raise Exception('empty output, cannot decode')
+    full_outputs = [
+        output
+        for output, full in zip(encoded_outputs, is_full)
+        if full and output is not None
+    ]
+    if any(len(output) < 66 for output in full_outputs):
+        raise Exception('output too short to decode')
+
+    if datatype.startswith('uint'):
+        joined = ''.join([output[2:66] for output in full_outputs])
+        limbs = np.frombuffer(bytes.fromhex(joined), dtype='>u8').reshape(
+            len(full_outputs), 4
+        )
+        if not _uint_limbs_in_range(limbs, int(datatype[4:])):
+            raise Exception('invalid uint padding')
+        if as_float:
+            scales = np.array([2.0 ** 192, 2.0 ** 128, 2.0 ** 64, 1.0])
+            values = limbs.astype(np.float64).dot(scales)
+        elif (limbs[:, :3] == 0).all():
+            values = limbs[:, 3].astype(object)
+        else:
+            as_object = limbs.astype(object)
+            values = (
+                ((as_object[:, 0] << 64 | as_object[:, 1]) << 64)
+                | as_object[:, 2]
+            ) << 64 | as_object[:, 3]
+    else:
+        decoded = [
+            _decode_static_word(datatype, bytes.fromhex(output[2:66]))
+            for output in full_outputs
+        ]
+        if as_float:
+            values = np.array(decoded, dtype=np.float64)
+        else:
+            values = np.empty(len(decoded), dtype=object)
+            values[:] = decoded
+
+    if is_full.all():
+        return values
+
+    # put back in empty outputs
+    if as_float:
+        fill_value = np.nan if empty_token is None else float(empty_token)
+        result = np.full(len(encoded_outputs), fill_value, dtype=np.float64)
+    else:
+        result = np.empty(len(encoded_outputs), dtype=object)
+        result[:] = [empty_token] * len(encoded_outputs)
+    result[is_full] = values
+    return result
+
+
+def _uint_limbs_in_range(limbs: spec.NumpyArray, n_bits: int) -> bool:
+    """whether (n, 4) array of big endian uint64 limbs fit in n_bits"""
+    import numpy as np
+
+    n_full_limbs, remainder_bits = divmod(n_bits, 64)
+    n_zero_limbs = 4 - n_full_limbs
+    if remainder_bits > 0:
+        n_zero_limbs -= 1
+        if (limbs[:, n_zero_limbs] >> np.uint64(remainder_bits)).any():
+            return False
+    return not limbs[:, :n_zero_limbs].any()
@@ -6,6 +6,7 @@ from ctc import binary
 from ctc import spec
 
 from . import contract_parsing
+from . import function_codecs
 from . import function_parsing
 
 
@@ -29,6 +30,16 @@ def encode_call_data(
     function_abi: typing.Optional[spec.FunctionABI] = None,
 ) -> str:
 
+    # use precompiled codec when encoding entirely from function abi
+    if (
+        function_abi is not None
+        and function_selector is None
+        and parameter_types is None
+        and encoded_parameters is None
+    ):
+        codec = function_codecs.get_function_codec(function_abi)
+        return function_codecs.encode_codec_call_data(codec, parameters)
+
     # encode function selector
     if function_selector is None:
         function_selector = function_parsing.get_function_selector(function_abi)
@@ -206,6 +217,16 @@ def decode_function_output(
 ) -> typing.Any:
     # need to test case when function has no output
 
+    # use precompiled codec when decoding entirely from function abi
+    if output_types is None and function_abi is not None:
+        codec = function_codecs.get_function_codec(function_abi)
+        return function_codecs.decode_codec_output(
+            codec,
+            encoded_output,
+            delist_single_outputs=delist_single_outputs,
+            package_named_outputs=package_named_outputs,
+        )
+
     # get output types
     if output_types is None:
         if function_abi is None:
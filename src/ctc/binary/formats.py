@@ -237,3 +237,35 @@ def hex_to_ascii(data: str) -> str:
 
     cast_bytes = typing.cast(bytes, data)
     return codecs.decode(cast_bytes, encoding='hex').decode('ascii')
+
+
+def decode_big_endian_rows(
+    rows: spec.NumpyArray,
+    *,
+    signed: bool,
+) -> spec.NumpyArray:
+    """decode (n, n_bytes) uint8 array of big-endian integers
+
+    returns int64 array when every value fits, otherwise object array of ints
+    """
+    import numpy as np
+
+    rows = np.ascontiguousarray(rows)
+    n, n_bytes = rows.shape
+    if n_bytes % 8 == 0 and n_bytes > 0:
+        words = rows.view('>u8').reshape(n, n_bytes // 8)
+        low = words[:, -1].astype(np.uint64)
+        high = words[:, :-1]
+        if signed:
+            low_signed = low.view(np.int64)
+            extension = np.where(
+                low_signed < 0, np.uint64(2 ** 64 - 1), np.uint64(0)
+            )
+            if (high == extension[:, np.newaxis]).all():
+                return low_signed.copy()
+        elif (high == 0).all() and (low < 2 ** 63).all():
+            return low.astype(np.int64)
+    return np.array(
+        [int.from_bytes(row.tobytes(), 'big', signed=signed) for row in rows],
+        dtype=object,
+    )
@@ -27,9 +27,11 @@ command_index_by_category: dict[str, toolcli.CommandIndex] = {
         ): 'ctc.cli.commands.admin.db.create_tables_command',
         ('db', 'status'): 'ctc.cli.commands.admin.db.status_command',
         ('db', 'drop'): 'ctc.cli.commands.admin.db.drop_command',
+        ('db', 'backfill'): 'ctc.cli.commands.admin.db.backfill_command',
         ('log',): 'ctc.cli.commands.admin.log_command',
         ('setup',): 'ctc.cli.commands.admin.setup_command',
         ('rechunk-events',): 'ctc.cli.commands.admin.rechunk_command',
+        ('convert-events',): 'ctc.cli.commands.admin.convert_events_command',
         ('chains',): 'ctc.cli.commands.admin.chains_command',
     },
     'compute': {
@@ -23,3 +23,4 @@ class AsyncContextManager:
         # TODO: close all sessions, not just default session
         # TODO: close pending db connections
         await rpc.async_close_http_session()
+        await rpc.async_close_websocket_connection()
@@ -63,14 +63,7 @@ def output_data(
 
     else:
 
-        # check whether file exists
-        if os.path.isfile(output):
-            if overwrite:
-                pass
-            elif toolcli.input_yes_or_no('File already exists. Overwrite? '):
-                pass
-            else:
-                raise Exception('aborting')
+        _check_output_overwrite(output, overwrite=overwrite)
 
         if output.endswith('.csv'):
             data.to_csv(output)
@@ -80,3 +73,50 @@ def output_data(
 
         else:
             raise Exception('unknown output format: ' + str(output))
+
+
+def _check_output_overwrite(output: str, *, overwrite: bool) -> None:
+    if os.path.isfile(output):
+        if overwrite:
+            pass
+        elif toolcli.input_yes_or_no('File already exists. Overwrite? '):
+            pass
+        else:
+            raise Exception('aborting')
+
+
+async def async_output_data_chunks(
+    chunks: typing.AsyncIterator[spec.DataFrame],
+    output: str,
+    *,
+    overwrite: bool,
+    **output_kwargs: typing.Any,
+) -> int:
+    """output chunks of data, returning the number of rows output
+
+    csv files are written one chunk at a time, other outputs are combined
+    """
+
+    if output.endswith('.csv'):
+        _check_output_overwrite(output, overwrite=overwrite)
+        n_rows = 0
+        async for chunk in chunks:
+            if n_rows == 0:
+                chunk.to_csv(output)
+            else:
+                chunk.to_csv(output, mode='a', header=False)
+            n_rows += len(chunk)
+        return n_rows
+
+    else:
+        import pandas as pd
+
+        all_chunks = [chunk async for chunk in chunks]
+        if len(all_chunks) > 0:
+            output_data(
+                pd.concat(all_chunks),
+                output=output,
+                overwrite=overwrite,
+                **output_kwargs,
+            )
+        return sum(len(chunk) for chunk in all_chunks)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import toolcli
+
+from ctc import spec
+from ctc.evm.event_utils import event_backends
+
+
+def get_command_spec() -> toolcli.CommandSpec:
+    return {
+        'f': async_convert_events_command,
+        'help': 'convert stored event files to a different file format',
+        'args': [
+            {
+                'name': 'contract',
+                'nargs': '?',
+                'help': 'address of contract emitting the event',
+            },
+            {
+                'name': 'event',
+                'nargs': '?',
+                'default': None,
+                'help': 'event hash',
+            },
+            {
+                'name': '--format',
+                'dest': 'file_format',
+                'choices': event_backends.events_file_formats,
+                'help': 'target file format, default is configured format',
+            },
+            {
+                'name': '--network',
+                'metavar': 'NAME_OR_ID',
+                'help': 'network to convert events of',
+            },
+            {
+                'name': '--all',
+                'action': 'store_true',
+                'dest': 'all_events',
+                'help': 'whether to convert all events (can take a long time)',
+            },
+            {
+                'name': '--dry',
+                'action': 'store_true',
+                'help': 'perform a dry run where no changes are made',
+            },
+            {
+                'name': ['--verbose', '-v'],
+                'action': 'store_true',
+                'help': 'increase verbosity',
+            },
+        ],
+        'examples': [
+            '0x956f47f50a910163d8bf957cf5846d573e7f87ca 0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef --format parquet',
+            '--all --format parquet',
+        ],
+        'hidden': True,
+    }
+
+
+async def async_convert_events_command(
+    *,
+    contract: spec.Address,
+    event: str,
+    file_format: str | None,
+    network: spec.NetworkReference,
+    all_events: bool,
+    dry: bool,
+    verbose: bool,
+) -> None:
+
+    if network is None:
+        from ctc import config
+
+        network = config.get_default_network()
+
+    if all_events:
+
+        await event_backends.async_convert_all_events_file_format(
+            file_format=file_format,
+            network=network,
+            dry=dry,
+            verbose=verbose,
+        )
+
+    elif contract is not None and event is not None:
+
+        await event_backends.async_convert_events_file_format(
+            contract_address=contract,
+            event_hash=event,
+            file_format=file_format,
+            network=network,
+            dry=dry,
+            verbose=verbose,
+        )
+
+    else:
+        raise Exception(
+            'usage either `ctc convert-events --all` or `ctc convert-events contract_address event_hash`'
+        )
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import typing
+
+import toolcli
+
+from ctc import db
+from ctc import spec
+
+
+def get_command_spec() -> toolcli.CommandSpec:
+    return {
+        'f': async_backfill_command,
+        'help': 'fill db with block timestamps or blocks of a block range',
+        'args': [
+            {
+                'name': 'schema_name',
+                'nargs': '?',
+                'default': 'block_timestamps',
+                'choices': ['block_timestamps', 'blocks'],
+                'help': 'schema to fill, default is block_timestamps',
+            },
+            {
+                'name': '--start-block',
+                'type': int,
+                'help': 'first block of range, default is 0',
+            },
+            {
+                'name': '--end-block',
+                'type': int,
+                'help': 'last block of range, default is latest confirmed block',
+            },
+            {
+                'name': '--network',
+                'metavar': 'NAME_OR_ID',
+                'help': 'network to backfill',
+            },
+            {
+                'name': '--chunk-size',
+                'type': int,
+                'default': 1000,
+                'help': 'number of blocks per batched rpc request',
+            },
+            {
+                'name': '--concurrency',
+                'type': int,
+                'default': 8,
+                'help': 'number of rpc requests in flight at once',
+            },
+            {
+                'name': '--write-size',
+                'type': int,
+                'default': 100000,
+                'help': 'number of blocks written per db transaction',
+            },
+            {
+                'name': '--restart',
+                'action': 'store_true',
+                'help': 'ignore checkpoint of previous backfills',
+            },
+            {
+                'name': '--export',
+                'metavar': 'DIR',
+                'help': 'export block timestamps to compressed npz file in DIR',
+            },
+        ],
+        'examples': [
+            '',
+            'block_timestamps --start-block 15000000 --end-block 16000000',
+            '--export ./block_timestamps',
+            'blocks --network arbitrum --chunk-size 200',
+        ],
+        'hidden': True,
+    }
+
+
+async def async_backfill_command(
+    *,
+    schema_name: str,
+    start_block: int | None,
+    end_block: int | None,
+    network: spec.NetworkReference | None,
+    chunk_size: int,
+    concurrency: int,
+    write_size: int,
+    restart: bool,
+    export: str | None,
+) -> None:
+
+    if network is None:
+        from ctc import config
+
+        network = config.get_default_network()
+        if network is None:
+            raise Exception('must specify network or configure default network')
+    elif isinstance(network, str) and network.isdigit():
+        network = int(network)
+
+    if export is not None and schema_name != 'block_timestamps':
+        raise Exception('only block_timestamps can be exported')
+
+    backfill_start, backfill_end = await db.async_backfill_blocks(
+        schema_name=typing.cast(db.BackfillSchemaName, schema_name),
+        start_block=start_block,
+        end_block=end_block,
+        network=network,
+        chunk_size=chunk_size,
+        max_concurrent_chunks=concurrency,
+        write_size=write_size,
+        resume=not restart,
+    )
+
+    if export is not None:
+        path = await db.async_export_block_timestamps(
+            export,
+            start_block=backfill_start,
+            end_block=backfill_end,
+            network=network,
+        )
+        print('exported block timestamps to', path)
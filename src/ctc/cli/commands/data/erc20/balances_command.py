@@ -173,7 +173,7 @@ async def async_balances_command(
                 )
                 return
 
-            transfers = await evm.async_get_erc20_transfers(
+            transfers = evm.async_iterate_erc20_transfers(
                 erc20,
                 start_block=None,
                 end_block=block,
@@ -81,30 +81,44 @@ async def async_events_command(
         end_block = None
 
     if event.startswith('0x'):
-        events: spec.DataFrame = await evm.async_get_events(
-            contract_address=contract,
-            start_block=start_block,
-            end_block=end_block,
-            include_timestamps=include_timestamps,
-            verbose=False,
-            event_hash=event,
-        )
+        event_hash: str | None = event
+        event_name = None
     else:
-        events = await evm.async_get_events(
-            contract_address=contract,
-            start_block=start_block,
-            end_block=end_block,
-            include_timestamps=include_timestamps,
-            verbose=False,
-            event_name=event,
-        )
-
-    if len(events) == 0:
+        event_hash = None
+        event_name = event
+    chunks = evm.async_iterate_events(
+        contract_address=contract,
+        start_block=start_block,
+        end_block=end_block,
+        include_timestamps=include_timestamps,
+        verbose=False,
+        event_hash=event_hash,
+        event_name=event_name,
+    )
+    formatted_chunks = _async_format_event_chunks(
+        chunks,
+        include_timestamps=include_timestamps,
+        output=output,
+        verbose=verbose,
+    )
+    n_events = await cli_utils.async_output_data_chunks(
+        formatted_chunks, output=output, overwrite=overwrite
+    )
+
+    if n_events == 0:
         print('[no events found]')
 
-    else:
 
-        # output
+async def _async_format_event_chunks(
+    chunks: typing.AsyncIterator[spec.DataFrame],
+    *,
+    include_timestamps: bool,
+    output: str,
+    verbose: bool,
+) -> typing.AsyncIterator[spec.DataFrame]:
+
+    async for events in chunks:
+
         if not verbose:
             events.index = typing.cast(
                 spec.PandasIndex,
@@ -131,4 +145,4 @@ async def async_events_command(
             events = events.rename(columns=new_column_names)
         if output == 'stdout' and include_timestamps:
             events = events.astype({'timestamp': 'str'})
-        cli_utils.output_data(events, output=output, overwrite=overwrite)
+        yield events
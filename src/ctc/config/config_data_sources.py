@@ -13,6 +13,7 @@ from . import config_values
 
 
 BackendType = Literal['filesystem', 'rpc', 'db', 'rest', 'hybrid']
+FilesystemFormat = Literal['csv', 'parquet', 'feather']
 
 
 class DataSource(TypedDict, total=False):
@@ -30,6 +31,7 @@ class DataSource(TypedDict, total=False):
     db_config: toolsql.DBConfig
     rest_endpoint: dict[str, typing.Any]
     filesystem_root: str
+    filesystem_format: FilesystemFormat
     provider: spec.ProviderReference
 
     # hybrid parameters
@@ -46,6 +48,7 @@ class LeafDataSource(TypedDict, total=False):
     db_config: toolsql.DBConfig
     rest_endpoint: str
     filesystem_root: str
+    filesystem_format: FilesystemFormat
     provider: spec.ProviderReference
 
 
@@ -91,7 +94,10 @@ def get_data_source(**tags: typing.Any) -> DataSource:
         return {
             'backend': 'hybrid',
             'hybrid_order': [
-                {'backend': 'filesystem'},
+                {
+                    'backend': 'filesystem',
+                    'filesystem_format': _get_default_events_format(),
+                },
                 {'backend': 'rpc'},
             ],
         }
@@ -117,3 +123,14 @@ def get_data_source(**tags: typing.Any) -> DataSource:
         }
     else:
         return {'backend': 'rpc'}
+
+
+def _get_default_events_format() -> FilesystemFormat:
+    """store events as csv unless another format is opted into in config"""
+    file_format = config_values.get_events_file_format()
+    if file_format == 'parquet':
+        return 'parquet'
+    elif file_format == 'feather':
+        return 'feather'
+    else:
+        return 'csv'
@@ -19,6 +19,7 @@ def get_config_validators() -> typing.Mapping[
         'db_configs': validate_db_configs,
         'log_rpc_calls': None,
         'log_sql_queries': None,
+        'events_file_format': validate_events_file_format,
     }
 
 
@@ -35,9 +36,15 @@ def get_config_base_types() -> typing.Mapping[
         'db_configs': dict,
         'log_rpc_calls': bool,
         'log_sql_queries': bool,
+        'events_file_format': str,
     }
 
 
+def get_optional_config_keys() -> typing.Sequence[str]:
+    """keys that are allowed in config but that need not be specified"""
+    return ['events_file_format']
+
+
 def validate_config(config: typing.Mapping[typing.Any, typing.Any]) -> None:
     """raise spec.ConfigInvalid if config is not valid"""
 
@@ -54,7 +61,7 @@ def validate_config(config: typing.Mapping[typing.Any, typing.Any]) -> None:
     for key, value in config.items():
 
         # check that key is allowed
-        if key not in config_keys:
+        if key not in config_keys and key not in get_optional_config_keys():
             raise spec.ConfigInvalid('key not allowed in config:')
 
         # check value type
@@ -135,14 +142,19 @@ def validate_providers(
 ) -> None:
 
     provider_keys = set(spec.provider_keys)
+    allowed_provider_keys = provider_keys | set(spec.optional_provider_keys)
     for provider_name, provider in value.items():
         if not isinstance(provider_name, str):
             raise spec.ConfigInvalid('provider name should be a str')
 
-        if set(provider.keys()) != provider_keys:
+        if not provider_keys.issubset(provider.keys()):
             raise spec.ConfigInvalid(
                 'provider should have keys: ' + str(provider_keys)
             )
+        if not allowed_provider_keys.issuperset(provider.keys()):
+            raise spec.ConfigInvalid(
+                'provider can only have keys: ' + str(allowed_provider_keys)
+            )
 
         url = provider['url']
         name = provider['name']
@@ -161,17 +173,46 @@ def validate_providers(
             )
         if network not in config['networks']:
             raise spec.ConfigInvalid('provider network not in network entries')
-        if protocol != 'http':
-            raise spec.ConfigInvalid('only http supported')
+        if protocol not in ('http', 'wss'):
+            raise spec.ConfigInvalid('only http and wss supported')
         if not isinstance(session_kwargs, dict):
             raise spec.ConfigInvalid('session_kwargs must be a dict')
         if chunk_size is not None and not isinstance(chunk_size, int):
             raise spec.ConfigInvalid('chunk_size is not int')
 
-        if not url.startswith('http'):
+        max_requests_per_second = provider.get('max_requests_per_second')
+        if max_requests_per_second is not None:
+            if not isinstance(max_requests_per_second, (int, float)):
+                raise spec.ConfigInvalid('max_requests_per_second is not float')
+            if max_requests_per_second <= 0:
+                raise spec.ConfigInvalid('max_requests_per_second must be > 0')
+        max_concurrent_requests = provider.get('max_concurrent_requests')
+        if max_concurrent_requests is not None:
+            if not isinstance(max_concurrent_requests, int):
+                raise spec.ConfigInvalid('max_concurrent_requests is not int')
+            if max_concurrent_requests <= 0:
+                raise spec.ConfigInvalid('max_concurrent_requests must be > 0')
+        cache_responses = provider.get('cache_responses')
+        if cache_responses is not None and not isinstance(cache_responses, bool):
+            raise spec.ConfigInvalid('cache_responses is not bool')
+        microbatch_window = provider.get('microbatch_window')
+        if microbatch_window is not None:
+            if not isinstance(microbatch_window, (int, float)):
+                raise spec.ConfigInvalid('microbatch_window is not float')
+            if microbatch_window < 0:
+                raise spec.ConfigInvalid('microbatch_window must be >= 0')
+        multicall = provider.get('multicall')
+        if multicall is not None and not isinstance(multicall, bool):
+            raise spec.ConfigInvalid('multicall is not bool')
+
+        if protocol == 'http' and not url.startswith('http'):
             raise spec.ConfigInvalid(
                 'http provider url must start with "http://" or "https://"'
             )
+        if protocol == 'wss' and not url.startswith('ws'):
+            raise spec.ConfigInvalid(
+                'wss provider url must start with "ws://" or "wss://"'
+            )
 
 
 def validate_default_network(
@@ -214,3 +255,11 @@ def validate_db_configs(
         )
     if set(value['main'].keys()) != {'dbms', 'path'}:
         raise spec.ConfigInvalid('db config should have keys dbms and path')
+
+
+def validate_events_file_format(
+    value: typing.Any, config: typing.Mapping[typing.Any, typing.Any]
+) -> None:
+
+    if value not in ['csv', 'parquet', 'feather']:
+        raise spec.ConfigInvalid('invalid events_file_format: ' + str(value))
@@ -219,6 +219,20 @@ def get_log_sql_queries() -> bool:
     return config.get('log_sql_queries', False)
 
 
+#
+# # events
+#
+
+
+def get_events_file_format() -> str:
+    """get file format of new event files, csv unless configured otherwise"""
+    config: typing.Mapping[str, typing.Any] = config_read.get_config(
+        warn_if_dne=False
+    )
+    events_file_format: str = config.get('events_file_format', 'csv')
+    return events_file_format
+
+
 def get_log_dir() -> str:
     return os.path.join(get_data_dir(), 'logs')
 
@@ -69,6 +69,11 @@ async def async_setup_ctc(
         default_data_dir=data_dir,
         disable_logs=disable_logs,
     )
+    events_file_format = data_dir_setup.setup_events_file_format(
+        old_config=old_config,
+        styles=styles,
+        headless=headless,
+    )
     if not skip_db:
         db_data = db_setup.setup_dbs(
             data_dir=data_dir_data['data_dir'],
@@ -89,6 +94,7 @@ async def async_setup_ctc(
         network_data=network_data,
         db_data=db_data,
         data_dir_data=data_dir_data,
+        events_file_format=events_file_format,
         styles=styles,
         headless=headless,
         overwrite=overwrite,
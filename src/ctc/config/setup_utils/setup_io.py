@@ -72,6 +72,7 @@ def write_new_config(
     network_data: spec.PartialConfig,
     db_data: spec.PartialConfig,
     data_dir_data: spec.PartialConfig,
+    events_file_format: str = 'csv',
     styles: typing.Mapping[str, str],
     overwrite: bool = False,
     headless: bool = False,
@@ -102,13 +103,18 @@ def write_new_config(
         'log_rpc_calls': data_dir_data['log_rpc_calls'],
         'log_sql_queries': data_dir_data['log_sql_queries'],
     }
+
+    # optional keys are only written when they are set
+    config_data: typing.Dict[str, typing.Any] = dict(config)
+    if events_file_format != 'csv':
+        config_data['events_file_format'] = events_file_format
     print()
     print()
     toolstr.print('## Creating Configuration File', style=styles['header'])
     if os.path.isfile(config_path):
         with open(config_path, 'r') as f:
             old_config_raw = json.load(f)
-        write_new = json.dumps(config, sort_keys=True) != json.dumps(
+        write_new = json.dumps(config_data, sort_keys=True) != json.dumps(
             old_config_raw, sort_keys=True
         )
 
@@ -128,7 +134,13 @@ def write_new_config(
     print()
     if write_new:
         with open(config_path, 'w') as f:
-            json.dump(config, f)
+            json.dump(config_data, f)
+
+        # engines of the previous db config should not be reused
+        from ctc import db
+
+        db.invalidate_engines()
+
         toolstr.print(
             'Config file created at',
             toolstr.add_style(config_path, styles['path']),
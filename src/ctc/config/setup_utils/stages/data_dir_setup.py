@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import importlib.util
 import os
 import shutil
 import typing
@@ -105,3 +106,34 @@ def setup_data_dir(
         'log_rpc_calls': not disable_logs,
         'log_sql_queries': not disable_logs,
     }
+
+
+def setup_events_file_format(
+    *,
+    styles: dict[str, str],
+    old_config: typing.Mapping[typing.Any, typing.Any],
+    headless: bool,
+) -> str:
+    """event files are stored as csv unless parquet is opted into"""
+
+    events_file_format: str = old_config.get('events_file_format', 'csv')
+    if importlib.util.find_spec('pyarrow') is None:
+        return events_file_format
+
+    print()
+    if events_file_format == 'parquet':
+        default = 'yes'
+    else:
+        default = 'no'
+    use_parquet = toolcli.input_yes_or_no(
+        'Store event data as parquet files instead of csv? ',
+        default=default,
+        style=styles['question'],
+        headless=headless,
+    )
+    if use_parquet:
+        return 'parquet'
+    elif events_file_format == 'parquet':
+        return 'csv'
+    else:
+        return events_file_format
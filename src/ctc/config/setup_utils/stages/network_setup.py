@@ -235,13 +235,15 @@ async def async_collect_provider_metadata(
     else:
         print('Adding RPC provider: ' + str(url))
 
-    if url.startswith('ws://'):
-        # TODO: take new input instead of raising exception
-        raise NotImplementedError('websockets not supported')
-    elif not url.startswith('https://') and not url.startswith('http://'):
-        print()
-        print('No prefix for url. Adding `https://`')
-        url = 'https://' + url
+    protocol: typing.Literal['http', 'wss']
+    if url.startswith('ws://') or url.startswith('wss://'):
+        protocol = 'wss'
+    else:
+        if not url.startswith('https://') and not url.startswith('http://'):
+            print()
+            print('No prefix for url. Adding `https://`')
+            url = 'https://' + url
+        protocol = 'http'
 
     if (
         chain_id is None
@@ -259,7 +261,7 @@ async def async_collect_provider_metadata(
             temporary_provider: spec.Provider = {
                 'name': None,
                 'network': -2,
-                'protocol': 'http',
+                'protocol': protocol,
                 'session_kwargs': {},
                 'chunk_size': None,
                 'url': url,
@@ -313,10 +315,6 @@ async def async_collect_provider_metadata(
         style=styles['question'],
         headless=headless,
     )
-    if url.startswith('http'):
-        protocol: typing.Literal['http'] = 'http'
-    else:
-        raise Exception('unknown protocol, missing http(s) in url?')
     provider: spec.Provider = {
         'name': name,
         'url': url,
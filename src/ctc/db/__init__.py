@@ -2,6 +2,7 @@ from .management import *
 from .schemas import *
 
 from .connect_utils import *
+from .executor_utils import *
 from .intake_utils import *
 from .query_utils import *
 from .schema_utils import *
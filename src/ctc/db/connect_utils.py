@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import os
+import threading
 import typing
 
 import toolsql
@@ -13,13 +14,32 @@ from .management import dba_utils
 from .management import version_utils
 
 
+_engines_lock = threading.RLock()
+
+# engines shared by every query of the process, keyed by db_config
+_engines: dict[str, toolsql.SAEngine] = {}
+
+# engines whose schema has already been checked, keyed by db_config, schema,
+# and network, so that a changed config never reuses an engine of old config
+_schema_engines: dict[
+    typing.Tuple[str, str, typing.Optional[spec.NetworkReference]],
+    toolsql.SAEngine,
+] = {}
+
+
 def create_engine(
     schema_name: schema_utils.SchemaName,
     *,
     network: spec.NetworkReference | None,
     create_missing_schema: bool = True,
 ) -> toolsql.SAEngine | None:
-    """create sqlalchemy engine object"""
+    """get pooled sqlalchemy engine for schema
+
+    - engines are created once per db_config and shared across calls
+    - schema existence is checked once per engine, not once per query
+    - db config is resolved on every call, so config changes take effect
+    - use invalidate_engines() after dropping or creating schemas
+    """
 
     # get db config
     data_source: config.DataSource | config.LeafDataSource = (
@@ -34,35 +54,113 @@ def create_engine(
     db_config = data_source['db_config']
     if db_config is None:
         raise Exception('invalid db_config')
+    db_config_key = _get_db_config_key(db_config)
+
+    # fast path, engine already created and schema already checked
+    schema_key = (db_config_key, schema_name, network)
+    if create_missing_schema:
+        engine = _schema_engines.get(schema_key)
+        if engine is not None:
+            return engine
+
+    with _engines_lock:
+        engine = get_db_config_engine(db_config)
+
+        # create missing tables
+        if create_missing_schema:
+            if schema_key not in _schema_engines:
+                _initialize_missing_schema(
+                    schema_name=schema_name,
+                    network=network,
+                    engine=engine,
+                )
+                _schema_engines[schema_key] = engine
+
+    return engine
+
+
+def _get_db_config_key(db_config: toolsql.DBConfig) -> str:
+    import json
+
+    return json.dumps(db_config, sort_keys=True, default=str)
+
+
+def get_db_config_engine(db_config: toolsql.DBConfig) -> toolsql.SAEngine:
+    """get pooled engine of db_config, creating it if need be"""
+
+    key = _get_db_config_key(db_config)
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+
+            # create directory if need be
+            if db_config['dbms'] == 'sqlite':
+                pathdir = os.path.dirname(os.path.abspath(db_config['path']))
+                os.makedirs(pathdir, exist_ok=True)
+
+            engine = toolsql.create_engine(
+                db_config=db_config,
+                engine_kwargs=_get_pool_kwargs(db_config),
+            )
+            _engines[key] = engine
+        return engine
+
+
+def _get_pool_kwargs(
+    db_config: toolsql.DBConfig,
+) -> typing.Mapping[str, typing.Any]:
+    import sqlalchemy.pool  # type: ignore
 
-    # create directory if need be
     if db_config['dbms'] == 'sqlite':
-        pathdir = os.path.dirname(os.path.abspath(db_config['path']))
-        os.makedirs(pathdir, exist_ok=True)
+        # sqlite file connections are cheap to keep open, and may be used by
+        # threads other than the one that opened them
+        return {
+            'poolclass': sqlalchemy.pool.QueuePool,
+            'pool_size': 5,
+            'max_overflow': 10,
+            'connect_args': {'check_same_thread': False},
+        }
+    else:
+        return {'pool_pre_ping': True}
 
-    # create engine
-    engine = toolsql.create_engine(db_config=db_config)
 
-    # create missing tables
-    if create_missing_schema:
-        with engine.begin() as conn:
+def _initialize_missing_schema(
+    *,
+    schema_name: schema_utils.SchemaName,
+    network: spec.NetworkReference | None,
+    engine: toolsql.SAEngine,
+) -> None:
+    with engine.begin() as conn:
 
-            # check that schema versions being tracked
-            if not version_utils.is_schema_versions_initialized(engine=engine):
-                dba_utils.initialize_schema_versions(conn=conn)
+        # check that schema versions being tracked
+        if not version_utils.is_schema_versions_initialized(engine=engine):
+            dba_utils.initialize_schema_versions(conn=conn)
 
-            # check if schema in database
-            schema_version = version_utils.get_schema_version(
+        # check if schema in database
+        schema_version = version_utils.get_schema_version(
+            schema_name=schema_name,
+            network=network,
+            conn=conn,
+        )
+
+        # create schema if missing
+        if schema_version is None:
+            dba_utils.initialize_schema(
                 schema_name=schema_name,
                 network=network,
+                conn=conn,
             )
 
-            # create schema if missing
-            if schema_version is None:
-                dba_utils.initialize_schema(
-                    schema_name=schema_name,
-                    network=network,
-                    conn=conn,
-                )
 
-    return engine
+def invalidate_engines() -> None:
+    """dispose of shared engines so that they are recreated on next use
+
+    call after changing db config, or after dropping or creating schemas
+    outside of create_engine()
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _schema_engines.clear()
+        version_utils.reset_schema_version_engine()
@@ -0,0 +1,140 @@
+"""run blocking database work off of the event loop
+
+sqlalchemy and toolsql calls block their thread, so db work is run in a
+dedicated thread pool where it cannot stall in-flight rpc requests
+- each db thread runs db coroutines to completion on its own event loop
+- concurrent db work is bounded per engine so that its pool is not exhausted
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import threading
+import typing
+import weakref
+
+import toolsql
+
+
+_R = typing.TypeVar('_R')
+
+_max_workers = 8
+
+# maximum number of concurrent db jobs per engine, by dialect
+_max_concurrent_jobs = {'sqlite': 4}
+_default_max_concurrent_jobs = 8
+
+_executor_lock = threading.Lock()
+_executor_state: dict[
+    str, typing.Optional[concurrent.futures.ThreadPoolExecutor]
+] = {'executor': None}
+_thread_state = threading.local()
+
+# semaphores are bound to an event loop, so they are stored per loop
+_engine_semaphores: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, asyncio.Semaphore]
+] = weakref.WeakKeyDictionary()
+
+
+async def async_run_with_connection(
+    async_f: typing.Callable[..., typing.Coroutine[typing.Any, typing.Any, _R]],
+    *,
+    engine: toolsql.SAEngine,
+    begin: bool = False,
+    **kwargs: typing.Any,
+) -> _R:
+    """run db coroutine function in a db thread, using pooled connection
+
+    - async_f receives the connection as its conn kwarg
+    - if begin is True, async_f runs in a transaction that is committed when
+      async_f returns
+    """
+
+    def get_connection() -> typing.ContextManager[toolsql.SAConnection]:
+        if begin:
+            return engine.begin()  # type: ignore
+        else:
+            return engine.connect()  # type: ignore
+
+    # already in a db thread, waiting on another db thread could deadlock
+    if _in_db_thread():
+        with get_connection() as conn:
+            return await async_f(conn=conn, **kwargs)
+
+    def run() -> _R:
+        with get_connection() as conn:
+            return run_coroutine_in_db_thread(async_f(conn=conn, **kwargs))
+
+    return await async_run_db_job(run, engine=engine)
+
+
+async def async_run_db_job(
+    f: typing.Callable[[], _R],
+    *,
+    engine: toolsql.SAEngine,
+) -> _R:
+    """run blocking function in a db thread, bounded by engine concurrency"""
+    if _in_db_thread():
+        return f()
+
+    loop = asyncio.get_running_loop()
+    async with _get_engine_semaphore(engine, loop):
+        return await loop.run_in_executor(_get_executor(), f)
+
+
+async def async_run_in_db_executor(f: typing.Callable[[], _R]) -> _R:
+    """run blocking function in a db thread, for work that has no engine
+
+    f is responsible for its own locking, concurrency is not bounded here
+    """
+    if _in_db_thread():
+        return f()
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), f)
+
+
+def run_coroutine_in_db_thread(
+    coroutine: typing.Coroutine[typing.Any, typing.Any, _R],
+) -> _R:
+    """run coroutine to completion on event loop of current db thread"""
+    loop: asyncio.AbstractEventLoop | None = getattr(_thread_state, 'loop', None)
+    if loop is None:
+        loop = asyncio.new_event_loop()
+        _thread_state.loop = loop
+    return loop.run_until_complete(coroutine)
+
+
+def _in_db_thread() -> bool:
+    return getattr(_thread_state, 'loop', None) is not None
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    executor = _executor_state['executor']
+    if executor is None:
+        with _executor_lock:
+            executor = _executor_state['executor']
+            if executor is None:
+                executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=_max_workers,
+                    thread_name_prefix='ctc_db',
+                )
+                _executor_state['executor'] = executor
+    return executor
+
+
+def _get_engine_semaphore(
+    engine: toolsql.SAEngine,
+    loop: asyncio.AbstractEventLoop,
+) -> asyncio.Semaphore:
+    semaphores = _engine_semaphores.setdefault(loop, {})
+    key = str(engine.url)
+    semaphore = semaphores.get(key)
+    if semaphore is None:
+        max_jobs = _max_concurrent_jobs.get(
+            engine.dialect.name, _default_max_concurrent_jobs
+        )
+        semaphore = asyncio.Semaphore(max_jobs)
+        semaphores[key] = semaphore
+    return semaphore
@@ -1,4 +1,5 @@
 from .active_utils import *
 from .dba_utils import *
 from .reorg_utils import *
+from .backfill_utils import *
 from .version_utils import *
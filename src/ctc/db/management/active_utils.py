@@ -3,6 +3,7 @@ from __future__ import annotations
 import typing
 
 if typing.TYPE_CHECKING:
+    from ctc import spec
     from .. import schema_utils
 
 
@@ -34,3 +35,16 @@ def get_active_timestamp_schema() -> schema_utils.NetworkSchemaName | None:
         return 'blocks'
     else:
         return None
+
+
+def is_timestamp_array_active(
+    network: spec.NetworkReference | None = None,
+) -> bool:
+    """return whether timestamp lookups are served from timestamp array
+
+    the array takes precedence over the active timestamp schema, lookups that
+    fall outside of the array use the active timestamp schema
+    """
+    from ..schemas.block_timestamps import block_timestamps_array
+
+    return block_timestamps_array.has_block_timestamps_array(network)
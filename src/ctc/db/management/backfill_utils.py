@@ -0,0 +1,358 @@
+"""bulk backfill of block data into db over a range of blocks
+
+- blocks are fetched in chunks of batched eth_getBlockByNumber requests, with
+  multiple chunks in flight at once
+- fetched chunks are buffered and written in large transactions, skipping the
+  per-call confirmation checks of the normal intake path
+- block ranges are checkpointed to the data dir as they are written, so an
+  interrupted backfill resumes from the blocks that are still missing
+- checkpoints are keyed by db as well as by schema and network, and dropping
+  a schema removes its checkpoints, so a resume never skips unstored blocks
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import typing
+
+from typing_extensions import Literal
+from typing_extensions import TypedDict
+
+if typing.TYPE_CHECKING:
+    import toolsql
+
+    from ctc import spec
+
+
+BackfillSchemaName = Literal['block_timestamps', 'blocks']
+
+_checkpoint_version = 1
+
+
+class _BackfillCheckpoint(TypedDict):
+    version: int
+    block_ranges: list[list[int]]
+
+
+class _BackfillBuffer(TypedDict):
+    blocks: list[spec.Block]
+    block_timestamps: dict[int, int]
+    block_ranges: list[typing.Tuple[int, int]]
+
+
+async def async_backfill_blocks(
+    *,
+    schema_name: BackfillSchemaName = 'block_timestamps',
+    start_block: int | None = None,
+    end_block: int | None = None,
+    network: spec.NetworkReference | None = None,
+    chunk_size: int = 1000,
+    max_concurrent_chunks: int = 8,
+    write_size: int = 100000,
+    resume: bool = True,
+    verbose: bool = True,
+) -> typing.Tuple[int, int]:
+    """fetch and store blocks of range into block_timestamps or blocks schema
+
+    returns (start_block, end_block) of the backfilled range
+
+    ## Inputs
+    - schema_name: schema to fill, either block_timestamps or blocks
+    - start_block: first block of range, default is 0
+    - end_block: last block of range, default is latest fully confirmed block
+    - chunk_size: number of blocks per batched rpc request
+    - max_concurrent_chunks: number of rpc requests in flight at once
+    - write_size: number of blocks to buffer per db transaction
+    - resume: whether to skip block ranges written by previous backfills
+    """
+    import asyncio
+
+    from ctc import config
+    from ctc import evm
+    from ctc import rpc
+    from ctc.evm.event_utils.event_backends import filesystem_index
+    from .. import connect_utils
+    from . import reorg_utils
+
+    if schema_name not in ('block_timestamps', 'blocks'):
+        raise Exception('cannot backfill schema: ' + str(schema_name))
+    if network is None:
+        network = config.get_default_network()
+        if network is None:
+            raise Exception('must specify network or configure default network')
+    provider = rpc.add_provider_parameters(
+        {'network': evm.get_network_name(network)},
+        {'chunk_size': chunk_size},
+    )
+
+    engine = connect_utils.create_engine(
+        schema_name=schema_name,
+        network=network,
+    )
+    if engine is None:
+        raise Exception('db not configured')
+
+    # determine block range, checking confirmations once for whole range
+    latest_block = await rpc.async_eth_block_number(provider=provider)
+    max_end_block = latest_block - reorg_utils.get_required_confirmations(
+        network=network
+    )
+    if start_block is None:
+        start_block = 0
+    if end_block is None:
+        end_block = max_end_block
+    elif end_block > max_end_block:
+        raise Exception(
+            'end_block is not fully confirmed, must be <= '
+            + str(max_end_block)
+        )
+
+    # determine chunks not yet written
+    checkpoint_path = get_backfill_checkpoint_path(
+        schema_name,
+        network,
+        engine=engine,
+    )
+    if resume:
+        completed = _read_backfill_checkpoint(checkpoint_path)
+    else:
+        completed = []
+    chunks = []
+    remaining = filesystem_index.get_block_ranges_gaps(
+        completed,
+        start_block=start_block,
+        end_block=end_block,
+    )
+    for gap_start, gap_end in remaining:
+        for chunk_start in range(gap_start, gap_end + 1, chunk_size):
+            chunk_end = min(chunk_start + chunk_size - 1, gap_end)
+            chunks.append((chunk_start, chunk_end))
+    n_blocks = sum(end - start + 1 for start, end in chunks)
+
+    if verbose:
+        print('backfilling', schema_name, 'for network', network)
+        print('- block range:', start_block, 'to', end_block)
+        n_stored = end_block - start_block + 1 - n_blocks
+        print('- blocks already stored:', n_stored)
+        print('- blocks to fetch:', n_blocks)
+
+    buffer: _BackfillBuffer = {
+        'blocks': [],
+        'block_timestamps': {},
+        'block_ranges': [],
+    }
+    progress = {'n_written': 0}
+
+    async def async_flush() -> None:
+        # swap buffer before awaiting so that workers keep filling a new one
+        flushed: _BackfillBuffer = {
+            'blocks': buffer['blocks'],
+            'block_timestamps': buffer['block_timestamps'],
+            'block_ranges': buffer['block_ranges'],
+        }
+        buffer['blocks'] = []
+        buffer['block_timestamps'] = {}
+        buffer['block_ranges'] = []
+        if len(flushed['block_ranges']) == 0:
+            return
+
+        await _async_write_backfill_blocks(
+            blocks=flushed['blocks'],
+            block_timestamps=flushed['block_timestamps'],
+            schema_name=schema_name,
+            engine=engine,
+            network=network,
+        )
+        completed.extend(flushed['block_ranges'])
+        completed[:] = _merge_block_ranges(completed)
+        _write_backfill_checkpoint(checkpoint_path, completed)
+
+        progress['n_written'] += sum(
+            end - start + 1 for start, end in flushed['block_ranges']
+        )
+        if verbose:
+            print('- wrote', progress['n_written'], '/', n_blocks, 'blocks')
+
+    chunk_iterator = iter(chunks)
+
+    async def async_worker() -> None:
+        for chunk_start, chunk_end in chunk_iterator:
+            blocks = await rpc.async_batch_eth_get_block_by_number(
+                block_numbers=range(chunk_start, chunk_end + 1),
+                include_full_transactions=False,
+                provider=provider,
+            )
+            if schema_name == 'block_timestamps':
+                for block in blocks:
+                    buffer['block_timestamps'][block['number']] = block[
+                        'timestamp'
+                    ]
+            else:
+                buffer['blocks'].extend(blocks)
+            buffer['block_ranges'].append((chunk_start, chunk_end))
+
+            n_buffered = len(buffer['blocks'])
+            n_buffered += len(buffer['block_timestamps'])
+            if n_buffered >= write_size:
+                await async_flush()
+
+    n_workers = min(max_concurrent_chunks, len(chunks))
+    await asyncio.gather(*[async_worker() for w in range(n_workers)])
+    await async_flush()
+
+    # extend timestamp array, since backfill bypasses block intake
+    if schema_name == 'block_timestamps':
+        from ..schemas.block_timestamps import block_timestamps_array
+        from . import active_utils
+
+        if active_utils.is_timestamp_array_active(network):
+            await block_timestamps_array.async_refresh_block_timestamps_array(
+                network
+            )
+
+    if verbose:
+        print('...done')
+
+    return (start_block, end_block)
+
+
+async def async_export_block_timestamps(
+    dirname: str,
+    *,
+    start_block: int,
+    end_block: int,
+    network: spec.NetworkReference | None = None,
+) -> str:
+    """export stored block timestamps of range to compressed npz file"""
+    from ctc import db
+    from .compression import block_timestamp_compression
+
+    block_timestamps = await db.async_query_all_block_timestamps(
+        network=network,
+        start_block=start_block,
+        end_block=end_block,
+    )
+    if block_timestamps is None:
+        raise Exception('no block timestamps in db')
+    n_missing = end_block - start_block + 1 - len(block_timestamps)
+    if n_missing > 0:
+        raise Exception(
+            str(n_missing) + ' blocks of range missing from db, backfill first'
+        )
+
+    os.makedirs(dirname, exist_ok=True)
+    return block_timestamp_compression.save_compressed_block_timestamps(
+        block_timestamps,
+        dirname=dirname,
+    )
+
+
+async def _async_write_backfill_blocks(
+    *,
+    blocks: typing.Sequence[spec.Block],
+    block_timestamps: typing.Mapping[int, int],
+    schema_name: BackfillSchemaName,
+    engine: toolsql.SAEngine,
+    network: spec.NetworkReference,
+) -> None:
+    from .. import executor_utils
+    from ..schemas.block_timestamps import block_timestamps_statements
+    from ..schemas.blocks import blocks_statements
+
+    if schema_name == 'block_timestamps':
+        await executor_utils.async_run_with_connection(
+            block_timestamps_statements.async_upsert_block_timestamps,
+            engine=engine,
+            begin=True,
+            block_timestamps=block_timestamps,
+            network=network,
+        )
+    elif schema_name == 'blocks':
+        await executor_utils.async_run_with_connection(
+            blocks_statements.async_upsert_blocks,
+            engine=engine,
+            begin=True,
+            blocks=blocks,
+            network=network,
+        )
+    else:
+        raise Exception('cannot backfill schema: ' + str(schema_name))
+
+
+#
+# # checkpoints
+#
+
+
+def get_backfill_checkpoint_path(
+    schema_name: BackfillSchemaName,
+    network: spec.NetworkReference,
+    *,
+    engine: toolsql.SAEngine,
+) -> str:
+    """get path of backfill checkpoint for schema, network, and db of engine"""
+    from ctc import config
+    from ctc import evm
+
+    chain_id = evm.get_network_chain_id(network)
+    db_key = hashlib.md5(str(engine.url).encode()).hexdigest()[:16]
+    return os.path.join(
+        config.get_data_dir(),
+        'backfill',
+        schema_name + '__' + str(chain_id) + '__' + db_key + '.json',
+    )
+
+
+def delete_backfill_checkpoint(
+    schema_name: BackfillSchemaName,
+    network: spec.NetworkReference,
+    *,
+    engine: toolsql.SAEngine,
+) -> None:
+    """delete backfill checkpoint, for use when stored blocks are dropped"""
+    path = get_backfill_checkpoint_path(schema_name, network, engine=engine)
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_backfill_checkpoint(path: str) -> list[typing.Tuple[int, int]]:
+    try:
+        with open(path, 'r') as f:
+            checkpoint: _BackfillCheckpoint = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return []
+    if checkpoint.get('version') != _checkpoint_version:
+        return []
+    return [(start, end) for start, end in checkpoint['block_ranges']]
+
+
+def _write_backfill_checkpoint(
+    path: str,
+    block_ranges: typing.Sequence[typing.Tuple[int, int]],
+) -> None:
+    checkpoint: _BackfillCheckpoint = {
+        'version': _checkpoint_version,
+        'block_ranges': [[start, end] for start, end in block_ranges],
+    }
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def _merge_block_ranges(
+    block_ranges: typing.Iterable[typing.Tuple[int, int]],
+) -> list[typing.Tuple[int, int]]:
+    merged: list[typing.Tuple[int, int]] = []
+    for start, end in sorted(block_ranges):
+        if len(merged) > 0 and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
@@ -100,3 +100,32 @@ def load_compressed_block_times(
 
     blocks = range(start_block, end_block + 1)
     return dict(zip(blocks, timestamps))
+
+
+def load_compressed_block_timestamps_array(
+    path: str,
+) -> typing.Tuple[int, spec.NumpyArray]:
+    """load (start_block, timestamps array) without building a dict"""
+
+    import numpy as np
+
+    filename = os.path.basename(path)
+    name = os.path.splitext(filename)[0]
+    _, block_range, t_info = name.split('__')
+    start_block_str, _ = block_range.split('_to_')
+    start_block = int(start_block_str)
+    t_index, t_str = t_info.split('_')
+    t_start = int(t_str)
+
+    timestamp_diffs = np.load(path)['timestamp_diffs']
+
+    if t_index == 't0':
+        head = [t_start]
+    elif t_index == 't1':
+        head = [0, t_start]
+    else:
+        raise Exception('unknown t_index: ' + str(t_index))
+    tail = t_start + np.cumsum(timestamp_diffs, dtype=np.int64)
+    timestamps = np.concatenate([np.array(head, dtype=np.int64), tail])
+
+    return start_block, timestamps
@@ -273,6 +273,17 @@ def drop_schema(
                 )
                 table_object.drop(bind=engine)
 
+        # forget backfilled ranges, since their blocks are no longer stored
+        backfill_schema_names = ('block_timestamps', 'blocks')
+        if schema_name in backfill_schema_names and network is not None:
+            from . import backfill_utils
+
+            backfill_utils.delete_backfill_checkpoint(
+                typing.cast(backfill_utils.BackfillSchemaName, schema_name),
+                network,
+                engine=engine,
+            )
+
     # delete rows from schema_versions table
     schema_version_engine = connect_utils.create_engine(
         schema_name='schema_versions',
@@ -289,3 +300,6 @@ def drop_schema(
                     confirm_delete_row=True,
                     confirm_delete_schema=True,
                 )
+
+    # dropped schemas must be checked again before next use
+    connect_utils.invalidate_engines()
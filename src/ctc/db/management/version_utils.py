@@ -74,13 +74,21 @@ def _get_schema_version_engine() -> toolsql.SAEngine:
     lock = typing.cast(threading.Lock, _schema_version_cache['lock'])
     with lock:
         if _schema_version_cache.get('engine') is None:
-            db_config = config.get_db_config()
-            _schema_version_cache['engine'] = toolsql.create_engine(
-                db_config=db_config
-            )
+            from .. import connect_utils
+
+            db_config = config.get_db_config(require=True)
+            _schema_version_cache[
+                'engine'
+            ] = connect_utils.get_db_config_engine(db_config)
         return _schema_version_cache['engine']
 
 
+def reset_schema_version_engine() -> None:
+    lock = typing.cast(threading.Lock, _schema_version_cache['lock'])
+    with lock:
+        _schema_version_cache['engine'] = None
+
+
 def set_schema_version(
     schema_name: str,
     network: spec.NetworkReference | None,
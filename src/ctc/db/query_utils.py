@@ -8,6 +8,7 @@ import toolsql
 
 from ctc import spec
 from . import connect_utils
+from . import executor_utils
 from . import schema_utils
 
 
@@ -61,8 +62,11 @@ def wrap_selector_with_connection(
         if require_network:
             kwargs['network'] = network
         try:
-            with engine.connect() as conn:
-                return await async_f(*args, conn=conn, **kwargs)
+            return await executor_utils.async_run_with_connection(
+                functools.partial(async_f, *args),
+                engine=engine,
+                **kwargs,
+            )
         except sqlalchemy.exc.OperationalError:
             return None
 
@@ -1,3 +1,4 @@
+from .block_timestamps_array import *
 from .block_timestamps_statements import *
 from .block_timestamps_schema_defs import *
 from .multischema_block_timestamps_queries import *
@@ -0,0 +1,362 @@
+"""dense memory-mapped array of block timestamps
+
+- the timestamps of a contiguous range of blocks are stored in a flat file
+    - 8 byte header containing the first block number, as little-endian uint64
+    - one little-endian uint32 timestamp per block
+- block -> timestamp lookups are an index into the array
+- timestamp -> block lookups are a binary search of the array
+- the array is extended in place as newer confirmed blocks are intaken
+- writers hold an exclusive lock on a sidecar lock file, so that writers in
+  separate processes cannot interleave
+"""
+
+from __future__ import annotations
+
+import contextlib
+import os
+import threading
+import typing
+
+from typing_extensions import Literal
+from typing_extensions import TypedDict
+
+from ctc import spec
+
+
+_header_dtype = '<u8'
+_header_size = 8
+_timestamp_dtype = '<u4'
+_timestamp_size = 4
+
+
+class BlockTimestampsArray(TypedDict):
+    start_block: int
+    timestamps: spec.NumpyArray
+
+
+# memory maps are reused until the file grows
+_arrays: dict[str, typing.Tuple[int, BlockTimestampsArray]] = {}
+_arrays_lock = threading.Lock()
+
+
+def get_block_timestamps_array_path(
+    network: spec.NetworkReference | None = None,
+) -> str:
+    from ctc import config
+    from ctc import evm
+
+    if network is None:
+        network = config.get_default_network()
+        if network is None:
+            raise Exception('must specify network or configure default network')
+    chain_id = evm.get_network_chain_id(network)
+    return os.path.join(
+        config.get_data_dir(),
+        'block_timestamps',
+        'block_timestamps__' + str(chain_id) + '.u32',
+    )
+
+
+def has_block_timestamps_array(
+    network: spec.NetworkReference | None = None,
+) -> bool:
+    """return whether a readable array with at least one block exists"""
+    path = get_block_timestamps_array_path(network)
+    try:
+        n_bytes = os.path.getsize(path)
+    except OSError:
+        return False
+    return n_bytes >= _header_size + _timestamp_size
+
+
+@contextlib.contextmanager
+def _lock_array(path: str) -> typing.Iterator[None]:
+    """hold exclusive lock on array across threads and processes"""
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _arrays_lock, open(path + '.lock', 'a+b') as f:
+        if os.name == 'nt':
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # type: ignore
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)  # type: ignore
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def load_block_timestamps_array(
+    network: spec.NetworkReference | None = None,
+) -> BlockTimestampsArray | None:
+    """load memory-mapped block timestamps array of network, if it exists"""
+    import numpy as np
+
+    path = get_block_timestamps_array_path(network)
+    try:
+        n_bytes = os.path.getsize(path)
+    except FileNotFoundError:
+        return None
+
+    cached = _arrays.get(path)
+    if cached is not None and cached[0] == n_bytes:
+        return cached[1]
+
+    if n_bytes < _header_size:
+        return None
+    with _arrays_lock:
+        n_timestamps = (n_bytes - _header_size) // _timestamp_size
+        start_block = int(np.fromfile(path, dtype=_header_dtype, count=1)[0])
+        timestamps: spec.NumpyArray
+        if n_timestamps > 0:
+            timestamps = np.memmap(
+                path,
+                dtype=_timestamp_dtype,
+                mode='r',
+                offset=_header_size,
+                shape=(n_timestamps,),
+            )
+        else:
+            timestamps = np.zeros(0, dtype=_timestamp_dtype)
+        array: BlockTimestampsArray = {
+            'start_block': start_block,
+            'timestamps': timestamps,
+        }
+        _arrays[path] = (n_bytes, array)
+        return array
+
+
+def get_block_timestamps_array_range(
+    network: spec.NetworkReference | None = None,
+) -> typing.Tuple[int, int] | None:
+    """get (first block, last block) stored in block timestamps array"""
+    array = load_block_timestamps_array(network)
+    if array is None or len(array['timestamps']) == 0:
+        return None
+    start_block = array['start_block']
+    return (start_block, start_block + len(array['timestamps']) - 1)
+
+
+#
+# # building
+#
+
+
+def write_block_timestamps_array(
+    timestamps: typing.Sequence[int] | spec.NumpyArray,
+    *,
+    start_block: int,
+    network: spec.NetworkReference,
+) -> None:
+    """write timestamps of contiguous blocks beginning at start_block"""
+    import numpy as np
+
+    path = get_block_timestamps_array_path(network)
+    with _lock_array(path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(np.array([start_block], dtype=_header_dtype).tobytes())
+            f.write(np.asarray(timestamps, dtype=_timestamp_dtype).tobytes())
+        os.replace(tmp_path, path)
+
+
+def build_block_timestamps_array_from_compressed(
+    path: str,
+    *,
+    network: spec.NetworkReference,
+) -> None:
+    """build block timestamps array from a compressed npz timestamps file"""
+    from ctc.db.management.compression import block_timestamp_compression
+
+    (
+        start_block,
+        timestamps,
+    ) = block_timestamp_compression.load_compressed_block_timestamps_array(
+        path
+    )
+    write_block_timestamps_array(
+        timestamps,
+        start_block=start_block,
+        network=network,
+    )
+
+
+async def async_build_block_timestamps_array_from_db(
+    network: spec.NetworkReference,
+) -> None:
+    """build block timestamps array from block_timestamps table
+
+    only the contiguous run of blocks beginning at the earliest stored block
+    is included
+    """
+    from ctc import db
+
+    block_timestamps = await db.async_query_all_block_timestamps(
+        network=network
+    )
+    if block_timestamps is None or len(block_timestamps) == 0:
+        raise Exception('no block timestamps in db')
+    start_block = min(block_timestamps.keys())
+    write_block_timestamps_array(
+        _get_contiguous_timestamps(block_timestamps, start_block=start_block),
+        start_block=start_block,
+        network=network,
+    )
+
+
+def append_block_timestamps_to_array(
+    block_timestamps: typing.Mapping[int, int],
+    *,
+    network: spec.NetworkReference,
+) -> int:
+    """extend block timestamps array with timestamps of following blocks
+
+    blocks are only appended while they are contiguous with end of array,
+    returns number of blocks appended
+    """
+    import numpy as np
+
+    path = get_block_timestamps_array_path(network)
+    if not has_block_timestamps_array(network):
+        return 0
+    with _lock_array(path):
+
+        # read end of array under lock, other writers may have extended it
+        with open(path, 'r+b') as f:
+            header = f.read(_header_size)
+            if len(header) < _header_size:
+                return 0
+            start_block = int(np.frombuffer(header, dtype=_header_dtype)[0])
+            n_bytes = f.seek(0, os.SEEK_END)
+            n_timestamps = (n_bytes - _header_size) // _timestamp_size
+            timestamps = _get_contiguous_timestamps(
+                block_timestamps, start_block=start_block + n_timestamps
+            )
+            if len(timestamps) == 0:
+                return 0
+
+            # drop partial timestamp left by an interrupted write
+            end = _header_size + n_timestamps * _timestamp_size
+            if end != n_bytes:
+                f.truncate(end)
+            f.seek(end)
+            f.write(np.array(timestamps, dtype=_timestamp_dtype).tobytes())
+    return len(timestamps)
+
+
+async def async_refresh_block_timestamps_array(
+    network: spec.NetworkReference,
+) -> int:
+    """append blocks newer than end of array from block_timestamps table"""
+    from ctc import db
+
+    block_range = get_block_timestamps_array_range(network)
+    if block_range is None:
+        return 0
+    block_timestamps = await db.async_query_all_block_timestamps(
+        network=network,
+        start_block=block_range[1] + 1,
+    )
+    if block_timestamps is None:
+        return 0
+    return append_block_timestamps_to_array(block_timestamps, network=network)
+
+
+def _get_contiguous_timestamps(
+    block_timestamps: typing.Mapping[int, int],
+    *,
+    start_block: int,
+) -> list[int]:
+    timestamps = []
+    block = start_block
+    while block in block_timestamps:
+        timestamps.append(block_timestamps[block])
+        block += 1
+    return timestamps
+
+
+#
+# # lookups
+#
+
+
+def get_array_block_timestamps(
+    block_numbers: typing.Sequence[typing.SupportsInt],
+    *,
+    network: spec.NetworkReference | None = None,
+) -> list[int | None] | None:
+    """get timestamps of blocks, None for blocks outside of array"""
+    import numpy as np
+
+    array = load_block_timestamps_array(network)
+    if array is None:
+        return None
+    timestamps = array['timestamps']
+
+    indices = np.array([int(block) for block in block_numbers], dtype=np.int64)
+    indices -= array['start_block']
+    in_range = (indices >= 0) & (indices < len(timestamps))
+    values = np.zeros(len(indices), dtype=np.int64)
+    values[in_range] = timestamps[indices[in_range]]
+    return [
+        int(value) if found else None
+        for value, found in zip(values.tolist(), in_range.tolist())
+    ]
+
+
+def get_array_timestamps_blocks(
+    timestamps: typing.Sequence[int],
+    *,
+    network: spec.NetworkReference | None = None,
+    mode: Literal['<=', '>=', '=='] = '>=',
+) -> list[int | None] | None:
+    """get blocks of timestamps, None if array cannot determine block
+
+    - '>=': first block with timestamp >= target
+    - '<=': last block with timestamp <= target
+    - '==': first block with timestamp == target
+    """
+    import numpy as np
+
+    array = load_block_timestamps_array(network)
+    if array is None:
+        return None
+    block_timestamps = array['timestamps']
+    n = len(block_timestamps)
+    if n == 0:
+        return [None for timestamp in timestamps]
+    start_block = array['start_block']
+    targets = np.array(timestamps, dtype=np.int64)
+
+    if mode == '>=' or mode == '==':
+        indices = np.searchsorted(block_timestamps, targets, side='left')
+
+        # block before result must be in array to confirm it is the first
+        found = indices < n
+        if start_block > 0:
+            found &= indices > 0
+        if mode == '==':
+            clipped = np.minimum(indices, n - 1)
+            found &= block_timestamps[clipped] == targets
+    elif mode == '<=':
+        indices = np.searchsorted(block_timestamps, targets, side='right') - 1
+
+        # block after result must be in array to confirm it is the last
+        found = (indices >= 0) & (indices < n - 1)
+    else:
+        raise Exception('unknown mode: ' + str(mode))
+
+    blocks = (indices + start_block).tolist()
+    return [
+        int(block) if block_found else None
+        for block, block_found in zip(blocks, found.tolist())
+    ]
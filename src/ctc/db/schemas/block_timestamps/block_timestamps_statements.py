@@ -143,6 +143,33 @@ async def async_select_block_timestamps(
     ]
 
 
+async def async_select_all_block_timestamps(
+    *,
+    conn: toolsql.SAConnection,
+    network: spec.NetworkReference | None = None,
+    start_block: int | None = None,
+    end_block: int | None = None,
+) -> dict[int, int] | None:
+
+    table = schema_utils.get_table_name('block_timestamps', network=network)
+
+    query: dict[str, typing.Any] = {}
+    if start_block is not None:
+        query['where_gte'] = {'block_number': start_block}
+    if end_block is not None:
+        query['where_lte'] = {'block_number': end_block}
+    results = toolsql.select(
+        conn=conn,
+        table=table,
+        raise_if_table_dne=False,
+        **query,
+    )
+    if results is None:
+        return None
+
+    return {row['block_number']: row['timestamp'] for row in results}
+
+
 async def async_select_max_block_number(
     *,
     conn: toolsql.SAConnection,
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from ...management import active_utils
 from ... import query_utils
+from . import block_timestamps_statements
 from . import multischema_block_timestamps_statements
 from . import multischema_block_timestamps_search
 
@@ -40,3 +41,8 @@ async_query_timestamp_block_range = query_utils.wrap_selector_with_connection(
     multischema_block_timestamps_search.async_select_timestamp_block_range,
     active_utils.get_active_timestamp_schema,
 )
+
+async_query_all_block_timestamps = query_utils.wrap_selector_with_connection(
+    block_timestamps_statements.async_select_all_block_timestamps,
+    'block_timestamps',
+)
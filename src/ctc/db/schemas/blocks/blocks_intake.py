@@ -7,8 +7,10 @@ from ctc import spec
 
 from ... import management
 from ... import connect_utils
+from ... import executor_utils
 from ... import intake_utils
 from . import blocks_statements
+from ..block_timestamps import block_timestamps_array
 from ..block_timestamps import block_timestamps_statements
 
 
@@ -54,12 +56,13 @@ async def async_intake_raw_block(
     )
     if engine is None:
         return
-    with engine.begin() as conn:
-        await blocks_statements.async_upsert_block(
-            conn=conn,
-            block=block,
-            network=network,
-        )
+    await executor_utils.async_run_with_connection(
+        blocks_statements.async_upsert_block,
+        engine=engine,
+        begin=True,
+        block=block,
+        network=network,
+    )
 
 
 async def async_intake_block_timestamp(
@@ -91,12 +94,13 @@ async def async_intake_block_timestamp(
     )
     if engine is None:
         return
-    with engine.begin() as conn:
-        await block_timestamps_statements.async_upsert_block_timestamp(
-            conn=conn,
-            block_number=block_number,
-            timestamp=timestamp,
-        )
+    await executor_utils.async_run_with_connection(
+        block_timestamps_statements.async_upsert_block_timestamp,
+        engine=engine,
+        begin=True,
+        block_number=block_number,
+        timestamp=timestamp,
+    )
 
 
 async def async_intake_blocks(
@@ -134,12 +138,13 @@ async def async_intake_raw_blocks(
         )
         if engine is None:
             return
-        with engine.begin() as conn:
-            await blocks_statements.async_upsert_blocks(
-                conn=conn,
-                blocks=confirmed,
-                network=network,
-            )
+        await executor_utils.async_run_with_connection(
+            blocks_statements.async_upsert_blocks,
+            engine=engine,
+            begin=True,
+            blocks=confirmed,
+            network=network,
+        )
 
 
 async def async_intake_block_timestamps(
@@ -186,6 +191,22 @@ async def async_intake_block_timestamps(
     else:
         raise Exception('specify either blocks or block_timestamps')
 
+    # extend timestamp array with confirmed blocks that follow its end
+    if management.is_timestamp_array_active(network):
+        if confirmed_blocks is not None:
+            array_block_timestamps = {
+                block['number']: block['timestamp']
+                for block in confirmed_blocks
+            }
+        elif confirmed_block_timestamps is not None:
+            array_block_timestamps = confirmed_block_timestamps
+        else:
+            raise Exception('no confirmed blocks')
+        block_timestamps_array.append_block_timestamps_to_array(
+            array_block_timestamps,
+            network=network,
+        )
+
     # store in database
     engine = connect_utils.create_engine(
         schema_name='block_timestamps',
@@ -193,12 +214,13 @@ async def async_intake_block_timestamps(
     )
     if engine is None:
         return
-    with engine.begin() as conn:
-        await block_timestamps_statements.async_upsert_block_timestamps(
-            conn=conn,
-            blocks=confirmed_blocks,
-            block_timestamps=confirmed_block_timestamps,
-        )
+    await executor_utils.async_run_with_connection(
+        block_timestamps_statements.async_upsert_block_timestamps,
+        engine=engine,
+        begin=True,
+        blocks=confirmed_blocks,
+        block_timestamps=confirmed_block_timestamps,
+    )
 
 
 #
@@ -5,4 +5,5 @@ from .erc20_utils import *
 from .eth_utils import *
 from .event_utils import *
 from .network_utils import *
+from .sweep_utils import *
 from .transaction_utils import *
@@ -1,3 +1,4 @@
+from .abi_cache import *
 from .contract_abi_io import *
 from .event_abi_io import *
 from .function_abi_io import *
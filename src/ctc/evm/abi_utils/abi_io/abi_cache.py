@@ -0,0 +1,190 @@
+"""in-process cache of contract abis, indexed for function lookups
+
+- contract abis are cached by (chain id, address), so that repeated lookups
+  skip the db query, block explorer request, and proxy check
+- entries expire after a ttl and the least recently used entries are evicted
+  once the cache is full
+- each cached abi is indexed by function name, selector, and signature, so
+  that function lookups do not scan the whole abi
+"""
+
+from __future__ import annotations
+
+import collections
+import threading
+import time
+import typing
+
+from typing_extensions import TypedDict
+
+from ctc import binary
+from ctc import spec
+from ... import network_utils
+
+
+class ContractABIIndex(TypedDict):
+    contract_abi: spec.ContractABI
+    functions_by_name: dict[str, list[spec.FunctionABI]]
+    functions_by_selector: dict[str, list[spec.FunctionABI]]
+    functions_by_signature: dict[str, list[spec.FunctionABI]]
+
+
+class ContractABICacheSettings(TypedDict):
+    ttl: float
+    max_entries: int
+
+
+_settings: ContractABICacheSettings = {
+    'ttl': 3600,
+    'max_entries': 10000,
+}
+
+_contract_abi_indices: collections.OrderedDict[
+    typing.Tuple[spec.ChainId, spec.Address],
+    typing.Tuple[float, ContractABIIndex],
+] = collections.OrderedDict()
+_contract_abi_indices_lock = threading.Lock()
+
+
+def configure_contract_abi_cache(
+    *,
+    ttl: typing.Optional[float] = None,
+    max_entries: typing.Optional[int] = None,
+) -> None:
+    """configure lifetime and size limit of cached contract abis"""
+    if ttl is not None:
+        _settings['ttl'] = ttl
+    if max_entries is not None:
+        _settings['max_entries'] = max_entries
+        with _contract_abi_indices_lock:
+            _trim_contract_abi_cache()
+
+
+def clear_contract_abi_cache() -> None:
+    with _contract_abi_indices_lock:
+        _contract_abi_indices.clear()
+
+
+def get_cached_contract_abi_index(
+    contract_address: spec.Address,
+    *,
+    network: spec.NetworkReference,
+) -> ContractABIIndex | None:
+    """get index of cached contract abi, None if missing or expired"""
+    key = _get_cache_key(contract_address, network)
+    with _contract_abi_indices_lock:
+        entry = _contract_abi_indices.get(key)
+        if entry is None:
+            return None
+        t_cached, index = entry
+        if time.monotonic() - t_cached > _settings['ttl']:
+            del _contract_abi_indices[key]
+            return None
+        _contract_abi_indices.move_to_end(key)
+        return index
+
+
+def cache_contract_abi(
+    contract_address: spec.Address,
+    contract_abi: spec.ContractABI,
+    *,
+    network: spec.NetworkReference,
+) -> ContractABIIndex:
+    """add contract abi to cache, returning its index"""
+    index = build_contract_abi_index(contract_abi)
+    key = _get_cache_key(contract_address, network)
+    with _contract_abi_indices_lock:
+        _contract_abi_indices[key] = (time.monotonic(), index)
+        _contract_abi_indices.move_to_end(key)
+        _trim_contract_abi_cache()
+    return index
+
+
+def _get_cache_key(
+    contract_address: spec.Address,
+    network: spec.NetworkReference,
+) -> typing.Tuple[spec.ChainId, spec.Address]:
+    chain_id = network_utils.get_network_chain_id(network)
+    return (chain_id, contract_address.lower())
+
+
+def _trim_contract_abi_cache() -> None:
+    while len(_contract_abi_indices) > _settings['max_entries']:
+        _contract_abi_indices.popitem(last=False)
+
+
+#
+# # indices
+#
+
+
+def build_contract_abi_index(
+    contract_abi: spec.ContractABI,
+) -> ContractABIIndex:
+    """index functions of contract abi by name, selector, and signature"""
+    index: ContractABIIndex = {
+        'contract_abi': contract_abi,
+        'functions_by_name': {},
+        'functions_by_selector': {},
+        'functions_by_signature': {},
+    }
+    for item in contract_abi:
+        if item.get('type') != 'function':
+            continue
+        function_abi = typing.cast(spec.FunctionABI, item)
+        signature = binary.get_function_signature(function_abi)
+        selector = '0x' + binary.get_function_selector(
+            function_signature=signature
+        )
+        index['functions_by_name'].setdefault(function_abi['name'], [])
+        index['functions_by_name'][function_abi['name']].append(function_abi)
+        index['functions_by_selector'].setdefault(selector, [])
+        index['functions_by_selector'][selector].append(function_abi)
+        index['functions_by_signature'].setdefault(signature, [])
+        index['functions_by_signature'][signature].append(function_abi)
+    return index
+
+
+def get_indexed_function_abi(
+    index: ContractABIIndex,
+    *,
+    function_name: typing.Optional[str] = None,
+    n_parameters: typing.Optional[int] = None,
+    parameter_types: typing.Optional[list[spec.ABIDatumType]] = None,
+    function_selector: typing.Optional[spec.FunctionSelector] = None,
+) -> spec.FunctionABI:
+    """get function abi from indexed contract abi
+
+    function_name can also be a function signature like 'balanceOf(address)'
+    """
+
+    # narrow candidates using index, then apply remaining filters
+    candidates: typing.Sequence[spec.FunctionABI]
+    if function_selector is not None:
+        selector = binary.convert(function_selector, 'prefix_hex').lower()
+        candidates = index['functions_by_selector'].get(selector, [])
+        if function_name is not None and '(' in function_name:
+            candidates = [
+                candidate
+                for candidate in candidates
+                if binary.get_function_signature(candidate) == function_name
+            ]
+            function_name = None
+    elif function_name is not None and '(' in function_name:
+        candidates = index['functions_by_signature'].get(function_name, [])
+        function_name = None
+    elif function_name is not None:
+        candidates = index['functions_by_name'].get(function_name, [])
+    else:
+        return binary.get_function_abi(
+            contract_abi=index['contract_abi'],
+            n_parameters=n_parameters,
+            parameter_types=parameter_types,
+        )
+
+    return binary.get_function_abi(
+        contract_abi=typing.cast(spec.ContractABI, candidates),
+        function_name=function_name,
+        n_parameters=n_parameters,
+        parameter_types=parameter_types,
+    )
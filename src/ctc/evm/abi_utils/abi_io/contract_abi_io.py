@@ -5,6 +5,7 @@ from ctc import rpc
 
 from ... import address_utils
 from .. import abi_modify
+from . import abi_cache
 
 
 async def async_get_contract_abi(
@@ -28,6 +29,14 @@ async def async_get_contract_abi(
     if network is None:
         network = rpc.get_provider_network(provider)
 
+    # load from in-process cache
+    if db_query:
+        index = abi_cache.get_cached_contract_abi_index(
+            contract_address, network=network
+        )
+        if index is not None:
+            return index['contract_abi']
+
     # load from db
     if db_query:
         from ctc import db
@@ -37,6 +46,7 @@ async def async_get_contract_abi(
             network=network,
         )
         if abi is not None:
+            abi_cache.cache_contract_abi(contract_address, abi, network=network)
             return abi
 
     from ctc.protocols import etherscan_utils
@@ -66,6 +76,8 @@ async def async_get_contract_abi(
         abi = abi_modify.combine_contract_abis([abi, proxy_abi])
         includes_proxy = True
 
+    abi_cache.cache_contract_abi(contract_address, abi, network=network)
+
     # save to db
     if db_intake:
         from ctc import db
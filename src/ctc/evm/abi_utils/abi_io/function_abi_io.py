@@ -3,7 +3,9 @@ from __future__ import annotations
 import typing
 
 from ctc import binary
+from ctc import rpc
 from ctc import spec
+from . import abi_cache
 from . import contract_abi_io
 
 
@@ -18,40 +20,74 @@ async def async_get_function_abi(
     network: typing.Optional[spec.NetworkReference] = None,
 ) -> spec.FunctionABI:
 
-    if contract_abi is None:
-        if contract_address is None:
-            raise Exception('must specify contract_abi or contract_address')
-        contract_abi = await contract_abi_io.async_get_contract_abi(
-            contract_address=contract_address,
-            network=network,
-        )
+    if contract_abi is not None:
+        try:
+            return binary.get_function_abi(
+                function_name=function_name,
+                contract_abi=contract_abi,
+                n_parameters=n_parameters,
+                parameter_types=parameter_types,
+                function_selector=function_selector,
+            )
+        except LookupError as e:
+            if contract_address is None:
+                raise e
 
+    if contract_address is None:
+        raise Exception('must specify contract_abi or contract_address')
+    if network is None:
+        network = rpc.get_provider_network(None)
+
+    # use indexed abi from in-process cache when possible
+    index = await _async_get_contract_abi_index(
+        contract_address, network=network
+    )
     try:
-        return binary.get_function_abi(
+        return abi_cache.get_indexed_function_abi(
+            index,
             function_name=function_name,
-            contract_abi=contract_abi,
             n_parameters=n_parameters,
             parameter_types=parameter_types,
             function_selector=function_selector,
         )
+    except LookupError:
+        pass
 
-    except LookupError as e:
+    # query contract_abi again if contract abi might have changed since db
+    index = await _async_get_contract_abi_index(
+        contract_address, network=network, db_query=False
+    )
+    return abi_cache.get_indexed_function_abi(
+        index,
+        function_name=function_name,
+        n_parameters=n_parameters,
+        parameter_types=parameter_types,
+        function_selector=function_selector,
+    )
 
-        # query contract_abi again if contract abi might have changed since db
-        if contract_address is not None:
-            contract_abi = await contract_abi_io.async_get_contract_abi(
-                contract_address=contract_address,
-                network=network,
-                db_query=False,
-            )
 
-            return binary.get_function_abi(
-                function_name=function_name,
-                contract_abi=contract_abi,
-                n_parameters=n_parameters,
-                parameter_types=parameter_types,
-                function_selector=function_selector,
-            )
+async def _async_get_contract_abi_index(
+    contract_address: spec.Address,
+    *,
+    network: spec.NetworkReference,
+    db_query: bool = True,
+) -> abi_cache.ContractABIIndex:
+    if db_query:
+        index = abi_cache.get_cached_contract_abi_index(
+            contract_address, network=network
+        )
+        if index is not None:
+            return index
 
-        else:
-            raise e
+    # async_get_contract_abi() adds abi to cache
+    contract_abi = await contract_abi_io.async_get_contract_abi(
+        contract_address=contract_address,
+        network=network,
+        db_query=db_query,
+    )
+    index = abi_cache.get_cached_contract_abi_index(
+        contract_address, network=network
+    )
+    if index is None:
+        index = abi_cache.build_contract_abi_index(contract_abi)
+    return index
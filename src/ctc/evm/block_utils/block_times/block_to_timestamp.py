@@ -20,6 +20,15 @@ async def async_get_block_timestamp(
         from ctc import db
 
         network = rpc.get_provider_network(provider)
+
+        # timestamp array is checked before any db engine is acquired
+        if db.is_timestamp_array_active(network):
+            array_timestamps = db.get_array_block_timestamps(
+                [block], network=network
+            )
+            if array_timestamps is not None and array_timestamps[0] is not None:
+                return array_timestamps[0]
+
         timestamp = await db.async_query_block_timestamp(
             block_number=block,
             network=network,
@@ -50,18 +59,37 @@ async def async_get_block_timestamps(
         from ctc import db
 
         network = rpc.get_provider_network(provider)
-        db_timestamps = await db.async_query_block_timestamps(
-            block_numbers=blocks,
-            network=network,
-        )
-        if db_timestamps is None:
-            db_timestamps = [None for block in blocks]
-        results: dict[int, int | None] = dict(zip(blocks, db_timestamps))
-        remaining_blocks: typing.Sequence[int] = [
-            block
-            for block, timestamp in zip(blocks, db_timestamps)
-            if timestamp is None
-        ]
+        results: dict[int, int | None] = {}
+        remaining_blocks: typing.Sequence[int] = blocks
+
+        # timestamp array is checked before any db engine is acquired
+        if db.is_timestamp_array_active(network):
+            array_timestamps = db.get_array_block_timestamps(
+                remaining_blocks, network=network
+            )
+            if array_timestamps is not None:
+                results.update(zip(remaining_blocks, array_timestamps))
+                remaining_blocks = [
+                    block
+                    for block, timestamp in zip(
+                        remaining_blocks, array_timestamps
+                    )
+                    if timestamp is None
+                ]
+
+        if len(remaining_blocks) > 0:
+            db_timestamps = await db.async_query_block_timestamps(
+                block_numbers=remaining_blocks,
+                network=network,
+            )
+            if db_timestamps is None:
+                db_timestamps = [None for block in remaining_blocks]
+            results.update(zip(remaining_blocks, db_timestamps))
+            remaining_blocks = [
+                block
+                for block, timestamp in zip(remaining_blocks, db_timestamps)
+                if timestamp is None
+            ]
     else:
         results = {}
         remaining_blocks = blocks
@@ -8,7 +8,6 @@ from ctc import spec
 from ctc import rpc
 
 from . import block_time_search
-from . import block_time_singular
 
 
 async def async_get_blocks_of_timestamps(
@@ -23,83 +22,141 @@ async def async_get_blocks_of_timestamps(
     use_db: bool = True,
     mode: Literal['<=', '>=', '=='] = '>=',
 ) -> list[int]:
-    """once parallel node search created, use that"""
+    """get blocks of timestamps
 
+    timestamps not found in given arrays or db are searched for together using
+    batched block requests, see _async_get_blocks_of_timestamps_from_node()
+    """
+
+    results: dict[int, int] = {}
+    remaining_timestamps = list(timestamps)
+
+    # get timestamps from given arrays
     if block_timestamps is not None or (
         block_number_array is not None and block_timestamp_array is not None
     ):
-        import numpy as np
-
-        if mode != '>=':
-            raise NotImplementedError()
-
-        if block_timestamp_array is None:
-            if block_timestamps is None:
-                raise Exception('must specify more arguments')
-            block_timestamp_array = np.array(list(block_timestamps.values()))
-        if block_number_array is None:
-            if block_timestamps is None:
-                raise Exception('must specify more arguments')
-            block_number_array = np.array(list(block_timestamps.keys()))
-
-        blocks = []
-        for timestamp in timestamps:
-            block = block_time_singular._get_block_of_timestamp_from_arrays(
-                timestamp=timestamp,
-                block_timestamp_array=block_timestamp_array,
-                block_number_array=block_number_array,
-                verbose=False,
+        array_blocks = _get_blocks_of_timestamps_from_arrays(
+            remaining_timestamps,
+            block_timestamps=block_timestamps,
+            block_number_array=block_number_array,
+            block_timestamp_array=block_timestamp_array,
+            mode=mode,
+        )
+        remaining_timestamps = _package_blocks(
+            remaining_timestamps, array_blocks, results=results
+        )
+
+    # get timestamps form db
+    if use_db and len(remaining_timestamps) > 0:
+        from ctc import db
+
+        network = rpc.get_provider_network(provider)
+
+        # timestamp array is checked before any db engine is acquired
+        if db.is_timestamp_array_active(network):
+            db_array_blocks = db.get_array_timestamps_blocks(
+                remaining_timestamps, network=network, mode=mode
             )
-            blocks.append(block)
-
-        return blocks
-
-    else:
-
-        # get timestamps form db
-        if use_db:
-            from ctc import db
+            if db_array_blocks is not None:
+                remaining_timestamps = _package_blocks(
+                    remaining_timestamps, db_array_blocks, results=results
+                )
 
-            network = rpc.get_provider_network(provider)
+        if len(remaining_timestamps) > 0:
             db_blocks = await db.async_query_timestamps_blocks(
                 network=network,
-                timestamps=timestamps,
+                timestamps=remaining_timestamps,
                 mode=mode,
             )
-            if db_blocks is None:
-                db_blocks = [None for timestamp in timestamps]
-
-            # package non-null results
-            results: dict[int, int] = {}
-            remaining_timestamps: list[int] = []
-            for possible_block, timestamp in zip(db_blocks, timestamps):
-                if possible_block is None:
-                    remaining_timestamps.append(timestamp)
-                else:
-                    results[timestamp] = possible_block
-        else:
-            remaining_timestamps = list(timestamps)
-            results = {}
-
-        # get timestamps from rpc node
-        if len(remaining_timestamps) > 0:
-            coroutines = []
-            for timestamp in remaining_timestamps:
-                coroutine = block_time_singular.async_get_block_of_timestamp(
-                    timestamp=timestamp,
-                    verbose=False,
-                    cache=cache,
-                    nary=nary,
-                    provider=provider,
-                    use_db=False,
-                    mode=mode,
+            if db_blocks is not None:
+                remaining_timestamps = _package_blocks(
+                    remaining_timestamps, db_blocks, results=results
                 )
-                coroutines.append(coroutine)
-            import asyncio
 
-            node_blocks = await asyncio.gather(*coroutines)
-            node_results = dict(zip(remaining_timestamps, node_blocks))
-            results.update(node_results)
+    # get timestamps from rpc node
+    if len(remaining_timestamps) > 0:
+        node_blocks = (
+            await block_time_search._async_get_blocks_of_timestamps_from_node(
+                remaining_timestamps,
+                nary=nary,
+                cache=cache,
+                provider=provider,
+                mode=mode,
+            )
+        )
+        node_results = dict(zip(remaining_timestamps, node_blocks))
+        results.update(node_results)
+
+    # combine
+    return [results[timestamp] for timestamp in timestamps]
+
 
-        # combine
-        return [results[timestamp] for timestamp in timestamps]
+def _get_blocks_of_timestamps_from_arrays(
+    timestamps: typing.Sequence[int],
+    *,
+    block_timestamps: typing.Optional[typing.Mapping[int, int]] = None,
+    block_number_array: typing.Optional[spec.NumpyArray] = None,
+    block_timestamp_array: typing.Optional[spec.NumpyArray] = None,
+    mode: Literal['<=', '>=', '=='] = '>=',
+) -> list[int | None]:
+    """get blocks of timestamps from sorted arrays, None if not determinable
+
+    a result is only returned if its neighboring block on the searched side is
+    also in the arrays, so timestamps outside of the arrays give None
+    """
+    import numpy as np
+
+    if block_timestamp_array is None:
+        if block_timestamps is None:
+            raise Exception('must specify more arguments')
+        block_timestamp_array = np.array(list(block_timestamps.values()))
+    if block_number_array is None:
+        if block_timestamps is None:
+            raise Exception('must specify more arguments')
+        block_number_array = np.array(list(block_timestamps.keys()))
+
+    n = len(block_timestamp_array)
+    if n == 0:
+        return [None for timestamp in timestamps]
+    targets = np.array(timestamps, dtype=np.int64)
+
+    if mode == '>=' or mode == '==':
+        indices = np.searchsorted(block_timestamp_array, targets, side='left')
+
+        # block before result must be in array to confirm it is the first
+        found = (indices < n) & ((indices > 0) | (block_number_array[0] == 0))
+        if mode == '==':
+            clipped = np.minimum(indices, n - 1)
+            found &= block_timestamp_array[clipped] == targets
+    elif mode == '<=':
+        indices = (
+            np.searchsorted(block_timestamp_array, targets, side='right') - 1
+        )
+
+        # block after result must be in array to confirm it is the last
+        found = (indices >= 0) & (indices < n - 1)
+    else:
+        raise Exception('unknown mode: ' + str(mode))
+
+    blocks = block_number_array[np.clip(indices, 0, n - 1)].tolist()
+    return [
+        int(block) if block_found else None
+        for block, block_found in zip(blocks, found.tolist())
+    ]
+
+
+def _package_blocks(
+    timestamps: typing.Sequence[int],
+    possible_blocks: typing.Sequence[int | None],
+    *,
+    results: dict[int, int],
+) -> list[int]:
+    """add non-null blocks to results and return timestamps still missing"""
+
+    remaining_timestamps = []
+    for timestamp, possible_block in zip(timestamps, possible_blocks):
+        if possible_block is None:
+            remaining_timestamps.append(timestamp)
+        else:
+            results[timestamp] = possible_block
+    return remaining_timestamps
@@ -28,8 +28,8 @@ async def _async_get_block_of_timestamp_from_node(
 ) -> int:
     """
 
-    - could make this efficiently parallelizable to multiple timestamps by sharing cache
-        - would need to remove the initializing key from the shared cache
+    - to search for multiple timestamps, use
+      _async_get_blocks_of_timestamps_from_node(), which shares probes
     """
 
     if nary is None:
@@ -116,14 +116,9 @@ async def _async_is_match_block_of_timestamp(
 ) -> list[bool]:
 
     # retrieve values not in cache
-    not_in_cache = [
-        block_number
-        for block_number in block_numbers
-        if block_number not in cache['timestamps']
-    ]
-    gotten = await block_crud.async_get_blocks(not_in_cache, provider=provider)
-    for block_number, block in zip(not_in_cache, gotten):
-        cache['timestamps'][block_number] = block['timestamp']
+    await _async_fetch_block_timestamps(
+        block_numbers, cache=cache, provider=provider
+    )
 
     # compute results
     return [
@@ -132,6 +127,26 @@ async def _async_is_match_block_of_timestamp(
     ]
 
 
+async def _async_fetch_block_timestamps(
+    block_numbers: typing.Iterable[int],
+    *,
+    cache: BlockTimestampSearchCache,
+    provider: spec.ProviderReference = None,
+) -> None:
+    not_in_cache = sorted(
+        {
+            block_number
+            for block_number in block_numbers
+            if block_number not in cache['timestamps']
+        }
+    )
+    if len(not_in_cache) == 0:
+        return
+    gotten = await block_crud.async_get_blocks(not_in_cache, provider=provider)
+    for block_number, block in zip(not_in_cache, gotten):
+        cache['timestamps'][block_number] = block['timestamp']
+
+
 def _get_next_probes_block_of_timestamp(
     *,
     nary: int,
@@ -191,3 +206,159 @@ def _get_next_probes_block_of_timestamp(
             probes = [target_index + i for i in range(-half, n_probes - half)]
 
             return probes
+
+
+#
+# # batch search
+#
+
+
+async def _async_get_blocks_of_timestamps_from_node(
+    timestamps: typing.Sequence[int],
+    *,
+    nary: typing.Optional[int] = None,
+    cache: typing.Optional[BlockTimestampSearchCache] = None,
+    provider: spec.ProviderReference = None,
+    mode: Literal['<=', '>=', '=='] = '>=',
+) -> list[int]:
+    """search for blocks of many timestamps at once
+
+    - all targets are searched together, each probed block narrows the search
+      range of every target whose range it falls into
+    - the probes of each round are fetched as a single batch of blocks
+    - targets that share a search range are separated by probing the
+      interpolated block of each target, targets with a range of their own are
+      probed as in the single timestamp search
+    - every range is also bisected, bounding the worst case number of rounds
+    """
+    import numpy as np
+
+    if nary is None:
+        nary = 6
+    if cache is None:
+        cache = {'initializing': {}, 'timestamps': {}}
+    if len(timestamps) == 0:
+        return []
+
+    targets = sorted(set(timestamps))
+    start_block = 1
+    end_block = await block_crud.async_get_latest_block_number(
+        provider=provider
+    )
+    await _async_fetch_block_timestamps(
+        [start_block, end_block], cache=cache, provider=provider
+    )
+
+    while True:
+
+        # locate each target between the known blocks
+        known_blocks = sorted(
+            block_number
+            for block_number in cache['timestamps'].keys()
+            if start_block <= block_number <= end_block
+        )
+        known_timestamps = [
+            cache['timestamps'][block_number] for block_number in known_blocks
+        ]
+        indices = np.searchsorted(known_timestamps, targets).tolist()
+
+        # probe each unresolved range, sorted targets share ranges contiguously
+        probes: set[int] = set()
+        group: list[int] = []
+        for t, target in enumerate(targets):
+            group.append(target)
+            index = indices[t]
+            if t + 1 < len(targets) and indices[t + 1] == index:
+                continue
+            if 0 < index < len(known_blocks):
+                probes.update(
+                    _get_next_probes_blocks_of_timestamps(
+                        probe_min=known_blocks[index - 1],
+                        probe_max=known_blocks[index],
+                        min_timestamp=known_timestamps[index - 1],
+                        max_timestamp=known_timestamps[index],
+                        timestamps=group,
+                        nary=nary,
+                    )
+                )
+            group = []
+
+        if len(probes) == 0:
+            break
+        await _async_fetch_block_timestamps(
+            probes, cache=cache, provider=provider
+        )
+
+    results = {}
+    for target, index in zip(targets, indices):
+        if index == len(known_blocks):
+            if mode == '<=':
+                results[target] = end_block
+                continue
+            else:
+                raise Exception('no block after timestamp: ' + str(target))
+        block = known_blocks[index]
+        block_timestamp = known_timestamps[index]
+        if mode == '>=':
+            results[target] = block
+        elif mode == '<=':
+            if block_timestamp == target:
+                results[target] = block
+            elif index == 0:
+                raise Exception('no block exists <= timestamp')
+            else:
+                results[target] = block - 1
+        elif mode == '==':
+            if block_timestamp == target:
+                results[target] = block
+            else:
+                raise Exception(
+                    'there is no block with timestamp ' + str(target)
+                )
+        else:
+            raise Exception('unknown mode: ' + str(mode))
+
+    return [results[timestamp] for timestamp in timestamps]
+
+
+def _get_next_probes_blocks_of_timestamps(
+    *,
+    probe_min: int,
+    probe_max: int,
+    min_timestamp: int,
+    max_timestamp: int,
+    timestamps: typing.Sequence[int],
+    nary: int,
+) -> list[int]:
+    """get probes for targets whose timestamps are in (min_timestamp, max]"""
+    import numpy as np
+
+    # range is resolved once its bounds are adjacent blocks
+    size = probe_max - probe_min
+    if size <= 1:
+        return []
+    if size <= nary:
+        return list(range(probe_min + 1, probe_max))
+
+    mean_block_time = (max_timestamp - min_timestamp) / size
+    target_indices = [
+        probe_min + int((timestamp - min_timestamp) / mean_block_time)
+        for timestamp in timestamps
+    ]
+
+    probes = [probe_min + size // 2]
+    if len(timestamps) > 1:
+        probes.extend(target_indices)
+    elif size > 1000:
+        probes_array = target_indices[0] + size * np.linspace(
+            -0.01, 0.01, nary - 1
+        )
+        probes.extend(probes_array.astype(int).tolist())
+    else:
+        n_probes = nary - 1
+        half = int(n_probes / 2)
+        probes.extend(
+            target_indices[0] + i for i in range(-half, n_probes - half)
+        )
+
+    return [probe for probe in probes if probe_min < probe < probe_max]
@@ -8,6 +8,7 @@ if typing.TYPE_CHECKING:
 from ctc import rpc
 from ctc import spec
 from .. import block_crud
+from . import block_time_plural
 from . import block_time_search
 
 
@@ -31,41 +32,53 @@ async def async_get_block_of_timestamp(
 
         timestamp = tooltime.timestamp_to_seconds(timestamp)
 
+    # given arrays
     if block_timestamps is not None or (
         block_timestamp_array is not None and block_number_array is not None
     ):
-        return _get_block_of_timestamp_from_arrays(
+        array_block = _get_block_of_timestamp_from_arrays(
             timestamp=timestamp,
             block_timestamp_array=block_timestamp_array,
             block_number_array=block_number_array,
             block_timestamps=block_timestamps,
             verbose=verbose,
+            mode=mode,
         )
-    else:
+        if array_block is not None:
+            return array_block
 
-        # db
-        if use_db:
-            from ctc import db
+    # db
+    if use_db:
+        from ctc import db
 
-            network = rpc.get_provider_network(provider=provider)
-            block = await db.async_query_timestamp_block(
-                network=network,
-                timestamp=timestamp,
-                mode=mode,
+        network = rpc.get_provider_network(provider=provider)
+
+        # timestamp array is checked before any db engine is acquired
+        if db.is_timestamp_array_active(network):
+            array_blocks = db.get_array_timestamps_blocks(
+                [timestamp], network=network, mode=mode
             )
-            if block is not None:
-                return block
+            if array_blocks is not None and array_blocks[0] is not None:
+                return array_blocks[0]
 
-        # rpc node
-        return await block_time_search._async_get_block_of_timestamp_from_node(
+        block = await db.async_query_timestamp_block(
+            network=network,
             timestamp=timestamp,
-            nary=nary,
-            cache=cache,
-            verbose=verbose,
-            provider=provider,
             mode=mode,
-            use_db_assist=use_db_assist,
         )
+        if block is not None:
+            return block
+
+    # rpc node
+    return await block_time_search._async_get_block_of_timestamp_from_node(
+        timestamp=timestamp,
+        nary=nary,
+        cache=cache,
+        verbose=verbose,
+        provider=provider,
+        mode=mode,
+        use_db_assist=use_db_assist,
+    )
 
 
 def _get_block_of_timestamp_from_arrays(
@@ -75,28 +88,22 @@ def _get_block_of_timestamp_from_arrays(
     block_number_array: spec.NumpyArray | None = None,
     block_timestamps: typing.Mapping[int, int] | None = None,
     verbose: bool = False,
-) -> int:
-    import numpy as np
-
-    if block_timestamp_array is None:
-        if block_timestamps is None:
-            raise Exception('must specify more arguments')
-        block_timestamp_array = np.array(list(block_timestamps.values()))
-    if block_number_array is None:
-        if block_timestamps is None:
-            raise Exception('must specify more arguments')
-        block_number_array = np.array(list(block_timestamps.keys()))
+    mode: typing.Literal['<=', '>=', '=='] = '>=',
+) -> int | None:
+    """get block of timestamp from arrays, None if arrays cannot determine it"""
 
     if not isinstance(timestamp, int):
         import tooltime
 
         timestamp = tooltime.timestamp_to_seconds(timestamp)
 
-    index = np.searchsorted(block_timestamp_array, timestamp)
-    result = block_number_array[index]
-    if not isinstance(result, int):
-        raise Exception('invalid rpc result')
-    return result
+    return block_time_plural._get_blocks_of_timestamps_from_arrays(
+        [timestamp],
+        block_timestamps=block_timestamps,
+        block_number_array=block_number_array,
+        block_timestamp_array=block_timestamp_array,
+        mode=mode,
+    )[0]
 
 
 async def async_get_block_number_and_time(
@@ -95,8 +95,73 @@ async def async_get_erc20_transfers(
     return transfers
 
 
+async def async_iterate_erc20_transfers(
+    token: spec.ERC20Reference,
+    *,
+    start_block: typing.Optional[spec.BlockNumberReference] = None,
+    end_block: typing.Optional[spec.BlockNumberReference] = None,
+    start_time: tooltime.Timestamp | None = None,
+    end_time: tooltime.Timestamp | None = None,
+    include_timestamps: bool = False,
+    normalize: bool = True,
+    convert_from_str: bool = True,
+    verbose: bool = False,
+    provider: spec.ProviderReference = None,
+    **event_kwargs: typing.Any,
+) -> typing.AsyncIterator[spec.DataFrame]:
+    """iterate over transfers of erc20 as dataframe chunks, in block order
+
+    see async_get_erc20_transfers() for processing applied to each chunk
+    """
+
+    if normalize and not convert_from_str:
+        raise Exception(
+            'cannot normalize without str conversion'
+            ', use normalize=False or convert_from_str=True'
+        )
+
+    network = rpc.get_provider_network(provider)
+    token_address = await erc20_metadata.async_get_erc20_address(
+        token, network=network
+    )
+
+    try:
+        event_abi = await abi_utils.async_get_event_abi(
+            contract_address=token, event_name='Transfer'
+        )
+    except Exception:
+        event_abi = erc20_spec.erc20_event_abis['Transfer']
+
+    old_column = 'arg__' + event_abi['inputs'][2]['name']
+    column = 'arg__amount'
+    decimals = None
+    async for transfers in event_utils.async_iterate_events(
+        contract_address=token_address,
+        event_abi=event_abi,
+        start_block=start_block,
+        end_block=end_block,
+        start_time=start_time,
+        end_time=end_time,
+        include_timestamps=include_timestamps,
+        verbose=verbose,
+        provider=provider,
+        **event_kwargs,
+    ):
+        transfers = transfers.rename(columns={old_column: column})
+        if convert_from_str:
+            transfers[column] = transfers[column].map(int)
+        if normalize:
+            if decimals is None:
+                decimals = await erc20_metadata.async_get_erc20_decimals(
+                    token=token_address,
+                    block=transfers.index.values[0][0],
+                )
+            transfers[column] = transfers[column] / float('1e' + str(decimals))
+        yield transfers
+
+
 async def async_get_erc20_balances_from_transfers(
-    transfers: spec.DataFrame,
+    transfers: spec.DataFrame | typing.AsyncIterator[spec.DataFrame],
     *,
     block: typing.Optional[spec.BlockNumberReference] = None,
     dtype: typing.Optional[
@@ -104,6 +169,61 @@ async def async_get_erc20_balances_from_transfers(
     ] = None,
     normalize: bool = False,
 ) -> spec.DataFrame:
+    """compute balances of wallets from transfers
+
+    transfers can be a dataframe or an async iterator of dataframe chunks,
+    such as from async_iterate_erc20_transfers(), which are aggregated one
+    chunk at a time
+    """
+
+    import pandas as pd
+
+    if isinstance(transfers, pd.DataFrame):
+        balances = _get_transfers_balance_changes(
+            transfers, block=block, dtype=dtype
+        )
+        contract_address = None
+        if len(transfers) > 0:
+            contract_address = transfers['contract_address'].values[0]
+    else:
+        total: spec.DataFrame | None = None
+        contract_address = None
+        async for chunk in transfers:
+            if len(chunk) == 0:
+                continue
+            chunk_balances = _get_transfers_balance_changes(
+                chunk, block=block, dtype=dtype
+            )
+            if total is None:
+                total = chunk_balances
+                contract_address = chunk['contract_address'].values[0]
+            else:
+                total = total.add(chunk_balances, fill_value=0)
+        if total is None:
+            total = typing.cast(spec.DataFrame, pd.Series([], dtype=object))
+        balances = total
+
+    if normalize and contract_address is not None:
+        decimals = await erc20_metadata.async_get_erc20_decimals(
+            contract_address
+        )
+        balances /= 10 ** decimals
+
+    # sort
+    balances = balances.sort_values(ascending=False)  # type: ignore
+
+    balances.name = 'balance'
+    balances.index.name = 'address'
+
+    return balances
+
+
+def _get_transfers_balance_changes(
+    transfers: spec.DataFrame,
+    *,
+    block: typing.Optional[spec.BlockNumberReference],
+    dtype: typing.Optional[typing.Union[typing.Type[int], typing.Type[float]]],
+) -> spec.DataFrame:
 
     # filter block
     if block is not None:
@@ -121,17 +241,4 @@ async def async_get_erc20_balances_from_transfers(
     from_transfers = transfers.groupby('arg__from')[amount_key].sum()
     to_transfers = transfers.groupby('arg__to')[amount_key].sum()
     balances: spec.DataFrame = to_transfers.sub(from_transfers, fill_value=0)
-
-    if normalize:
-        decimals = await erc20_metadata.async_get_erc20_decimals(
-            transfers['contract_address'].values[0]
-        )
-        balances /= 10 ** decimals
-
-    # sort
-    balances = balances.sort_values(ascending=False)  # type: ignore
-
-    balances.name = 'balance'
-    balances.index.name = 'address'
-
     return balances
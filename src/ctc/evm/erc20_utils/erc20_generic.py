@@ -40,12 +40,13 @@ async def async_erc20s_eth_calls(
         erc20_metadata.async_get_erc20_address(token) for token in tokens
     ]
     addresses = await asyncio.gather(*coroutines)
-    return await rpc.async_batch_eth_call(
+    results: list[typing.Any] = await rpc.async_batch_eth_call(
         to_addresses=addresses,
         function_abi=erc20_spec.erc20_function_abis[function_name],
         block_number=block,
         **rpc_kwargs,
     )
+    return results
 
 
 async def async_erc20_eth_call_by_block(
@@ -58,9 +59,38 @@ async def async_erc20_eth_call_by_block(
     """perform eth_call for an erc20 across multiple blocks"""
 
     address = await erc20_metadata.async_get_erc20_address(token)
-    return await rpc.async_batch_eth_call(
+    results: list[typing.Any] = await rpc.async_batch_eth_call(
         to_address=address,
         function_abi=erc20_spec.erc20_function_abis[function_name],
         block_numbers=blocks,
         **rpc_kwargs,
     )
+    return results
+
+
+async def async_erc20_eth_call_array_by_block(
+    function_name: str,
+    token: spec.ERC20Reference,
+    *,
+    blocks: typing.Iterable[spec.BlockNumberReference],
+    as_float: bool = False,
+    **rpc_kwargs: typing.Any,
+) -> spec.NumpyArray:
+    """perform eth_call for an erc20 across blocks, decoding into an array
+
+    function must have a single integer output
+    """
+
+    if as_float:
+        output_format: typing.Literal['array', 'float_array'] = 'float_array'
+    else:
+        output_format = 'array'
+    address = await erc20_metadata.async_get_erc20_address(token)
+    results: spec.NumpyArray = await rpc.async_batch_eth_call(
+        to_address=address,
+        function_abi=erc20_spec.erc20_function_abis[function_name],
+        block_numbers=blocks,
+        output_format=output_format,
+        **rpc_kwargs,
+    )
+    return results
@@ -170,3 +170,50 @@ async def async_normalize_erc20_quantities_by_block(
         quantity / (10 ** decimal)
         for quantity, decimal in zip(quantities, use_decimals)
     ]
+
+
+async def async_normalize_erc20_quantities_array_by_block(
+    quantities: spec.NumpyArray,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    *,
+    token: typing.Optional[spec.ERC20Address] = None,
+    decimals: typing.Optional[typing.Sequence[typing.SupportsInt]] = None,
+    provider: spec.ProviderReference = None,
+) -> spec.NumpyArray:
+    """normalize array of quantities as a single float64 array operation"""
+    import numpy as np
+
+    as_float = np.asarray(quantities, dtype=np.float64)
+    if len(as_float) != len(blocks):
+        raise Exception('number of quantities must match number of blocks')
+
+    # only look up decimals of blocks with non zero values
+    nonzero = as_float != 0
+    if decimals is None:
+        if token is None:
+            raise Exception('must specify token or decimals')
+        if not nonzero.any():
+            return as_float
+        nonzero_blocks = [
+            block for block, mask in zip(blocks, nonzero) if mask
+        ]
+        use_decimals = np.array(
+            await erc20_metadata.async_get_erc20_decimals_by_block(
+                token=token,
+                blocks=nonzero_blocks,
+                provider=provider,
+            ),
+            dtype=np.float64,
+        )
+    else:
+        if len(decimals) != len(as_float):
+            raise Exception(
+                'number of quantities must match number of decimals'
+            )
+        use_decimals = np.array(
+            [int(decimal) for decimal in decimals], dtype=np.float64
+        )[nonzero]
+
+    normalized = as_float.copy()
+    normalized[nonzero] /= np.power(10.0, use_decimals)
+    return normalized
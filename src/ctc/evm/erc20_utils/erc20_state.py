@@ -75,14 +75,55 @@ async def async_get_erc20s_total_supplies(
     return total_supplies
 
 
+@typing.overload
 async def async_get_erc20_total_supply_by_block(
     token: spec.ERC20Reference,
     blocks: typing.Sequence[spec.BlockNumberReference],
     *,
     normalize: bool = True,
     provider: spec.ProviderReference = None,
+    output_format: typing.Literal['list'] = 'list',
     **rpc_kwargs: typing.Any,
 ) -> typing.Union[list[int], list[float]]:
+    ...
+
+
+@typing.overload
+async def async_get_erc20_total_supply_by_block(
+    token: spec.ERC20Reference,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    *,
+    normalize: bool = True,
+    provider: spec.ProviderReference = None,
+    output_format: typing.Literal['array'],
+    **rpc_kwargs: typing.Any,
+) -> spec.NumpyArray:
+    ...
+
+
+async def async_get_erc20_total_supply_by_block(
+    token: spec.ERC20Reference,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    *,
+    normalize: bool = True,
+    provider: spec.ProviderReference = None,
+    output_format: typing.Literal['list', 'array'] = 'list',
+    **rpc_kwargs: typing.Any,
+) -> typing.Union[list[int], list[float], spec.NumpyArray]:
+    """get total supply of erc20 across multiple blocks
+
+    output_format 'array' returns a numpy array, as float64 if normalized
+    """
+
+    if output_format == 'array':
+        return await _async_erc20_eth_call_array_by_block(
+            token=token,
+            function_name='totalSupply',
+            blocks=blocks,
+            normalize=normalize,
+            provider=provider,
+            **rpc_kwargs,
+        )
 
     total_supplies = await erc20_generic.async_erc20_eth_call_by_block(
         token=token,
@@ -105,6 +146,38 @@ async def async_get_erc20_total_supply_by_block(
     return total_supplies
 
 
+async def _async_erc20_eth_call_array_by_block(
+    function_name: str,
+    token: spec.ERC20Reference,
+    *,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    normalize: bool,
+    provider: spec.ProviderReference,
+    **rpc_kwargs: typing.Any,
+) -> spec.NumpyArray:
+    """perform erc20 eth_call across blocks, decoding into a numpy array"""
+
+    quantities = await erc20_generic.async_erc20_eth_call_array_by_block(
+        token=token,
+        function_name=function_name,
+        blocks=blocks,
+        as_float=normalize,
+        provider=provider,
+        **rpc_kwargs,
+    )
+    if normalize:
+        normalize_array = (
+            erc20_normalize.async_normalize_erc20_quantities_array_by_block
+        )
+        quantities = await normalize_array(
+            quantities,
+            blocks,
+            token=token,
+            provider=provider,
+        )
+    return quantities
+
+
 #
 # # balance of
 #
@@ -168,6 +241,7 @@ async def async_get_erc20_balance_of_addresses(
         provider=provider,
     )
 
+    balances: typing.Union[list[int], list[float]]
     balances = await rpc.async_batch_eth_call(
         to_address=token,
         block_number=block,
@@ -228,6 +302,7 @@ async def async_get_erc20s_balance_of(
     return balances
 
 
+@typing.overload
 async def async_get_erc20_balance_of_by_block(
     wallet: spec.Address,
     token: spec.ERC20Reference,
@@ -236,9 +311,42 @@ async def async_get_erc20_balance_of_by_block(
     normalize: bool = True,
     provider: spec.ProviderReference = None,
     empty_token: typing.Any = 0,
+    output_format: typing.Literal['list'] = 'list',
     **rpc_kwargs: typing.Any,
 ) -> typing.Union[list[int], list[float]]:
-    """"""
+    ...
+
+
+@typing.overload
+async def async_get_erc20_balance_of_by_block(
+    wallet: spec.Address,
+    token: spec.ERC20Reference,
+    *,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    normalize: bool = True,
+    provider: spec.ProviderReference = None,
+    empty_token: typing.Any = 0,
+    output_format: typing.Literal['array'],
+    **rpc_kwargs: typing.Any,
+) -> spec.NumpyArray:
+    ...
+
+
+async def async_get_erc20_balance_of_by_block(
+    wallet: spec.Address,
+    token: spec.ERC20Reference,
+    *,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    normalize: bool = True,
+    provider: spec.ProviderReference = None,
+    empty_token: typing.Any = 0,
+    output_format: typing.Literal['list', 'array'] = 'list',
+    **rpc_kwargs: typing.Any,
+) -> typing.Union[list[int], list[float], spec.NumpyArray]:
+    """get erc20 balance of wallet across multiple blocks
+
+    output_format 'array' returns a numpy array, as float64 if normalized
+    """
 
     wallet = await address_utils.async_resolve_address(
         wallet,
@@ -246,6 +354,18 @@ async def async_get_erc20_balance_of_by_block(
         provider=provider,
     )
 
+    if output_format == 'array':
+        return await _async_erc20_eth_call_array_by_block(
+            token=token,
+            function_name='balanceOf',
+            blocks=blocks,
+            function_parameters=[wallet],
+            normalize=normalize,
+            provider=provider,
+            empty_token=empty_token,
+            **rpc_kwargs,
+        )
+
     balances = await erc20_generic.async_erc20_eth_call_by_block(
         token=token,
         function_name='balanceOf',
@@ -1,3 +1,6 @@
+from .filesystem_columnar import *
+from .filesystem_conversion import *
 from .filesystem_events import *
+from .filesystem_index import *
 from .filesystem_rechunking import *
 from .node_events import *
@@ -0,0 +1,371 @@
+"""columnar storage of events in parquet or feather files
+
+compared to csv, columnar event files
+- store each column with a fixed type instead of as text
+    - uint256 and int256 as big-endian binary, without loss of precision
+    - addresses and hashes as fixed-width binary
+- can load a subset of columns without parsing the others
+- can skip parquet row groups that fall outside of a block range
+
+the logical type of each column is stored in the schema metadata of each file,
+so files can be decoded without looking up the abi of their event
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import typing
+
+from ctc import spec
+
+
+_index_columns = ['block_number', 'transaction_index', 'log_index']
+_metadata_key = b'ctc_column_types'
+_row_group_size = 65536
+
+columnar_file_formats = ['parquet', 'feather']
+
+
+def _import_pyarrow() -> typing.Any:
+    try:
+        import pyarrow  # type: ignore
+    except ImportError:
+        raise Exception(
+            'the pyarrow package is required for parquet and feather event'
+            ' storage, try `pip install pyarrow`'
+        )
+    return pyarrow
+
+
+#
+# # column types
+#
+
+
+def get_event_column_types(
+    columns: typing.Sequence[str],
+    event_abi: typing.Optional[spec.EventABI],
+    *,
+    arg_prefix: str = 'arg__',
+) -> dict[str, str]:
+    """get logical type of each column of an event dataframe
+
+    logical types are abi datatypes, plus 'str' for text columns and 'object'
+    for columns of unknown type
+    """
+
+    column_types = {
+        'block_number': 'int64',
+        'transaction_index': 'int64',
+        'log_index': 'int64',
+        'block_hash': 'bytes32',
+        'transaction_hash': 'bytes32',
+        'event_hash': 'bytes32',
+        'contract_address': 'address',
+        'address': 'address',
+        'event_name': 'str',
+    }
+    if event_abi is not None:
+        for arg in event_abi['inputs']:
+            column_types[arg_prefix + arg['name']] = arg['type']
+
+    return {
+        column: column_types.get(column, 'object') for column in columns
+    }
+
+
+def _parse_abi_type(
+    abi_type: str,
+) -> typing.Tuple[str, typing.Optional[int]]:
+    """return (kind, n_bytes) of value types that have a fixed-width form"""
+
+    if abi_type == 'address':
+        return ('fixed_bytes', 20)
+    elif abi_type.startswith('bytes') and abi_type[5:].isdigit():
+        return ('fixed_bytes', int(abi_type[5:]))
+    elif abi_type.startswith('uint') and abi_type[4:].isdigit():
+        return ('uint', int(abi_type[4:]) // 8)
+    elif abi_type.startswith('int') and abi_type[3:].isdigit():
+        return ('int', int(abi_type[3:]) // 8)
+    elif abi_type in ['uint', 'int']:
+        return (abi_type, 32)
+    else:
+        return (abi_type, None)
+
+
+#
+# # encoding
+#
+
+
+def _encode_column(
+    items: typing.Sequence[typing.Any],
+    column_type: str,
+) -> typing.Any:
+    pyarrow = _import_pyarrow()
+
+    kind, n_bytes = _parse_abi_type(column_type)
+
+    if kind == 'fixed_bytes':
+        assert n_bytes is not None
+        return pyarrow.array(
+            [_to_bytes(item) for item in items],
+            type=pyarrow.binary(n_bytes),
+        )
+
+    elif kind in ['uint', 'int']:
+        assert n_bytes is not None
+        signed = kind == 'int'
+        if n_bytes <= 8:
+            if signed:
+                arrow_type = pyarrow.int64()
+            else:
+                arrow_type = pyarrow.uint64()
+            return pyarrow.array(
+                [None if item is None else int(item) for item in items],
+                type=arrow_type,
+            )
+        else:
+            return pyarrow.array(
+                [
+                    None
+                    if item is None
+                    else int(item).to_bytes(n_bytes, 'big', signed=signed)
+                    for item in items
+                ],
+                type=pyarrow.binary(n_bytes),
+            )
+
+    elif column_type == 'bool':
+        return pyarrow.array(
+            [None if item is None else bool(item) for item in items],
+            type=pyarrow.bool_(),
+        )
+
+    elif column_type == 'bytes':
+        return pyarrow.array(
+            [_to_bytes(item) for item in items],
+            type=pyarrow.binary(),
+        )
+
+    elif column_type == 'object':
+        try:
+            return pyarrow.array(items)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+            pass
+
+    # strings, arrays, and tuples are stored as text, same as in csv files
+    return pyarrow.array(
+        [None if item is None else str(item) for item in items],
+        type=pyarrow.string(),
+    )
+
+
+def _to_bytes(item: typing.Any) -> typing.Optional[bytes]:
+    if item is None:
+        return None
+    elif isinstance(item, bytes):
+        return item
+    elif isinstance(item, str):
+        if item.startswith('0x'):
+            return bytes.fromhex(item[2:])
+        elif item.startswith(("b'", 'b"')):
+            import ast
+
+            as_bytes: bytes = ast.literal_eval(item)
+            return as_bytes
+        else:
+            return bytes.fromhex(item)
+    else:
+        raise Exception('cannot convert to bytes: ' + str(type(item)))
+
+
+def events_to_arrow_table(
+    events: spec.DataFrame,
+    event_abi: typing.Optional[spec.EventABI] = None,
+) -> typing.Any:
+    """convert event dataframe to arrow table with typed columns"""
+
+    pyarrow = _import_pyarrow()
+
+    if list(events.index.names) == _index_columns:
+        events = events.reset_index()
+    column_types = get_event_column_types(
+        [str(column) for column in events.columns],
+        event_abi=event_abi,
+    )
+
+    arrays = []
+    for column, column_type in column_types.items():
+        arrays.append(_encode_column(events[column].tolist(), column_type))
+    table = pyarrow.Table.from_arrays(arrays, names=list(column_types.keys()))
+
+    metadata = {_metadata_key: json.dumps(column_types).encode()}
+    return table.replace_schema_metadata(metadata)
+
+
+def write_columnar_events_file(
+    events: spec.DataFrame,
+    path: str,
+    *,
+    file_format: str,
+    event_abi: typing.Optional[spec.EventABI] = None,
+) -> None:
+    """write event dataframe to a parquet or feather file"""
+
+    table = events_to_arrow_table(events, event_abi=event_abi)
+    if 'block_number' in table.column_names:
+        table = table.sort_by(
+            [(column, 'ascending') for column in _index_columns]
+        )
+
+    # write to temporary path so that partial files are never listed
+    dirname, filename = os.path.split(path)
+    tmp_path = os.path.join(dirname, '.' + filename + '.tmp')
+    if file_format == 'parquet':
+        import pyarrow.parquet  # type: ignore
+
+        pyarrow.parquet.write_table(
+            table,
+            tmp_path,
+            row_group_size=_row_group_size,
+            compression='zstd',
+        )
+    elif file_format == 'feather':
+        import pyarrow.feather  # type: ignore
+
+        pyarrow.feather.write_feather(table, tmp_path, compression='zstd')
+    else:
+        raise Exception('unknown columnar file format: ' + str(file_format))
+    os.replace(tmp_path, path)
+
+
+#
+# # decoding
+#
+
+
+def read_columnar_events_file(
+    path: str,
+    *,
+    file_format: str,
+    columns: typing.Optional[typing.Sequence[str]] = None,
+    start_block: typing.Optional[int] = None,
+    end_block: typing.Optional[int] = None,
+) -> spec.DataFrame:
+    """read parquet or feather event file into event dataframe
+
+    ## Inputs
+    - columns: non-index columns to load, or None to load all columns
+    - start_block and end_block: block range of rows to load, pushed down to
+      the file reader so that parquet row groups outside the range are skipped
+    """
+
+    _import_pyarrow()
+    import pyarrow.dataset  # type: ignore
+
+    dataset = pyarrow.dataset.dataset(path, format=file_format)
+
+    load_columns: typing.Optional[list[str]] = None
+    if columns is not None:
+        load_columns = list(_index_columns) + [
+            column for column in columns if column not in _index_columns
+        ]
+
+    block_filter = None
+    if start_block is not None:
+        block_filter = pyarrow.dataset.field('block_number') >= start_block
+    if end_block is not None:
+        end_filter = pyarrow.dataset.field('block_number') <= end_block
+        if block_filter is None:
+            block_filter = end_filter
+        else:
+            block_filter = block_filter & end_filter
+
+    table = dataset.to_table(columns=load_columns, filter=block_filter)
+    return arrow_table_to_events(table, metadata=dataset.schema.metadata)
+
+
+def arrow_table_to_events(
+    table: typing.Any,
+    *,
+    metadata: typing.Optional[typing.Mapping[bytes, bytes]] = None,
+) -> spec.DataFrame:
+    """convert arrow table of typed event columns to event dataframe"""
+    import pandas as pd
+
+    if metadata is None:
+        metadata = table.schema.metadata
+    if metadata is not None and _metadata_key in metadata:
+        column_types = json.loads(metadata[_metadata_key])
+    else:
+        column_types = {}
+
+    data = {}
+    for column in table.column_names:
+        array = table.column(column).combine_chunks()
+        data[column] = _decode_column(array, column_types.get(column, 'object'))
+    df = pd.DataFrame(data)
+
+    if all(column in df.columns for column in _index_columns):
+        df = df.set_index(_index_columns)
+    return df
+
+
+def _decode_column(array: typing.Any, column_type: str) -> typing.Any:
+    import numpy as np
+
+    from ctc import binary
+
+    kind, n_bytes = _parse_abi_type(column_type)
+    if n_bytes is None or array.null_count > 0:
+        if kind == 'bytes':
+            return [
+                None if item is None else '0x' + item.hex()
+                for item in array.to_pylist()
+            ]
+        elif n_bytes is not None and kind != 'fixed_bytes':
+            return [
+                None
+                if item is None
+                else _decode_integer(item, signed=kind == 'int')
+                for item in array.to_pylist()
+            ]
+        elif n_bytes is not None:
+            return [
+                None if item is None else '0x' + item.hex()
+                for item in array.to_pylist()
+            ]
+        else:
+            return array.to_numpy(zero_copy_only=False)
+
+    if kind in ['uint', 'int'] and n_bytes <= 8:
+        return array.to_numpy(zero_copy_only=False)
+    n = len(array)
+    if n == 0:
+        if kind == 'fixed_bytes':
+            return np.array([], dtype=object)
+        else:
+            return np.array([], dtype=np.int64)
+
+    # view fixed-width values as rows of a contiguous buffer
+    buffer = array.buffers()[1]
+    raw = np.frombuffer(buffer, dtype=np.uint8)
+    raw = raw[array.offset * n_bytes : (array.offset + n) * n_bytes]
+
+    if kind == 'fixed_bytes':
+        as_hex = raw.tobytes().hex()
+        width = 2 * n_bytes
+        return np.array(
+            ['0x' + as_hex[i * width : (i + 1) * width] for i in range(n)],
+            dtype=object,
+        )
+
+    # integers, use int64 when every value fits, as pandas does for node data
+    rows = raw.reshape(n, n_bytes)
+    return binary.decode_big_endian_rows(rows, signed=kind == 'int')
+
+
+def _decode_integer(item: bytes, *, signed: bool) -> int:
+    return int.from_bytes(item, 'big', signed=signed)
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import os
+import typing
+
+from ctc import spec
+
+from . import filesystem_events
+from . import filesystem_index
+from ... import abi_utils
+
+
+async def async_convert_events_file_format(
+    contract_address: spec.Address,
+    event_hash: str,
+    *,
+    file_format: typing.Optional[str] = None,
+    verbose: bool = True,
+    dry: bool = False,
+    network: spec.NetworkReference = 'mainnet',
+) -> None:
+    """convert event files of a contract event to a different file format
+
+    each file is fully written in the new format before its original is removed
+    """
+
+    if file_format is None:
+        file_format = filesystem_events.get_events_file_format()
+    if file_format not in filesystem_events.events_file_formats:
+        raise Exception('unknown event file format: ' + str(file_format))
+
+    event_list = filesystem_events.list_events(
+        contract_address=contract_address,
+        event_hash=event_hash,
+        allow_missing_blocks=True,
+        network=network,
+    )
+    if event_list is None:
+        if verbose:
+            print('skipping conversion, no event data found')
+        return
+
+    # gather files not yet in target format
+    original_paths = {
+        path: block_range
+        for path, block_range in event_list['paths'].items()
+        if filesystem_events.get_events_path_file_format(path) != file_format
+    }
+
+    if verbose or dry:
+        import toolstr
+
+        n_bytes = sum(os.path.getsize(path) for path in original_paths)
+        if dry:
+            print('[DRY RUN -- WILL NOT CHANGE FILES]')
+        print('event file conversion')
+        print('- contract:', contract_address)
+        print('- event_hash:', event_hash)
+        print('- target format:', file_format)
+        print(
+            '- converting',
+            len(original_paths),
+            'files (' + toolstr.format(n_bytes) + ' bytes)',
+        )
+    if dry:
+        return
+    if len(original_paths) == 0:
+        return
+
+    event_abi = await abi_utils.async_get_event_abi(
+        contract_address=contract_address,
+        event_hash=event_hash,
+        network=network,
+    )
+
+    for original_path, (start_block, end_block) in sorted(
+        original_paths.items(), key=lambda item: item[1]
+    ):
+        events = filesystem_events.read_events_file(
+            original_path,
+            event_abi=event_abi,
+        )
+        await filesystem_events.async_save_events_to_filesystem(
+            events=events,
+            contract_address=contract_address,
+            event_abi=event_abi,
+            start_block=start_block,
+            end_block=end_block,
+            file_format=file_format,
+            overwrite=True,
+            verbose=verbose,
+            network=network,
+        )
+        os.remove(original_path)
+    filesystem_index.refresh_event_index(
+        os.path.dirname(next(iter(original_paths)))
+    )
+
+    if verbose:
+        print()
+        print('...done')
+
+
+async def async_convert_all_events_file_format(
+    file_format: typing.Optional[str] = None,
+    network: spec.NetworkReference = 'mainnet',
+    *,
+    verbose: bool = True,
+    dry: bool = False,
+) -> None:
+    """convert every stored event file of network to a file format"""
+
+    contracts_events = filesystem_events.list_contracts_events(
+        network=network,
+        allow_missing_blocks=True,
+    )
+    for contract_address, events_data in contracts_events.items():
+        for event_hash in events_data.keys():
+            await async_convert_events_file_format(
+                contract_address=contract_address,
+                event_hash=event_hash,
+                file_format=file_format,
+                verbose=verbose,
+                dry=dry,
+                network=network,
+            )
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import ast
-import functools
 import os
 import typing
 from typing_extensions import TypedDict
@@ -21,12 +20,41 @@ from ... import network_utils
 
 
 filesystem_layout = {
-    'evm_events_path': 'events/contract__{contract_address}/event__{event_hash}/{start_block}__to__{end_block}.csv',
+    'evm_events_path': 'events/contract__{contract_address}/event__{event_hash}/{start_block}__to__{end_block}.{file_format}',
     'evm_contract_abis_path': 'contract_abis/contract__{contract_address}/{name}.json',
     'evm_named_contract_abis_path': '{data_root}/{network}/evm/named_contract_abis',
 }
 
 
+events_file_formats = ['csv', 'parquet', 'feather']
+
+# chunks smaller than this are extended when appending adjacent blocks
+max_append_chunk_bytes = 32 * 1024 * 1024
+
+
+def get_events_file_format() -> str:
+    """get file format used for saving new event files"""
+    data_source = config.get_data_source(datatype='events')
+    if data_source.get('backend') == 'filesystem':
+        file_format = data_source.get('filesystem_format')
+        if file_format is not None:
+            return file_format
+    for leaf_source in data_source.get('hybrid_order', []):
+        if leaf_source.get('backend') == 'filesystem':
+            file_format = leaf_source.get('filesystem_format')
+            if file_format is not None:
+                return file_format
+    return 'csv'
+
+
+def get_events_path_file_format(path: str) -> str:
+    """get file format of event file from its extension"""
+    extension = os.path.splitext(path)[1][1:]
+    if extension not in events_file_formats:
+        raise Exception('unknown event file format: ' + str(path))
+    return extension
+
+
 #
 # # paths
 #
@@ -79,8 +107,14 @@ def get_events_filepath(
     event_hash: typing.Optional[str] = None,
     event_abi: typing.Optional[spec.EventABI] = None,
     network: typing.Optional[spec.NetworkReference] = None,
+    file_format: typing.Optional[str] = None,
 ) -> str:
 
+    if file_format is None:
+        file_format = get_events_file_format()
+    if file_format not in events_file_formats:
+        raise Exception('unknown event file format: ' + str(file_format))
+
     # create lowercase versions of contract_address and event_hash
     contract_address = contract_address.lower()
     if event_hash is None:
@@ -95,6 +129,7 @@ def get_events_filepath(
         event_hash=event_hash,
         start_block=start_block,
         end_block=end_block,
+        file_format=file_format,
     )
 
     # add parent directory
@@ -121,6 +156,8 @@ def list_events_contracts(
     if not os.path.isdir(events_root):
         return []
     for contract_dir in os.listdir(events_root):
+        if contract_dir.startswith('.'):
+            continue
         contract_address = contract_dir.split('__')[-1]
         contracts.append(contract_address)
     return contracts
@@ -131,9 +168,9 @@ _PathEventsResult = typing.Dict[str, typing.Tuple[int, int]]
 
 class _ListEventsResult(TypedDict):
     paths: _PathEventsResult
-    block_range: spec.NumpyArray
-    block_mask: spec.NumpyArray
-    missing_blocks: spec.NumpyArray
+    block_range: typing.Tuple[int, int]
+    missing_blocks: bool
+    gaps: list[typing.Tuple[int, int]]
 
 
 def list_contract_events(
@@ -144,72 +181,71 @@ def list_contract_events(
     allow_missing_blocks: bool = False,
     network: typing.Optional[spec.NetworkReference] = None,
 ) -> dict[str, _ListEventsResult]:
+    """list chunk files of contract events, and the blocks they cover
+
+    ## Outputs
+    - paths: block range of each chunk file
+    - block_range: (first block, last block) covered by chunk files
+    - missing_blocks: whether chunk files leave gaps within block_range
+    - gaps: inclusive block ranges within block_range not covered by chunks
+    """
+
+    from . import filesystem_index
 
     if event_hash is not None:
-        query_event_hash = event_hash
+        query_event_hash: typing.Optional[str] = event_hash.lower()
     elif event_abi is not None:
         query_event_hash = binary.get_event_hash(event_abi)
     else:
         query_event_hash = None
 
-    # compile path data
+    # gather event directories
     contract_address = contract_address.lower()
     contract_dir = get_events_contract_dir(contract_address, network=network)
-    paths: dict[str, _PathEventsResult] = {}
-    if not os.path.isdir(contract_dir):
+    if query_event_hash is not None:
+        event_dirnames = ['event__' + query_event_hash]
+    elif os.path.isdir(contract_dir):
+        event_dirnames = [
+            dirname
+            for dirname in os.listdir(contract_dir)
+            if not dirname.startswith('.')
+        ]
+    else:
         return {}
-    for event_dirname in os.listdir(contract_dir):
+
+    # compile path data from index of each event directory
+    events: dict[str, _ListEventsResult] = {}
+    for event_dirname in event_dirnames:
         event_dir = os.path.join(contract_dir, event_dirname)
         _, event_hash = event_dirname.split('__')
-        if query_event_hash is not None and event_hash != query_event_hash:
+        chunk_ranges = filesystem_index.get_event_chunk_ranges(event_dir)
+        if len(chunk_ranges) == 0:
             continue
-        for filename in os.listdir(event_dir):
-            path = os.path.join(event_dir, filename)
-            start_block_str, _, end_block_str = os.path.splitext(filename)[
-                0
-            ].split('__')
-            paths.setdefault(event_hash, {})
-            paths[event_hash][path] = (int(start_block_str), int(end_block_str))
 
-    import numpy as np
+        # skip chunks left behind by an interrupted merge of chunks
+        superseded = filesystem_index.get_superseded_chunks(chunk_ranges)
+        paths = {
+            os.path.join(event_dir, filename): block_range
+            for filename, block_range in chunk_ranges.items()
+            if filename not in superseded
+        }
 
-    # create block_range and block_mask
-    events: dict[str, _ListEventsResult] = {}
-    for event_hash in paths.keys():
-
-        # gather start and end blocks
-        start_blocks = []
-        end_blocks = []
-        for path, (start_block, end_block) in paths[event_hash].items():
-            start_blocks.append(start_block)
-            end_blocks.append(end_block)
-
-        # create block_range
-        min_block = min(start_blocks)
-        max_block = max(end_blocks) + 1
-        block_range = np.arange(min_block, max_block)
-
-        # create block_mask
-        n_blocks = block_range.size
-        block_mask = np.zeros(n_blocks)
-        for path, (start_block, end_block) in paths[event_hash].items():
-            start_index = start_block - min_block
-            end_index = n_blocks - (max_block - end_block) + 1
-            block_mask[start_index:end_index] += 1
-        if (block_mask > 1).sum() > 0:
+        block_ranges = list(paths.values())
+        if len(filesystem_index.get_block_ranges_overlaps(block_ranges)) > 0:
             raise Exception('overlapping chunks')
-        block_mask = block_mask.astype(bool)
-
-        # check if blocks missing
-        missing_blocks = block_mask.sum() != n_blocks
+        bounds = filesystem_index.get_block_ranges_bounds(block_ranges)
+        if bounds is None:
+            continue
+        gaps = filesystem_index.get_block_ranges_gaps(block_ranges)
+        missing_blocks = len(gaps) > 0
         if missing_blocks and not allow_missing_blocks:
             raise Exception('missing blocks')
 
         events[event_hash] = {
-            'paths': paths[event_hash],
-            'block_range': block_range,
-            'block_mask': block_mask,
+            'paths': paths,
+            'block_range': bounds,
             'missing_blocks': missing_blocks,
+            'gaps': gaps,
         }
 
     return events
@@ -297,6 +333,7 @@ async def async_save_events_to_filesystem(
     event_name: typing.Optional[str] = None,
     overwrite: bool = False,
     verbose: bool = True,
+    file_format: typing.Optional[str] = None,
     provider: spec.ProviderReference = None,
     network: typing.Optional[spec.NetworkReference] = None,
 ) -> spec.DataFrame:
@@ -320,6 +357,8 @@ async def async_save_events_to_filesystem(
         )
 
     # compute path
+    if file_format is None:
+        file_format = get_events_file_format()
     path = get_events_filepath(
         contract_address=contract_address,
         event_hash=event_hash,
@@ -327,6 +366,7 @@ async def async_save_events_to_filesystem(
         start_block=start_block,
         end_block=end_block,
         network=network,
+        file_format=file_format,
     )
     if os.path.exists(path) and not overwrite:
         raise Exception('path already exists, use overwrite=True')
@@ -335,12 +375,121 @@ async def async_save_events_to_filesystem(
         print('saving events to file:', path)
 
     # save
-    os.makedirs(os.path.dirname(path), exist_ok=True)
-    events.to_csv(path)
+    from . import filesystem_index
+
+    event_dir = os.path.dirname(path)
+    os.makedirs(event_dir, exist_ok=True)
+    previous_ranges = filesystem_index.get_event_chunk_ranges(event_dir)
+    if file_format == 'csv':
+        # write to temporary path so that partial files are never listed
+        tmp_filename = '.' + os.path.basename(path) + '.tmp'
+        tmp_path = os.path.join(event_dir, tmp_filename)
+        events.to_csv(tmp_path)
+        os.replace(tmp_path, path)
+    else:
+        from . import filesystem_columnar
+
+        filesystem_columnar.write_columnar_events_file(
+            events,
+            path,
+            file_format=file_format,
+            event_abi=event_abi,
+        )
+    filesystem_index.record_event_chunk(
+        path,
+        start_block=start_block,
+        end_block=end_block,
+        previous_ranges=previous_ranges,
+    )
 
     return events
 
 
+async def async_append_events_to_filesystem(
+    events: spec.DataFrame,
+    contract_address: spec.Address,
+    *,
+    start_block: int,
+    end_block: int,
+    event_abi: spec.EventABI,
+    verbose: bool = True,
+    file_format: typing.Optional[str] = None,
+    network: spec.NetworkReference,
+) -> None:
+    """save events, extending the chunk that ends right before start_block
+
+    blocks are appended to the preceding chunk while that chunk is smaller than
+    max_append_chunk_bytes, so that following the tip of the chain does not
+    create a new small file on every sync
+    """
+    from . import filesystem_index
+
+    event_dir = get_events_event_dir(
+        contract_address, event_abi=event_abi, network=network
+    )
+    chunk_ranges = filesystem_index.get_event_chunk_ranges(event_dir)
+    previous_filenames = [
+        filename
+        for filename, (chunk_start, chunk_end) in chunk_ranges.items()
+        if chunk_end == start_block - 1
+    ]
+
+    if len(previous_filenames) == 1:
+        previous_path = os.path.join(event_dir, previous_filenames[0])
+        previous_start, _ = chunk_ranges[previous_filenames[0]]
+        if os.path.getsize(previous_path) < max_append_chunk_bytes:
+
+            if len(events) == 0:
+                # no new events, only the block range of the chunk changes
+                new_path = get_events_filepath(
+                    contract_address=contract_address,
+                    event_abi=event_abi,
+                    start_block=previous_start,
+                    end_block=end_block,
+                    network=network,
+                    file_format=get_events_path_file_format(previous_path),
+                )
+                if verbose:
+                    print('extending events file:', new_path)
+                os.rename(previous_path, new_path)
+
+            else:
+                import pandas as pd
+
+                previous_events = read_events_file(
+                    previous_path, event_abi=event_abi
+                )
+                if len(previous_events) > 0:
+                    events = pd.concat([previous_events, events]).sort_index()
+                await async_save_events_to_filesystem(
+                    events=events,
+                    contract_address=contract_address,
+                    start_block=previous_start,
+                    end_block=end_block,
+                    event_abi=event_abi,
+                    verbose=verbose,
+                    file_format=file_format,
+                    network=network,
+                )
+
+                # merged chunk is in place, so previous chunk is superseded
+                os.remove(previous_path)
+
+            filesystem_index.refresh_event_index(event_dir)
+            return
+
+    await async_save_events_to_filesystem(
+        events=events,
+        contract_address=contract_address,
+        start_block=start_block,
+        end_block=end_block,
+        event_abi=event_abi,
+        verbose=verbose,
+        file_format=file_format,
+        network=network,
+    )
+
+
 async def async_get_events_from_filesystem(
     contract_address: spec.ContractAddress,
     *,
@@ -350,9 +499,15 @@ async def async_get_events_from_filesystem(
     verbose: bool = True,
     start_block: typing.Optional[spec.BlockNumberReference] = None,
     end_block: typing.Optional[spec.BlockNumberReference] = None,
+    columns: typing.Optional[typing.Sequence[str]] = None,
     provider: spec.ProviderReference = None,
     network: spec.NetworkReference | None = None,
 ) -> spec.DataFrame:
+    """load events from filesystem
+
+    ## Inputs
+    - columns: non-index columns to load, or None to load all columns
+    """
 
     # get network
     if network is None:
@@ -392,11 +547,34 @@ async def async_get_events_from_filesystem(
         contract_address=contract_address,
         event_abi=event_abi,
         event_hash=event_hash,
+        allow_missing_blocks=True,
         network=network,
     )
     if event_hash not in events or len(events[event_hash]['paths']) == 0:
         raise backend_utils.DataNotFound('no files for event')
 
+    # check that files cover requested blocks
+    from . import filesystem_index
+
+    block_range = events[event_hash]['block_range']
+    if start_block is not None and start_block < block_range[0]:
+        raise backend_utils.DataNotFound(
+            'start_block outside of filesystem contents'
+        )
+    if end_block is not None and end_block > block_range[-1]:
+        raise backend_utils.DataNotFound(
+            'end_block outside of filesystem contents'
+        )
+    gaps = filesystem_index.get_block_ranges_gaps(
+        events[event_hash]['paths'].values(),
+        start_block=start_block,
+        end_block=end_block,
+    )
+    if len(gaps) > 0:
+        raise backend_utils.DataNotFound(
+            'filesystem missing blocks in range ' + str(list(gaps[0]))
+        )
+
     # get paths to load
     paths_to_load = []
     for path, (path_start, path_end) in events[event_hash]['paths'].items():
@@ -426,49 +604,97 @@ async def async_get_events_from_filesystem(
             for path in paths_to_load:
                 print('-', path)
 
+    # csv files need event abi to decode bytes columns
+    if event_abi is None and any(
+        get_events_path_file_format(path) == 'csv' for path in paths_to_load
+    ):
+        event_abi = await abi_utils.async_get_event_abi(
+            contract_address=contract_address,
+            event_name=event_name,
+            event_hash=event_hash,
+            network=network,
+        )
+
     import pandas as pd
 
     # load paths
     dfs = []
     for path in paths_to_load:
-        df = pd.read_csv(path)
-        df = df.set_index(['block_number', 'transaction_index', 'log_index'])
+        df = read_events_file(
+            path,
+            event_abi=event_abi,
+            columns=columns,
+            start_block=start_block,
+            end_block=end_block,
+        )
         dfs.append(df)
     df = pd.concat(dfs, axis=0)
     df = df.sort_index()
 
     # trim unwanted
     if start_block is not None:
-        if start_block < events[event_hash]['block_range'][0]:
-            raise backend_utils.DataNotFound(
-                'start_block outside of filesystem contents'
-            )
         mask = df.index.get_level_values(level='block_number') >= start_block
         df = df[mask]
     if end_block is not None:
-        if end_block > events[event_hash]['block_range'][-1]:
-            raise backend_utils.DataNotFound(
-                'end_block outside of filesystem contents'
-            )
         mask = df.index.get_level_values(level='block_number') <= end_block
         df = df[mask]
 
+    return df
+
+
+def read_events_file(
+    path: str,
+    *,
+    event_abi: typing.Optional[spec.EventABI] = None,
+    columns: typing.Optional[typing.Sequence[str]] = None,
+    start_block: typing.Optional[int] = None,
+    end_block: typing.Optional[int] = None,
+) -> spec.DataFrame:
+    """read single event file of any format into event dataframe
+
+    csv files require event_abi, and are not filtered by block range
+    """
+
+    file_format = get_events_path_file_format(path)
+    if file_format != 'csv':
+        from . import filesystem_columnar
+
+        return filesystem_columnar.read_columnar_events_file(
+            path,
+            file_format=file_format,
+            columns=columns,
+            start_block=start_block,
+            end_block=end_block,
+        )
+
+    if event_abi is None:
+        raise Exception('must specify event_abi to load csv event files')
+
+    import pandas as pd
+
+    index_columns = ['block_number', 'transaction_index', 'log_index']
+    if columns is not None:
+        usecols: typing.Optional[list[str]] = index_columns + [
+            column for column in columns if column not in index_columns
+        ]
+    else:
+        usecols = None
+    df = pd.read_csv(path, usecols=usecols)
+    df = df.set_index(index_columns)
+
     # convert any bytes
     prefix = 'arg__'
-    if event_abi is None:
-        event_abi = await abi_utils.async_get_event_abi(
-            contract_address=contract_address,
-            event_name=event_name,
-            event_hash=event_hash,
-            network=network,
-        )
     for arg in event_abi['inputs']:
-        if arg['type'] in ['bytes32']:
-            column = prefix + arg['name']
-            lam = functools.partial(
-                binary.convert,
-                output_format='prefix_hex',
-            )
-            df[column] = df[column].map(ast.literal_eval).map(lam)
+        column = prefix + arg['name']
+        if arg['type'] in ['bytes32'] and column in df.columns:
+            df[column] = df[column].map(_parse_csv_bytes)
 
     return df
+
+
+def _parse_csv_bytes(value: str) -> str:
+    # bytes are written as python literals, or as hex if already converted
+    if value.startswith('0x'):
+        return value
+    else:
+        return binary.convert(ast.literal_eval(value), 'prefix_hex')
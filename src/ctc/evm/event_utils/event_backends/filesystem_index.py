@@ -0,0 +1,229 @@
+"""persistent block-range index of the event chunks stored on filesystem
+
+- each event directory gets a small json manifest mapping filenames to the
+  block range of their chunk
+- manifests live next to their event directory so that writing a manifest does
+  not modify the directory it describes
+- a manifest is trusted only while the mtime of its event directory matches
+  the recorded mtime, otherwise it is rebuilt from a directory listing
+- coverage, gap, and overlap queries are answered with interval arithmetic,
+  costing O(n_chunks) rather than O(n_blocks)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import typing
+
+from typing_extensions import TypedDict
+
+
+_manifest_version = 1
+
+
+class _EventIndexManifest(TypedDict):
+    version: int
+    directory_mtime_ns: int
+    chunks: dict[str, list[int]]
+
+
+ChunkRanges = typing.Dict[str, typing.Tuple[int, int]]
+
+
+def get_event_index_path(event_dir: str) -> str:
+    event_dir = os.path.normpath(event_dir)
+    parent, dirname = os.path.split(event_dir)
+    return os.path.join(parent, '.' + dirname + '.index.json')
+
+
+def get_event_chunk_ranges(event_dir: str) -> ChunkRanges:
+    """get block range of each chunk file in event directory"""
+
+    try:
+        mtime_ns = os.stat(event_dir).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+
+    manifest = _read_manifest(event_dir)
+    if manifest is not None and manifest['directory_mtime_ns'] == mtime_ns:
+        return {
+            filename: (block_range[0], block_range[1])
+            for filename, block_range in manifest['chunks'].items()
+        }
+    else:
+        return refresh_event_index(event_dir)
+
+
+def refresh_event_index(event_dir: str) -> ChunkRanges:
+    """rebuild index of event directory from a listing of its files"""
+
+    try:
+        mtime_ns = os.stat(event_dir).st_mtime_ns
+        filenames = os.listdir(event_dir)
+    except FileNotFoundError:
+        return {}
+
+    chunk_ranges: ChunkRanges = {}
+    for filename in filenames:
+
+        # hidden files are partially written chunks
+        if filename.startswith('.'):
+            continue
+
+        chunk_ranges[filename] = parse_chunk_filename(filename)
+
+    _write_manifest(event_dir, chunk_ranges=chunk_ranges, mtime_ns=mtime_ns)
+    return chunk_ranges
+
+
+def record_event_chunk(
+    path: str,
+    *,
+    start_block: int,
+    end_block: int,
+    previous_ranges: ChunkRanges,
+) -> None:
+    """record newly written chunk file in index of its event directory
+
+    previous_ranges should be the chunk ranges from before the file was written
+    """
+
+    event_dir, filename = os.path.split(path)
+    chunk_ranges = dict(previous_ranges)
+    chunk_ranges[filename] = (start_block, end_block)
+    mtime_ns = os.stat(event_dir).st_mtime_ns
+    _write_manifest(event_dir, chunk_ranges=chunk_ranges, mtime_ns=mtime_ns)
+
+
+def parse_chunk_filename(filename: str) -> typing.Tuple[int, int]:
+    start_block_str, _, end_block_str = os.path.splitext(filename)[0].split(
+        '__'
+    )
+    return (int(start_block_str), int(end_block_str))
+
+
+def _read_manifest(event_dir: str) -> typing.Optional[_EventIndexManifest]:
+    path = get_event_index_path(event_dir)
+    try:
+        with open(path, 'r') as f:
+            manifest: _EventIndexManifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if manifest.get('version') != _manifest_version:
+        return None
+    return manifest
+
+
+def _write_manifest(
+    event_dir: str,
+    *,
+    chunk_ranges: ChunkRanges,
+    mtime_ns: int,
+) -> None:
+    manifest: _EventIndexManifest = {
+        'version': _manifest_version,
+        'directory_mtime_ns': mtime_ns,
+        'chunks': {
+            filename: [start_block, end_block]
+            for filename, (start_block, end_block) in chunk_ranges.items()
+        },
+    }
+    path = get_event_index_path(event_dir)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+        os.replace(tmp_path, path)
+    except OSError:
+        # index is only an optimization, read-only data dirs still work
+        pass
+
+
+#
+# # interval queries
+#
+
+
+def get_block_ranges_bounds(
+    block_ranges: typing.Iterable[typing.Tuple[int, int]],
+) -> typing.Optional[typing.Tuple[int, int]]:
+    """get (min start block, max end block) of block ranges"""
+    block_ranges = list(block_ranges)
+    if len(block_ranges) == 0:
+        return None
+    return (
+        min(start for start, end in block_ranges),
+        max(end for start, end in block_ranges),
+    )
+
+
+def get_block_ranges_overlaps(
+    block_ranges: typing.Iterable[typing.Tuple[int, int]],
+) -> list[typing.Tuple[int, int]]:
+    """get block ranges that are covered by more than one input range"""
+    overlaps = []
+    max_end: typing.Optional[int] = None
+    for start, end in sorted(block_ranges):
+        if max_end is not None and start <= max_end:
+            overlaps.append((start, min(end, max_end)))
+        if max_end is None or end > max_end:
+            max_end = end
+    return overlaps
+
+
+def get_superseded_chunks(chunk_ranges: ChunkRanges) -> list[str]:
+    """get chunks whose block range lies within the range of another chunk
+
+    these are left behind if a process stops after writing a merged chunk but
+    before removing the chunk that it replaces
+    """
+    superseded = []
+    max_end: typing.Optional[int] = None
+    for filename, (start, end) in sorted(
+        chunk_ranges.items(),
+        key=lambda item: (item[1][0], -item[1][1], item[0]),
+    ):
+        if max_end is not None and end <= max_end:
+            superseded.append(filename)
+        else:
+            max_end = end
+    return superseded
+
+
+def get_block_ranges_gaps(
+    block_ranges: typing.Iterable[typing.Tuple[int, int]],
+    *,
+    start_block: typing.Optional[int] = None,
+    end_block: typing.Optional[int] = None,
+) -> list[typing.Tuple[int, int]]:
+    """get inclusive block ranges not covered by any input range
+
+    if start_block or end_block are None, the bounds of the input ranges are used
+    """
+
+    sorted_ranges = sorted(block_ranges)
+    if start_block is None or end_block is None:
+        bounds = get_block_ranges_bounds(sorted_ranges)
+        if bounds is None:
+            return []
+        if start_block is None:
+            start_block = bounds[0]
+        if end_block is None:
+            end_block = bounds[1]
+
+    gaps = []
+    cursor = start_block
+    for start, end in sorted_ranges:
+        if end < cursor:
+            continue
+        if start > end_block:
+            break
+        if start > cursor:
+            gaps.append((cursor, start - 1))
+        cursor = end + 1
+        if cursor > end_block:
+            break
+    if cursor <= end_block:
+        gaps.append((cursor, end_block))
+    return gaps
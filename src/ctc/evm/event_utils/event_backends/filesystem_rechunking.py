@@ -9,6 +9,7 @@ from ctc import binary
 from ctc import spec
 
 from . import filesystem_events
+from . import filesystem_index
 from ... import abi_utils
 
 
@@ -221,6 +222,7 @@ async def async_rechunk_events(
     # remove original files
     for original_path in original_paths:
         os.remove(original_path + '__OLD')
+    filesystem_index.refresh_event_index(os.path.dirname(original_paths[0]))
 
     if verbose:
         print()
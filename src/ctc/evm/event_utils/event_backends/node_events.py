@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import typing
 
+from typing_extensions import TypedDict
+
 from ctc import binary
 from ctc import rpc
 from ctc import spec
@@ -9,6 +11,53 @@ from ctc import spec
 from ... import abi_utils
 from ... import block_utils
 
+if typing.TYPE_CHECKING:
+    import concurrent.futures
+
+
+# initial and maximum number of blocks per eth_getLogs request
+_default_blocks_per_chunk = 100000
+_max_blocks_per_chunk = 10000000
+
+# window sizes are steered so that responses contain about this many logs
+_target_logs_per_chunk = 2000
+
+_default_max_concurrent_chunks = 16
+
+# completed windows held in memory while iterating over events in block order
+_default_max_buffered_chunks = 32
+
+# process pools used for decoding events, by number of processes
+_decode_pools: dict[int, concurrent.futures.ProcessPoolExecutor] = {}
+
+# messages used by nodes and providers when a log query returns too many logs
+# - rate limits, timeouts, and invalid ranges must not match these
+_log_limit_error_phrases = [
+    'query returned more than',
+    'response size exceeded',
+    'log response size',
+    'block range too large',
+]
+
+# bounds on splitting a window after log limit errors, beyond which the
+# original error is raised
+_min_split_window = 4
+_max_split_depth = 10
+
+
+ContractEventKey = typing.Tuple[spec.Address, str]
+
+# completed windows, as {window_start: (window_end, logs)}
+_LogWindowResults = typing.Dict[
+    int, typing.Tuple[int, typing.Sequence[spec.RawLog]]
+]
+
+
+class _LogWindowState(TypedDict):
+    cursor: int
+    end_block: int
+    window: int
+
 
 def _get_chunks_in_range(
     start_block: int,
@@ -47,19 +96,26 @@ async def async_get_events_from_node(
     event_abi: spec.EventABI | None = None,
     contract_address: spec.Address | None = None,
     contract_abi: spec.ContractABI | None = None,
-    blocks_per_chunk: int = 2000,
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    decode_processes: int | None = None,
     verbose: bool = True,
     provider: spec.ProviderReference = None,
 ) -> spec.DataFrame:
-    """see fetch_events() for complete kwarg list"""
-    import asyncio
+    """see fetch_events() for complete kwarg list
+
+    block range is queried in windows that adapt to the density of events
+    - blocks_per_chunk: size of initial windows
+    - max_concurrent_chunks: maximum number of windows requested at once
+    - decode_processes: number of worker processes that decode windows
+      while later windows are downloaded, or None to decode in process
+    """
 
     provider = rpc.get_provider(provider)
     network = provider['network']
     if network is None:
         raise Exception('could not determine network')
 
-    # create chunks
     start_block, end_block = await block_utils.async_block_numbers_to_int(
         blocks=[start_block, end_block],
         provider=provider,
@@ -68,16 +124,6 @@ async def async_get_events_from_node(
         print(
             'getting events from node, block range:', [start_block, end_block]
         )
-    blocks_per_chunk = min(1000, blocks_per_chunk)
-    if blocks_per_chunk is not None:
-        chunks = _get_chunks_in_range(
-            start_block=start_block,
-            end_block=end_block,
-            chunk_size=blocks_per_chunk,
-            trim_excess=True,
-        )
-    else:
-        chunks = [[start_block, end_block]]
 
     # gather metadata
     if contract_abi is None and event_abi is None:
@@ -115,20 +161,40 @@ async def async_get_events_from_node(
             raise Exception('must specify event_name, event_abi, or event_hash')
 
     # fetch events
-    coroutines = []
-    for chunk in chunks:
-        coroutine = _async_get_chunk_of_events_from_node(
-            block_range=chunk,
-            event_hash=event_hash,
+    if blocks_per_chunk is None:
+        blocks_per_chunk = _default_blocks_per_chunk
+    if max_concurrent_chunks is None:
+        max_concurrent_chunks = _default_max_concurrent_chunks
+    if decode_processes is not None:
+        if event_abi is None:
+            event_abi = await abi_utils.async_get_event_abi(
+                contract_address=contract_address,
+                contract_abi=contract_abi,
+                event_hash=event_hash,
+                event_name=event_name,
+                network=network,
+            )
+        return await _async_get_events_decoded_in_processes(
+            start_block=start_block,
+            end_block=end_block,
+            event_abi=event_abi,
             contract_address=contract_address,
+            blocks_per_chunk=blocks_per_chunk,
+            max_concurrent_chunks=max_concurrent_chunks,
+            decode_processes=decode_processes,
             verbose=verbose,
             provider=provider,
         )
-        coroutines.append(coroutine)
-    chunks_entries = await asyncio.gather(*coroutines)
-    entries = [
-        entry for chunk_entries in chunks_entries for entry in chunk_entries
-    ]
+    entries = await _async_get_logs_adaptively(
+        start_block=start_block,
+        end_block=end_block,
+        event_hash=event_hash,
+        contract_address=contract_address,
+        blocks_per_chunk=blocks_per_chunk,
+        max_concurrent_chunks=max_concurrent_chunks,
+        verbose=verbose,
+        provider=provider,
+    )
 
     # package as dataframe
     return await _async_package_exported_events(
@@ -142,11 +208,557 @@ async def async_get_events_from_node(
     )
 
 
+async def async_get_multi_events_from_node(
+    contract_addresses: typing.Sequence[spec.Address],
+    *,
+    event_hashes: typing.Sequence[str] | None = None,
+    event_abis: typing.Sequence[spec.EventABI] | None = None,
+    start_block: spec.BlockNumberReference = 'latest',
+    end_block: spec.BlockNumberReference = 'latest',
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    verbose: bool = True,
+    provider: spec.ProviderReference = None,
+) -> dict[ContractEventKey, spec.DataFrame]:
+    """get events of many contracts and event types in one sweep of blocks
+
+    each eth_getLogs request matches all contracts and all event types, logs
+    are then split into one dataframe per (contract_address, event_hash)
+
+    ## Inputs
+    - event_abis: abis of events, used for every contract
+    - event_hashes: hashes of events, abis are looked up for each contract
+    """
+
+    provider = rpc.get_provider(provider)
+    contract_event_abis = await async_get_contract_event_abis(
+        contract_addresses,
+        event_hashes=event_hashes,
+        event_abis=event_abis,
+        network=provider['network'],
+    )
+    start_block, end_block = await block_utils.async_block_numbers_to_int(
+        blocks=[start_block, end_block],
+        provider=provider,
+    )
+    return await async_get_contract_events_from_node(
+        contract_event_abis,
+        start_block=start_block,
+        end_block=end_block,
+        blocks_per_chunk=blocks_per_chunk,
+        max_concurrent_chunks=max_concurrent_chunks,
+        verbose=verbose,
+        provider=provider,
+    )
+
+
+async def async_get_contract_event_abis(
+    contract_addresses: typing.Sequence[spec.Address],
+    *,
+    event_hashes: typing.Sequence[str] | None = None,
+    event_abis: typing.Sequence[spec.EventABI] | None = None,
+    network: spec.NetworkReference | None = None,
+) -> dict[ContractEventKey, spec.EventABI]:
+    """get abi of each (contract_address, event_hash) pair"""
+    import asyncio
+
+    contract_addresses = [address.lower() for address in contract_addresses]
+    if event_abis is not None:
+        contract_event_abis = {}
+        for event_abi in event_abis:
+            event_hash = binary.get_event_hash(event_abi)
+            for contract_address in contract_addresses:
+                contract_event_abis[(contract_address, event_hash)] = event_abi
+        return contract_event_abis
+    elif event_hashes is not None:
+        keys = [
+            (contract_address, event_hash.lower())
+            for contract_address in contract_addresses
+            for event_hash in event_hashes
+        ]
+        coroutines = [
+            abi_utils.async_get_event_abi(
+                contract_address=contract_address,
+                event_hash=event_hash,
+                network=network,
+            )
+            for contract_address, event_hash in keys
+        ]
+        return dict(zip(keys, await asyncio.gather(*coroutines)))
+    else:
+        raise Exception('must specify event_hashes or event_abis')
+
+
+async def async_get_contract_events_from_node(
+    contract_event_abis: typing.Mapping[ContractEventKey, spec.EventABI],
+    *,
+    start_block: int,
+    end_block: int,
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    verbose: bool = True,
+    provider: spec.ProviderReference = None,
+) -> dict[ContractEventKey, spec.DataFrame]:
+    """get events of (contract_address, event_hash) pairs in one block sweep"""
+    import asyncio
+
+    contract_addresses = sorted({address for address, _ in contract_event_abis})
+    event_hashes = sorted({event_hash for _, event_hash in contract_event_abis})
+
+    if verbose:
+        print(
+            'getting events of',
+            len(contract_addresses),
+            'contracts from node, block range:',
+            [start_block, end_block],
+        )
+
+    # fetch logs of all contract events together
+    if blocks_per_chunk is None:
+        blocks_per_chunk = _default_blocks_per_chunk
+    if max_concurrent_chunks is None:
+        max_concurrent_chunks = _default_max_concurrent_chunks
+    entries = await _async_get_logs_adaptively(
+        start_block=start_block,
+        end_block=end_block,
+        event_hash=event_hashes,
+        contract_address=contract_addresses,
+        blocks_per_chunk=blocks_per_chunk,
+        max_concurrent_chunks=max_concurrent_chunks,
+        verbose=verbose,
+        provider=provider,
+    )
+
+    # split logs by contract event, dropping pairs that were not requested
+    entries_by_key: dict[ContractEventKey, list[spec.RawLog]] = {
+        key: [] for key in contract_event_abis.keys()
+    }
+    for entry in entries:
+        if len(entry['topics']) == 0:
+            continue
+        key = (entry['address'].lower(), entry['topics'][0].lower())
+        key_entries = entries_by_key.get(key)
+        if key_entries is not None:
+            key_entries.append(entry)
+
+    # package as dataframes
+    keys = list(contract_event_abis.keys())
+    coroutines = [
+        _async_package_exported_events(
+            entries_by_key[key],
+            contract_address=key[0],
+            contract_abi=None,
+            event_hash=key[1],
+            event_name=contract_event_abis[key]['name'],
+            event_abi=contract_event_abis[key],
+            provider=provider,
+        )
+        for key in keys
+    ]
+    return dict(zip(keys, await asyncio.gather(*coroutines)))
+
+
+async def async_iterate_event_chunks_from_node(
+    contract_address: spec.Address | None,
+    *,
+    event_abi: spec.EventABI,
+    start_block: int,
+    end_block: int,
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    max_buffered_chunks: int | None = None,
+    decode_processes: int | None = None,
+    verbose: bool = True,
+    provider: spec.ProviderReference = None,
+) -> typing.AsyncIterator[typing.Tuple[int, int, spec.DataFrame]]:
+    """iterate over events of block range as decoded dataframe chunks
+
+    - yields (chunk_start_block, chunk_end_block, events) for consecutive
+      windows of blocks, in block order
+    - windows are fetched concurrently, but at most max_buffered_chunks
+      completed windows are held while waiting for an earlier window
+    - decode_processes: number of worker processes used to decode windows
+    """
+
+    if verbose:
+        print(
+            'streaming events from node, block range:',
+            [start_block, end_block],
+        )
+
+    if blocks_per_chunk is None:
+        blocks_per_chunk = _default_blocks_per_chunk
+    if max_concurrent_chunks is None:
+        max_concurrent_chunks = _default_max_concurrent_chunks
+    if max_buffered_chunks is None:
+        max_buffered_chunks = _default_max_buffered_chunks
+    event_hash = binary.get_event_hash(event_abi)
+    async for chunk_start, chunk_end, entries in _async_iterate_logs_adaptively(
+        start_block=start_block,
+        end_block=end_block,
+        event_hash=event_hash,
+        contract_address=contract_address,
+        blocks_per_chunk=blocks_per_chunk,
+        max_concurrent_chunks=max_concurrent_chunks,
+        max_buffered_chunks=max_buffered_chunks,
+        verbose=verbose,
+        provider=provider,
+    ):
+        if decode_processes is not None:
+            events = await _async_decode_events_in_pool(
+                entries,
+                event_abi=event_abi,
+                pool=get_decode_pool(decode_processes),
+            )
+        else:
+            events = await _async_package_exported_events(
+                entries,
+                contract_address=contract_address,
+                contract_abi=None,
+                event_hash=event_hash,
+                event_name=event_abi['name'],
+                event_abi=event_abi,
+                provider=provider,
+            )
+        yield chunk_start, chunk_end, events
+
+
+#
+# # process pool decoding
+#
+
+
+def get_decode_pool(
+    n_processes: int,
+) -> concurrent.futures.ProcessPoolExecutor:
+    """get shared pool of processes used for decoding events"""
+    import concurrent.futures
+
+    pool = _decode_pools.get(n_processes)
+    if pool is None:
+        import multiprocessing
+
+        # spawned workers do not inherit event loop or sockets of parent
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=n_processes,
+            mp_context=multiprocessing.get_context('spawn'),
+        )
+        _decode_pools[n_processes] = pool
+    return pool
+
+
+def shutdown_decode_pools() -> None:
+    """shut down processes used for decoding events"""
+    for pool in _decode_pools.values():
+        pool.shutdown()
+    _decode_pools.clear()
+
+
+async def _async_get_events_decoded_in_processes(
+    *,
+    start_block: int,
+    end_block: int,
+    event_abi: spec.EventABI,
+    contract_address: spec.Address | None,
+    blocks_per_chunk: int,
+    max_concurrent_chunks: int,
+    decode_processes: int,
+    verbose: bool,
+    provider: spec.ProviderReference,
+) -> spec.DataFrame:
+    """get events, decoding each window in a worker process as it arrives"""
+    import asyncio
+    import pandas as pd
+
+    pool = get_decode_pool(decode_processes)
+    tasks = []
+    async for _, _, entries in _async_iterate_logs_adaptively(
+        start_block=start_block,
+        end_block=end_block,
+        event_hash=binary.get_event_hash(event_abi),
+        contract_address=contract_address,
+        blocks_per_chunk=blocks_per_chunk,
+        max_concurrent_chunks=max_concurrent_chunks,
+        max_buffered_chunks=_default_max_buffered_chunks,
+        verbose=verbose,
+        provider=provider,
+    ):
+        if len(entries) > 0:
+            coroutine = _async_decode_events_in_pool(
+                entries, event_abi=event_abi, pool=pool
+            )
+            tasks.append(asyncio.create_task(coroutine))
+
+    dfs: list[spec.DataFrame] = await asyncio.gather(*tasks)
+    if len(dfs) == 0:
+        return create_empty_event_dataframe(event_abi=event_abi)
+    elif len(dfs) == 1:
+        return dfs[0]
+    else:
+        return pd.concat(dfs)
+
+
+async def _async_decode_events_in_pool(
+    entries: typing.Sequence[spec.RawLog],
+    *,
+    event_abi: spec.EventABI,
+    pool: concurrent.futures.ProcessPoolExecutor,
+) -> spec.DataFrame:
+    import asyncio
+    import pandas as pd
+
+    if len(entries) == 0:
+        return create_empty_event_dataframe(event_abi=event_abi)
+
+    loop = asyncio.get_running_loop()
+    columns = await loop.run_in_executor(
+        pool, _decode_events_columns_compact, entries, event_abi
+    )
+    df = pd.DataFrame(columns)
+    return df.set_index(['block_number', 'transaction_index', 'log_index'])
+
+
+def _decode_events_columns_compact(
+    entries: typing.Sequence[spec.RawLog],
+    event_abi: spec.EventABI,
+) -> dict[str, typing.Any]:
+    """decode logs into columns, run inside of worker processes
+
+    integer metadata columns are returned as numpy arrays, which are sent
+    back to the parent process as single buffers
+    """
+    import numpy as np
+
+    columns = binary.decode_events_columns(entries, event_abi=event_abi)
+    for key in ['block_number', 'transaction_index', 'log_index']:
+        columns[key] = np.array(columns[key], dtype=np.int64)
+    return columns
+
+
+#
+# # adaptive windows
+#
+
+
+async def _async_get_logs_adaptively(
+    *,
+    start_block: int,
+    end_block: int,
+    event_hash: str | typing.Sequence[str],
+    contract_address: spec.Address | typing.Sequence[spec.Address] | None,
+    blocks_per_chunk: int,
+    max_concurrent_chunks: int,
+    verbose: bool,
+    provider: spec.ProviderReference,
+) -> list[spec.RawLog]:
+    """get logs of block range using windows that adapt to event density
+
+    - workers carve windows off the front of the remaining block range
+    - a window that fails with a result limit error is split in half
+    - windows shrink after dense responses and grow after sparse responses
+    """
+    import asyncio
+
+    state: _LogWindowState = {
+        'cursor': start_block,
+        'end_block': end_block,
+        'window': max(1, min(blocks_per_chunk, _max_blocks_per_chunk)),
+    }
+    results: _LogWindowResults = {}
+
+    n_blocks = end_block - start_block + 1
+    n_workers = max(1, min(max_concurrent_chunks, n_blocks))
+    coroutines = [
+        _async_log_window_worker(
+            state=state,
+            results=results,
+            event_hash=event_hash,
+            contract_address=contract_address,
+            verbose=verbose,
+            provider=provider,
+        )
+        for i in range(n_workers)
+    ]
+    await asyncio.gather(*coroutines)
+
+    return [log for key in sorted(results.keys()) for log in results[key][1]]
+
+
+async def _async_log_window_worker(
+    *,
+    state: _LogWindowState,
+    results: _LogWindowResults,
+    event_hash: str | typing.Sequence[str],
+    contract_address: spec.Address | typing.Sequence[spec.Address] | None,
+    verbose: bool,
+    provider: spec.ProviderReference,
+) -> None:
+    while state['cursor'] <= state['end_block']:
+        window_start = state['cursor']
+        window_end = min(window_start + state['window'] - 1, state['end_block'])
+        state['cursor'] = window_end + 1
+        await _async_get_log_window(
+            (window_start, window_end),
+            state=state,
+            results=results,
+            event_hash=event_hash,
+            contract_address=contract_address,
+            verbose=verbose,
+            provider=provider,
+        )
+
+
+async def _async_iterate_logs_adaptively(
+    *,
+    start_block: int,
+    end_block: int,
+    event_hash: str | typing.Sequence[str],
+    contract_address: spec.Address | typing.Sequence[spec.Address] | None,
+    blocks_per_chunk: int,
+    max_concurrent_chunks: int,
+    max_buffered_chunks: int,
+    verbose: bool,
+    provider: spec.ProviderReference,
+) -> typing.AsyncIterator[
+    typing.Tuple[int, int, typing.Sequence[spec.RawLog]]
+]:
+    """iterate over logs of adaptive windows in block order
+
+    workers stop carving new windows while max_buffered_chunks completed
+    windows are waiting to be yielded
+    """
+    import asyncio
+
+    state: _LogWindowState = {
+        'cursor': start_block,
+        'end_block': end_block,
+        'window': max(1, min(blocks_per_chunk, _max_blocks_per_chunk)),
+    }
+    results: _LogWindowResults = {}
+    errors: list[BaseException] = []
+    condition = asyncio.Condition()
+    max_buffered_chunks = max(1, max_buffered_chunks)
+
+    async def async_worker() -> None:
+        try:
+            while True:
+                async with condition:
+                    await condition.wait_for(
+                        lambda: len(results) < max_buffered_chunks
+                    )
+                if state['cursor'] > state['end_block']:
+                    return
+                window_start = state['cursor']
+                window_end = min(
+                    window_start + state['window'] - 1, state['end_block']
+                )
+                state['cursor'] = window_end + 1
+                await _async_get_log_window(
+                    (window_start, window_end),
+                    state=state,
+                    results=results,
+                    event_hash=event_hash,
+                    contract_address=contract_address,
+                    verbose=verbose,
+                    provider=provider,
+                )
+                async with condition:
+                    condition.notify_all()
+        except Exception as e:
+            async with condition:
+                errors.append(e)
+                condition.notify_all()
+
+    n_blocks = end_block - start_block + 1
+    n_workers = max(1, min(max_concurrent_chunks, n_blocks))
+    tasks = [asyncio.create_task(async_worker()) for i in range(n_workers)]
+    try:
+        next_block = start_block
+        while next_block <= end_block:
+            async with condition:
+                await condition.wait_for(
+                    lambda: next_block in results or len(errors) > 0
+                )
+                if len(errors) > 0:
+                    raise errors[0]
+                window_end, logs = results.pop(next_block)
+                condition.notify_all()
+            yield next_block, window_end, logs
+            next_block = window_end + 1
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _async_get_log_window(
+    block_range: typing.Tuple[int, int],
+    *,
+    state: _LogWindowState,
+    results: _LogWindowResults,
+    event_hash: str | typing.Sequence[str],
+    contract_address: spec.Address | typing.Sequence[spec.Address] | None,
+    verbose: bool,
+    provider: spec.ProviderReference,
+    split_depth: int = 0,
+    original_error: spec.RpcException | None = None,
+) -> None:
+    window_start, window_end = block_range
+    n_blocks = window_end - window_start + 1
+    try:
+        logs = await _async_get_chunk_of_events_from_node(
+            block_range=[window_start, window_end],
+            event_hash=event_hash,
+            contract_address=contract_address,
+            verbose=verbose,
+            provider=provider,
+        )
+    except spec.RpcException as e:
+        if not _is_log_limit_error(e):
+            raise
+        if original_error is None:
+            original_error = e
+        if n_blocks < _min_split_window or split_depth >= _max_split_depth:
+            raise original_error
+
+        # split window in half and shrink future windows to match
+        half = n_blocks // 2
+        state['window'] = max(1, min(state['window'], half))
+        for subrange in [
+            (window_start, window_start + half - 1),
+            (window_start + half, window_end),
+        ]:
+            await _async_get_log_window(
+                subrange,
+                state=state,
+                results=results,
+                event_hash=event_hash,
+                contract_address=contract_address,
+                verbose=verbose,
+                provider=provider,
+                split_depth=split_depth + 1,
+                original_error=original_error,
+            )
+        return
+
+    results[window_start] = (window_end, logs)
+
+    # only full-size windows are evidence that the window size is too small
+    if len(logs) > 2 * _target_logs_per_chunk:
+        state['window'] = max(1, min(state['window'], n_blocks // 2))
+    elif len(logs) < _target_logs_per_chunk // 2 and n_blocks >= state['window']:
+        state['window'] = min(_max_blocks_per_chunk, 2 * state['window'])
+
+
+def _is_log_limit_error(e: spec.RpcException) -> bool:
+    message = str(e).lower()
+    return any(phrase in message for phrase in _log_limit_error_phrases)
+
+
 async def _async_get_chunk_of_events_from_node(
     block_range: typing.Sequence[spec.BlockNumberReference],
-    event_hash: str,
+    event_hash: str | typing.Sequence[str],
     *,
-    contract_address: spec.Address | None,
+    contract_address: spec.Address | typing.Sequence[spec.Address] | None,
     verbose: bool,
     provider: spec.ProviderReference = None,
 ) -> typing.Sequence[spec.RawLog]:
@@ -193,17 +805,11 @@ async def _async_package_exported_events(
     if len(entries) == 0:
         return create_empty_event_dataframe(event_abi=event_abi)
 
-    formatted_entries = []
-    for entry in entries:
-        formatted_entry = binary.normalize_event(
-            event=entry,
-            event_abi=event_abi,
-        )
-        formatted_entries.append(formatted_entry)
+    columns = binary.decode_events_columns(entries, event_abi=event_abi)
 
     import pandas as pd
 
-    df = pd.DataFrame(formatted_entries)
+    df = pd.DataFrame(columns)
     df = df.set_index(['block_number', 'transaction_index', 'log_index'])
 
     return df
@@ -13,6 +13,12 @@ from .. import abi_utils
 if typing.TYPE_CHECKING:
     import tooltime
 
+    from .event_backends import node_events
+
+
+# downloaded rows held in memory by event iterators before being stored
+max_unsaved_stream_rows = 100000
+
 
 def is_event_hash(data: spec.BinaryData) -> bool:
     try:
@@ -56,10 +62,16 @@ async def async_get_events(
     include_timestamps: bool = False,
     backend_order: typing.Sequence[str] | None = None,
     keep_multiindex: bool = True,
+    decode_processes: int | None = None,
     verbose: bool = True,
     provider: spec.ProviderReference = None,
     **query: typing.Any,
 ) -> spec.DataFrame:
+    """get events of contract, using stored events where available
+
+    - decode_processes: number of worker processes used to decode events
+      fetched from node, or None to decode in process
+    """
 
     start_block, end_block = await block_utils.async_parse_block_range(
         start_block=start_block,
@@ -84,8 +96,19 @@ async def async_get_events(
     if backend_order is None:
         backend_order = ['filesystem', 'download']
 
+    # only backends that fetch from node decode events
+    backend_functions = dict(get_event_backend_functions()['get'])
+    if decode_processes is not None:
+        import functools
+
+        for backend in ['download', 'node']:
+            backend_functions[backend] = functools.partial(
+                backend_functions[backend],
+                decode_processes=decode_processes,
+            )
+
     events = await backend_utils.async_run_on_backend(
-        get_event_backend_functions()['get'],
+        backend_functions,
         contract_address=contract_address,
         start_block=start_block,
         end_block=end_block,
@@ -95,6 +118,258 @@ async def async_get_events(
         **query,
     )
 
+    return await _async_format_event_chunk(
+        events,
+        include_timestamps=include_timestamps,
+        keep_multiindex=keep_multiindex,
+    )
+
+
+async def async_iterate_events(
+    contract_address: spec.Address,
+    *,
+    event_hash: str | None = None,
+    event_name: str | None = None,
+    event_abi: spec.EventABI | None = None,
+    start_block: spec.BlockNumberReference | None = None,
+    end_block: spec.BlockNumberReference | None = None,
+    start_time: tooltime.Timestamp | None = None,
+    end_time: tooltime.Timestamp | None = None,
+    include_timestamps: bool = False,
+    keep_multiindex: bool = True,
+    max_buffered_chunks: int | None = None,
+    decode_processes: int | None = None,
+    verbose: bool = True,
+    provider: spec.ProviderReference = None,
+) -> typing.AsyncIterator[spec.DataFrame]:
+    """iterate over events as decoded dataframe chunks, in block order
+
+    - stored blocks are read from filesystem one chunk file at a time
+    - missing blocks are streamed from node, confirmed blocks are stored
+    - only non-empty chunks are yielded
+    - decode_processes: number of worker processes used to decode events
+      streamed from node, or None to decode in process
+
+    memory use is bounded by the size of chunks rather than the size of the
+    block range, so that aggregations over large ranges can consume chunks
+    as they arrive
+    """
+    from .event_backends import filesystem_events
+    from .event_backends import filesystem_index
+    from .event_backends import node_events
+
+    provider = rpc.get_provider(provider)
+    network = provider['network']
+    if network is None:
+        raise Exception('could not determine network')
+    contract_address = contract_address.lower()
+
+    # resolve block range
+    start_block, end_block = await block_utils.async_parse_block_range(
+        start_block=start_block,
+        end_block=end_block,
+        start_time=start_time,
+        end_time=end_time,
+        allow_none=True,
+        provider=provider,
+    )
+    if start_block is None:
+        start_block = await block_utils.async_get_contract_creation_block(
+            contract_address,
+            verbose=verbose,
+        )
+        if start_block is None:
+            raise Exception('could not determine start_block')
+    if end_block is None:
+        end_block = 'latest'
+    start_block, end_block = await block_utils.async_block_numbers_to_int(
+        blocks=[start_block, end_block],
+        provider=provider,
+    )
+
+    # resolve event abi
+    if event_abi is None:
+        if event_hash is None and event_name is None:
+            raise Exception('must specify event_hash, event_name, or event_abi')
+        event_abi = await abi_utils.async_get_event_abi(
+            contract_address=contract_address,
+            event_name=event_name,
+            event_hash=event_hash,
+            network=network,
+        )
+    event_hash = binary.get_event_hash(event_abi)
+
+    max_confirmed_block = await _async_get_max_confirmed_block(
+        provider=provider
+    )
+    confirmed_end_block = min(end_block, max_confirmed_block)
+
+    # confirmed blocks, from stored chunks or from node where missing
+    if start_block <= confirmed_end_block:
+        listed_events = filesystem_events.list_events(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            allow_missing_blocks=True,
+            network=network,
+        )
+        if listed_events is None:
+            stored_paths = {}
+        else:
+            stored_paths = listed_events['paths']
+        segments: list[typing.Tuple[int, int, str | None]] = [
+            (path_start, path_end, path)
+            for path, (path_start, path_end) in stored_paths.items()
+            if path_end >= start_block and path_start <= confirmed_end_block
+        ]
+        for gap_start, gap_end in filesystem_index.get_block_ranges_gaps(
+            stored_paths.values(),
+            start_block=start_block,
+            end_block=confirmed_end_block,
+        ):
+            segments.append((gap_start, gap_end, None))
+
+        for segment_start, segment_end, path in sorted(
+            segments, key=lambda segment: segment[:2]
+        ):
+            if path is not None:
+                if verbose:
+                    print('loading events file:', path)
+                events = filesystem_events.read_events_file(
+                    path,
+                    event_abi=event_abi,
+                    start_block=start_block,
+                    end_block=confirmed_end_block,
+                )
+                events = _trim_events_to_block_range(
+                    events,
+                    start_block=start_block,
+                    end_block=confirmed_end_block,
+                )
+                if len(events) > 0:
+                    yield await _async_format_event_chunk(
+                        events.sort_index(),
+                        include_timestamps=include_timestamps,
+                        keep_multiindex=keep_multiindex,
+                    )
+            else:
+                async for events in _async_iterate_and_store_events(
+                    contract_address=contract_address,
+                    event_abi=event_abi,
+                    start_block=segment_start,
+                    end_block=segment_end,
+                    max_buffered_chunks=max_buffered_chunks,
+                    decode_processes=decode_processes,
+                    provider=provider,
+                    verbose=verbose,
+                ):
+                    yield await _async_format_event_chunk(
+                        events,
+                        include_timestamps=include_timestamps,
+                        keep_multiindex=keep_multiindex,
+                    )
+
+    # unconfirmed blocks, from node without storing them
+    if end_block > max_confirmed_block:
+        chunks = node_events.async_iterate_event_chunks_from_node(
+            contract_address,
+            event_abi=event_abi,
+            start_block=max(start_block, max_confirmed_block + 1),
+            end_block=end_block,
+            max_buffered_chunks=max_buffered_chunks,
+            decode_processes=decode_processes,
+            verbose=verbose,
+            provider=provider,
+        )
+        async for _, _, events in chunks:
+            if len(events) > 0:
+                yield await _async_format_event_chunk(
+                    _format_bytes_columns(events, event_abi=event_abi),
+                    include_timestamps=include_timestamps,
+                    keep_multiindex=keep_multiindex,
+                )
+
+
+async def _async_iterate_and_store_events(
+    *,
+    contract_address: spec.Address,
+    event_abi: spec.EventABI,
+    start_block: int,
+    end_block: int,
+    max_buffered_chunks: int | None,
+    decode_processes: int | None,
+    provider: spec.Provider,
+    verbose: bool,
+) -> typing.AsyncIterator[spec.DataFrame]:
+    """stream confirmed events from node, storing them in batches of rows"""
+    import pandas as pd
+
+    from .event_backends import filesystem_events
+    from .event_backends import node_events
+
+    network = provider['network']
+    if network is None:
+        raise Exception('could not determine network')
+
+    unsaved: list[spec.DataFrame] = []
+    n_unsaved_rows = 0
+    unsaved_start = start_block
+    chunks = node_events.async_iterate_event_chunks_from_node(
+        contract_address,
+        event_abi=event_abi,
+        start_block=start_block,
+        end_block=end_block,
+        max_buffered_chunks=max_buffered_chunks,
+        decode_processes=decode_processes,
+        verbose=verbose,
+        provider=provider,
+    )
+    async for _, chunk_end, events in chunks:
+        if len(events) > 0:
+            unsaved.append(events)
+            n_unsaved_rows += len(events)
+            yield _format_bytes_columns(events.copy(), event_abi=event_abi)
+
+        if n_unsaved_rows >= max_unsaved_stream_rows or chunk_end == end_block:
+            if len(unsaved) > 1:
+                to_save = pd.concat(unsaved).sort_index()
+            elif len(unsaved) == 1:
+                to_save = unsaved[0]
+            else:
+                to_save = node_events.create_empty_event_dataframe(event_abi)
+            await filesystem_events.async_append_events_to_filesystem(
+                to_save,
+                contract_address,
+                start_block=unsaved_start,
+                end_block=chunk_end,
+                event_abi=event_abi,
+                verbose=verbose,
+                network=network,
+            )
+            unsaved = []
+            n_unsaved_rows = 0
+            unsaved_start = chunk_end + 1
+
+
+def _trim_events_to_block_range(
+    events: spec.DataFrame,
+    *,
+    start_block: int,
+    end_block: int,
+) -> spec.DataFrame:
+    block_numbers = events.index.get_level_values(level='block_number')
+    mask = (block_numbers >= start_block) & (block_numbers <= end_block)
+    if mask.all():
+        return events
+    else:
+        return events[mask]
+
+
+async def _async_format_event_chunk(
+    events: spec.DataFrame,
+    *,
+    include_timestamps: bool,
+    keep_multiindex: bool,
+) -> spec.DataFrame:
     if not keep_multiindex:
         from ctc.toolbox import pd_utils
 
@@ -154,24 +429,23 @@ async def async_download_events(
     event_abi: spec.EventABI | None = None,
     start_block: spec.BlockNumberReference | None = None,
     end_block: spec.BlockNumberReference | None = None,
+    decode_processes: int | None = None,
     provider: spec.ProviderReference = None,
     verbose: bool = True,
 ) -> spec.DataFrame:
     from .event_backends import filesystem_events
+    from .event_backends import node_events
 
     if event_hash is None and event_name is None and event_abi is None:
         raise Exception('must specify either event_hash or event_name')
 
     contract_address = contract_address.lower()
 
-    if start_block is not None and end_block is not None:
-        start_block, end_block = await block_utils.async_block_numbers_to_int(
-            blocks=[start_block, end_block],
-        )
-    elif start_block is not None:
-        start_block = await block_utils.async_block_number_to_int(start_block)
-    elif end_block is not None:
-        end_block = await block_utils.async_block_number_to_int(end_block)
+    if start_block is None or end_block is None:
+        raise Exception('must specify start_block and end_block')
+    start_block, end_block = await block_utils.async_block_numbers_to_int(
+        blocks=[start_block, end_block],
+    )
 
     provider = rpc.get_provider(provider)
     network = provider['network']
@@ -191,58 +465,371 @@ async def async_download_events(
 
         event_hash = binary.get_event_hash(event_abi)
 
-    # determine what needs to be downloaded
-    listed_events = filesystem_events.list_events(
+    if event_abi is None:
+        event_abi = await abi_utils.async_get_event_abi(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            network=network,
+        )
+
+    # only store confirmed blocks, newer blocks could still be reorged
+    max_confirmed_block = await _async_get_max_confirmed_block(
+        provider=provider
+    )
+
+    # download blocks missing from filesystem
+    await _async_download_missing_blocks(
         contract_address=contract_address,
         event_hash=event_hash,
+        event_abi=event_abi,
+        start_block=start_block,
+        end_block=min(end_block, max_confirmed_block),
+        decode_processes=decode_processes,
+        provider=provider,
+        verbose=verbose,
     )
-    downloads: list[typing.Mapping[str, typing.Any]] = []
-    if listed_events is None:
-        download: typing.Mapping[str, typing.Any] = {
-            'start_block': start_block,
-            'end_block': end_block,
-        }
-        downloads.append(download)
-    else:
 
-        block_range = listed_events['block_range']
-        if start_block < block_range[0]:
-            download = {
-                'start_block': start_block,
-                'end_block': block_range[0] - 1,
-                'common_kwargs': {'verbose': verbose},
-            }
-            downloads.append(download)
-        if end_block > block_range[-1]:
-            download = {
-                'start_block': block_range[-1] + 1,
-                'end_block': end_block,
-                'common_kwargs': {'verbose': verbose},
-            }
-            downloads.append(download)
-
-    # perform downloads
-    for download in downloads:
-        await async_transfer_events(
-            from_backend='node',
-            to_backend='filesystem',
+    # load confirmed blocks from filesystem
+    dfs = []
+    if start_block <= max_confirmed_block:
+        df = await filesystem_events.async_get_events_from_filesystem(
             event_hash=event_hash,
             event_abi=event_abi,
             contract_address=contract_address,
+            start_block=start_block,
+            end_block=min(end_block, max_confirmed_block),
+            verbose=verbose,
             provider=provider,
-            **download,
         )
+        dfs.append(df)
 
-    # load from filesystem
-    return await filesystem_events.async_get_events_from_filesystem(
+    # load unconfirmed blocks from node without storing them
+    if end_block > max_confirmed_block:
+        df = await node_events.async_get_events_from_node(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            event_abi=event_abi,
+            start_block=max(start_block, max_confirmed_block + 1),
+            end_block=end_block,
+            decode_processes=decode_processes,
+            verbose=verbose,
+            provider=provider,
+        )
+        dfs.append(_format_bytes_columns(df, event_abi=event_abi))
+
+    if len(dfs) == 1:
+        return dfs[0]
+    else:
+        import pandas as pd
+
+        return pd.concat(dfs).sort_index()
+
+
+async def async_sync_events(
+    contract_address: spec.Address,
+    *,
+    event_hash: str | None = None,
+    event_name: str | None = None,
+    event_abi: spec.EventABI | None = None,
+    start_block: spec.BlockNumberReference | None = None,
+    provider: spec.ProviderReference = None,
+    verbose: bool = True,
+) -> None:
+    """bring stored events of contract up to date with latest confirmed block
+
+    - only block ranges missing from filesystem are requested from node
+    - new blocks at the tip are appended to the last stored chunk
+    - start_block defaults to start of stored events, or contract creation
+    """
+    from .event_backends import filesystem_events
+
+    contract_address = contract_address.lower()
+    provider = rpc.get_provider(provider)
+    network = provider['network']
+    if network is None:
+        raise Exception('could not determine network')
+
+    if event_abi is None:
+        if event_hash is None and event_name is None:
+            raise Exception('must specify event_hash, event_name, or event_abi')
+        event_abi = await abi_utils.async_get_event_abi(
+            contract_address=contract_address,
+            event_name=event_name,
+            event_hash=event_hash,
+            network=network,
+        )
+    event_hash = binary.get_event_hash(event_abi)
+
+    if start_block is None:
+        listed_events = filesystem_events.list_events(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            allow_missing_blocks=True,
+            network=network,
+        )
+        if listed_events is not None:
+            start_block = listed_events['block_range'][0]
+        else:
+            start_block = await block_utils.async_get_contract_creation_block(
+                contract_address,
+                provider=provider,
+                verbose=verbose,
+            )
+            if start_block is None:
+                raise Exception('could not determine start_block')
+    start_block = await block_utils.async_block_number_to_int(
+        start_block, provider=provider
+    )
+
+    await _async_download_missing_blocks(
+        contract_address=contract_address,
         event_hash=event_hash,
         event_abi=event_abi,
-        contract_address=contract_address,
         start_block=start_block,
-        end_block=end_block,
+        end_block=await _async_get_max_confirmed_block(provider=provider),
+        provider=provider,
         verbose=verbose,
+    )
+
+
+async def async_get_multi_events(
+    contract_addresses: typing.Sequence[spec.Address],
+    *,
+    event_hashes: typing.Sequence[str] | None = None,
+    event_abis: typing.Sequence[spec.EventABI] | None = None,
+    start_block: spec.BlockNumberReference,
+    end_block: spec.BlockNumberReference,
+    provider: spec.ProviderReference = None,
+    verbose: bool = True,
+) -> dict[node_events.ContractEventKey, spec.DataFrame]:
+    """get events of many contracts and event types with one sweep of blocks
+
+    - block ranges missing from filesystem are requested for all contract
+      events at once, then stored as chunks of each contract event
+    - returns a dataframe for each (contract_address, event_hash)
+
+    ## Inputs
+    - event_abis: abis of events, used for every contract
+    - event_hashes: hashes of events, abis are looked up for each contract
+    """
+    from .event_backends import filesystem_events
+    from .event_backends import filesystem_index
+    from .event_backends import node_events
+
+    provider = rpc.get_provider(provider)
+    network = provider['network']
+    if network is None:
+        raise Exception('could not determine network')
+    contract_event_abis = await node_events.async_get_contract_event_abis(
+        contract_addresses,
+        event_hashes=event_hashes,
+        event_abis=event_abis,
+        network=network,
+    )
+    start_block, end_block = await block_utils.async_block_numbers_to_int(
+        blocks=[start_block, end_block],
         provider=provider,
     )
+    max_confirmed_block = await _async_get_max_confirmed_block(
+        provider=provider
+    )
+    confirmed_end_block = min(end_block, max_confirmed_block)
+
+    # find block ranges missing for each contract event
+    gaps_by_key = {}
+    for contract_address, event_hash in contract_event_abis.keys():
+        listed_events = filesystem_events.list_events(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            allow_missing_blocks=True,
+            network=network,
+        )
+        if listed_events is None:
+            stored_ranges = []
+        else:
+            stored_ranges = list(listed_events['paths'].values())
+        gaps_by_key[(contract_address, event_hash)] = (
+            filesystem_index.get_block_ranges_gaps(
+                stored_ranges,
+                start_block=start_block,
+                end_block=confirmed_end_block,
+            )
+        )
+
+    # sweep each missing range once for all contract events that lack it
+    for sweep_start, sweep_end in _merge_block_ranges(
+        gap for gaps in gaps_by_key.values() for gap in gaps
+    ):
+        sweep_gaps = {
+            key: [
+                (gap_start, gap_end)
+                for gap_start, gap_end in gaps
+                if gap_start >= sweep_start and gap_end <= sweep_end
+            ]
+            for key, gaps in gaps_by_key.items()
+        }
+        sweep_event_abis = {
+            key: contract_event_abis[key]
+            for key, gaps in sweep_gaps.items()
+            if len(gaps) > 0
+        }
+        sweep_events = await node_events.async_get_contract_events_from_node(
+            sweep_event_abis,
+            start_block=sweep_start,
+            end_block=sweep_end,
+            verbose=verbose,
+            provider=provider,
+        )
+        for key, events in sweep_events.items():
+            block_numbers = events.index.get_level_values('block_number')
+            for gap_start, gap_end in sweep_gaps[key]:
+                mask = (block_numbers >= gap_start) & (block_numbers <= gap_end)
+                await filesystem_events.async_append_events_to_filesystem(
+                    events[mask],
+                    key[0],
+                    start_block=gap_start,
+                    end_block=gap_end,
+                    event_abi=contract_event_abis[key],
+                    verbose=verbose,
+                    network=network,
+                )
+
+    # load unconfirmed blocks from node without storing them
+    unconfirmed: dict[node_events.ContractEventKey, spec.DataFrame] = {}
+    if end_block > max_confirmed_block:
+        unconfirmed = await node_events.async_get_contract_events_from_node(
+            contract_event_abis,
+            start_block=max(start_block, max_confirmed_block + 1),
+            end_block=end_block,
+            verbose=verbose,
+            provider=provider,
+        )
+
+    # load confirmed blocks from filesystem
+    results = {}
+    for key, event_abi in contract_event_abis.items():
+        dfs = []
+        if start_block <= max_confirmed_block:
+            df = await filesystem_events.async_get_events_from_filesystem(
+                event_hash=key[1],
+                event_abi=event_abi,
+                contract_address=key[0],
+                start_block=start_block,
+                end_block=confirmed_end_block,
+                verbose=verbose,
+                provider=provider,
+            )
+            dfs.append(df)
+        if key in unconfirmed:
+            dfs.append(
+                _format_bytes_columns(unconfirmed[key], event_abi=event_abi)
+            )
+        if len(dfs) == 1:
+            results[key] = dfs[0]
+        else:
+            import pandas as pd
+
+            results[key] = pd.concat(dfs).sort_index()
+
+    return results
+
+
+def _merge_block_ranges(
+    block_ranges: typing.Iterable[typing.Tuple[int, int]],
+) -> list[typing.Tuple[int, int]]:
+    """merge overlapping or adjacent block ranges"""
+    merged: list[typing.Tuple[int, int]] = []
+    for start, end in sorted(block_ranges):
+        if len(merged) > 0 and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+async def _async_download_missing_blocks(
+    *,
+    contract_address: spec.Address,
+    event_hash: str,
+    event_abi: spec.EventABI,
+    start_block: int,
+    end_block: int,
+    decode_processes: int | None = None,
+    provider: spec.Provider,
+    verbose: bool,
+) -> None:
+    """download block ranges not yet stored on filesystem and store them"""
+    from .event_backends import filesystem_events
+    from .event_backends import filesystem_index
+    from .event_backends import node_events
+
+    network = provider['network']
+    if network is None:
+        raise Exception('could not determine network')
+
+    listed_events = filesystem_events.list_events(
+        contract_address=contract_address,
+        event_hash=event_hash,
+        allow_missing_blocks=True,
+        network=network,
+    )
+    if listed_events is None:
+        stored_ranges = []
+    else:
+        stored_ranges = list(listed_events['paths'].values())
+    gaps = filesystem_index.get_block_ranges_gaps(
+        stored_ranges,
+        start_block=start_block,
+        end_block=end_block,
+    )
+
+    for gap_start, gap_end in gaps:
+        events = await node_events.async_get_events_from_node(
+            contract_address=contract_address,
+            event_hash=event_hash,
+            event_abi=event_abi,
+            start_block=gap_start,
+            end_block=gap_end,
+            decode_processes=decode_processes,
+            verbose=verbose,
+            provider=provider,
+        )
+        await filesystem_events.async_append_events_to_filesystem(
+            events,
+            contract_address,
+            start_block=gap_start,
+            end_block=gap_end,
+            event_abi=event_abi,
+            verbose=verbose,
+            network=network,
+        )
+
+
+async def _async_get_max_confirmed_block(provider: spec.Provider) -> int:
+    from ctc.db import management
+
+    network = provider['network']
+    if network is None:
+        raise Exception('could not determine network')
+    latest_block = await rpc.async_eth_block_number(provider=provider)
+    required_confirmations = management.get_required_confirmations(
+        network=network
+    )
+    return int(latest_block) - required_confirmations
+
+
+def _format_bytes_columns(
+    events: spec.DataFrame,
+    event_abi: spec.EventABI,
+) -> spec.DataFrame:
+    """format bytes args as hex, as they are when loaded from filesystem"""
+    for arg in event_abi['inputs']:
+        column = 'arg__' + arg['name']
+        if arg['type'] == 'bytes32' and column in events.columns:
+            events[column] = events[column].map(
+                lambda value: binary.convert(value, 'prefix_hex')
+            )
+    return events
 
 
 async def async_get_event_timestamps(
@@ -0,0 +1 @@
+from .call_sweeps import *
@@ -0,0 +1,446 @@
+"""sweeps of a grid of eth_call's across a list of blocks
+
+- each call is a (contract, function, parameters) triple queried at every block
+- duplicate calls and duplicate blocks are only queried once
+- calls that share a block are packed into Multicall3 calls where deployed,
+  and chunks of blocks are sent as JSON-RPC batches spread across providers
+- results at finalized blocks are read from and written to the rpc response
+  cache when enabled, by the provider's `cache_responses` or by use_cache
+- output is a DataFrame indexed by block with one column per call, or a numpy
+  object array of shape (n_blocks, n_calls)
+"""
+
+from __future__ import annotations
+
+import typing
+
+from typing_extensions import TypedDict
+
+if typing.TYPE_CHECKING:
+    from typing_extensions import Literal
+    from typing_extensions import NotRequired
+
+from ctc import binary
+from ctc import rpc
+from ctc import spec
+from .. import abi_utils
+from .. import block_utils
+
+
+SweepCallParameters = typing.Union[
+    typing.Sequence[typing.Any], typing.Mapping[str, typing.Any]
+]
+
+
+class SweepCallDict(TypedDict):
+    contract: spec.Address
+    function: typing.Union[spec.FunctionABI, str]
+    function_parameters: NotRequired[SweepCallParameters]
+    name: NotRequired[str]
+
+
+# (contract, function) or (contract, function, function_parameters)
+SweepCallTuple = typing.Sequence[typing.Any]
+
+SweepCall = typing.Union[SweepCallDict, SweepCallTuple]
+
+
+class _ResolvedCall(TypedDict):
+    name: str
+    to_address: spec.Address
+    function_abi: spec.FunctionABI
+    call_data: str
+
+
+_default_blocks_per_chunk = 100
+_default_max_concurrent_chunks = 8
+
+
+@typing.overload
+async def async_sweep_calls(
+    calls: typing.Sequence[SweepCall],
+    *,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    output_format: Literal['dataframe'] = 'dataframe',
+    provider: spec.ProviderReference = None,
+    providers: typing.Sequence[spec.ProviderReference] | None = None,
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    fill_empty: bool = False,
+    empty_token: typing.Any = None,
+    use_cache: bool | None = None,
+) -> spec.DataFrame:
+    ...
+
+
+@typing.overload
+async def async_sweep_calls(
+    calls: typing.Sequence[SweepCall],
+    *,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    output_format: Literal['array'],
+    provider: spec.ProviderReference = None,
+    providers: typing.Sequence[spec.ProviderReference] | None = None,
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    fill_empty: bool = False,
+    empty_token: typing.Any = None,
+    use_cache: bool | None = None,
+) -> spec.NumpyArray:
+    ...
+
+
+async def async_sweep_calls(
+    calls: typing.Sequence[SweepCall],
+    *,
+    blocks: typing.Sequence[spec.BlockNumberReference],
+    output_format: Literal['dataframe', 'array'] = 'dataframe',
+    provider: spec.ProviderReference = None,
+    providers: typing.Sequence[spec.ProviderReference] | None = None,
+    blocks_per_chunk: int | None = None,
+    max_concurrent_chunks: int | None = None,
+    fill_empty: bool = False,
+    empty_token: typing.Any = None,
+    use_cache: bool | None = None,
+) -> spec.DataFrame | spec.NumpyArray:
+    """perform every call at every block
+
+    ## Inputs
+    - calls: dicts with keys contract, function, function_parameters, name,
+      or tuples of (contract, function) or (contract, function, parameters)
+    - blocks: blocks at which to perform calls
+    - providers: providers to spread chunks of blocks across
+    - fill_empty, empty_token: how to decode empty call outputs
+
+    ## Output
+    - 'dataframe': DataFrame indexed by block with one column per call
+    - 'array': numpy object array of shape (n_blocks, n_calls)
+    """
+
+    import asyncio
+
+    if output_format not in ('dataframe', 'array'):
+        raise Exception('unknown output format: ' + str(output_format))
+    if providers is None or len(providers) == 0:
+        providers = [provider]
+    full_providers = [rpc.get_provider(item) for item in providers]
+    network = full_providers[0]['network']
+    if blocks_per_chunk is None:
+        blocks_per_chunk = _default_blocks_per_chunk
+    if max_concurrent_chunks is None:
+        max_concurrent_chunks = _default_max_concurrent_chunks
+
+    # resolve calls and blocks
+    coroutines = [_async_resolve_call(call, network=network) for call in calls]
+    resolved_calls = await asyncio.gather(*coroutines)
+    int_blocks = await block_utils.async_block_numbers_to_int(
+        blocks=blocks, provider=full_providers[0]
+    )
+
+    # dedupe calls and blocks
+    unique_calls: list[_ResolvedCall] = []
+    call_indices: list[int] = []
+    unique_call_indices: dict[tuple[str, str], int] = {}
+    for resolved_call in resolved_calls:
+        key = (
+            resolved_call['to_address'].lower(),
+            resolved_call['call_data'].lower(),
+        )
+        if key not in unique_call_indices:
+            unique_call_indices[key] = len(unique_calls)
+            unique_calls.append(resolved_call)
+        call_indices.append(unique_call_indices[key])
+    unique_blocks = sorted(set(int_blocks))
+
+    # query chunks of blocks, spread across providers
+    semaphore = asyncio.Semaphore(max_concurrent_chunks)
+
+    async def async_query_chunk(
+        chunk_blocks: typing.Sequence[int], chunk_provider: spec.Provider
+    ) -> dict[int, list[str | None]]:
+        async with semaphore:
+            return await _async_query_sweep_chunk(
+                unique_calls,
+                chunk_blocks,
+                provider=chunk_provider,
+                use_cache=use_cache,
+            )
+
+    chunk_coroutines = [
+        async_query_chunk(
+            unique_blocks[i : i + blocks_per_chunk],
+            full_providers[c % len(full_providers)],
+        )
+        for c, i in enumerate(range(0, len(unique_blocks), blocks_per_chunk))
+    ]
+    raw_outputs: dict[int, list[str | None]] = {}
+    for chunk_outputs in await asyncio.gather(*chunk_coroutines):
+        raw_outputs.update(chunk_outputs)
+
+    # decode outputs into (block x call) grid
+    digestor = rpc.get_digestor('eth_call')
+    decoded_outputs: dict[int, list[typing.Any]] = {}
+    for block, block_outputs in raw_outputs.items():
+        decoded_outputs[block] = [
+            None
+            if raw_output is None
+            else digestor(
+                raw_output,
+                function_abi=unique_call['function_abi'],
+                fill_empty=fill_empty,
+                empty_token=empty_token,
+            )
+            for unique_call, raw_output in zip(unique_calls, block_outputs)
+        ]
+    rows = [
+        [decoded_outputs[block][index] for index in call_indices]
+        for block in int_blocks
+    ]
+
+    import numpy as np
+
+    array = np.empty((len(int_blocks), len(resolved_calls)), dtype=object)
+    for b, row in enumerate(rows):
+        for c, value in enumerate(row):
+            array[b, c] = value
+    if output_format == 'array':
+        return array
+    else:
+        import pandas as pd
+
+        return pd.DataFrame(
+            array,
+            index=pd.Index(int_blocks, name='block'),
+            columns=[call['name'] for call in resolved_calls],
+        )
+
+
+async def _async_resolve_call(
+    call: SweepCall,
+    *,
+    network: spec.NetworkReference,
+) -> _ResolvedCall:
+
+    # parse components
+    name = None
+    if isinstance(call, dict):
+        call = typing.cast(SweepCallDict, call)
+        contract = call['contract']
+        function = call['function']
+        function_parameters = call.get('function_parameters')
+        name = call.get('name')
+    elif isinstance(call, (list, tuple)):
+        if len(call) == 2:
+            contract, function = call
+            function_parameters = None
+        elif len(call) == 3:
+            contract, function, function_parameters = call
+        else:
+            raise Exception('unknown call format')
+    else:
+        raise Exception('unknown call format')
+
+    # get abi
+    if isinstance(function, dict):
+        function_abi = typing.cast(spec.FunctionABI, function)
+    elif isinstance(function, str):
+        function_abi = await abi_utils.async_get_function_abi(
+            contract_address=contract,
+            function_name=function,
+            network=network,
+        )
+    else:
+        raise Exception('could not determine function_abi')
+
+    if name is None:
+        name = contract + '.' + function_abi['name']
+        if function_parameters:
+            if isinstance(function_parameters, dict):
+                values = list(function_parameters.values())
+            else:
+                values = list(function_parameters)
+            name += '(' + ', '.join(str(value) for value in values) + ')'
+
+    return {
+        'name': name,
+        'to_address': contract,
+        'function_abi': function_abi,
+        'call_data': binary.encode_call_data(
+            function_abi=function_abi,
+            parameters=function_parameters,
+        ),
+    }
+
+
+async def _async_query_sweep_chunk(
+    calls: typing.Sequence[_ResolvedCall],
+    blocks: typing.Sequence[int],
+    *,
+    provider: spec.Provider,
+    use_cache: bool | None,
+) -> dict[int, list[str | None]]:
+    """perform calls at chunk of blocks, returning raw outputs by block"""
+
+    if use_cache is None:
+        use_cache = provider.get('cache_responses', False)
+
+    # individual call requests, checking cache for already known results
+    outputs: dict[int, list[str | None]] = {}
+    requests: dict[int, list[spec.RpcSingularRequest]] = {}
+    pending: dict[int, list[int]] = {}
+    for block in blocks:
+        outputs[block] = [None] * len(calls)
+        requests[block] = [
+            typing.cast(
+                spec.RpcSingularRequest,
+                rpc.construct_eth_call(
+                    to_address=call['to_address'],
+                    call_data=call['call_data'],
+                    block_number=block,
+                ),
+            )
+            for call in calls
+        ]
+        pending[block] = list(range(len(calls)))
+        if use_cache:
+            cached, _ = await rpc.async_get_cached_responses(
+                requests[block], provider
+            )
+            cached_by_id = {
+                response['id']: response['result']  # type: ignore
+                for response in cached
+            }
+            pending[block] = []
+            for index, request in enumerate(requests[block]):
+                if request['id'] in cached_by_id:
+                    outputs[block][index] = cached_by_id[request['id']]
+                else:
+                    pending[block].append(index)
+
+    # query pending calls, falling back to plain calls if multicall fails
+    # - a failed or reverted aggregate call is retried as plain calls
+    # - a reverted subcall is not retried, it would revert again
+    try:
+        fetched, n_reverted = await _async_query_pending_calls(
+            calls,
+            requests=requests,
+            pending=pending,
+            provider=provider,
+            multicall=True,
+        )
+    except Exception:
+        if not provider.get('multicall', True):
+            raise
+        fetched, n_reverted = await _async_query_pending_calls(
+            calls,
+            requests=requests,
+            pending=pending,
+            provider=provider,
+            multicall=False,
+        )
+    if n_reverted > 0 and not provider['convert_reverts_to_none']:
+        raise spec.RpcException('RPC ERROR: execution reverted')
+    for block, block_fetched in fetched.items():
+        for index, output in block_fetched.items():
+            outputs[block][index] = output
+
+    # store results of finalized blocks
+    if use_cache:
+        stored_requests = []
+        stored_responses: spec.RpcPluralResponseRaw = []
+        for block, block_fetched in fetched.items():
+            for index, output in block_fetched.items():
+                if output is not None:
+                    request = requests[block][index]
+                    stored_requests.append(request)
+                    response: spec.RpcSingularResponseSuccess = {
+                        'jsonrpc': '2.0',
+                        'id': request['id'],
+                        'result': output,
+                    }
+                    stored_responses.append(response)
+        if len(stored_requests) > 0:
+            await rpc.async_store_responses(
+                stored_requests, stored_responses, provider=provider
+            )
+
+    return outputs
+
+
+async def _async_query_pending_calls(
+    calls: typing.Sequence[_ResolvedCall],
+    *,
+    requests: typing.Mapping[int, typing.Sequence[spec.RpcSingularRequest]],
+    pending: typing.Mapping[int, typing.Sequence[int]],
+    provider: spec.Provider,
+    multicall: bool,
+) -> tuple[dict[int, dict[int, str | None]], int]:
+    """send pending calls of each block as one JSON-RPC batch
+
+    return outputs by block and the number of reverted multicall subcalls,
+    whose outputs are None
+    """
+
+    # pack each block into multicalls where possible
+    chunk_requests: list[spec.RpcSingularRequest] = []
+    request_targets: list[tuple[int, typing.Sequence[int], bool]] = []
+    for block, indices in pending.items():
+        if len(indices) == 0:
+            continue
+        multicall_address = None
+        if (
+            multicall
+            and provider.get('multicall', True)
+            and len(indices) >= rpc.min_multicall_size
+        ):
+            multicall_address = rpc.get_multicall3_address(
+                provider['network'], block_number=block
+            )
+        if multicall_address is not None:
+            chunk_size = rpc.get_multicall_chunk_size()
+            for i in range(0, len(indices), chunk_size):
+                chunk_indices = indices[i : i + chunk_size]
+                encoded_calls = [
+                    (
+                        calls[index]['to_address'],
+                        binary.convert(calls[index]['call_data'], 'binary'),
+                    )
+                    for index in chunk_indices
+                ]
+                chunk_requests.extend(
+                    rpc.construct_multicall_requests(
+                        encoded_calls,
+                        multicall_address=multicall_address,
+                        block_number=block,
+                    )
+                )
+                request_targets.append((block, chunk_indices, True))
+        else:
+            for index in indices:
+                chunk_requests.append(requests[block][index])
+                request_targets.append((block, [index], False))
+    if len(chunk_requests) == 0:
+        return {}, 0
+
+    responses = await rpc.async_send(chunk_requests, provider=provider)
+
+    # distribute outputs back to calls
+    fetched: dict[int, dict[int, str | None]] = {}
+    n_reverted = 0
+    for response, (block, indices, is_multicall) in zip(
+        responses, request_targets
+    ):
+        block_fetched = fetched.setdefault(block, {})
+        if is_multicall:
+            results = rpc.decode_multicall_response(response)
+            if len(results) != len(indices):
+                raise Exception('multicall returned wrong number of results')
+            for index, (success, return_data) in zip(indices, results):
+                if success:
+                    block_fetched[index] = '0x' + return_data.hex()
+                else:
+                    block_fetched[index] = None
+                    n_reverted += 1
+        else:
+            block_fetched[indices[0]] = response
+    return fetched, n_reverted
@@ -5,6 +5,7 @@ import typing
 from ctc import spec
 from ctc import evm
 
+from .. import chainlink_feed_metadata
 from .. import chainlink_spec
 from . import feed_datum
 
@@ -18,25 +19,31 @@ async def async_get_feed_answer_datum_by_block(
     interpolate: bool = True,
     invert: bool = False,
 ) -> spec.Series:
-    import asyncio
     import pandas as pd
     from ctc.toolbox import pd_utils
 
-    int_blocks = await evm.async_block_numbers_to_int(blocks=blocks)
+    int_blocks = await evm.async_block_numbers_to_int(
+        blocks=blocks, provider=provider
+    )
 
     # query data
-    coroutines = []
-    for block in int_blocks:
-        coroutine = feed_datum.async_get_feed_datum(
-            feed=feed,
-            fields='answer',
-            normalize=normalize,
-            block=block,
-            provider=provider,
-            invert=invert,
-        )
-        coroutines.append(coroutine)
-    result = await asyncio.gather(*coroutines)
+    feed = await chainlink_feed_metadata.async_resolve_feed_address(feed)
+    answers = await evm.async_sweep_calls(
+        [(feed, chainlink_spec.feed_function_abis['latestAnswer'])],
+        blocks=int_blocks,
+        output_format='array',
+        provider=provider,
+        fill_empty=True,
+        empty_token=None,
+    )
+    result = list(answers[:, 0])
+    if any(not isinstance(answer, (int, float)) for answer in result):
+        raise Exception('invalid rpc result')
+    if normalize:
+        decimals = await chainlink_feed_metadata.async_get_feed_decimals(feed)
+        result = [answer / 10 ** decimals for answer in result]
+    if invert:
+        result = [1 / answer for answer in result]
 
     # create series
     series = pd.Series(data=result, index=int_blocks)
@@ -185,13 +185,13 @@ async def async_import_network_to_db(
     if engine is None:
         raise Exception('cannot find db table to import to')
 
-    with engine.begin() as conn:
-
-        await chainlink_statements.async_upsert_feeds(
-            feeds=feeds,
-            network=network,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        chainlink_statements.async_upsert_feeds,
+        engine=engine,
+        begin=True,
+        feeds=feeds,
+        network=network,
+    )
 
     if verbose:
         if indent is None:
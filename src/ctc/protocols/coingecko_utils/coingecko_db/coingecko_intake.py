@@ -30,8 +30,9 @@ async def async_intake_tokens(
     )
     if engine is None:
         return
-    with engine.begin() as conn:
-        await coingecko_statements.async_upsert_tokens(
-            tokens=tokens,
-            conn=conn,
-        )
+    await db.async_run_with_connection(
+        coingecko_statements.async_upsert_tokens,
+        engine=engine,
+        begin=True,
+        tokens=tokens,
+    )
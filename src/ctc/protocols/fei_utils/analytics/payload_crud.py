@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import os
+import time
 import typing
 
 from ctc import spec
@@ -51,22 +53,204 @@ async def async_create_payload(
     }
 
 
-# def update_payload(
-#     timescale: analytics_spec.Timescale,
-#     old_payload: analytics_spec.AnalyticsPayload,
-# ) -> analytics_spec.AnalyticsPayload:
-
-#     new_timestamps = get_new_timestamps(
-#         timescale=timescale,
-#         old_payload=old_payload,
-#     )
-#     new_blocks = get_new_blocks(
-#         new_timestamps=new_timestamps,
-#         old_payload=old_payload,
-#     )
-#     new_metrics = get_metrics(blocks=new_blocks)
-
-#     return combine_new_data(
-#         old_payload=old_payload,
-#         new_metrics=new_metrics,
-#     )
+async def async_update_payload(
+    old_payload: analytics_spec.AnalyticsPayload,
+    *,
+    end_time: analytics_spec.Timestamp | None = None,
+    provider: spec.ProviderReference = None,
+) -> analytics_spec.AnalyticsPayload:
+    """update payload to end_time, computing metrics only for new samples
+
+    - samples of old payload that are still within the window are kept
+    - blocks are only resolved for timestamps not in old payload
+    - metrics are computed for new samples plus the last kept sample, so
+      that metrics over intervals between samples remain correct
+    - the last sample of old payload is always recomputed, since it may
+      have used the latest block rather than the block of its timestamp
+    - falls back to creating payload from scratch if no samples can be kept
+      or if the set of metrics has changed
+    """
+
+    timescale: analytics_spec.Timescale = {
+        'window_size': old_payload['window_size'],
+        'interval_size': old_payload['interval_size'],
+    }
+    if end_time is None:
+        end_time = round(time.time())
+    timestamps = timestamp_crud.get_timestamps(
+        timescale=timescale, end_time=end_time
+    )
+
+    # determine which old samples can be kept
+    old_timestamps = old_payload['timestamps'][:-1]
+    n_kept = 0
+    kept_start = 0
+    if len(timestamps) > 0 and timestamps[0] in old_timestamps:
+        kept_start = old_timestamps.index(timestamps[0])
+        kept_timestamps = old_timestamps[kept_start:]
+        if timestamps[: len(kept_timestamps)] == kept_timestamps:
+            n_kept = len(kept_timestamps)
+    kept_end = kept_start + n_kept
+    if (
+        n_kept == 0
+        or n_kept == len(timestamps)
+        or not _payload_metrics_are_complete(old_payload)
+    ):
+        return await async_create_payload(
+            timestamps=timestamps, timescale=timescale, provider=provider
+        )
+
+    # compute metrics of new samples
+    kept_blocks = list(old_payload['block_numbers'][kept_start:kept_end])
+    new_blocks = await timestamp_crud.async_get_timestamps_blocks(
+        timestamps=timestamps[n_kept:], provider=provider
+    )
+    new_data = await metric_crud.async_get_metrics(
+        blocks=[kept_blocks[-1]] + new_blocks
+    )
+
+    # merge kept samples with new samples
+    data = _merge_metric_data(
+        old_payload['data'],
+        new_data,
+        kept_slice=slice(kept_start, kept_end),
+    )
+    if data is None:
+        return await async_create_payload(
+            timestamps=timestamps, timescale=timescale, provider=provider
+        )
+
+    return {
+        'version': old_payload['version'],
+        #
+        # time data
+        'n_samples': len(timestamps),
+        'window_size': old_payload['window_size'],
+        'interval_size': old_payload['interval_size'],
+        'timestamps': timestamps,
+        'block_numbers': kept_blocks + new_blocks,
+        'created_at_timestamp': int(time.time()),
+        #
+        # metric data
+        'data': data,
+    }
+
+
+def _payload_metrics_are_complete(
+    payload: analytics_spec.AnalyticsPayload,
+) -> bool:
+    """check that payload has a value for every sample of every metric"""
+    for metric_group in payload['data'].values():
+        for metric in metric_group['metrics'].values():
+            if len(metric.get('values', [])) != payload['n_samples']:
+                return False
+    return True
+
+
+def _merge_metric_data(
+    old_data: dict[str, analytics_spec.MetricGroup],
+    new_data: dict[str, analytics_spec.MetricGroup],
+    *,
+    kept_slice: slice,
+) -> dict[str, analytics_spec.MetricGroup] | None:
+    """append new samples to kept samples of each metric
+
+    first sample of new data overlaps with last kept sample and is dropped,
+    return None if old and new data do not have the same metrics
+    """
+
+    if set(old_data.keys()) != set(new_data.keys()):
+        return None
+
+    data: dict[str, analytics_spec.MetricGroup] = {}
+    for group_name, new_group in new_data.items():
+        old_group = old_data[group_name]
+        if set(old_group['metrics'].keys()) != set(new_group['metrics']):
+            return None
+        metrics: dict[str, analytics_spec.MetricData] = {}
+        for metric_name, old_metric in old_group['metrics'].items():
+            new_values = new_group['metrics'][metric_name]['values']
+            metric = old_metric.copy()
+            metric['values'] = list(old_metric['values'][kept_slice]) + list(
+                new_values[1:]
+            )
+            metrics[metric_name] = metric
+        group: analytics_spec.MetricGroup = {
+            'name': old_group['name'],
+            'metrics': metrics,
+        }
+        if 'order' in new_group:
+            group['order'] = new_group['order']
+        data[group_name] = group
+    return data
+
+
+#
+# # payload store
+#
+
+
+def get_payload_path(timescale: analytics_spec.TimescaleSpec) -> str:
+    """get default path of stored payload for timescale"""
+    import ctc.config
+
+    timescale = timestamp_crud.resolve_timescale(timescale)
+    name = 'payload_{window_size}_{interval_size}.json'.format(**timescale)
+    return os.path.join(
+        ctc.config.get_data_dir(),
+        'fei',
+        'analytics',
+        name.replace(' ', '_'),
+    )
+
+
+def load_payload(path: str) -> analytics_spec.AnalyticsPayload:
+    import json
+
+    with open(path, 'r') as f:
+        payload: analytics_spec.AnalyticsPayload = json.load(f)
+    return payload
+
+
+def save_payload(payload: analytics_spec.AnalyticsPayload, path: str) -> None:
+    import json
+
+    dirpath = os.path.dirname(path)
+    if dirpath != '':
+        os.makedirs(dirpath, exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(payload, f)
+    os.replace(tmp_path, path)
+
+
+async def async_refresh_payload(
+    timescale: analytics_spec.TimescaleSpec,
+    *,
+    path: str | None = None,
+    end_time: analytics_spec.Timestamp | None = None,
+    provider: spec.ProviderReference = None,
+) -> analytics_spec.AnalyticsPayload:
+    """update stored payload, or create it if not yet stored"""
+
+    timescale = timestamp_crud.resolve_timescale(timescale)
+    if path is None:
+        path = get_payload_path(timescale)
+
+    payload: analytics_spec.AnalyticsPayload | None = None
+    if os.path.exists(path):
+        old_payload = load_payload(path)
+        if (
+            old_payload['window_size'] == timescale['window_size']
+            and old_payload['interval_size'] == timescale['interval_size']
+        ):
+            payload = await async_update_payload(
+                old_payload, end_time=end_time, provider=provider
+            )
+    if payload is None:
+        payload = await async_create_payload(
+            timescale=timescale, end_time=end_time, provider=provider
+        )
+
+    save_payload(payload, path)
+    return payload
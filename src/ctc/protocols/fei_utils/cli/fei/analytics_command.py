@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import os
 import time
 
@@ -27,12 +26,21 @@ def get_command_spec() -> toolcli.CommandSpec:
                 'action': 'store_true',
                 'help': 'allow overwriting an already-existing file',
             },
+            {
+                'name': '--update',
+                'action': 'store_true',
+                'help': 'update existing payload, computing only new samples',
+            },
         ],
         'examples': {
             '30d,1d': {
                 'description': 'create default payload for app.fei.money',
                 'runnable': False,
             },
+            '30d,1d --update': {
+                'description': 'refresh stored payload with new samples',
+                'runnable': False,
+            },
         },
     }
 
@@ -42,6 +50,7 @@ async def async_payload_command(
     timescale: str,
     path: str,
     overwrite: bool,
+    update: bool,
 ) -> None:
 
     # validate inputs
@@ -49,8 +58,13 @@ async def async_payload_command(
         timescale = '30d, 1d'
     timescale_full = fei_utils.resolve_timescale(timescale)
     if path is None:
-        name = 'payload_{window_size}_{interval_size}'.format(**timescale_full)
-        path = './' + name + '.json'
+        if update:
+            path = fei_utils.get_payload_path(timescale_full)
+        else:
+            name = 'payload_{window_size}_{interval_size}'.format(
+                **timescale_full
+            )
+            path = './' + name + '.json'
 
     # print summary
     print('generating data payload')
@@ -58,18 +72,23 @@ async def async_payload_command(
     print('- window size:', timescale_full['window_size'])
     print('- output path:', path)
 
-    if os.path.exists(path) and not overwrite:
+    if os.path.exists(path) and not overwrite and not update:
         raise Exception('path already exists: ' + str(path))
 
     # create payload
     print()
     print('starting...')
     start_time = time.time()
-    payload = await fei_utils.async_create_payload(timescale=timescale_full)
+    if update:
+        await fei_utils.async_refresh_payload(timescale_full, path=path)
+    else:
+        payload = await fei_utils.async_create_payload(
+            timescale=timescale_full
+        )
     end_time = time.time()
     print()
     print('...done (t=' + toolstr.format(end_time - start_time) + 's)')
 
     # save payload
-    with open(path, 'w') as f:
-        json.dump(payload, f)
+    if not update:
+        fei_utils.save_payload(payload, path)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import typing
 from typing_extensions import TypedDict
 
@@ -26,14 +25,13 @@ async def async_get_public_pools_with_data(
         block=block, provider=provider
     )
     comptrollers = [pool[2] for pool in all_pools]
-    coroutines = [
-        _async_get_pool_summary_or_error(
-            comptroller, block=block, provider=provider
-        )
-        for comptroller in comptrollers
-    ]
-    results = await asyncio.gather(*coroutines)
-    summaries = [result['summary'] for result in results]
+    results = await _async_get_pool_summaries_or_errors(
+        comptrollers,
+        lens_address=lens_address,
+        block=block,
+        provider=provider,
+    )
+    summaries: list[typing.Any] = [result['summary'] for result in results]
     errors = [result['error'] is not None for result in results]
 
     return {
@@ -45,28 +43,66 @@ async def async_get_public_pools_with_data(
     }
 
 
+_revert_error = 'RPC ERROR: execution reverted'
+
+
 class _ReturnPoolSummaryOrError(TypedDict):
     summary: typing.Optional[lens_spec.ReturnPoolSummary]
     error: typing.Optional[str]
 
 
-async def _async_get_pool_summary_or_error(
-    comptroller: spec.Address,
+async def _async_get_pool_summaries_or_errors(
+    comptrollers: typing.Sequence[spec.Address],
     *,
-    lens_address: spec.Address | None = None,
+    lens_address: spec.Address,
     provider: spec.ProviderReference = None,
     block: typing.Optional[spec.BlockNumberReference] = None,
-) -> _ReturnPoolSummaryOrError:
-    try:
-        summary = await async_get_pool_summary(
-            comptroller=comptroller,
-            lens_address=lens_address,
-            provider=provider,
-            block=block,
-        )
-        return {'summary': summary, 'error': None}
-    except spec.RpcException as e:
-        return {'summary': None, 'error': e.args[0]}
+) -> list[_ReturnPoolSummaryOrError]:
+    function_abi = lens_abis.get_function_abi('getPoolSummary')
+    results = await _async_batch_lens_call(
+        function_abi=function_abi,
+        function_parameter_list=[[comptroller] for comptroller in comptrollers],
+        lens_address=lens_address,
+        block=block,
+        provider=provider,
+    )
+    output: list[_ReturnPoolSummaryOrError] = []
+    for result in results:
+        if result is None:
+            output.append({'summary': None, 'error': _revert_error})
+        else:
+            summary = lens_spec.return_pool_summary_to_dict(result)
+            output.append({'summary': summary, 'error': None})
+    return output
+
+
+async def _async_batch_lens_call(
+    *,
+    function_abi: spec.FunctionABI,
+    function_parameter_list: typing.Sequence[typing.Sequence[typing.Any]],
+    lens_address: spec.Address,
+    provider: spec.ProviderReference = None,
+    block: typing.Optional[spec.BlockNumberReference] = None,
+) -> list[typing.Any]:
+    """call lens once per parameter set in a single batch
+
+    batches are aggregated into Multicall3 calls where available, and lens
+    calls that fail inside a multicall are retried as separate eth_call's,
+    calls that still revert return None instead of failing the whole batch
+    """
+
+    import copy
+
+    full_provider = copy.copy(rpc.get_provider(provider))
+    full_provider['convert_reverts_to_none'] = True
+    results = await rpc.async_batch_eth_call(
+        to_address=lens_address,
+        function_abi=function_abi,
+        function_parameter_list=function_parameter_list,
+        block_number=block,
+        provider=full_provider,
+    )
+    return list(results)
 
 
 async def async_get_public_pools_by_verification_with_data(
@@ -84,13 +120,12 @@ async def async_get_public_pools_by_verification_with_data(
         block=block, provider=provider
     )
     comptrollers = [pool[2] for pool in all_pools]
-    coroutines = [
-        _async_get_pool_summary_or_error(
-            comptroller, block=block, provider=provider
-        )
-        for comptroller in comptrollers
-    ]
-    results = await asyncio.gather(*coroutines)
+    results = await _async_get_pool_summaries_or_errors(
+        comptrollers,
+        lens_address=lens_address,
+        block=block,
+        provider=provider,
+    )
 
     filtered_pools = []
     filtered_results = []
@@ -101,7 +136,9 @@ async def async_get_public_pools_by_verification_with_data(
         ):
             filtered_pools.append(pool)
             filtered_results.append(result)
-    summaries = [result['summary'] for result in filtered_results]
+    summaries: list[typing.Any] = [
+        result['summary'] for result in filtered_results
+    ]
     errors = [result['error'] is not None for result in filtered_results]
 
     return {
@@ -200,28 +237,32 @@ async def async_get_public_pool_users_with_data(
         block=block, provider=provider
     )
     comptrollers = [pool[2] for pool in all_pools]
-    coroutines = [
-        _async_get_pool_users_with_data_or_error(
-            comptroller=comptroller,
-            max_health=max_health,
-            block=block,
-            provider=provider,
-        )
-        for comptroller in comptrollers
-    ]
-    result = await asyncio.gather(*coroutines)
+    function_abi = lens_abis.get_function_abi(
+        'getPoolUsersWithData',
+        parameter_types=('address', 'uint256'),
+    )
+    result = await _async_batch_lens_call(
+        function_abi=function_abi,
+        function_parameter_list=[
+            [comptroller, max_health] for comptroller in comptrollers
+        ],
+        lens_address=lens_address,
+        block=block,
+        provider=provider,
+    )
 
-    users = []
-    close_factors = []
-    liquidation_incentives = []
+    users: list[typing.Any] = []
+    close_factors: list[typing.Any] = []
+    liquidation_incentives: list[typing.Any] = []
     errored = []
     for subresult in result:
-        if subresult['error'] is None:
-            users.append(subresult['pool_users']['users'])
-            close_factors.append(subresult['pool_users']['close_factor'])
-            liquidation_incentives.append(
-                subresult['pool_users']['liquidation_incentive']
+        if subresult is not None:
+            pool_users = lens_spec.return_pool_users_with_data_to_dict(
+                subresult
             )
+            users.append(pool_users['users'])
+            close_factors.append(pool_users['close_factor'])
+            liquidation_incentives.append(pool_users['liquidation_incentive'])
             errored.append(False)
         else:
             users.append(None)
@@ -238,16 +279,6 @@ async def async_get_public_pool_users_with_data(
     }
 
 
-async def _async_get_pool_users_with_data_or_error(
-    **kwargs: typing.Any,
-) -> dict[str, typing.Any]:
-    try:
-        summary = await async_get_pool_users_with_data(**kwargs)
-        return {'pool_users': summary, 'error': None}
-    except spec.RpcException as e:
-        return {'pool_users': None, 'error': e.args[0]}
-
-
 async def async_get_pool_users_with_data(
     comptroller: spec.Address,
     *,
@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import typing
 
+from ctc import binary
 from ctc import evm
 from ctc import spec
 from . import uniswap_v2_events
+from . import uniswap_v2_metadata
 from . import uniswap_v2_state
 
 if typing.TYPE_CHECKING:
@@ -34,6 +36,8 @@ async def async_get_pool_log_deltas(
     )
     if start_block is None:
         start_block = await evm.async_get_contract_creation_block(pool)
+        if start_block is None:
+            raise Exception('could not determine start_block')
         initial_point_task = None
     else:
         if include_initial_state:
@@ -46,27 +50,39 @@ async def async_get_pool_log_deltas(
         else:
             initial_point_task = None
 
-    # get mints, burns, and swaps
-    mints_task = uniswap_v2_events.async_get_pool_mints(
-        pool,
-        start_block=start_block,
-        end_block=end_block,
-        normalize=normalize,
-    )
-    burns_task = uniswap_v2_events.async_get_pool_burns(
-        pool,
-        start_block=start_block,
-        end_block=end_block,
-        normalize=normalize,
-    )
-    swaps_task = uniswap_v2_events.async_get_pool_swaps(
-        pool,
+    # get mints, burns, and swaps with a single sweep of blocks
+    if end_block is None:
+        end_block = 'latest'
+    if normalize:
+        decimals_task = asyncio.create_task(
+            uniswap_v2_metadata.async_get_pool_decimals(pool)
+        )
+    event_abis = uniswap_v2_events.pool_event_abis
+    events = await evm.async_get_multi_events(
+        [pool],
+        event_abis=list(event_abis.values()),
         start_block=start_block,
         end_block=end_block,
-        normalize=normalize,
+        verbose=False,
     )
+    if normalize:
+        decimals = await decimals_task
+    else:
+        decimals = None
+    events_by_name = {
+        name: events[(pool.lower(), binary.get_event_hash(event_abi))]
+        for name, event_abi in event_abis.items()
+    }
     mints, burns, swaps = await asyncio.gather(
-        mints_task, burns_task, swaps_task
+        uniswap_v2_events._async_format_liquidity_events(
+            events_by_name['Mint'], decimals=decimals
+        ),
+        uniswap_v2_events._async_format_liquidity_events(
+            events_by_name['Burn'], decimals=decimals
+        ),
+        uniswap_v2_events._async_format_swaps(
+            events_by_name['Swap'], decimals=decimals
+        ),
     )
 
     # gather as DataFrames
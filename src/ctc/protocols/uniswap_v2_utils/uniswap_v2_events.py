@@ -153,46 +153,17 @@ async def async_get_pool_swaps(
         provider=provider,
         verbose=verbose,
     )
-    swaps['arg__amount0In'] = swaps['arg__amount0In'].map(int)
-    swaps['arg__amount0Out'] = swaps['arg__amount0Out'].map(int)
-    swaps['arg__amount1In'] = swaps['arg__amount1In'].map(int)
-    swaps['arg__amount1Out'] = swaps['arg__amount1Out'].map(int)
-
-    # normalize columns
     if normalize:
-        x_decimals, y_decimals = await decimals_task
-        swaps['arg__amount0In'] = await evm.async_normalize_erc20_quantities(
-            quantities=swaps['arg__amount0In'].astype(float),
-            decimals=x_decimals,
-        )
-        swaps['arg__amount0Out'] = await evm.async_normalize_erc20_quantities(
-            quantities=swaps['arg__amount0Out'].astype(float),
-            decimals=x_decimals,
-        )
-        swaps['arg__amount1In'] = await evm.async_normalize_erc20_quantities(
-            quantities=swaps['arg__amount1In'].astype(float),
-            decimals=y_decimals,
-        )
-        swaps['arg__amount1Out'] = await evm.async_normalize_erc20_quantities(
-            quantities=swaps['arg__amount1Out'].astype(float),
-            decimals=y_decimals,
-        )
-
-    # rename columns
+        decimals = await decimals_task
+    else:
+        decimals = None
     if replace_symbols:
-        x_symbol, y_symbol = await symbols_task
+        symbols = await symbols_task
     else:
-        x_symbol = 'x'
-        y_symbol = 'y'
-    columns = {
-        'arg__amount0In': x_symbol + '_sold',
-        'arg__amount0Out': x_symbol + '_bought',
-        'arg__amount1In': y_symbol + '_sold',
-        'arg__amount1Out': y_symbol + '_bought',
-    }
-    swaps = swaps.rename(columns=columns)
-
-    return swaps
+        symbols = None
+    return await _async_format_swaps(
+        swaps, decimals=decimals, symbols=symbols, provider=provider
+    )
 
 
 async def async_get_pool_mints(
@@ -234,31 +205,17 @@ async def async_get_pool_mints(
         provider=provider,
         verbose=verbose,
     )
-    mints['arg__amount0'] = mints['arg__amount0'].map(int)
-    mints['arg__amount1'] = mints['arg__amount1'].map(int)
-
     if normalize:
-        decimals0, decimals1 = await decimals_task
-        mints['arg__amount0'] = await evm.async_normalize_erc20_quantities(
-            quantities=mints['arg__amount0'].astype(float),
-            decimals=decimals0,
-            provider=provider,
-        )
-        mints['arg__amount1'] = await evm.async_normalize_erc20_quantities(
-            quantities=mints['arg__amount1'].astype(float),
-            decimals=decimals1,
-            provider=provider,
-        )
-
+        decimals = await decimals_task
+    else:
+        decimals = None
     if replace_symbols:
-        symbol0, symbol1 = await symbols_task
-        new_names = {
-            'arg__amount0': symbol0 + '_amount',
-            'arg__amount1': symbol1 + '_amount',
-        }
-        mints = mints.rename(columns=new_names)
-
-    return mints
+        symbols = await symbols_task
+    else:
+        symbols = None
+    return await _async_format_liquidity_events(
+        mints, decimals=decimals, symbols=symbols, provider=provider
+    )
 
 
 async def async_get_pool_burns(
@@ -300,28 +257,105 @@ async def async_get_pool_burns(
         provider=provider,
         verbose=verbose,
     )
-    burns['arg__amount0'] = burns['arg__amount0'].map(int)
-    burns['arg__amount1'] = burns['arg__amount1'].map(int)
-
     if normalize:
-        decimals0, decimals1 = await decimals_task
-        burns['arg__amount0'] = await evm.async_normalize_erc20_quantities(
-            quantities=burns['arg__amount0'].astype(float),
+        decimals = await decimals_task
+    else:
+        decimals = None
+    if replace_symbols:
+        symbols = await symbols_task
+    else:
+        symbols = None
+    return await _async_format_liquidity_events(
+        burns, decimals=decimals, symbols=symbols, provider=provider
+    )
+
+
+async def _async_format_swaps(
+    swaps: spec.DataFrame,
+    *,
+    decimals: typing.Sequence[int] | None = None,
+    symbols: typing.Sequence[str] | None = None,
+    provider: spec.ProviderReference = None,
+) -> spec.DataFrame:
+    """convert Swap amounts to ints, normalize by decimals, rename columns"""
+
+    swaps['arg__amount0In'] = swaps['arg__amount0In'].map(int)
+    swaps['arg__amount0Out'] = swaps['arg__amount0Out'].map(int)
+    swaps['arg__amount1In'] = swaps['arg__amount1In'].map(int)
+    swaps['arg__amount1Out'] = swaps['arg__amount1Out'].map(int)
+
+    # normalize columns
+    if decimals is not None:
+        x_decimals, y_decimals = decimals
+        swaps['arg__amount0In'] = await evm.async_normalize_erc20_quantities(
+            quantities=swaps['arg__amount0In'].astype(float),
+            decimals=x_decimals,
+            provider=provider,
+        )
+        swaps['arg__amount0Out'] = await evm.async_normalize_erc20_quantities(
+            quantities=swaps['arg__amount0Out'].astype(float),
+            decimals=x_decimals,
+            provider=provider,
+        )
+        swaps['arg__amount1In'] = await evm.async_normalize_erc20_quantities(
+            quantities=swaps['arg__amount1In'].astype(float),
+            decimals=y_decimals,
+            provider=provider,
+        )
+        swaps['arg__amount1Out'] = await evm.async_normalize_erc20_quantities(
+            quantities=swaps['arg__amount1Out'].astype(float),
+            decimals=y_decimals,
+            provider=provider,
+        )
+
+    # rename columns
+    if symbols is not None:
+        x_symbol, y_symbol = symbols
+    else:
+        x_symbol = 'x'
+        y_symbol = 'y'
+    columns = {
+        'arg__amount0In': x_symbol + '_sold',
+        'arg__amount0Out': x_symbol + '_bought',
+        'arg__amount1In': y_symbol + '_sold',
+        'arg__amount1Out': y_symbol + '_bought',
+    }
+    swaps = swaps.rename(columns=columns)
+
+    return swaps
+
+
+async def _async_format_liquidity_events(
+    events: spec.DataFrame,
+    *,
+    decimals: typing.Sequence[int] | None = None,
+    symbols: typing.Sequence[str] | None = None,
+    provider: spec.ProviderReference = None,
+) -> spec.DataFrame:
+    """convert Mint or Burn amounts to ints, normalize, rename columns"""
+
+    events['arg__amount0'] = events['arg__amount0'].map(int)
+    events['arg__amount1'] = events['arg__amount1'].map(int)
+
+    if decimals is not None:
+        decimals0, decimals1 = decimals
+        events['arg__amount0'] = await evm.async_normalize_erc20_quantities(
+            quantities=events['arg__amount0'].astype(float),
             decimals=decimals0,
             provider=provider,
         )
-        burns['arg__amount1'] = await evm.async_normalize_erc20_quantities(
-            quantities=burns['arg__amount1'].astype(float),
+        events['arg__amount1'] = await evm.async_normalize_erc20_quantities(
+            quantities=events['arg__amount1'].astype(float),
             decimals=decimals1,
             provider=provider,
         )
 
-    if replace_symbols:
-        symbol0, symbol1 = await symbols_task
+    if symbols is not None:
+        symbol0, symbol1 = symbols
         new_names = {
             'arg__amount0': symbol0 + '_amount',
             'arg__amount1': symbol1 + '_amount',
         }
-        burns = burns.rename(columns=new_names)
+        events = events.rename(columns=new_names)
 
-    return burns
+    return events
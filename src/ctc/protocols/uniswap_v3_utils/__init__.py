@@ -1,5 +1,8 @@
 from .uniswap_v3_crud import *
 from .uniswap_v3_depth import *
+from .uniswap_v3_math import *
+from .uniswap_v3_simulation import *
 from .uniswap_v3_spec import *
+from .uniswap_v3_state import *
 from .uniswap_v3_pools import *
 from .contracts import *
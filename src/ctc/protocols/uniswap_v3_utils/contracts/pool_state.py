@@ -183,6 +183,31 @@ async def async_pool_tick_bitmap(
     return result
 
 
+async def async_pool_tick_bitmaps(
+    word_positions: typing.Sequence[int],
+    pool: spec.Address,
+    *,
+    provider: spec.ProviderReference = None,
+    block: spec.BlockNumberReference | None = None,
+) -> list[int]:
+    function_abi = await uniswap_v3_spec.async_get_function_abi(
+        'tickBitmap',
+        'pool',
+    )
+    result = await rpc.async_batch_eth_call(
+        to_address=pool,
+        function_abi=function_abi,
+        provider=provider,
+        block_number=block,
+        function_parameter_list=[
+            [word_position] for word_position in word_positions
+        ],
+    )
+    if not all(isinstance(item, int) for item in result):
+        raise Exception('invalid rpc result')
+    return result
+
+
 async def async_pool_positions(
     key: str,
     pool: spec.Address,
@@ -11,6 +11,9 @@ from .. import uniswap_v3_spec
 async def async_get_populated_ticks(
     pool: spec.Address,
     tick_bitmap_index: int,
+    *,
+    provider: spec.ProviderReference = None,
+    block: spec.BlockNumberReference | None = None,
 ) -> tuple[typing.Mapping[str, int], ...]:
     function_abi = await uniswap_v3_spec.async_get_function_abi(
         'getPopulatedTicksInWord',
@@ -20,9 +23,58 @@ async def async_get_populated_ticks(
         to_address=uniswap_v3_spec.tick_lens,
         function_abi=function_abi,
         function_parameters=[pool, tick_bitmap_index],
+        provider=provider,
+        block_number=block,
     )
+    return _format_populated_ticks(result, function_abi=function_abi)
+
+
+async def async_get_populated_ticks_by_word(
+    pool: spec.Address,
+    tick_bitmap_indices: typing.Sequence[int],
+    *,
+    provider: spec.ProviderReference = None,
+    block: spec.BlockNumberReference | None = None,
+) -> dict[int, tuple[typing.Mapping[str, int], ...]]:
+    """get populated ticks of many bitmap words in a single batch"""
+
+    if len(tick_bitmap_indices) == 0:
+        return {}
+    function_abi = await uniswap_v3_spec.async_get_function_abi(
+        'getPopulatedTicksInWord',
+        'tick_lens',
+    )
+    results = await rpc.async_batch_eth_call(
+        to_address=uniswap_v3_spec.tick_lens,
+        function_abi=function_abi,
+        function_parameter_list=[
+            [pool, tick_bitmap_index]
+            for tick_bitmap_index in tick_bitmap_indices
+        ],
+        provider=provider,
+        block_number=block,
+    )
+    return {
+        tick_bitmap_index: _format_populated_ticks(
+            result, function_abi=function_abi
+        )
+        for tick_bitmap_index, result in zip(tick_bitmap_indices, results)
+    }
+
+
+def _format_populated_ticks(
+    result: typing.Any,
+    *,
+    function_abi: spec.FunctionABI,
+) -> tuple[typing.Mapping[str, int], ...]:
+    """convert decoded (tick, liquidityNet, liquidityGross) tuples to dicts"""
+
+    names = [
+        component['name']
+        for component in function_abi['outputs'][0]['components']
+    ]
     if not isinstance(result, tuple) or not all(
-        isinstance(item, dict) for item in result
+        isinstance(item, tuple) and len(item) == len(names) for item in result
     ):
         raise Exception('invalid rpc result')
-    return typing.cast(typing.Tuple[typing.Mapping[str, int], ...], result)
+    return tuple(dict(zip(names, item)) for item in result)
@@ -1,6 +1,7 @@
 """
-the implementations here are stopgap solutions
-- in future will create a more complete internal Uniswap v3 representation
+liquidity depth can be computed two ways
+- from a local pool state replica, simulating swaps in memory with no rpc calls
+- by bisecting over on-chain Quoter calls, one rpc round trip per probe
 """
 from __future__ import annotations
 
@@ -10,6 +11,8 @@ from ctc.toolbox import optimize_utils
 from ctc import evm
 
 from . import contracts
+from . import uniswap_v3_simulation
+from . import uniswap_v3_spec
 
 
 async def async_get_liquidity_depth(
@@ -26,14 +29,30 @@ async def async_get_liquidity_depth(
     max_iterations: int = 50,
     token_in_decimals: int | None = None,
     token_out_decimals: int | None = None,
+    pool_state: uniswap_v3_spec.PoolState | None = None,
 ) -> float:
-    """return amount of token sold needed to reach new price"""
+    """return amount of token sold needed to reach new price
+
+    if pool_state is given, depth is simulated locally from that state
+    instead of searching over Quoter calls
+    """
 
     if token_in_decimals is None:
         token_in_decimals = await evm.async_get_erc20_decimals(token_in)
     if token_out_decimals is None:
         token_out_decimals = await evm.async_get_erc20_decimals(token_out)
 
+    if pool_state is not None:
+        return get_liquidity_depth(
+            pool_state,
+            new_price=new_price,
+            token_in=token_in,
+            token_out=token_out,
+            fee=fee,
+            token_in_decimals=token_in_decimals,
+            token_out_decimals=token_out_decimals,
+        )
+
     if input_tol is None:
         input_tol = 10 ** (token_in_decimals - 2)
 
@@ -64,6 +83,64 @@ async def async_get_liquidity_depth(
         return 0
 
 
+def get_liquidity_depth(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    new_price: int | float,
+    token_in: str,
+    token_out: str,
+    fee: int,
+    token_in_decimals: int,
+    token_out_decimals: int,
+) -> float:
+    """return amount of token sold needed to reach new price, simulated locally
+
+    new_price is the marginal price of token_in in units of token_out after
+    fees, matching the output of async_get_new_price()
+    """
+
+    token_in = token_in.lower()
+    token_out = token_out.lower()
+    if fee != pool_state['fee']:
+        raise Exception('fee does not match fee of pool state')
+    if (token_in, token_out) == (pool_state['token0'], pool_state['token1']):
+        zero_for_one = True
+    elif (token_in, token_out) == (pool_state['token1'], pool_state['token0']):
+        zero_for_one = False
+    else:
+        raise Exception('tokens do not match tokens of pool state')
+
+    # convert marginal price after fees to pool price of token0 in token1
+    fee_multiplier = 1 - fee / 1e6
+    raw_new_price = new_price / 10 ** (token_in_decimals - token_out_decimals)
+    if raw_new_price <= 0:
+        raise Exception('new_price must be positive')
+    if zero_for_one:
+        pool_price = raw_new_price / fee_multiplier
+    else:
+        pool_price = fee_multiplier / raw_new_price
+    target = uniswap_v3_simulation.price_to_sqrt_price_x96(pool_price)
+
+    # no sale can move price away from target in the selling direction
+    current = pool_state['sqrt_price_x96']
+    if (zero_for_one and target >= current) or (
+        not zero_for_one and target <= current
+    ):
+        return 0
+    target = min(
+        max(target, uniswap_v3_spec.min_sqrt_ratio + 1),
+        uniswap_v3_spec.max_sqrt_ratio - 1,
+    )
+
+    result = uniswap_v3_simulation.simulate_swap_to_price(
+        pool_state, sqrt_price_x96=target
+    )
+    if zero_for_one:
+        return float(result['amount0'])
+    else:
+        return float(result['amount1'])
+
+
 async def _async_new_price_distance(
     amount_sold: int | float,
     *,
@@ -0,0 +1,348 @@
+"""integer ports of the Uniswap v3 core math libraries
+
+results match the on-chain TickMath, SqrtPriceMath, and SwapMath libraries
+exactly, including rounding direction
+"""
+from __future__ import annotations
+
+import typing
+
+from . import uniswap_v3_spec
+
+
+q96 = 2**96
+_uint256_max = 2**256 - 1
+_fee_denominator = 1000000
+
+
+def _div_rounding_up(a: int, b: int) -> int:
+    return -(-a // b)
+
+
+#
+# # tick math
+#
+
+_tick_multipliers = [
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+]
+
+
+def get_sqrt_ratio_at_tick(tick: int) -> int:
+    """compute sqrt(1.0001 ** tick) * 2 ** 96 as in TickMath"""
+
+    abs_tick = abs(tick)
+    if abs_tick > uniswap_v3_spec.max_tick:
+        raise Exception('tick out of range: ' + str(tick))
+
+    if abs_tick & 0x1 != 0:
+        ratio = 0xFFFCB933BD6FAD37AA2D162D1A594001
+    else:
+        ratio = 0x100000000000000000000000000000000
+    for bit, multiplier in _tick_multipliers:
+        if abs_tick & bit != 0:
+            ratio = (ratio * multiplier) >> 128
+
+    if tick > 0:
+        ratio = _uint256_max // ratio
+
+    # round up when converting from Q128.128 to Q64.96
+    if ratio % (1 << 32) == 0:
+        return ratio >> 32
+    else:
+        return (ratio >> 32) + 1
+
+
+def get_tick_at_sqrt_ratio(sqrt_price_x96: int) -> int:
+    """compute greatest tick whose sqrt ratio is <= sqrt_price_x96"""
+
+    import math
+
+    if (
+        sqrt_price_x96 < uniswap_v3_spec.min_sqrt_ratio
+        or sqrt_price_x96 >= uniswap_v3_spec.max_sqrt_ratio
+    ):
+        raise Exception('sqrt price out of range: ' + str(sqrt_price_x96))
+
+    # estimate with floats, then correct against exact tick ratios
+    tick = math.floor(2 * math.log(sqrt_price_x96 / q96) / math.log(1.0001))
+    tick = min(max(tick, uniswap_v3_spec.min_tick), uniswap_v3_spec.max_tick)
+    while tick > uniswap_v3_spec.min_tick and (
+        get_sqrt_ratio_at_tick(tick) > sqrt_price_x96
+    ):
+        tick -= 1
+    while tick < uniswap_v3_spec.max_tick and (
+        get_sqrt_ratio_at_tick(tick + 1) <= sqrt_price_x96
+    ):
+        tick += 1
+    return tick
+
+
+#
+# # sqrt price math
+#
+
+
+def get_amount0_delta(
+    sqrt_ratio_a_x96: int,
+    sqrt_ratio_b_x96: int,
+    *,
+    liquidity: int,
+    round_up: bool,
+) -> int:
+    """amount of token0 between two prices for given liquidity"""
+
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    numerator1 = liquidity << 96
+    numerator2 = sqrt_ratio_b_x96 - sqrt_ratio_a_x96
+    if round_up:
+        return _div_rounding_up(
+            _div_rounding_up(numerator1 * numerator2, sqrt_ratio_b_x96),
+            sqrt_ratio_a_x96,
+        )
+    else:
+        return (numerator1 * numerator2 // sqrt_ratio_b_x96) // sqrt_ratio_a_x96
+
+
+def get_amount1_delta(
+    sqrt_ratio_a_x96: int,
+    sqrt_ratio_b_x96: int,
+    *,
+    liquidity: int,
+    round_up: bool,
+) -> int:
+    """amount of token1 between two prices for given liquidity"""
+
+    if sqrt_ratio_a_x96 > sqrt_ratio_b_x96:
+        sqrt_ratio_a_x96, sqrt_ratio_b_x96 = sqrt_ratio_b_x96, sqrt_ratio_a_x96
+    if round_up:
+        return _div_rounding_up(
+            liquidity * (sqrt_ratio_b_x96 - sqrt_ratio_a_x96), q96
+        )
+    else:
+        return liquidity * (sqrt_ratio_b_x96 - sqrt_ratio_a_x96) // q96
+
+
+def _get_next_sqrt_price_from_amount0_rounding_up(
+    sqrt_price_x96: int,
+    *,
+    liquidity: int,
+    amount: int,
+    add: bool,
+) -> int:
+    if amount == 0:
+        return sqrt_price_x96
+    numerator1 = liquidity << 96
+    product = amount * sqrt_price_x96
+    if add:
+        if product <= _uint256_max:
+            return _div_rounding_up(
+                numerator1 * sqrt_price_x96, numerator1 + product
+            )
+        else:
+            return _div_rounding_up(
+                numerator1, numerator1 // sqrt_price_x96 + amount
+            )
+    else:
+        if product > _uint256_max or numerator1 <= product:
+            raise Exception('insufficient liquidity for output amount')
+        return _div_rounding_up(
+            numerator1 * sqrt_price_x96, numerator1 - product
+        )
+
+
+def _get_next_sqrt_price_from_amount1_rounding_down(
+    sqrt_price_x96: int,
+    *,
+    liquidity: int,
+    amount: int,
+    add: bool,
+) -> int:
+    if add:
+        return sqrt_price_x96 + (amount << 96) // liquidity
+    else:
+        quotient = _div_rounding_up(amount << 96, liquidity)
+        if sqrt_price_x96 <= quotient:
+            raise Exception('insufficient liquidity for output amount')
+        return sqrt_price_x96 - quotient
+
+
+def get_next_sqrt_price_from_input(
+    sqrt_price_x96: int,
+    *,
+    liquidity: int,
+    amount_in: int,
+    zero_for_one: bool,
+) -> int:
+    """price after adding amount_in of input token within a single range"""
+
+    if zero_for_one:
+        return _get_next_sqrt_price_from_amount0_rounding_up(
+            sqrt_price_x96, liquidity=liquidity, amount=amount_in, add=True
+        )
+    else:
+        return _get_next_sqrt_price_from_amount1_rounding_down(
+            sqrt_price_x96, liquidity=liquidity, amount=amount_in, add=True
+        )
+
+
+def get_next_sqrt_price_from_output(
+    sqrt_price_x96: int,
+    *,
+    liquidity: int,
+    amount_out: int,
+    zero_for_one: bool,
+) -> int:
+    """price after removing amount_out of output token within a single range"""
+
+    if zero_for_one:
+        return _get_next_sqrt_price_from_amount1_rounding_down(
+            sqrt_price_x96, liquidity=liquidity, amount=amount_out, add=False
+        )
+    else:
+        return _get_next_sqrt_price_from_amount0_rounding_up(
+            sqrt_price_x96, liquidity=liquidity, amount=amount_out, add=False
+        )
+
+
+#
+# # swap math
+#
+
+
+def compute_swap_step(
+    sqrt_price_current_x96: int,
+    sqrt_price_target_x96: int,
+    *,
+    liquidity: int,
+    amount_remaining: int,
+    fee: int,
+) -> typing.Tuple[int, int, int, int]:
+    """compute a swap step within a single tick range as in SwapMath
+
+    amount_remaining is positive for exact input and negative for exact output
+
+    returns (next sqrt price, amount in, amount out, fee amount)
+    """
+
+    zero_for_one = sqrt_price_current_x96 >= sqrt_price_target_x96
+    exact_in = amount_remaining >= 0
+
+    if exact_in:
+        amount_remaining_less_fee = (
+            amount_remaining
+            * (_fee_denominator - fee)
+            // _fee_denominator
+        )
+        if zero_for_one:
+            amount_in = get_amount0_delta(
+                sqrt_price_target_x96,
+                sqrt_price_current_x96,
+                liquidity=liquidity,
+                round_up=True,
+            )
+        else:
+            amount_in = get_amount1_delta(
+                sqrt_price_current_x96,
+                sqrt_price_target_x96,
+                liquidity=liquidity,
+                round_up=True,
+            )
+        if amount_remaining_less_fee >= amount_in:
+            sqrt_price_next_x96 = sqrt_price_target_x96
+        else:
+            sqrt_price_next_x96 = get_next_sqrt_price_from_input(
+                sqrt_price_current_x96,
+                liquidity=liquidity,
+                amount_in=amount_remaining_less_fee,
+                zero_for_one=zero_for_one,
+            )
+    else:
+        if zero_for_one:
+            amount_out = get_amount1_delta(
+                sqrt_price_target_x96,
+                sqrt_price_current_x96,
+                liquidity=liquidity,
+                round_up=False,
+            )
+        else:
+            amount_out = get_amount0_delta(
+                sqrt_price_current_x96,
+                sqrt_price_target_x96,
+                liquidity=liquidity,
+                round_up=False,
+            )
+        if -amount_remaining >= amount_out:
+            sqrt_price_next_x96 = sqrt_price_target_x96
+        else:
+            sqrt_price_next_x96 = get_next_sqrt_price_from_output(
+                sqrt_price_current_x96,
+                liquidity=liquidity,
+                amount_out=-amount_remaining,
+                zero_for_one=zero_for_one,
+            )
+
+    reached_target = sqrt_price_next_x96 == sqrt_price_target_x96
+
+    # compute amounts for the portion of the range that was traversed
+    if zero_for_one:
+        if not (reached_target and exact_in):
+            amount_in = get_amount0_delta(
+                sqrt_price_next_x96,
+                sqrt_price_current_x96,
+                liquidity=liquidity,
+                round_up=True,
+            )
+        if not (reached_target and not exact_in):
+            amount_out = get_amount1_delta(
+                sqrt_price_next_x96,
+                sqrt_price_current_x96,
+                liquidity=liquidity,
+                round_up=False,
+            )
+    else:
+        if not (reached_target and exact_in):
+            amount_in = get_amount1_delta(
+                sqrt_price_current_x96,
+                sqrt_price_next_x96,
+                liquidity=liquidity,
+                round_up=True,
+            )
+        if not (reached_target and not exact_in):
+            amount_out = get_amount0_delta(
+                sqrt_price_current_x96,
+                sqrt_price_next_x96,
+                liquidity=liquidity,
+                round_up=False,
+            )
+
+    # cap output amount to not exceed remaining output amount
+    if not exact_in and amount_out > -amount_remaining:
+        amount_out = -amount_remaining
+
+    if exact_in and sqrt_price_next_x96 != sqrt_price_target_x96:
+        # remainder of input goes to fees when target is not reached
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = _div_rounding_up(amount_in * fee, _fee_denominator - fee)
+
+    return sqrt_price_next_x96, amount_in, amount_out, fee_amount
@@ -0,0 +1,267 @@
+"""simulate swaps against a local replica of Uniswap v3 pool state
+
+swaps walk initialized ticks in the same steps as the pool contract, so
+simulated amounts match on-chain amounts exactly
+"""
+from __future__ import annotations
+
+import typing
+
+from . import uniswap_v3_math
+from . import uniswap_v3_spec
+
+
+def simulate_swap(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    zero_for_one: bool,
+    amount_in: int | None = None,
+    amount_out: int | None = None,
+    sqrt_price_limit_x96: int | None = None,
+) -> uniswap_v3_spec.SwapResult:
+    """simulate swap of token0 for token1 (zero_for_one) or vice versa
+
+    specify exactly one of amount_in or amount_out
+    - amounts in output are from perspective of pool, as in Swap events
+    - swap stops early if sqrt_price_limit_x96 is reached
+    """
+
+    import bisect
+
+    if amount_in is not None and amount_out is None:
+        amount_specified = int(amount_in)
+    elif amount_out is not None and amount_in is None:
+        amount_specified = -int(amount_out)
+    else:
+        raise Exception('specify exactly one of amount_in or amount_out')
+    exact_input = amount_specified > 0
+
+    sqrt_price_x96 = pool_state['sqrt_price_x96']
+    if sqrt_price_limit_x96 is None:
+        if zero_for_one:
+            sqrt_price_limit_x96 = uniswap_v3_spec.min_sqrt_ratio + 1
+        else:
+            sqrt_price_limit_x96 = uniswap_v3_spec.max_sqrt_ratio - 1
+    if zero_for_one:
+        if not (
+            uniswap_v3_spec.min_sqrt_ratio
+            < sqrt_price_limit_x96
+            <= sqrt_price_x96
+        ):
+            raise Exception('invalid sqrt_price_limit_x96')
+    else:
+        if not (
+            sqrt_price_x96
+            <= sqrt_price_limit_x96
+            < uniswap_v3_spec.max_sqrt_ratio
+        ):
+            raise Exception('invalid sqrt_price_limit_x96')
+
+    fee = pool_state['fee']
+    tick_spacing = pool_state['tick_spacing']
+    liquidity_net_by_tick = pool_state['liquidity_net_by_tick']
+    compressed_ticks = sorted(
+        tick // tick_spacing for tick in pool_state['liquidity_gross_by_tick']
+    )
+
+    amount_remaining = amount_specified
+    amount_calculated = 0
+    tick = pool_state['tick']
+    liquidity = pool_state['liquidity']
+    while amount_remaining != 0 and sqrt_price_x96 != sqrt_price_limit_x96:
+        sqrt_price_start_x96 = sqrt_price_x96
+
+        # find next tick, stopping at bitmap word boundaries like the pool
+        compressed = tick // tick_spacing
+        if zero_for_one:
+            word_start = compressed - (compressed % 256)
+            index = bisect.bisect_right(compressed_ticks, compressed) - 1
+            if index >= 0 and compressed_ticks[index] >= word_start:
+                tick_next = compressed_ticks[index] * tick_spacing
+                initialized = True
+            else:
+                tick_next = word_start * tick_spacing
+                initialized = False
+        else:
+            word_end = compressed + 1 - ((compressed + 1) % 256) + 255
+            index = bisect.bisect_right(compressed_ticks, compressed)
+            if (
+                index < len(compressed_ticks)
+                and compressed_ticks[index] <= word_end
+            ):
+                tick_next = compressed_ticks[index] * tick_spacing
+                initialized = True
+            else:
+                tick_next = word_end * tick_spacing
+                initialized = False
+        tick_next = min(
+            max(tick_next, uniswap_v3_spec.min_tick), uniswap_v3_spec.max_tick
+        )
+        sqrt_price_next_x96 = uniswap_v3_math.get_sqrt_ratio_at_tick(tick_next)
+
+        # swap within range of current tick
+        if zero_for_one:
+            use_limit = sqrt_price_next_x96 < sqrt_price_limit_x96
+        else:
+            use_limit = sqrt_price_next_x96 > sqrt_price_limit_x96
+        if use_limit:
+            sqrt_price_target_x96 = sqrt_price_limit_x96
+        else:
+            sqrt_price_target_x96 = sqrt_price_next_x96
+        (
+            sqrt_price_x96,
+            step_amount_in,
+            step_amount_out,
+            step_fee,
+        ) = uniswap_v3_math.compute_swap_step(
+            sqrt_price_x96,
+            sqrt_price_target_x96,
+            liquidity=liquidity,
+            amount_remaining=amount_remaining,
+            fee=fee,
+        )
+        if exact_input:
+            amount_remaining -= step_amount_in + step_fee
+            amount_calculated -= step_amount_out
+        else:
+            amount_remaining += step_amount_out
+            amount_calculated += step_amount_in + step_fee
+
+        # cross tick or recompute tick from new price
+        if sqrt_price_x96 == sqrt_price_next_x96:
+            if initialized:
+                liquidity_net = liquidity_net_by_tick[tick_next]
+                if zero_for_one:
+                    liquidity_net = -liquidity_net
+                liquidity += liquidity_net
+            if zero_for_one:
+                tick = tick_next - 1
+            else:
+                tick = tick_next
+        elif sqrt_price_x96 != sqrt_price_start_x96:
+            tick = uniswap_v3_math.get_tick_at_sqrt_ratio(sqrt_price_x96)
+
+    if zero_for_one == exact_input:
+        amount0 = amount_specified - amount_remaining
+        amount1 = amount_calculated
+    else:
+        amount0 = amount_calculated
+        amount1 = amount_specified - amount_remaining
+
+    return {
+        'amount0': amount0,
+        'amount1': amount1,
+        'sqrt_price_x96': sqrt_price_x96,
+        'tick': tick,
+        'liquidity': liquidity,
+    }
+
+
+def simulate_swap_to_price(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    sqrt_price_x96: int,
+) -> uniswap_v3_spec.SwapResult:
+    """simulate the swap that moves pool to sqrt_price_x96
+
+    the input amount of the result includes fees
+    """
+
+    current = pool_state['sqrt_price_x96']
+    zero_for_one = sqrt_price_x96 < current
+    if sqrt_price_x96 == current:
+        return {
+            'amount0': 0,
+            'amount1': 0,
+            'sqrt_price_x96': current,
+            'tick': pool_state['tick'],
+            'liquidity': pool_state['liquidity'],
+        }
+    return simulate_swap(
+        pool_state,
+        zero_for_one=zero_for_one,
+        amount_in=2**255 - 1,
+        sqrt_price_limit_x96=sqrt_price_x96,
+    )
+
+
+#
+# # prices
+#
+
+
+def sqrt_price_x96_to_price(
+    sqrt_price_x96: int,
+    *,
+    decimals0: int = 0,
+    decimals1: int = 0,
+) -> float:
+    """convert sqrt price to price of token0 in units of token1"""
+
+    price: float = (sqrt_price_x96 / uniswap_v3_math.q96) ** 2
+    return price * 10.0 ** (decimals0 - decimals1)
+
+
+def price_to_sqrt_price_x96(
+    price: int | float,
+    *,
+    decimals0: int = 0,
+    decimals1: int = 0,
+) -> int:
+    """convert price of token0 in units of token1 to sqrt price"""
+
+    raw_price = price / 10 ** (decimals0 - decimals1)
+    return int(raw_price**0.5 * uniswap_v3_math.q96)
+
+
+#
+# # curves
+#
+
+
+def get_depth_curve(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    price_changes: typing.Sequence[float],
+) -> list[uniswap_v3_spec.SwapResult]:
+    """compute swaps needed to move pool price by each relative change
+
+    price is price of token0 in units of token1, so negative changes sell
+    token0 into the pool and positive changes sell token1
+    """
+
+    sqrt_price_x96 = pool_state['sqrt_price_x96']
+    results = []
+    for price_change in price_changes:
+        if price_change <= -1:
+            raise Exception('price change must be greater than -1')
+        target = int(sqrt_price_x96 * (1 + price_change) ** 0.5)
+        target = min(
+            max(target, uniswap_v3_spec.min_sqrt_ratio + 1),
+            uniswap_v3_spec.max_sqrt_ratio - 1,
+        )
+        results.append(
+            simulate_swap_to_price(pool_state, sqrt_price_x96=target)
+        )
+    return results
+
+
+def get_price_impact_curve(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    amounts_in: typing.Sequence[int],
+    zero_for_one: bool,
+) -> list[float]:
+    """compute relative change of pool price after swapping each amount in
+
+    price is price of token0 in units of token1
+    """
+
+    start_price = pool_state['sqrt_price_x96'] ** 2
+    price_changes = []
+    for amount_in in amounts_in:
+        result = simulate_swap(
+            pool_state, zero_for_one=zero_for_one, amount_in=amount_in
+        )
+        price_changes.append(result['sqrt_price_x96'] ** 2 / start_price - 1)
+    return price_changes
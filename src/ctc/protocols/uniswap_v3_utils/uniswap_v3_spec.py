@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import typing
+from typing_extensions import TypedDict
+
 from ctc import evm
 from ctc import spec
 
@@ -14,6 +16,43 @@ quoter = '0xb27308f9f90d607463bb33ea1bebb41c27ce5ab6'
 factory = '0x1f98431c8ad98523631ae4a59f267346ea31f984'
 
 
+#
+# # pool math constants
+#
+
+min_tick = -887272
+max_tick = 887272
+min_sqrt_ratio = 4295128739
+max_sqrt_ratio = 1461446703485210103287273052203988822378723970342
+
+
+#
+# # pool state
+#
+
+
+class PoolState(TypedDict):
+    pool: spec.Address
+    block_number: int
+    token0: spec.Address
+    token1: spec.Address
+    fee: int
+    tick_spacing: int
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+    liquidity_gross_by_tick: typing.Dict[int, int]
+    liquidity_net_by_tick: typing.Dict[int, int]
+
+
+class SwapResult(TypedDict):
+    amount0: int
+    amount1: int
+    sqrt_price_x96: int
+    tick: int
+    liquidity: int
+
+
 #
 # # abi's
 #
@@ -0,0 +1,230 @@
+"""local replica of Uniswap v3 pool state
+
+the replica holds the price, active liquidity, and every initialized tick of
+a pool, so that swaps can be simulated in memory using uniswap_v3_simulation
+"""
+from __future__ import annotations
+
+import typing
+
+from ctc import evm
+from ctc import spec
+
+from . import contracts
+from . import uniswap_v3_spec
+
+
+async def async_get_pool_state(
+    pool: spec.Address,
+    *,
+    block: spec.BlockNumberReference = 'latest',
+    provider: spec.ProviderReference = None,
+) -> uniswap_v3_spec.PoolState:
+    """load price, liquidity, and all initialized ticks of pool at block
+
+    ticks are located by scanning the full tickBitmap in one batch and then
+    loading the populated ticks of each non-empty word in a second batch
+    """
+
+    import asyncio
+
+    block = await evm.async_block_number_to_int(block, provider=provider)
+    pool = pool.lower()
+
+    rpc_kwargs: typing.Mapping[str, typing.Any] = {
+        'provider': provider,
+        'block': block,
+    }
+    (
+        slot0,
+        liquidity,
+        fee,
+        tick_spacing,
+        token0,
+        token1,
+    ) = await asyncio.gather(
+        contracts.async_pool_slot0(pool, **rpc_kwargs),
+        contracts.async_pool_liquidity(pool, **rpc_kwargs),
+        contracts.async_pool_fee(pool, **rpc_kwargs),
+        contracts.async_pool_tick_spacing(pool, **rpc_kwargs),
+        contracts.async_pool_token0(pool, **rpc_kwargs),
+        contracts.async_pool_token1(pool, **rpc_kwargs),
+    )
+
+    # find non-empty bitmap words
+    min_word = (uniswap_v3_spec.min_tick // tick_spacing) >> 8
+    max_word = (uniswap_v3_spec.max_tick // tick_spacing) >> 8
+    word_positions = list(range(min_word, max_word + 1))
+    bitmaps = await contracts.async_pool_tick_bitmaps(
+        word_positions, pool, **rpc_kwargs
+    )
+    populated_words = [
+        word_position
+        for word_position, bitmap in zip(word_positions, bitmaps)
+        if bitmap != 0
+    ]
+
+    # load populated ticks
+    ticks_by_word = await contracts.async_get_populated_ticks_by_word(
+        pool, populated_words, **rpc_kwargs
+    )
+    liquidity_gross_by_tick = {}
+    liquidity_net_by_tick = {}
+    for populated_ticks in ticks_by_word.values():
+        for populated_tick in populated_ticks:
+            tick = populated_tick['tick']
+            liquidity_gross_by_tick[tick] = populated_tick['liquidityGross']
+            liquidity_net_by_tick[tick] = populated_tick['liquidityNet']
+
+    return {
+        'pool': pool,
+        'block_number': block,
+        'token0': token0.lower(),
+        'token1': token1.lower(),
+        'fee': fee,
+        'tick_spacing': tick_spacing,
+        'sqrt_price_x96': slot0['sqrt_price_x96'],
+        'tick': slot0['tick'],
+        'liquidity': liquidity,
+        'liquidity_gross_by_tick': liquidity_gross_by_tick,
+        'liquidity_net_by_tick': liquidity_net_by_tick,
+    }
+
+
+def copy_pool_state(
+    pool_state: uniswap_v3_spec.PoolState,
+) -> uniswap_v3_spec.PoolState:
+    """copy pool state so that it can be modified independently"""
+
+    new_state = pool_state.copy()
+    new_state['liquidity_gross_by_tick'] = dict(
+        pool_state['liquidity_gross_by_tick']
+    )
+    new_state['liquidity_net_by_tick'] = dict(
+        pool_state['liquidity_net_by_tick']
+    )
+    return new_state
+
+
+#
+# # event updates
+#
+
+
+def apply_swap_event(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    sqrt_price_x96: int,
+    liquidity: int,
+    tick: int,
+) -> None:
+    """update pool state in place using the values emitted by a Swap"""
+
+    pool_state['sqrt_price_x96'] = sqrt_price_x96
+    pool_state['liquidity'] = liquidity
+    pool_state['tick'] = tick
+
+
+def apply_liquidity_event(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    tick_lower: int,
+    tick_upper: int,
+    liquidity_delta: int,
+) -> None:
+    """update pool state in place for a Mint (positive liquidity_delta) or
+    a Burn (negative liquidity_delta)"""
+
+    gross = pool_state['liquidity_gross_by_tick']
+    net = pool_state['liquidity_net_by_tick']
+    for tick, net_delta in [
+        (tick_lower, liquidity_delta),
+        (tick_upper, -liquidity_delta),
+    ]:
+        new_gross = gross.get(tick, 0) + liquidity_delta
+        if new_gross < 0:
+            raise Exception('burned more liquidity than tick holds')
+        elif new_gross == 0:
+            gross.pop(tick, None)
+            net.pop(tick, None)
+        else:
+            gross[tick] = new_gross
+            net[tick] = net.get(tick, 0) + net_delta
+
+    if tick_lower <= pool_state['tick'] < tick_upper:
+        pool_state['liquidity'] += liquidity_delta
+
+
+async def async_update_pool_state(
+    pool_state: uniswap_v3_spec.PoolState,
+    *,
+    end_block: spec.BlockNumberReference = 'latest',
+    provider: spec.ProviderReference = None,
+) -> uniswap_v3_spec.PoolState:
+    """bring pool state up to end_block by replaying Swap, Mint, and Burn's
+
+    returns a new state, the input state is not modified
+    """
+
+    import asyncio
+    import pandas as pd
+
+    end_block = await evm.async_block_number_to_int(
+        end_block, provider=provider
+    )
+    new_state = copy_pool_state(pool_state)
+    start_block = pool_state['block_number'] + 1
+    if end_block < start_block:
+        return new_state
+
+    # get events
+    pool = pool_state['pool']
+    event_names = ['Swap', 'Mint', 'Burn']
+    event_abis = await asyncio.gather(
+        *[
+            uniswap_v3_spec.async_get_event_abi(event_name, 'pool')
+            for event_name in event_names
+        ]
+    )
+    events = await asyncio.gather(
+        *[
+            evm.async_get_events(
+                event_abi=event_abi,
+                contract_address=pool,
+                start_block=start_block,
+                end_block=end_block,
+                provider=provider,
+                verbose=False,
+            )
+            for event_abi in event_abis
+        ]
+    )
+    dfs = []
+    for event_name, df in zip(event_names, events):
+        df = df.copy()
+        df['event'] = event_name
+        dfs.append(df)
+    all_events = pd.concat(dfs).sort_index()
+
+    # replay events in log order
+    for _, event in all_events.iterrows():
+        if event['event'] == 'Swap':
+            apply_swap_event(
+                new_state,
+                sqrt_price_x96=int(event['arg__sqrtPriceX96']),
+                liquidity=int(event['arg__liquidity']),
+                tick=int(event['arg__tick']),
+            )
+        else:
+            liquidity_delta = int(event['arg__amount'])
+            if event['event'] == 'Burn':
+                liquidity_delta = -liquidity_delta
+            apply_liquidity_event(
+                new_state,
+                tick_lower=int(event['arg__tickLower']),
+                tick_upper=int(event['arg__tickUpper']),
+                liquidity_delta=liquidity_delta,
+            )
+
+    new_state['block_number'] = end_block
+    return new_state
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import typing
 
+from ctc import binary
 from ctc import evm
 from ctc import spec
 
 from .. import rpc_provider
+from . import rpc_batch_multicall
 from . import rpc_batch_utils
 
 
@@ -23,6 +25,7 @@ async def async_batch_eth_block_number(
     )
 
 
+@typing.overload
 async def async_batch_eth_call(
     *,
     function_abi: spec.FunctionABI | None = None,
@@ -31,8 +34,49 @@ async def async_batch_eth_call(
     provider: spec.ProviderReference = None,
     to_address: spec.Address | None = None,
     to_addresses: typing.Sequence[spec.Address] | None = None,
+    output_format: typing.Literal['list'] = 'list',
+    multicall: bool | None = None,
     **kwargs: typing.Any,
 ) -> spec.RpcPluralResponse:
+    ...
+
+
+@typing.overload
+async def async_batch_eth_call(
+    *,
+    function_abi: spec.FunctionABI | None = None,
+    function_name: str | None = None,
+    function_selector: spec.FunctionSelector | None = None,
+    provider: spec.ProviderReference = None,
+    to_address: spec.Address | None = None,
+    to_addresses: typing.Sequence[spec.Address] | None = None,
+    output_format: typing.Literal['array', 'float_array'],
+    multicall: bool | None = None,
+    **kwargs: typing.Any,
+) -> spec.NumpyArray:
+    ...
+
+
+async def async_batch_eth_call(
+    *,
+    function_abi: spec.FunctionABI | None = None,
+    function_name: str | None = None,
+    function_selector: spec.FunctionSelector | None = None,
+    provider: spec.ProviderReference = None,
+    to_address: spec.Address | None = None,
+    to_addresses: typing.Sequence[spec.Address] | None = None,
+    output_format: typing.Literal['list', 'array', 'float_array'] = 'list',
+    multicall: bool | None = None,
+    **kwargs: typing.Any,
+) -> spec.RpcPluralResponse | spec.NumpyArray:
+    """perform batch of eth_call's
+
+    output_format 'array' and 'float_array' decode the outputs of a function
+    with a single integer output into a numpy object or float64 array
+
+    same-block batches are aggregated into Multicall3 calls when available,
+    multicall=False disables this and multicall=True requires it
+    """
 
     if function_abi is None:
 
@@ -57,12 +101,60 @@ async def async_batch_eth_call(
             network=network,
         )
 
+    if output_format == 'list':
+        return await _async_execute_batch_eth_call(
+            function_abi=function_abi,
+            provider=provider,
+            multicall=multicall,
+            to_address=to_address,
+            to_addresses=to_addresses,
+            **kwargs,
+        )
+    elif output_format in ('array', 'float_array'):
+        fill_empty = kwargs.pop('fill_empty', False)
+        empty_token = kwargs.pop('empty_token', None)
+        if not kwargs.pop('decode_response', True):
+            raise Exception('array output requires decode_response')
+        encoded_outputs = await _async_execute_batch_eth_call(
+            function_abi=function_abi,
+            provider=provider,
+            multicall=multicall,
+            to_address=to_address,
+            to_addresses=to_addresses,
+            decode_response=False,
+            **kwargs,
+        )
+        return binary.decode_codec_outputs_array(
+            binary.get_function_codec(function_abi),
+            encoded_outputs,
+            as_float=(output_format == 'float_array'),
+            fill_empty=fill_empty,
+            empty_token=empty_token,
+        )
+    else:
+        raise Exception('unknown output format: ' + str(output_format))
+
+
+async def _async_execute_batch_eth_call(
+    *,
+    function_abi: spec.FunctionABI,
+    provider: spec.ProviderReference,
+    multicall: bool | None,
+    **kwargs: typing.Any,
+) -> spec.RpcPluralResponse:
+    if multicall is not False:
+        results = await rpc_batch_multicall.async_batch_eth_call_via_multicall(
+            function_abi=function_abi,
+            provider=provider,
+            require=(multicall is True),
+            **kwargs,
+        )
+        if results is not None:
+            return results
     return await rpc_batch_utils.async_batch_execute(
         'eth_call',
         function_abi=function_abi,
         provider=provider,
-        to_address=to_address,
-        to_addresses=to_addresses,
         **kwargs,
     )
 
@@ -0,0 +1,311 @@
+"""aggregation of same-block eth_call batches into Multicall3 calls
+
+- a batch of eth_call's that share a block is packed into `tryAggregate`
+  calls to the Multicall3 contract, each sized to a gas budget, so that a
+  batch of hundreds of calls takes one or two node requests
+- each multicall is sent with an explicit gas limit, and failed subcalls are
+  retried as plain eth_call's in case they only ran out of the shared gas
+- subcalls that still fail become None if the provider has
+  `convert_reverts_to_none`, otherwise they raise like a failed eth_call
+- used by batch eth_call whenever the network has a Multicall3 deployment at
+  the requested block, falling back to a JSON-RPC batch if aggregation fails
+- disable for a provider by setting its `multicall` entry to False, or for a
+  single batch with `multicall=False`
+- subcalls are executed with the Multicall3 contract as msg.sender
+"""
+
+from __future__ import annotations
+
+import typing
+
+from ctc import binary
+from ctc import spec
+from .. import rpc_provider
+from .. import rpc_registry
+from .. import rpc_request
+
+
+# same address on every network
+multicall3_address = '0xca11bde05977b3631167028862be2a173976ca11'
+
+# block of Multicall3 deployment, by chain id
+multicall3_deploy_blocks: typing.Mapping[int, int] = {
+    1: 14353601,  # mainnet
+    5: 6507670,  # goerli
+    10: 4286263,  # optimism
+    56: 15921452,  # bsc
+    100: 21022491,  # gnosis
+    137: 25770160,  # polygon
+    250: 33001987,  # fantom
+    42161: 7654707,  # arbitrum
+    43114: 11907934,  # avalanche
+}
+
+try_aggregate_abi: spec.FunctionABI = {
+    'inputs': [
+        {'name': 'requireSuccess', 'type': 'bool'},
+        {
+            'components': [
+                {'name': 'target', 'type': 'address'},
+                {'name': 'callData', 'type': 'bytes'},
+            ],
+            'name': 'calls',
+            'type': 'tuple[]',
+        },
+    ],
+    'name': 'tryAggregate',
+    'outputs': [
+        {
+            'components': [
+                {'name': 'success', 'type': 'bool'},
+                {'name': 'returnData', 'type': 'bytes'},
+            ],
+            'name': 'returnData',
+            'type': 'tuple[]',
+        }
+    ],
+    'stateMutability': 'payable',
+    'type': 'function',
+}
+
+# gas limit of each tryAggregate call, and gas reserved for each subcall
+multicall_gas_budget = 40000000
+multicall_gas_per_call = 100000
+
+# smallest batch worth aggregating
+min_multicall_size = 2
+
+# eth_call kwargs that can be expressed as multicall subcalls
+_multicall_constructor_kwargs = {
+    'to_address',
+    'to_addresses',
+    'function_parameters',
+    'function_parameter_list',
+    'call_data',
+    'block_number',
+}
+
+
+def get_multicall3_address(
+    network: spec.NetworkReference,
+    *,
+    block_number: spec.BlockNumberReference | None = None,
+) -> spec.Address | None:
+    """get Multicall3 address, None if not deployed on network at block"""
+
+    deploy_block = multicall3_deploy_blocks.get(
+        rpc_provider.get_provider_network({'network': network})
+    )
+    if deploy_block is None:
+        return None
+
+    if block_number is None:
+        return multicall3_address
+    standard_block = binary.standardize_block_number(block_number)
+    if isinstance(standard_block, int):
+        if standard_block < deploy_block:
+            return None
+    elif standard_block == 'earliest':
+        return None
+    return multicall3_address
+
+
+async def async_batch_eth_call_via_multicall(
+    *,
+    function_abi: spec.FunctionABI,
+    provider: spec.ProviderReference = None,
+    require: bool = False,
+    **kwargs: typing.Any,
+) -> spec.RpcPluralResponse | None:
+    """perform batch of same-block eth_call's as Multicall3 calls
+
+    return None if the batch cannot be aggregated, unless require is True
+    """
+
+    from . import rpc_batch_utils
+
+    constructor_kwargs, digestor_kwargs = (
+        rpc_batch_utils._separate_execution_kwargs(
+            method='eth_call', kwargs=kwargs
+        )
+    )
+    calls = _get_multicall_calls(function_abi, constructor_kwargs)
+    if calls is None or len(calls) < min_multicall_size:
+        if require:
+            raise Exception('batch cannot be aggregated into multicalls')
+        return None
+
+    # check for multicall deployment
+    full_provider = rpc_provider.get_provider(provider)
+    if not require and not full_provider.get('multicall', True):
+        return None
+    block_number = constructor_kwargs.get('block_number')
+    try:
+        multicall_address = get_multicall3_address(
+            full_provider['network'], block_number=block_number
+        )
+    except Exception:
+        multicall_address = None
+    if multicall_address is None:
+        if require:
+            raise Exception('multicall not available for network and block')
+        return None
+
+    # send calls in chunks sized to gas budget
+    requests = construct_multicall_requests(
+        calls, multicall_address=multicall_address, block_number=block_number
+    )
+    try:
+        responses = await rpc_request.async_send(
+            request=requests, provider=full_provider
+        )
+        results = []
+        for response in responses:
+            results.extend(decode_multicall_response(response))
+    except Exception:
+        if require:
+            raise
+        return None
+
+    # retry failed subcalls individually, they may have run out of gas
+    failed = [i for i, (success, _) in enumerate(results) if not success]
+    retried = await _async_retry_subcalls(
+        [calls[i] for i in failed],
+        block_number=block_number,
+        provider=full_provider,
+    )
+    encoded_outputs: list[typing.Any] = [
+        '0x' + return_data.hex() for _, return_data in results
+    ]
+    for i, retried_output in zip(failed, retried):
+        encoded_outputs[i] = retried_output
+
+    # digest subcall outputs
+    digestor = rpc_registry.get_digestor('eth_call')
+    outputs = []
+    for encoded_output in encoded_outputs:
+        if encoded_output is None:
+            output = None
+        else:
+            output = digestor(
+                encoded_output,
+                function_abi=function_abi,
+                **digestor_kwargs,
+            )
+        outputs.append(output)
+    return outputs
+
+
+async def _async_retry_subcalls(
+    calls: typing.Sequence[tuple[spec.Address, bytes]],
+    *,
+    block_number: spec.BlockNumberReference | None,
+    provider: spec.Provider,
+) -> list[typing.Any]:
+    """send subcalls as separate eth_call's, returning raw outputs
+
+    reverts become None or raise according to the provider's
+    convert_reverts_to_none, like any other eth_call
+    """
+
+    import asyncio
+
+    constructor = rpc_registry.get_constructor('eth_call')
+    coroutines = [
+        rpc_request.async_send(
+            request=constructor(
+                to_address=target,
+                call_data='0x' + call_data.hex(),
+                block_number=block_number,
+            ),
+            provider=provider,
+        )
+        for target, call_data in calls
+    ]
+    return list(await asyncio.gather(*coroutines))
+
+
+def get_multicall_chunk_size() -> int:
+    """get number of subcalls that fit in gas budget of one multicall"""
+    return max(1, multicall_gas_budget // multicall_gas_per_call)
+
+
+def construct_multicall_requests(
+    calls: typing.Sequence[tuple[spec.Address, bytes]],
+    *,
+    multicall_address: spec.Address,
+    block_number: spec.BlockNumberReference | None = None,
+) -> list[spec.RpcSingularRequest]:
+    """construct tryAggregate eth_call's for (target, call_data) subcalls"""
+    chunk_size = get_multicall_chunk_size()
+    constructor = rpc_registry.get_constructor('eth_call')
+    return [
+        constructor(
+            to_address=multicall_address,
+            function_abi=try_aggregate_abi,
+            function_parameters=[False, list(calls[i : i + chunk_size])],
+            block_number=block_number,
+            gas=hex(multicall_gas_budget),
+        )
+        for i in range(0, len(calls), chunk_size)
+    ]
+
+
+def decode_multicall_response(
+    response: spec.RpcSingularResponse,
+) -> list[tuple[bool, bytes]]:
+    """decode tryAggregate output into (success, return_data) tuples"""
+    if response is None:
+        raise spec.RpcException('RPC ERROR: multicall reverted')
+    results: list[tuple[bool, bytes]] = binary.decode_function_output(
+        encoded_output=response,
+        function_abi=try_aggregate_abi,
+    )
+    return results
+
+
+def _get_multicall_calls(
+    function_abi: spec.FunctionABI,
+    constructor_kwargs: typing.Mapping[str, typing.Any],
+) -> list[tuple[spec.Address, bytes]] | None:
+    """encode batch as (target, call_data) subcalls, None if not possible"""
+
+    kwargs = {k: v for k, v in constructor_kwargs.items() if v is not None}
+    if not set(kwargs.keys()).issubset(_multicall_constructor_kwargs):
+        return None
+
+    to_address = kwargs.get('to_address')
+    to_addresses = kwargs.get('to_addresses')
+    parameter_list = kwargs.get('function_parameter_list')
+    call_data = kwargs.get('call_data')
+
+    if to_addresses is not None and to_address is None:
+        if parameter_list is not None:
+            return None
+        if call_data is None:
+            call_data = binary.encode_call_data(
+                function_abi=function_abi,
+                parameters=kwargs.get('function_parameters'),
+            )
+        encoded = binary.convert(call_data, 'binary')
+        return [(address, encoded) for address in to_addresses]
+
+    elif parameter_list is not None and to_address is not None:
+        if call_data is not None or 'function_parameters' in kwargs:
+            return None
+        return [
+            (
+                to_address,
+                binary.convert(
+                    binary.encode_call_data(
+                        function_abi=function_abi,
+                        parameters=parameters,
+                    ),
+                    'binary',
+                ),
+            )
+            for parameters in parameter_list
+        ]
+
+    else:
+        return None
@@ -0,0 +1,488 @@
+"""content-addressed cache of rpc responses for immutable historical calls
+
+- enable for a provider by setting its `cache_responses` entry to True
+    - e.g. `rpc.async_eth_call(..., provider={'cache_responses': True})`
+- only methods that read state at a specific block are cached, and only
+  when that block is older than the required number of confirmations
+- entries are keyed by hash of (network, method, normalized params)
+- an in-memory LRU sits in front of an on-disk sqlite store
+- both tiers are size-bounded, the disk tier evicts least recently used rows
+- disk tier queries run in db threads, so sqlite io never blocks the event
+  loop, and only the memory tier is touched from the event loop
+"""
+
+from __future__ import annotations
+
+import collections
+import functools
+import os
+import threading
+import time
+import typing
+
+from typing_extensions import TypedDict
+
+if typing.TYPE_CHECKING:
+    import sqlite3
+
+from ctc import spec
+from . import rpc_provider
+from . import rpc_request
+
+
+# index of block number parameter for each cacheable method
+_cacheable_methods = {
+    'eth_call': 1,
+    'eth_getBalance': 1,
+    'eth_getCode': 1,
+    'eth_getStorageAt': 2,
+    'eth_getTransactionCount': 1,
+}
+
+# how long a fetched latest block number is trusted before re-fetching
+_latest_block_ttl = 15
+
+# keys per disk tier query, below the sqlite limit on query parameters
+_max_query_keys = 500
+
+
+class ResponseCacheSettings(TypedDict):
+    path: typing.Optional[str]
+    max_memory_entries: int
+    max_disk_bytes: int
+
+
+class ResponseCacheStats(TypedDict):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    stores: int
+    evictions: int
+
+
+_settings: ResponseCacheSettings = {
+    'path': None,
+    'max_memory_entries': 100000,
+    'max_disk_bytes': 1024 ** 3,
+}
+
+_stats: ResponseCacheStats = {
+    'memory_hits': 0,
+    'disk_hits': 0,
+    'misses': 0,
+    'stores': 0,
+    'evictions': 0,
+}
+
+_memory_cache: collections.OrderedDict[str, str] = collections.OrderedDict()
+_disk_state: dict[str, typing.Any] = {'connection': None, 'n_bytes': 0}
+_disk_lock = threading.RLock()
+_latest_blocks: dict[spec.ChainId, tuple[int, float]] = {}
+
+
+#
+# # settings
+#
+
+
+def configure_response_cache(
+    *,
+    path: typing.Optional[str] = None,
+    max_memory_entries: typing.Optional[int] = None,
+    max_disk_bytes: typing.Optional[int] = None,
+) -> None:
+    """configure location and size limits of response cache"""
+    if path is not None:
+        close_response_cache()
+        _settings['path'] = path
+    if max_memory_entries is not None:
+        _settings['max_memory_entries'] = max_memory_entries
+        _trim_memory_cache()
+    if max_disk_bytes is not None:
+        _settings['max_disk_bytes'] = max_disk_bytes
+
+
+def get_response_cache_path() -> str:
+    path = _settings['path']
+    if path is None:
+        from ctc import config
+
+        path = os.path.join(config.get_data_dir(), 'rpc_cache', 'responses.db')
+    return path
+
+
+def get_response_cache_stats() -> ResponseCacheStats:
+    return typing.cast(ResponseCacheStats, dict(_stats))
+
+
+def reset_response_cache_stats() -> None:
+    for key in _stats.keys():
+        _stats[key] = 0  # type: ignore
+
+
+def clear_response_cache(*, clear_disk: bool = False) -> None:
+    """clear in-memory tier, and optionally the on-disk tier"""
+    _memory_cache.clear()
+    if clear_disk:
+        with _disk_lock:
+            connection = _get_disk_connection()
+            with connection:
+                connection.execute('DELETE FROM responses')
+            _disk_state['n_bytes'] = 0
+
+
+def close_response_cache() -> None:
+    with _disk_lock:
+        connection = _disk_state['connection']
+        if connection is not None:
+            connection.close()
+            _disk_state['connection'] = None
+
+
+#
+# # keys
+#
+
+
+def get_request_cache_key(
+    request: spec.RpcSingularRequest,
+    network: spec.ChainId,
+) -> typing.Optional[str]:
+    """compute content address of request, or None if not cacheable"""
+    import hashlib
+    import json
+
+    block_number = _get_request_block_number(request)
+    if block_number is None:
+        return None
+
+    params = list(request['params'])
+    params[_cacheable_methods[request['method']]] = block_number
+    normalized = [network, request['method'], _normalize_param(params)]
+    as_str = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(as_str.encode()).hexdigest()
+
+
+def _get_request_block_number(
+    request: spec.RpcSingularRequest,
+) -> typing.Optional[int]:
+    index = _cacheable_methods.get(request.get('method', ''))
+    if index is None:
+        return None
+    params = request.get('params')
+    if not isinstance(params, list) or len(params) <= index:
+        return None
+
+    # block tags like 'latest' and block hashes are not cached
+    block = params[index]
+    if isinstance(block, int):
+        return block
+    elif isinstance(block, str) and block.startswith('0x') and len(block) < 66:
+        try:
+            return int(block, 16)
+        except ValueError:
+            return None
+    else:
+        return None
+
+
+def _normalize_param(param: typing.Any) -> typing.Any:
+    if isinstance(param, str) and param.startswith('0x'):
+        return param.lower()
+    elif isinstance(param, list):
+        return [_normalize_param(item) for item in param]
+    elif isinstance(param, dict):
+        return {key: _normalize_param(value) for key, value in param.items()}
+    else:
+        return param
+
+
+#
+# # lookup and storage
+#
+
+
+async def async_get_cached_responses(
+    request: spec.RpcPluralRequest,
+    provider: spec.Provider,
+) -> tuple[spec.RpcPluralResponseRaw, spec.RpcPluralRequest]:
+    """split request into cached responses and subrequests still to send
+
+    keys missing from memory tier are looked up in disk tier in one query
+    """
+    import json
+
+    network = rpc_provider.get_provider_network(provider)
+    keys = [
+        get_request_cache_key(subrequest, network=network)
+        for subrequest in request
+    ]
+
+    # memory tier
+    results: dict[str, str] = {}
+    disk_keys = []
+    for key in keys:
+        if key is None or key in results:
+            continue
+        memory_result = _get_memory_entry(key)
+        if memory_result is None:
+            disk_keys.append(key)
+        else:
+            results[key] = memory_result
+
+    # disk tier
+    if len(disk_keys) > 0:
+        from ctc.db import executor_utils
+
+        disk_results = await executor_utils.async_run_in_db_executor(
+            functools.partial(_get_disk_entries, disk_keys)
+        )
+        for key, disk_result in disk_results.items():
+            _put_memory_entry(key, disk_result)
+        _stats['disk_hits'] += len(disk_results)
+        results.update(disk_results)
+
+    cached: spec.RpcPluralResponseRaw = []
+    uncached: spec.RpcPluralRequest = []
+    for subrequest, key in zip(request, keys):
+        if key is not None:
+            result = results.get(key)
+        else:
+            result = None
+        if result is None:
+            if key is not None:
+                _stats['misses'] += 1
+            uncached.append(subrequest)
+        else:
+            cached.append(
+                {
+                    'jsonrpc': '2.0',
+                    'id': subrequest['id'],
+                    'result': json.loads(result),
+                }
+            )
+    return cached, uncached
+
+
+async def async_store_responses(
+    request: spec.RpcPluralRequest,
+    responses: spec.RpcPluralResponseRaw,
+    *,
+    provider: spec.Provider,
+) -> None:
+    """store successful responses of requests made at finalized blocks"""
+    import json
+
+    network = rpc_provider.get_provider_network(provider)
+    responses_by_id = {response['id']: response for response in responses}
+
+    entries = []
+    max_block_number = None
+    for subrequest in request:
+        key = get_request_cache_key(subrequest, network=network)
+        if key is None:
+            continue
+        response = responses_by_id.get(subrequest['id'])
+        if response is None or 'result' not in response:
+            continue
+        block_number = _get_request_block_number(subrequest)
+        if block_number is None:
+            continue
+        if max_block_number is None or block_number > max_block_number:
+            max_block_number = block_number
+        result = json.dumps(response['result'])  # type: ignore
+        entries.append((key, block_number, subrequest['method'], result))
+    if len(entries) == 0 or max_block_number is None:
+        return
+
+    # only store blocks that can no longer be reorged
+    max_finalized = await _async_get_max_finalized_block(
+        provider=provider,
+        network=network,
+        block_number=max_block_number,
+    )
+    if max_finalized is None:
+        return
+    finalized_entries = [
+        (key, method, result)
+        for key, block_number, method, result in entries
+        if block_number <= max_finalized
+    ]
+    if len(finalized_entries) > 0:
+        from ctc.db import executor_utils
+
+        await executor_utils.async_run_in_db_executor(
+            functools.partial(
+                _put_disk_entries, finalized_entries, network=network
+            )
+        )
+        for key, method, result in finalized_entries:
+            _put_memory_entry(key, result)
+        _stats['stores'] += len(finalized_entries)
+
+
+async def _async_get_max_finalized_block(
+    *,
+    provider: spec.Provider,
+    network: spec.ChainId,
+    block_number: int,
+) -> typing.Optional[int]:
+    from ctc.db import management
+
+    required_confirmations = management.get_required_confirmations(
+        network=network
+    )
+
+    # a stale latest block is conservative, only refresh when it matters
+    latest = _latest_blocks.get(network)
+    if latest is not None:
+        latest_block, t_fetched = latest
+        if block_number <= latest_block - required_confirmations:
+            return latest_block - required_confirmations
+        if time.time() - t_fetched < _latest_block_ttl:
+            return latest_block - required_confirmations
+
+    request = rpc_request.create('eth_blockNumber', [])
+    response = await rpc_request.async_send_raw(request, provider=provider)
+    if 'result' not in response:
+        return None
+    latest_block = int(response['result'], 16)  # type: ignore
+    _latest_blocks[network] = (latest_block, time.time())
+    return latest_block - required_confirmations
+
+
+def _get_memory_entry(key: str) -> typing.Optional[str]:
+    result = _memory_cache.get(key)
+    if result is not None:
+        _memory_cache.move_to_end(key)
+        _stats['memory_hits'] += 1
+    return result
+
+
+def _put_memory_entry(key: str, result: str) -> None:
+    _memory_cache[key] = result
+    _memory_cache.move_to_end(key)
+    _trim_memory_cache()
+
+
+def _trim_memory_cache() -> None:
+    while len(_memory_cache) > _settings['max_memory_entries']:
+        _memory_cache.popitem(last=False)
+
+
+#
+# # disk tier
+#
+
+
+def _get_disk_connection() -> sqlite3.Connection:
+    connection: sqlite3.Connection | None = _disk_state['connection']
+    if connection is None:
+        import sqlite3
+
+        path = get_response_cache_path()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        # connection is used from db threads, guarded by _disk_lock
+        connection = sqlite3.connect(path, check_same_thread=False)
+        with connection:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                ' key TEXT PRIMARY KEY,'
+                ' network INTEGER,'
+                ' method TEXT,'
+                ' result TEXT,'
+                ' size INTEGER,'
+                ' accessed REAL'
+                ')'
+            )
+            connection.execute(
+                'CREATE INDEX IF NOT EXISTS responses_accessed'
+                ' ON responses (accessed)'
+            )
+        n_bytes = connection.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses'
+        ).fetchone()[0]
+        _disk_state['connection'] = connection
+        _disk_state['n_bytes'] = n_bytes
+    return connection
+
+
+def _get_disk_entries(keys: typing.Sequence[str]) -> dict[str, str]:
+    """get results of keys present in disk tier, run in a db thread"""
+
+    results: dict[str, str] = {}
+    with _disk_lock:
+        connection = _get_disk_connection()
+        for i in range(0, len(keys), _max_query_keys):
+            chunk = keys[i : i + _max_query_keys]
+            rows = connection.execute(
+                'SELECT key, result FROM responses WHERE key IN ('
+                + ', '.join('?' for key in chunk)
+                + ')',
+                chunk,
+            ).fetchall()
+            results.update(rows)
+        if len(results) > 0:
+            now = time.time()
+            with connection:
+                connection.executemany(
+                    'UPDATE responses SET accessed = ? WHERE key = ?',
+                    [(now, key) for key in results.keys()],
+                )
+    return results
+
+
+def _put_disk_entries(
+    entries: typing.Sequence[tuple[str, str, str]],
+    *,
+    network: spec.ChainId,
+) -> None:
+    """store entries in disk tier, run in a db thread"""
+
+    now = time.time()
+    rows = [
+        (key, network, method, result, len(result), now)
+        for key, method, result in entries
+    ]
+    with _disk_lock:
+        connection = _get_disk_connection()
+        with connection:
+            # count only rows that are inserted, not ones with existing keys
+            for row in rows:
+                n_changes = connection.total_changes
+                connection.execute(
+                    'INSERT OR IGNORE INTO responses'
+                    ' (key, network, method, result, size, accessed)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)',
+                    row,
+                )
+                if connection.total_changes > n_changes:
+                    _disk_state['n_bytes'] += row[4]
+        if _disk_state['n_bytes'] > _settings['max_disk_bytes']:
+            _evict_disk_entries()
+
+
+def _evict_disk_entries() -> None:
+    """evict least recently used rows until under 90% of size limit"""
+
+    connection = _get_disk_connection()
+    target = int(0.9 * _settings['max_disk_bytes'])
+    with connection:
+        while _disk_state['n_bytes'] > target:
+            rows = connection.execute(
+                'SELECT key, size FROM responses ORDER BY accessed LIMIT 1000'
+            ).fetchall()
+            if len(rows) == 0:
+                _disk_state['n_bytes'] = 0
+                break
+            evicted = []
+            for key, size in rows:
+                evicted.append((key,))
+                _disk_state['n_bytes'] -= size
+                if _disk_state['n_bytes'] <= target:
+                    break
+            connection.executemany(
+                'DELETE FROM responses WHERE key = ?', evicted
+            )
+            _stats['evictions'] += len(evicted)
@@ -0,0 +1,212 @@
+"""coalescing of independent singular rpc requests
+
+singleflight
+- concurrent identical singular requests share one in-flight request
+- requests are identical if they use same provider, method, and params
+- methods that create or consume node-side state are never shared
+
+micro-batching
+- enable for a provider by setting its `microbatch_window` to a duration
+  in seconds, e.g. `provider={'microbatch_window': 0.005}`
+- singular requests issued within the window are merged into one
+  JSON-RPC batch request, up to the provider's chunk_size
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import typing
+
+from typing_extensions import TypedDict
+
+from ctc import spec
+from . import rpc_provider
+from . import rpc_request
+
+
+# methods with side effects or node-side state, never deduplicated
+_non_coalescable_methods = {
+    'eth_sendTransaction',
+    'eth_sendRawTransaction',
+    'eth_sign',
+    'eth_newFilter',
+    'eth_newBlockFilter',
+    'eth_newPendingTransactionFilter',
+    'eth_getFilterChanges',
+    'eth_uninstallFilter',
+    'eth_submitWork',
+    'eth_submitHashrate',
+}
+
+_CoalesceKey = typing.Tuple[spec.ProviderKey, str, str]
+
+
+class _PendingBatch(TypedDict):
+    requests: list[spec.RpcSingularRequest]
+    futures: list[asyncio.Future[spec.RpcSingularResponseRaw]]
+    flushed: bool
+
+
+_in_flight: dict[
+    _CoalesceKey, asyncio.Future[spec.RpcSingularResponseRaw]
+] = {}
+_pending_batches: dict[spec.ProviderKey, _PendingBatch] = {}
+
+
+async def async_send_coalesced(
+    request: spec.RpcSingularRequest,
+    provider: spec.Provider,
+) -> spec.RpcSingularResponseRaw:
+    """send singular request, sharing work with concurrent requests"""
+
+    import copy
+
+    key = _get_coalesce_key(request, provider)
+    if key is None:
+        return await _async_send_microbatched(request, provider)
+
+    # every waiter gets its own copy because digestors modify in place
+    # - the shared result itself is never handed out
+    future = _in_flight.get(key)
+    if future is None:
+
+        # leader sends the request on behalf of all followers
+        future = asyncio.ensure_future(
+            _async_send_microbatched(request, provider)
+        )
+        _in_flight[key] = future
+
+        def remove_in_flight(
+            done: asyncio.Future[spec.RpcSingularResponseRaw],
+        ) -> None:
+            if _in_flight.get(key) is done:
+                del _in_flight[key]
+
+        future.add_done_callback(remove_in_flight)
+
+        # shield so that a cancelled leader does not cancel its followers
+        response = await asyncio.shield(future)
+        return copy.deepcopy(response)
+
+    else:
+        response = await asyncio.shield(future)
+        response = copy.deepcopy(response)
+        response['id'] = request['id']
+        return response
+
+
+def _get_coalesce_key(
+    request: spec.RpcSingularRequest,
+    provider: spec.Provider,
+) -> typing.Optional[_CoalesceKey]:
+    import json
+
+    method = request.get('method')
+    if not isinstance(method, str) or method in _non_coalescable_methods:
+        return None
+    try:
+        params = json.dumps(request.get('params'), sort_keys=True)
+    except TypeError:
+        return None
+    return (rpc_provider.get_provider_key(provider), method, params)
+
+
+#
+# # micro-batching
+#
+
+
+async def _async_send_microbatched(
+    request: spec.RpcSingularRequest,
+    provider: spec.Provider,
+) -> spec.RpcSingularResponseRaw:
+
+    window = provider.get('microbatch_window')
+    if window is None:
+        return await rpc_request.async_send_raw(request, provider=provider)
+
+    loop = asyncio.get_running_loop()
+    provider_key = rpc_provider.get_provider_key(provider)
+    batch = _pending_batches.get(provider_key)
+    if batch is None:
+        batch = {'requests': [], 'futures': [], 'flushed': False}
+        _pending_batches[provider_key] = batch
+        flush = functools.partial(
+            _flush_batch,
+            provider_key=provider_key,
+            batch=batch,
+            provider=provider,
+        )
+        loop.call_later(window, flush)
+
+    future: asyncio.Future[spec.RpcSingularResponseRaw] = loop.create_future()
+    batch['requests'].append(request)
+    batch['futures'].append(future)
+
+    # flush early once batch is as large as a single chunk can be
+    chunk_size = provider['chunk_size']
+    if chunk_size is not None and len(batch['requests']) >= chunk_size:
+        _flush_batch(provider_key=provider_key, batch=batch, provider=provider)
+
+    return await future
+
+
+def _flush_batch(
+    *,
+    provider_key: spec.ProviderKey,
+    batch: _PendingBatch,
+    provider: spec.Provider,
+) -> None:
+    if batch['flushed']:
+        return
+    batch['flushed'] = True
+    if _pending_batches.get(provider_key) is batch:
+        del _pending_batches[provider_key]
+    asyncio.ensure_future(_async_send_batch(batch, provider))
+
+
+async def _async_send_batch(
+    batch: _PendingBatch,
+    provider: spec.Provider,
+) -> None:
+
+    requests = batch['requests']
+    futures = batch['futures']
+    responses: spec.RpcPluralResponseRaw
+    try:
+        if len(requests) == 1:
+            responses = [
+                await rpc_request.async_send_raw(requests[0], provider=provider)
+            ]
+        else:
+
+            # use positional ids so that independent requests cannot collide
+            wire_request = [
+                dict(subrequest, id=str(index))
+                for index, subrequest in enumerate(requests)
+            ]
+            wire_responses = await rpc_request.async_send_raw(
+                wire_request, provider=provider
+            )
+            responses_by_id = {
+                wire_response['id']: wire_response
+                for wire_response in wire_responses
+            }
+            responses = []
+            for index, subrequest in enumerate(requests):
+                wire_response = dict(responses_by_id[str(index)])
+                wire_response['id'] = subrequest['id']
+                responses.append(
+                    typing.cast(spec.RpcSingularResponseRaw, wire_response)
+                )
+
+    except Exception as e:
+        for future in futures:
+            if not future.done():
+                future.set_exception(e)
+        return
+
+    for future, response in zip(futures, responses):
+        if not future.done():
+            future.set_result(response)
@@ -111,8 +111,11 @@ async def async_eth_get_filter_logs(
 
 async def async_eth_get_logs(
     *,
-    address: spec.BinaryData | None = None,
-    topics: typing.Sequence[spec.BinaryData] | None = None,
+    address: spec.BinaryData | typing.Sequence[spec.BinaryData] | None = None,
+    topics: typing.Sequence[
+        spec.BinaryData | typing.Sequence[spec.BinaryData] | None
+    ]
+    | None = None,
     start_block: spec.BlockNumberReference | None = None,
     end_block: spec.BlockNumberReference | None = None,
     block_hash: spec.BinaryData | None = None,
@@ -1 +1,2 @@
 from .rpc_http_async import async_close_http_session
+from .rpc_websocket_async import async_close_websocket_connection
@@ -8,6 +8,7 @@ if typing.TYPE_CHECKING:
 
 from ctc import spec
 from .. import rpc_provider
+from .. import rpc_scheduler
 
 
 _http_sessions: dict[spec.ProviderKey, aiohttp.ClientSession] = {}
@@ -25,25 +26,36 @@ async def async_send_http(
     headers = {'User-Agent': 'ctc'}
     for attempt in range(n_attempts):
 
-        async with session.post(
-            provider['url'], json=request, headers=headers
-        ) as response:
-            if response.status != 200:
-                import random
-
-                t_sleep = 2 ** attempt + random.random()
-                warnings.warn(
-                    'request failed with code '
-                    + str(response.status)
-                    + ' retrying in '
-                    + str(t_sleep)
-                    + 's'
-                )
-                import asyncio
-
-                await asyncio.sleep(t_sleep)
-                continue
-            return await response.json()
+        t_start = await rpc_scheduler.async_acquire_request_slot(provider)
+        success = False
+        try:
+            async with session.post(
+                provider['url'], json=request, headers=headers
+            ) as response:
+                if response.status != 200:
+                    t_sleep = _get_retry_delay(response, attempt=attempt)
+                    warnings.warn(
+                        'request failed with code '
+                        + str(response.status)
+                        + ' retrying in '
+                        + str(t_sleep)
+                        + 's'
+                    )
+                else:
+                    result = await response.json()
+                    success = True
+        finally:
+            rpc_scheduler.release_request_slot(
+                provider, t_start=t_start, success=success
+            )
+
+        if success:
+            return result
+        else:
+            import asyncio
+
+            await asyncio.sleep(t_sleep)
+            continue
 
     else:
         message = (
@@ -57,6 +69,19 @@ async def async_send_http(
         raise Exception(message)
 
 
+def _get_retry_delay(response: aiohttp.ClientResponse, attempt: int) -> float:
+    """use server's Retry-After if given, otherwise exponential backoff"""
+    import random
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after is not None:
+        try:
+            return float(retry_after) + random.random()
+        except ValueError:
+            pass
+    return float(2 ** attempt) + random.random()
+
+
 def get_async_http_session(
     provider: spec.Provider, create: bool = True
 ) -> aiohttp.ClientSession:
@@ -82,10 +107,13 @@ async def async_close_http_session(
         return
 
     if provider is None and len(_http_sessions) == 1:
-        session = list(_http_sessions.values())[0]
+        key = list(_http_sessions.keys())[0]
     else:
         provider = rpc_provider.get_provider(provider)
-        session = get_async_http_session(provider=provider)
+        key = rpc_provider.get_provider_key(provider)
+        if key not in _http_sessions:
+            return
+    session = _http_sessions.pop(key)
 
     import asyncio
 
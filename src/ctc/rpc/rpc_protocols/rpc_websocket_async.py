@@ -1,18 +1,318 @@
+"""persistent multiplexed websocket transport
+
+- one long-lived connection is kept per provider key
+- many in-flight requests share a connection, responses are matched by id
+- request ids are rewritten on the wire so that concurrent requests that
+  happen to share an id cannot collide, original ids are restored in responses
+- dropped connections are re-established on the next request
+- requests that get no response within the timeout of the provider session
+  fail and are retried on a new connection
+"""
+
 from __future__ import annotations
 
+import asyncio
+import itertools
+import typing
+import warnings
+
+from typing_extensions import TypedDict
+
+if typing.TYPE_CHECKING:
+    import aiohttp
+
 from ctc import spec
+from .. import rpc_provider
+from .. import rpc_scheduler
+
+
+class _WebsocketConnection(TypedDict):
+    session: aiohttp.ClientSession
+    websocket: aiohttp.ClientWebSocketResponse[bool]
+    pending: dict[int, asyncio.Future[spec.RpcSingularResponseRaw]]
+    reader: asyncio.Task[None]
 
-# import websockets
 
-# from .. import rpc_provider
+_websocket_connections: dict[spec.ProviderKey, _WebsocketConnection] = {}
+_websocket_locks: dict[spec.ProviderKey, asyncio.Lock] = {}
+_wire_ids = itertools.count(1)
+
+# same as default total timeout of aiohttp sessions used for http requests
+_default_request_timeout = 300.0
 
 
 async def async_send_websocket(
     request: spec.RpcRequest,
-    provider: spec.Provider,
+    provider: spec.ProviderReference,
+    *,
+    n_attempts: int = 8,
 ) -> spec.RpcResponse:
-    raise NotImplementedError()
-    # provider = rpc_provider.get_provider(provider)
-    # async with websockets.connect(provider['url']) as websocket:
-    #     await websocket.send(request)
-    #     return await websocket.recv()
+    import aiohttp
+
+    provider = rpc_provider.get_provider(provider)
+    key = rpc_provider.get_provider_key(provider)
+    timeout = _get_request_timeout(provider)
+
+    for attempt in range(n_attempts):
+        connection = None
+        t_start = await rpc_scheduler.async_acquire_request_slot(provider)
+        success = False
+        try:
+            connection = await _async_get_websocket_connection(provider)
+            response = await _async_send_over_connection(
+                request=request,
+                connection=connection,
+                timeout=timeout,
+            )
+            success = True
+        except (
+            aiohttp.ClientError,
+            ConnectionError,
+            asyncio.TimeoutError,
+        ) as e:
+            error = e
+        finally:
+            rpc_scheduler.release_request_slot(
+                provider, t_start=t_start, success=success
+            )
+
+        if success:
+            return response
+        else:
+            import random
+
+            if connection is not None:
+                await _async_drop_connection(key=key, connection=connection)
+
+            t_sleep = 2 ** attempt + random.random()
+            warnings.warn(
+                'websocket request failed with '
+                + repr(error)
+                + ' retrying in '
+                + str(t_sleep)
+                + 's'
+            )
+            await asyncio.sleep(t_sleep)
+            continue
+
+    else:
+        raise Exception(
+            'websocket rpc request failed after '
+            + str(n_attempts)
+            + ' retries'
+        )
+
+
+def _get_request_timeout(provider: spec.Provider) -> float | None:
+    """use total timeout of provider session, None waits indefinitely"""
+    session_kwargs = provider['session_kwargs']
+    if session_kwargs is None or session_kwargs.get('timeout') is None:
+        return _default_request_timeout
+    timeout = session_kwargs['timeout']
+    if isinstance(timeout, (int, float)):
+        return float(timeout)
+    total: float | None = getattr(timeout, 'total', _default_request_timeout)
+    return total
+
+
+async def _async_send_over_connection(
+    request: spec.RpcRequest,
+    connection: _WebsocketConnection,
+    *,
+    timeout: float | None = None,
+) -> spec.RpcResponse:
+    import json
+
+    if isinstance(request, dict):
+        subrequests = [request]
+    elif isinstance(request, list):
+        subrequests = request
+    else:
+        raise Exception('unknown request type: ' + str(type(request)))
+
+    # register a future for each subrequest under a connection-unique id
+    loop = asyncio.get_running_loop()
+    pending = connection['pending']
+    wire_ids = []
+    wire_requests = []
+    futures = []
+    for subrequest in subrequests:
+        wire_id = next(_wire_ids)
+        future: asyncio.Future[spec.RpcSingularResponseRaw] = (
+            loop.create_future()
+        )
+        pending[wire_id] = future
+        wire_ids.append(wire_id)
+        wire_requests.append(dict(subrequest, id=wire_id))
+        futures.append(future)
+
+    try:
+        if isinstance(request, dict):
+            payload = json.dumps(wire_requests[0])
+        else:
+            payload = json.dumps(wire_requests)
+        await connection['websocket'].send_str(payload)
+        wire_responses = await asyncio.wait_for(
+            asyncio.gather(*futures), timeout=timeout
+        )
+    finally:
+
+        # deregister ids so that late responses are dropped, and fail
+        # subrequests left without a response by a timeout or lost connection
+        for wire_id, future in zip(wire_ids, futures):
+            pending.pop(wire_id, None)
+            if not future.done():
+                future.set_exception(
+                    ConnectionError('no response to websocket request')
+                )
+                # nothing else awaits future, so mark exception as retrieved
+                future.exception()
+
+    # restore original ids
+    responses = []
+    for subrequest, wire_response in zip(subrequests, wire_responses):
+        response = dict(wire_response)
+        response['id'] = subrequest['id']
+        responses.append(response)
+
+    if isinstance(request, dict):
+        return responses[0]
+    else:
+        return responses
+
+
+#
+# # connection management
+#
+
+
+async def _async_get_websocket_connection(
+    provider: spec.Provider,
+) -> _WebsocketConnection:
+
+    key = rpc_provider.get_provider_key(provider)
+    connection = _websocket_connections.get(key)
+    if connection is not None and not connection['websocket'].closed:
+        return connection
+
+    # only one coroutine should open a new connection for a given provider
+    lock = _websocket_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _websocket_locks[key] = lock
+    async with lock:
+
+        connection = _websocket_connections.get(key)
+        if connection is not None and not connection['websocket'].closed:
+            return connection
+
+        import aiohttp
+
+        kwargs = provider['session_kwargs']
+        if kwargs is None:
+            kwargs = {}
+        session = aiohttp.ClientSession(**kwargs)
+        try:
+            websocket = await session.ws_connect(
+                provider['url'],
+                headers={'User-Agent': 'ctc'},
+                heartbeat=30,
+                max_msg_size=0,
+            )
+        except Exception:
+            await session.close()
+            raise
+
+        pending: dict[int, asyncio.Future[spec.RpcSingularResponseRaw]] = {}
+        reader = asyncio.create_task(
+            _async_read_websocket(
+                key=key,
+                websocket=websocket,
+                pending=pending,
+            )
+        )
+        connection = {
+            'session': session,
+            'websocket': websocket,
+            'pending': pending,
+            'reader': reader,
+        }
+        _websocket_connections[key] = connection
+        return connection
+
+
+async def _async_read_websocket(
+    *,
+    key: spec.ProviderKey,
+    websocket: aiohttp.ClientWebSocketResponse[bool],
+    pending: dict[int, asyncio.Future[spec.RpcSingularResponseRaw]],
+) -> None:
+    """dispatch incoming responses to the futures of their requests"""
+    import json
+
+    import aiohttp
+
+    try:
+        async for message in websocket:
+            if message.type == aiohttp.WSMsgType.TEXT:
+                data = json.loads(message.data)
+            elif message.type == aiohttp.WSMsgType.BINARY:
+                data = json.loads(message.data.decode())
+            else:
+                break
+
+            if isinstance(data, dict):
+                data = [data]
+            for response in data:
+                future = pending.get(response.get('id'))
+                if future is not None and not future.done():
+                    future.set_result(response)
+
+    finally:
+
+        # deregister connection and fail any requests still in flight
+        connection = _websocket_connections.get(key)
+        if connection is not None and connection['websocket'] is websocket:
+            del _websocket_connections[key]
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(
+                    ConnectionError('websocket connection closed')
+                )
+
+
+async def _async_drop_connection(
+    *,
+    key: spec.ProviderKey,
+    connection: _WebsocketConnection,
+) -> None:
+    # another coroutine may have already replaced the failed connection
+    if _websocket_connections.get(key) is connection:
+        del _websocket_connections[key]
+    await _async_close_connection(connection)
+
+
+async def _async_close_connection(connection: _WebsocketConnection) -> None:
+    connection['reader'].cancel()
+    await connection['websocket'].close()
+    await connection['session'].close()
+
+
+async def async_close_websocket_connection(
+    provider: spec.ProviderReference = None,
+) -> None:
+    """close websocket connection of provider, or all if provider is None"""
+
+    if provider is None:
+        connections = list(_websocket_connections.values())
+        _websocket_connections.clear()
+    else:
+        provider = rpc_provider.get_provider(provider)
+        key = rpc_provider.get_provider_key(provider)
+        connection = _websocket_connections.pop(key, None)
+        if connection is None:
+            return
+        connections = [connection]
+
+    for connection in connections:
+        await _async_close_connection(connection)
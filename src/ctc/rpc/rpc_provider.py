@@ -16,8 +16,17 @@ def get_provider(provider: spec.ProviderReference = None) -> spec.Provider:
 
     elif isinstance(provider, str):
 
+        # case: provider specified as websocket url
+        if provider.startswith('ws'):
+            if ctc.config.has_provider(url=provider):
+                return ctc.config.get_provider(url=provider)
+            else:
+                raise Exception(
+                    'websocket providers must be added to config before use'
+                )
+
         # case: provider specified as url
-        if provider.startswith('http'):
+        elif provider.startswith('http'):
             if ctc.config.has_provider(url=provider):
                 return ctc.config.get_provider(url=provider)
             else:
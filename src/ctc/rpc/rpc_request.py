@@ -108,8 +108,19 @@ async def async_send(
     if logging_rpc_calls:
         log_rpc_request(request=request, provider=full_provider)
 
+    use_cache = full_provider.get('cache_responses', False)
+
     if isinstance(request, dict):
-        response = await async_send_raw(request=request, provider=full_provider)
+        if use_cache:
+            response = await _async_send_raw_with_cache(
+                request=request, provider=full_provider
+            )
+        else:
+            from . import rpc_coalescing
+
+            response = await rpc_coalescing.async_send_coalesced(
+                request=request, provider=full_provider
+            )
         if 'result' not in response and 'error' in response:
             if full_provider['convert_reverts_to_none']:
                 output = None
@@ -126,8 +137,25 @@ async def async_send(
 
     elif isinstance(request, list):
 
+        # use cached responses where possible
+        if use_cache:
+            from . import rpc_cache
+
+            cached_responses = await rpc_cache.async_get_cached_responses(
+                request, provider=full_provider
+            )
+            cached, request_to_send = cached_responses
+        else:
+            cached = []
+            request_to_send = request
+
         # chunk request
-        request_chunks = chunk_request(request=request, provider=full_provider)
+        if len(request_to_send) > 0:
+            request_chunks = chunk_request(
+                request=request_to_send, provider=full_provider
+            )
+        else:
+            request_chunks = []
 
         import logging
 
@@ -153,6 +181,18 @@ async def async_send(
 
         response_chunks = await asyncio.gather(*coroutines)
 
+        if use_cache:
+            await rpc_cache.async_store_responses(
+                request_to_send,
+                [
+                    subresponse
+                    for response_chunk in response_chunks
+                    for subresponse in response_chunk
+                ],
+                provider=full_provider,
+            )
+            response_chunks.append(cached)
+
         # reorder chunks
         plural_response = reorder_response_chunks(response_chunks, request)
 
@@ -232,6 +272,28 @@ async def async_send_raw(
         )
 
 
+async def _async_send_raw_with_cache(
+    request: spec.RpcSingularRequest,
+    provider: spec.Provider,
+) -> spec.RpcSingularResponseRaw:
+    from . import rpc_cache
+    from . import rpc_coalescing
+
+    cached, _ = await rpc_cache.async_get_cached_responses(
+        [request], provider=provider
+    )
+    if len(cached) > 0:
+        return cached[0]
+
+    response = await rpc_coalescing.async_send_coalesced(
+        request=request, provider=provider
+    )
+    await rpc_cache.async_store_responses(
+        [request], [response], provider=provider
+    )
+    return response
+
+
 def _log_request(request: spec.RpcRequest, provider: spec.Provider) -> None:
     import logging
 
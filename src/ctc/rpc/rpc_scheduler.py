@@ -0,0 +1,190 @@
+"""per-provider scheduling of outgoing rpc requests
+
+each provider gets a window of allowed in-flight requests
+- the window grows and shrinks AIMD-style, like tcp congestion control
+    - slow start: window grows by 1 per success until the first error
+    - congestion avoidance: window grows by 1 / window per success
+    - errors (429, 5xx, dropped connections) halve the window, at most once
+      per round trip so that a burst of failures only counts once
+    - successes much slower than recent latency hold the window constant
+- window never exceeds provider's max_concurrent_requests
+- a token bucket enforces provider's max_requests_per_second
+
+transports acquire a slot before each attempt and release it afterwards,
+so that fan-outs of thousands of coroutines only put a bounded number of
+requests on the wire at any time
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import typing
+
+from typing_extensions import TypedDict
+
+from ctc import spec
+from . import rpc_provider
+
+
+_initial_window = 16
+_default_max_concurrent_requests = 512
+_latency_ewma_weight = 0.1
+_latency_congestion_factor = 2.0
+
+
+class _ProviderSchedule(TypedDict):
+    window: float
+    slow_start: bool
+    in_flight: int
+    max_concurrent_requests: int
+    waiters: list[asyncio.Future[None]]
+    max_requests_per_second: typing.Optional[float]
+    tokens: float
+    last_refill: float
+    latency_ewma: typing.Optional[float]
+    last_decrease: float
+
+
+_schedules: dict[spec.ProviderKey, _ProviderSchedule] = {}
+
+
+def _get_schedule(provider: spec.Provider) -> _ProviderSchedule:
+    key = rpc_provider.get_provider_key(provider)
+    schedule = _schedules.get(key)
+    if schedule is None:
+
+        max_concurrent_requests = provider.get('max_concurrent_requests')
+        if max_concurrent_requests is None:
+            max_concurrent_requests = _default_max_concurrent_requests
+        max_requests_per_second = provider.get('max_requests_per_second')
+
+        schedule = {
+            'window': float(min(_initial_window, max_concurrent_requests)),
+            'slow_start': True,
+            'in_flight': 0,
+            'max_concurrent_requests': max_concurrent_requests,
+            'waiters': [],
+            'max_requests_per_second': max_requests_per_second,
+            'tokens': 1.0,
+            'last_refill': time.monotonic(),
+            'latency_ewma': None,
+            'last_decrease': 0.0,
+        }
+        _schedules[key] = schedule
+    return schedule
+
+
+async def async_acquire_request_slot(provider: spec.Provider) -> float:
+    """wait until provider can accept another request, return start time"""
+
+    schedule = _get_schedule(provider)
+
+    # wait for a free slot in the in-flight window
+    while schedule['in_flight'] >= int(schedule['window']):
+        waiter = asyncio.get_running_loop().create_future()
+        schedule['waiters'].append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            # pass a wakeup that this waiter can no longer use to others
+            if waiter in schedule['waiters']:
+                schedule['waiters'].remove(waiter)
+            else:
+                _wake_waiters(schedule)
+            raise
+    schedule['in_flight'] += 1
+
+    # wait for a token from the rate limit bucket
+    try:
+        await _async_take_token(schedule)
+    except BaseException:
+        schedule['in_flight'] -= 1
+        _wake_waiters(schedule)
+        raise
+
+    return time.monotonic()
+
+
+async def _async_take_token(schedule: _ProviderSchedule) -> None:
+    rate = schedule['max_requests_per_second']
+    if rate is None:
+        return
+
+    # bucket capacity of one second worth of requests allows small bursts
+    capacity = max(1.0, rate)
+    while True:
+        now = time.monotonic()
+        elapsed = now - schedule['last_refill']
+        schedule['tokens'] = min(capacity, schedule['tokens'] + elapsed * rate)
+        schedule['last_refill'] = now
+        if schedule['tokens'] >= 1:
+            schedule['tokens'] -= 1
+            return
+        await asyncio.sleep((1 - schedule['tokens']) / rate)
+
+
+def release_request_slot(
+    provider: spec.Provider,
+    *,
+    t_start: float,
+    success: bool,
+) -> None:
+    """release slot and adapt provider's window to the observed outcome"""
+
+    schedule = _get_schedule(provider)
+    schedule['in_flight'] -= 1
+
+    if success:
+        latency = time.monotonic() - t_start
+        latency_ewma = schedule['latency_ewma']
+        if latency_ewma is None:
+            schedule['latency_ewma'] = latency
+            congested = False
+        else:
+            congested = latency > _latency_congestion_factor * latency_ewma
+            schedule['latency_ewma'] = (
+                _latency_ewma_weight * latency
+                + (1 - _latency_ewma_weight) * latency_ewma
+            )
+
+        # additive increase
+        if not congested:
+            if schedule['slow_start']:
+                schedule['window'] += 1
+            else:
+                schedule['window'] += 1 / schedule['window']
+            schedule['window'] = min(
+                schedule['window'],
+                schedule['max_concurrent_requests'],
+            )
+
+    else:
+
+        # multiplicative decrease, ignoring requests sent before last decrease
+        if t_start > schedule['last_decrease']:
+            schedule['slow_start'] = False
+            schedule['window'] = max(1.0, schedule['window'] / 2)
+            schedule['last_decrease'] = time.monotonic()
+
+    _wake_waiters(schedule)
+
+
+def _wake_waiters(schedule: _ProviderSchedule) -> None:
+    n_free = int(schedule['window']) - schedule['in_flight']
+    while n_free > 0 and len(schedule['waiters']) > 0:
+        waiter = schedule['waiters'].pop(0)
+        if not waiter.done():
+            waiter.set_result(None)
+            n_free -= 1
+
+
+def get_request_window(provider: spec.ProviderReference = None) -> int:
+    """get current number of requests allowed in flight for provider"""
+    full_provider = rpc_provider.get_provider(provider)
+    return int(_get_schedule(full_provider)['window'])
+
+
+def reset_request_schedules() -> None:
+    """forget adapted windows, e.g. after provider config changes"""
+    _schedules.clear()
@@ -8,7 +8,7 @@
 from __future__ import annotations
 
 import typing
-from typing_extensions import TypedDict, Literal
+from typing_extensions import TypedDict, Literal, NotRequired
 
 from . import network_types
 
@@ -62,6 +62,10 @@ class PartialProvider(TypedDict, total=False):
     session_kwargs: typing.Optional[dict[str, typing.Any]]
     chunk_size: typing.Optional[int]
     convert_reverts_to_none: bool
+    max_requests_per_second: typing.Optional[float]
+    max_concurrent_requests: typing.Optional[int]
+    cache_responses: bool
+    microbatch_window: typing.Optional[float]
 
 
 class Provider(TypedDict, total=True):
@@ -72,6 +76,11 @@ class Provider(TypedDict, total=True):
     session_kwargs: typing.Optional[dict[str, typing.Any]]
     chunk_size: typing.Optional[int]
     convert_reverts_to_none: bool
+    max_requests_per_second: NotRequired[typing.Optional[float]]
+    max_concurrent_requests: NotRequired[typing.Optional[int]]
+    cache_responses: NotRequired[bool]
+    microbatch_window: NotRequired[typing.Optional[float]]
+    multicall: NotRequired[bool]
 
 
 provider_keys = [
@@ -84,6 +93,15 @@ provider_keys = [
     'convert_reverts_to_none',
 ]
 
+# keys that may be omitted from a provider
+optional_provider_keys = [
+    'max_requests_per_second',
+    'max_concurrent_requests',
+    'cache_responses',
+    'microbatch_window',
+    'multicall',
+]
+
 default_provider_settings = {
     # these must be particularly specified
     # 'url',
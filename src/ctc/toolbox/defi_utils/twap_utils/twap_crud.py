@@ -26,6 +26,7 @@ async def async_get_twap(
     output_end_time: typing.Optional[tooltime.Timestamp] = None,
     #
     # # other
+    time_weighted: bool = False,
     provider: spec.ProviderReference = None,
 ) -> spec.Series:
 
@@ -67,6 +68,7 @@ async def async_get_twap(
             raw_values=typing.cast(typing.Sequence[typing.Any], data.values),
             timestamps=(await block_timestamps_task),
             filter_duration=filter_duration,
+            time_weighted=time_weighted,
         )
     else:
         raise Exception('unknown mode: ' + str(mode))
@@ -3,39 +3,184 @@ from __future__ import annotations
 import typing
 
 import tooltime
+from typing_extensions import TypedDict
 
 from ctc import spec
 
 
+class TwapFilterState(TypedDict):
+    filter_seconds: float
+    time_weighted: bool
+    first_timestamp: typing.Optional[float]
+    timestamps: spec.NumpyArray
+    values: spec.NumpyArray
+
+
 def filter_twap(
     *,
     raw_values: typing.Sequence[typing.Any],
     timestamps: typing.Sequence[typing.Any],
     filter_duration: tooltime.Timestamp,
+    time_weighted: bool = False,
 ) -> spec.Series:
-    """convert raw value of a TWAP"""
+    """convert raw value of a TWAP
+
+    each output averages values in the window (t - filter_duration, t]
+    - by default, each sample in the window is weighted equally
+    - if time_weighted, each value is weighted by how long it held in the
+      window, treating values as constant until the next timestamp
+
+    timestamps must be sorted in ascending order
+    """
 
     import numpy as np
     import pandas as pd
 
     # compute twap times
-    timestamps_array: spec.NumpyArray = np.array(timestamps)
+    timestamps_array: spec.NumpyArray = np.asarray(timestamps, dtype=float)
+    raw_values_array: spec.NumpyArray = np.asarray(raw_values, dtype=float)
     filter_seconds = tooltime.timestamp_to_seconds(filter_duration)
-    first_input_timestamp = timestamps[0]
+    if len(timestamps_array) == 0:
+        return pd.Series([], dtype=float)
+    first_input_timestamp = timestamps_array[0]
     output_mask = timestamps_array > first_input_timestamp + filter_seconds
     twap_times = timestamps_array[output_mask]
 
     # compute twap values
-    # cannot use efficient numpy operation because filter size is variable
-    # (because block times are variable)
-    raw_values_array: spec.NumpyArray = np.array(raw_values)
-    twap_values = []
-    for twap_time in twap_times:
-        lower_bound = twap_time - filter_seconds < timestamps_array
-        upper_bound = timestamps_array <= twap_time
-        block_mask = lower_bound * upper_bound
-        twap_value = raw_values_array[block_mask].mean()
-        twap_values.append(twap_value)
+    twap_values = _compute_twap_values(
+        timestamps_array,
+        raw_values_array,
+        twap_times=twap_times,
+        filter_seconds=filter_seconds,
+        time_weighted=time_weighted,
+    )
 
     # format as Series
-    return pd.Series(twap_values, index=twap_times)
+    return pd.Series(twap_values, index=np.asarray(timestamps)[output_mask])
+
+
+def _compute_twap_values(
+    timestamps: spec.NumpyArray,
+    values: spec.NumpyArray,
+    *,
+    twap_times: spec.NumpyArray,
+    filter_seconds: float,
+    time_weighted: bool,
+) -> spec.NumpyArray:
+    """compute twap at each twap time using cumulative sums
+
+    window boundaries are located with binary search, so cost is
+    O(n log n) regardless of how many samples fall into each window
+    """
+
+    import numpy as np
+
+    window_starts = twap_times - filter_seconds
+
+    if not time_weighted:
+        # mean of samples with timestamps in (t - filter_seconds, t]
+        cumulative = np.concatenate([[0.0], np.cumsum(values)])
+        lower = np.searchsorted(timestamps, window_starts, side='right')
+        upper = np.searchsorted(timestamps, twap_times, side='right')
+        totals = cumulative[upper] - cumulative[lower]
+        counts = upper - lower
+        result: spec.NumpyArray = np.full(len(twap_times), np.nan)
+        nonempty = counts > 0
+        result[nonempty] = totals[nonempty] / counts[nonempty]
+        return result
+
+    else:
+        # integral of step function of values over window, divided by width
+        durations = np.diff(timestamps)
+        areas = values[:-1] * durations
+        cumulative = np.concatenate([[0.0], np.cumsum(areas)])
+
+        def integrate(times: spec.NumpyArray) -> spec.NumpyArray:
+            indices = np.searchsorted(timestamps, times, side='right') - 1
+            indices = np.clip(indices, 0, len(timestamps) - 1)
+            held = values[indices] * (times - timestamps[indices])
+            integral: spec.NumpyArray = cumulative[indices] + held
+            return integral
+
+        totals = integrate(twap_times) - integrate(window_starts)
+        result = totals / filter_seconds
+        result[window_starts < timestamps[0]] = np.nan
+        return result
+
+
+#
+# # incremental filtering
+#
+
+
+def create_twap_filter_state(
+    filter_duration: tooltime.Timestamp,
+    *,
+    time_weighted: bool = False,
+) -> TwapFilterState:
+    """create state for computing a TWAP incrementally as data arrives"""
+
+    import numpy as np
+
+    return {
+        'filter_seconds': tooltime.timestamp_to_seconds(filter_duration),
+        'time_weighted': time_weighted,
+        'first_timestamp': None,
+        'timestamps': np.zeros(0, dtype=float),
+        'values': np.zeros(0, dtype=float),
+    }
+
+
+def update_twap_filter(
+    state: TwapFilterState,
+    *,
+    raw_values: typing.Sequence[typing.Any],
+    timestamps: typing.Sequence[typing.Any],
+) -> spec.Series:
+    """compute TWAP at new timestamps, updating state in place
+
+    new timestamps must not come before any previous timestamp, outputs
+    match those of filter_twap() over the full concatenated series
+    """
+
+    import numpy as np
+    import pandas as pd
+
+    new_timestamps: spec.NumpyArray = np.asarray(timestamps, dtype=float)
+    new_values: spec.NumpyArray = np.asarray(raw_values, dtype=float)
+    if len(new_timestamps) == 0:
+        return pd.Series([], dtype=float)
+    if (
+        len(state['timestamps']) > 0
+        and new_timestamps[0] < state['timestamps'][-1]
+    ):
+        raise Exception('timestamps must not come before previous timestamps')
+    first_timestamp = state['first_timestamp']
+    if first_timestamp is None:
+        first_timestamp = new_timestamps[0]
+        state['first_timestamp'] = first_timestamp
+
+    # compute twap over retained window plus new data
+    all_timestamps = np.concatenate([state['timestamps'], new_timestamps])
+    all_values = np.concatenate([state['values'], new_values])
+    filter_seconds = state['filter_seconds']
+    output_mask = new_timestamps > first_timestamp + filter_seconds
+    twap_times = new_timestamps[output_mask]
+    twap_values = _compute_twap_values(
+        all_timestamps,
+        all_values,
+        twap_times=twap_times,
+        filter_seconds=filter_seconds,
+        time_weighted=state['time_weighted'],
+    )
+
+    # retain samples that can fall into future windows, plus the value
+    # that holds at the start of the next window
+    window_start = all_timestamps[-1] - filter_seconds
+    keep = max(
+        np.searchsorted(all_timestamps, window_start, side='right') - 1, 0
+    )
+    state['timestamps'] = all_timestamps[keep:]
+    state['values'] = all_values[keep:]
+
+    return pd.Series(twap_values, index=np.asarray(timestamps)[output_mask])
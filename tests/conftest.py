@@ -27,3 +27,86 @@ async def setup_teardown():
 
     # teardown
     await rpc.async_close_http_session()
+    await rpc.async_close_websocket_connection()
+
+
+@pytest.fixture
+def create_provider():
+    """factory of provider dicts that do not depend on config"""
+
+    def _create_provider(url='http://127.0.0.1:1/', **kwargs):
+        provider = {
+            'name': None,
+            'network': 1,
+            'protocol': 'http',
+            'url': url,
+            'session_kwargs': {},
+            'chunk_size': None,
+            'convert_reverts_to_none': False,
+        }
+        provider.update(kwargs)
+        return provider
+
+    return _create_provider
+
+
+@pytest.fixture
+def start_server():
+    """factory of local aiohttp servers, returns (runner, url)
+
+    the handler serves POST requests at '/', or websocket connections if
+    websocket is True, callers must await runner.cleanup()
+    """
+
+    async def _async_start_server(handler, *, websocket=False):
+        from aiohttp import web
+
+        app = web.Application()
+        if websocket:
+            app.router.add_get('/', handler)
+            scheme = 'ws'
+        else:
+            app.router.add_post('/', handler)
+            scheme = 'http'
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        return runner, scheme + '://127.0.0.1:' + str(port) + '/'
+
+    return _async_start_server
+
+
+@pytest.fixture
+def use_test_db(monkeypatch):
+    """factory that points config at a new sqlite db, returns (tempdir, config)
+
+    the data dir is also moved into tempdir, engines are invalidated on each
+    call and again at teardown
+    """
+    import os
+    import tempfile
+
+    from ctc import config
+    from ctc import db
+
+    def _use_test_db():
+        tempdir = tempfile.mkdtemp()
+        db_config = {
+            'dbms': 'sqlite',
+            'path': os.path.join(tempdir, 'example.db'),
+        }
+
+        def get_data_source(**tags):
+            return {'backend': 'db', 'db_config': db_config}
+
+        monkeypatch.setattr(config, 'get_data_source', get_data_source)
+        monkeypatch.setattr(config, 'get_db_config', lambda **kwargs: db_config)
+        monkeypatch.setattr(config, 'get_data_dir', lambda: tempdir)
+        db.invalidate_engines()
+        return tempdir, db_config
+
+    yield _use_test_db
+
+    db.invalidate_engines()
@@ -0,0 +1,68 @@
+import eth_abi_lite
+import pandas as pd
+
+from ctc import binary
+
+
+event_abi = {
+    'anonymous': False,
+    'inputs': [
+        {'indexed': True, 'name': 'sender', 'type': 'address'},
+        {'indexed': True, 'name': 'key', 'type': 'bytes32'},
+        {'indexed': True, 'name': 'label', 'type': 'string'},
+        {'indexed': False, 'name': 'amount', 'type': 'uint256'},
+        {'indexed': False, 'name': 'tick', 'type': 'int24'},
+        {'indexed': False, 'name': 'flag', 'type': 'bool'},
+        {'indexed': False, 'name': 'note', 'type': 'string'},
+        {'indexed': False, 'name': 'ids', 'type': 'uint256[]'},
+        {'indexed': False, 'name': 'selector', 'type': 'bytes4'},
+    ],
+    'name': 'Example',
+    'type': 'event',
+}
+
+
+def _create_log(i, amount):
+    data = eth_abi_lite.encode_single(
+        '(uint256,int24,bool,string,uint256[],bytes4)',
+        (amount, (-1) ** i * i * 1000, i % 2 == 0, 'x' * i, [i] * i, b'abcd'),
+    )
+    return {
+        'removed': False,
+        'log_index': i,
+        'transaction_index': 0,
+        'transaction_hash': '0x' + '11' * 32,
+        'block_hash': '0x' + '22' * 32,
+        'block_number': 100 + i,
+        'address': '0x' + 'ab' * 20,
+        'data': '0x' + data.hex(),
+        'topics': [
+            binary.get_event_hash(event_abi),
+            '0x' + '00' * 12 + '%040x' % i,
+            '0x' + '%064x' % (i * 7),
+            '0x' + '33' * 32,
+        ],
+    }
+
+
+def test_decode_events_columns_matches_normalize_event():
+    amounts = [0, 5, 2 ** 63 + 1, 2 ** 256 - 1]
+    logs = [_create_log(i, amount) for i, amount in enumerate(amounts)]
+
+    by_row = pd.DataFrame(
+        [binary.normalize_event(log, event_abi=event_abi) for log in logs]
+    )
+    by_column = pd.DataFrame(
+        binary.decode_events_columns(logs, event_abi=event_abi)
+    )
+
+    assert list(by_row.columns) == list(by_column.columns)
+    for column in by_row.columns:
+        assert list(by_row[column]) == list(by_column[column]), column
+
+
+def test_decode_events_columns_uses_int64_when_possible():
+    logs = [_create_log(i, i) for i in range(3)]
+    columns = binary.decode_events_columns(logs, event_abi=event_abi)
+    assert columns['arg__amount'].dtype == 'int64'
+    assert list(columns['arg__tick']) == [0, -1000, 2000]
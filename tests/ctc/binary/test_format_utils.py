@@ -63,3 +63,26 @@ match_tests = [
 def test_match_format(test):
     format_this, like_this, target = test
     assert binary.match_format(format_this, like_this) == target
+
+
+big_endian_tests = [
+    [[0, 5, 2 ** 63 - 1], 32, False, 'int64'],
+    [[0, -1, -(2 ** 63)], 32, True, 'int64'],
+    [[-1000, 2000], 3, True, 'object'],
+    [[0, 2 ** 63], 32, False, 'object'],
+    [[0, -(2 ** 63) - 1], 32, True, 'object'],
+]
+
+
+@pytest.mark.parametrize('test', big_endian_tests)
+def test_decode_big_endian_rows(test):
+    import numpy as np
+
+    values, n_bytes, signed, dtype = test
+    raw = b''.join(
+        value.to_bytes(n_bytes, 'big', signed=signed) for value in values
+    )
+    rows = np.frombuffer(raw, dtype=np.uint8).reshape(len(values), n_bytes)
+    decoded = binary.decode_big_endian_rows(rows, signed=signed)
+    assert decoded.dtype == dtype
+    assert list(decoded) == values
@@ -0,0 +1,132 @@
+import eth_abi_lite
+import pytest
+
+from ctc import binary
+
+
+get_reserves_abi = {
+    'inputs': [],
+    'name': 'getReserves',
+    'outputs': [
+        {'name': '_reserve0', 'type': 'uint112'},
+        {'name': '_reserve1', 'type': 'uint112'},
+        {'name': '_blockTimestampLast', 'type': 'uint32'},
+    ],
+    'stateMutability': 'view',
+    'type': 'function',
+}
+
+mixed_abi = {
+    'inputs': [
+        {'name': 'account', 'type': 'address'},
+        {'name': 'flag', 'type': 'bool'},
+        {'name': 'delta', 'type': 'int24'},
+        {'name': 'key', 'type': 'bytes32'},
+        {'name': 'selector', 'type': 'bytes4'},
+    ],
+    'name': 'f',
+    'outputs': [
+        {'name': 'account', 'type': 'address'},
+        {'name': 'flag', 'type': 'bool'},
+        {'name': 'delta', 'type': 'int24'},
+        {'name': 'key', 'type': 'bytes32'},
+        {'name': 'selector', 'type': 'bytes4'},
+    ],
+    'stateMutability': 'view',
+    'type': 'function',
+}
+
+dynamic_abi = {
+    'inputs': [{'name': 'values', 'type': 'uint256[]'}],
+    'name': 'g',
+    'outputs': [{'name': 'name', 'type': 'string'}],
+    'stateMutability': 'view',
+    'type': 'function',
+}
+
+mixed_parameters = [
+    '0x6b175474e89094c44da98b954eedeac495271d0f',
+    True,
+    -887272,
+    '0x' + 'ab' * 32,
+    bytes.fromhex('a9059cbb'),
+]
+
+
+def test_static_codec_matches_generic_codec():
+    codec = binary.get_function_codec(mixed_abi)
+    assert codec['static_parameters'] and codec['static_outputs']
+
+    call_data = binary.encode_call_data(
+        function_abi=mixed_abi, parameters=mixed_parameters
+    )
+    generic_parameters = list(mixed_parameters)
+    generic_parameters[3] = bytes.fromhex('ab' * 32)
+    expected = eth_abi_lite.encode_single(
+        '(address,bool,int24,bytes32,bytes4)', generic_parameters
+    )
+    assert call_data == '0x' + binary.get_function_selector(mixed_abi) + (
+        expected.hex()
+    )
+
+    named = binary.encode_call_data(
+        function_abi=mixed_abi,
+        parameters=dict(
+            zip(['account', 'flag', 'delta', 'key', 'selector'], mixed_parameters)
+        ),
+    )
+    assert named == call_data
+
+    decoded = binary.decode_function_output(
+        function_abi=mixed_abi, encoded_output=expected
+    )
+    assert decoded == mixed_parameters
+
+
+def test_codec_output_packaging():
+    encoded = eth_abi_lite.encode_single(
+        '(uint112,uint112,uint32)', [10 ** 20, 3, 1600000000]
+    )
+    assert binary.decode_function_output(
+        function_abi=get_reserves_abi, encoded_output=encoded
+    ) == [10 ** 20, 3, 1600000000]
+    assert binary.decode_function_output(
+        function_abi=get_reserves_abi,
+        encoded_output=encoded,
+        package_named_outputs=True,
+    ) == {
+        '_reserve0': 10 ** 20,
+        '_reserve1': 3,
+        '_blockTimestampLast': 1600000000,
+    }
+    assert binary.encode_call_data(function_abi=get_reserves_abi) == '0x0902f1ac'
+
+
+def test_codec_falls_back_to_generic_codec():
+    call_data = binary.encode_call_data(
+        function_abi=dynamic_abi, parameters=[[1, 2, 3]]
+    )
+    assert call_data[10:] == eth_abi_lite.encode_single(
+        '(uint256[])', [[1, 2, 3]]
+    ).hex()
+    encoded = eth_abi_lite.encode_single('(string)', ['hello'])
+    assert binary.decode_function_output(
+        function_abi=dynamic_abi, encoded_output=encoded
+    ) == 'hello'
+
+    # out of range values are rejected by generic encoder
+    with pytest.raises(Exception):
+        binary.encode_call_data(
+            function_abi=dict(get_reserves_abi, inputs=mixed_abi['inputs']),
+            parameters=[mixed_parameters[0], True, 2 ** 30, b'', b''],
+        )
+
+    # dirty padding is rejected by generic decoder
+    dirty = bytearray(
+        eth_abi_lite.encode_single('(uint112,uint112,uint32)', [1, 2, 3])
+    )
+    dirty[0] = 1
+    with pytest.raises(Exception):
+        binary.decode_function_output(
+            function_abi=get_reserves_abi, encoded_output=bytes(dirty)
+        )
@@ -50,12 +50,26 @@ valid_values = {
                 'convert_reverts_to_none': False,
             },
         },
+        {
+            'test_provider': {
+                'name': 'test_provider',
+                'url': 'wss://some_url.com',
+                'network': 1,
+                'protocol': 'wss',
+                'session_kwargs': {},
+                'chunk_size': None,
+                'convert_reverts_to_none': False,
+                'max_requests_per_second': 25,
+                'max_concurrent_requests': 100,
+            },
+        },
     ],
     'default_network': [1],
     'default_providers': [{}],
     'db_configs': [default_db_configs],
     'log_rpc_calls': [True, False],
     'log_sql_queries': [True, False],
+    'events_file_format': ['csv', 'parquet', 'feather'],
 }
 
 invalid_values = {
@@ -101,6 +115,18 @@ invalid_values = {
                 'convert_reverts_to_none': False,
             },
         },
+        {
+            'test_provider': {
+                'name': 'test_provider',
+                'url': 'https://some_url.com',
+                'network': 1,
+                'protocol': 'http',
+                'session_kwargs': {},
+                'chunk_size': None,
+                'convert_reverts_to_none': False,
+                'max_requests_per_second': 0,
+            },
+        },
     ],
     'default_network': [888, 'mainnet'],
     'default_providers': [{888: None}, {'mainnet': None}],
@@ -110,6 +136,7 @@ invalid_values = {
     ],
     'log_rpc_calls': [None, 'a', 2],
     'log_sql_queries': [None, 'a', 2],
+    'events_file_format': ['json', 'PARQUET', None],
 }
 
 
@@ -118,8 +145,21 @@ def test_every_config_key_has_validator_entry():
     config_validators = config_validate.get_config_validators()
     for key in config_spec:
         assert key in config_validators
+    optional_keys = config_validate.get_optional_config_keys()
     for key in config_validators:
-        assert key in config_spec
+        assert key in config_spec or key in optional_keys
+
+
+def test_optional_config_keys_need_not_be_specified():
+    default_config = config_defaults.get_default_config()
+    config_validate.validate_config(default_config)
+    config_validate.validate_config(
+        dict(default_config, events_file_format='parquet')
+    )
+    with pytest.raises(spec.ConfigInvalid):
+        config_validate.validate_config(
+            dict(default_config, events_file_format='json')
+        )
 
 
 @pytest.mark.parametrize('item', list(valid_values.items()))
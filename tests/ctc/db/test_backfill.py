@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from ctc import config
+from ctc import db
+from ctc import rpc
+from ctc.db.management.compression import block_timestamp_compression
+
+
+def _use_simulated_chain(monkeypatch, n_blocks):
+    fetched = []
+
+    async def async_eth_block_number(provider=None):
+        return n_blocks - 1
+
+    async def async_batch_eth_get_block_by_number(
+        block_numbers, include_full_transactions, provider
+    ):
+        fetched.extend(block_numbers)
+        return [
+            {'number': block, 'timestamp': 1438269988 + 13 * block}
+            for block in block_numbers
+        ]
+
+    monkeypatch.setattr(
+        rpc,
+        'add_provider_parameters',
+        lambda provider, parameters: dict(provider, **parameters),
+    )
+    monkeypatch.setattr(rpc, 'async_eth_block_number', async_eth_block_number)
+    monkeypatch.setattr(
+        rpc,
+        'async_batch_eth_get_block_by_number',
+        async_batch_eth_get_block_by_number,
+    )
+    return fetched
+
+
+@pytest.mark.asyncio
+async def test_backfill_resumes_from_checkpoint(monkeypatch, use_test_db):
+    tempdir, db_config = use_test_db()
+    fetched = _use_simulated_chain(monkeypatch, 3000)
+
+    start_block, end_block = await db.async_backfill_blocks(
+        start_block=100,
+        end_block=1999,
+        network=1,
+        chunk_size=300,
+        write_size=700,
+        verbose=False,
+    )
+    assert (start_block, end_block) == (100, 1999)
+    assert sorted(fetched) == list(range(100, 2000))
+
+    timestamps = await db.async_query_all_block_timestamps(
+        network=1, start_block=0
+    )
+    assert timestamps == {
+        block: 1438269988 + 13 * block for block in range(100, 2000)
+    }
+
+    # only blocks outside of previous backfill are fetched
+    fetched.clear()
+    await db.async_backfill_blocks(
+        start_block=0,
+        end_block=2499,
+        network=1,
+        chunk_size=300,
+        verbose=False,
+    )
+    assert sorted(fetched) == list(range(0, 100)) + list(range(2000, 2500))
+
+    path = await db.async_export_block_timestamps(
+        os.path.join(tempdir, 'export'),
+        start_block=0,
+        end_block=2499,
+        network=1,
+    )
+    exported = block_timestamp_compression.load_compressed_block_times(path)
+    assert exported == {
+        block: 1438269988 + 13 * block for block in range(0, 2500)
+    }
+
+    # blocks without enough confirmations are not backfilled
+    with pytest.raises(Exception):
+        await db.async_backfill_blocks(end_block=2999, network=1, verbose=False)
+
+
+@pytest.mark.asyncio
+async def test_backfill_checkpoint_is_specific_to_db(monkeypatch, use_test_db):
+    tempdir, db_config = use_test_db()
+    fetched = _use_simulated_chain(monkeypatch, 3000)
+    await db.async_backfill_blocks(
+        start_block=0, end_block=999, network=1, verbose=False
+    )
+    assert sorted(fetched) == list(range(0, 1000))
+
+    # switching to another db with the same data dir refetches every block
+    use_test_db()
+    monkeypatch.setattr(config, 'get_data_dir', lambda: tempdir)
+    fetched.clear()
+    await db.async_backfill_blocks(
+        start_block=0, end_block=999, network=1, verbose=False
+    )
+    assert sorted(fetched) == list(range(0, 1000))
+
+    # dropping the schema refetches every block
+    db.drop_schema('block_timestamps', network=1, confirm=True)
+    db.invalidate_engines()
+    fetched.clear()
+    await db.async_backfill_blocks(
+        start_block=0, end_block=999, network=1, verbose=False
+    )
+    assert sorted(fetched) == list(range(0, 1000))
+    timestamps = await db.async_query_all_block_timestamps(
+        network=1, start_block=0
+    )
+    assert timestamps is not None and len(timestamps) == 1000
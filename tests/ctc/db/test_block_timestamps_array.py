@@ -0,0 +1,132 @@
+import tempfile
+
+from ctc import config
+from ctc import db
+from ctc.db.management.compression import block_timestamp_compression
+
+
+example_block_timestamps = {
+    100: 1000,
+    101: 1012,
+    102: 1012,
+    103: 1030,
+    104: 1045,
+    105: 1060,
+}
+
+
+def _use_test_data_dir(monkeypatch):
+    tempdir = tempfile.mkdtemp()
+    monkeypatch.setattr(config, 'get_data_dir', lambda: tempdir)
+    return tempdir
+
+
+def test_build_array_from_compressed(monkeypatch):
+    tempdir = _use_test_data_dir(monkeypatch)
+    path = block_timestamp_compression.save_compressed_block_timestamps(
+        example_block_timestamps,
+        dirname=tempdir,
+    )
+    db.build_block_timestamps_array_from_compressed(path, network=1)
+
+    assert db.get_block_timestamps_array_range(network=1) == (100, 105)
+    assert db.get_array_block_timestamps(
+        [99, 100, 103, 105, 106], network=1
+    ) == [None, 1000, 1030, 1060, None]
+
+
+def test_array_timestamp_search(monkeypatch):
+    _use_test_data_dir(monkeypatch)
+    db.write_block_timestamps_array(
+        list(example_block_timestamps.values()),
+        start_block=100,
+        network=1,
+    )
+
+    # first block of array cannot be confirmed as first block >= timestamp
+    assert db.get_array_timestamps_blocks(
+        [999, 1000, 1012, 1020, 1060, 1061], network=1, mode='>='
+    ) == [None, None, 101, 103, 105, None]
+
+    # last block of array cannot be confirmed as last block <= timestamp
+    assert db.get_array_timestamps_blocks(
+        [999, 1000, 1012, 1020, 1059, 1060], network=1, mode='<='
+    ) == [None, 100, 102, 102, 104, None]
+
+    assert db.get_array_timestamps_blocks(
+        [1012, 1020, 1045], network=1, mode='=='
+    ) == [101, None, 104]
+
+
+def test_append_contiguous_blocks(monkeypatch):
+    _use_test_data_dir(monkeypatch)
+    db.write_block_timestamps_array(
+        list(example_block_timestamps.values()),
+        start_block=100,
+        network=1,
+    )
+    assert db.get_array_block_timestamps([106], network=1) == [None]
+
+    # blocks after a gap are not appended
+    n_appended = db.append_block_timestamps_to_array(
+        {106: 1070, 107: 1082, 109: 1100},
+        network=1,
+    )
+    assert n_appended == 2
+    assert db.get_block_timestamps_array_range(network=1) == (100, 107)
+    assert db.get_array_block_timestamps([106, 107, 109], network=1) == [
+        1070,
+        1082,
+        None,
+    ]
+
+
+async def test_lookups_use_array_without_engine(monkeypatch):
+    from ctc import evm
+    from ctc import rpc
+    from ctc.db import connect_utils
+
+    _use_test_data_dir(monkeypatch)
+    db.write_block_timestamps_array(
+        list(example_block_timestamps.values()),
+        start_block=100,
+        network=1,
+    )
+
+    def create_engine(*args, **kwargs):
+        raise Exception('engine should not be created')
+
+    monkeypatch.setattr(connect_utils, 'create_engine', create_engine)
+    monkeypatch.setattr(rpc, 'get_provider_network', lambda provider: 1)
+
+    assert await evm.async_get_block_timestamp(103) == 1030
+    assert await evm.async_get_block_timestamps([100, 104]) == [1000, 1045]
+    assert await evm.async_get_block_of_timestamp(1020) == 103
+    assert await evm.async_get_blocks_of_timestamps(
+        [1012, 1045], mode='=='
+    ) == [101, 104]
+
+
+def test_append_discards_partial_write(monkeypatch):
+    _use_test_data_dir(monkeypatch)
+    db.write_block_timestamps_array(
+        list(example_block_timestamps.values()),
+        start_block=100,
+        network=1,
+    )
+
+    # simulate a writer that was interrupted partway through a timestamp
+    path = db.get_block_timestamps_array_path(network=1)
+    with open(path, 'ab') as f:
+        f.write(b'\x00\x01')
+    n_appended = db.append_block_timestamps_to_array(
+        {106: 1070, 107: 1082},
+        network=1,
+    )
+    assert n_appended == 2
+    assert db.get_block_timestamps_array_range(network=1) == (100, 107)
+    assert db.get_array_block_timestamps([105, 106, 107], network=1) == [
+        1060,
+        1070,
+        1082,
+    ]
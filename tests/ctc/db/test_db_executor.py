@@ -0,0 +1,71 @@
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import sqlalchemy
+import toolsql
+
+from ctc import db
+
+
+def _create_engine():
+    path = os.path.join(tempfile.mkdtemp(), 'example.db')
+    return toolsql.create_engine(db_config={'dbms': 'sqlite', 'path': path})
+
+
+async def test_db_jobs_do_not_block_event_loop():
+    engine = _create_engine()
+
+    ticks = []
+
+    async def tick():
+        for i in range(5):
+            ticks.append(i)
+            await asyncio.sleep(0.01)
+
+    tick_task = asyncio.create_task(tick())
+    await db.async_run_db_job(lambda: time.sleep(0.1), engine=engine)
+    assert len(ticks) == 5
+    await tick_task
+
+
+async def test_run_with_connection_runs_coroutine_in_db_thread():
+    engine = _create_engine()
+    main_thread = threading.get_ident()
+
+    async def async_select(*, conn, value):
+        await asyncio.gather(asyncio.sleep(0), asyncio.sleep(0))
+        result = conn.execute(sqlalchemy.text('SELECT ' + str(value)))
+        return threading.get_ident(), result.scalar()
+
+    results = await asyncio.gather(
+        *[
+            db.async_run_with_connection(async_select, engine=engine, value=i)
+            for i in range(10)
+        ]
+    )
+    assert [value for thread, value in results] == list(range(10))
+    assert all(thread != main_thread for thread, value in results)
+
+
+async def test_db_job_concurrency_is_bounded_per_engine():
+    from ctc.db import executor_utils
+
+    engine = _create_engine()
+    lock = threading.Lock()
+    state = {'active': 0, 'max_active': 0}
+
+    def job():
+        with lock:
+            state['active'] += 1
+            state['max_active'] = max(state['max_active'], state['active'])
+        time.sleep(0.02)
+        with lock:
+            state['active'] -= 1
+
+    await asyncio.gather(
+        *[db.async_run_db_job(job, engine=engine) for i in range(20)]
+    )
+    assert state['max_active'] <= executor_utils._max_concurrent_jobs['sqlite']
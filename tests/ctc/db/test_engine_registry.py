@@ -0,0 +1,73 @@
+import os
+import tempfile
+
+from ctc import config
+from ctc import db
+from ctc.db.management import version_utils
+
+
+def test_engines_are_shared_and_schema_checked_once(monkeypatch, use_test_db):
+    use_test_db()
+
+    n_checks = []
+    get_schema_version = version_utils.get_schema_version
+
+    def counted_get_schema_version(*args, **kwargs):
+        n_checks.append(1)
+        return get_schema_version(*args, **kwargs)
+
+    monkeypatch.setattr(
+        version_utils, 'get_schema_version', counted_get_schema_version
+    )
+
+    engine = db.create_engine('block_timestamps', network=1)
+    n_initial_checks = len(n_checks)
+    assert n_initial_checks > 0
+    for i in range(10):
+        assert db.create_engine('block_timestamps', network=1) is engine
+    assert len(n_checks) == n_initial_checks
+
+    # other schemas in the same database share the same engine
+    assert db.create_engine('blocks', network=1) is engine
+    assert len(n_checks) > n_initial_checks
+
+    assert (
+        version_utils.get_schema_version('block_timestamps', network=1)
+        is not None
+    )
+
+
+def test_invalidate_engines_recreates_engines(use_test_db):
+    use_test_db()
+    engine = db.create_engine('block_timestamps', network=1)
+    use_test_db()
+    new_engine = db.create_engine('block_timestamps', network=1)
+    assert new_engine is not engine
+    assert new_engine.url != engine.url
+
+
+def test_changed_db_config_uses_new_engine(monkeypatch, use_test_db):
+    use_test_db()
+    engine = db.create_engine('block_timestamps', network=1)
+
+    # config changes without invalidating engines
+    tempdir = tempfile.mkdtemp()
+    db_config = {
+        'dbms': 'sqlite',
+        'path': os.path.join(tempdir, 'other.db'),
+    }
+    monkeypatch.setattr(
+        config,
+        'get_data_source',
+        lambda **tags: {'backend': 'db', 'db_config': db_config},
+    )
+    new_engine = db.create_engine('block_timestamps', network=1)
+    assert new_engine is not engine
+    assert str(new_engine.url).endswith('other.db')
+    with new_engine.connect() as conn:
+        assert (
+            version_utils.get_schema_version(
+                'block_timestamps', network=1, conn=conn
+            )
+            is not None
+        )
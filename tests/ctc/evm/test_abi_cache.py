@@ -0,0 +1,80 @@
+import pytest
+
+from ctc import binary
+from ctc import evm
+from ctc.evm.abi_utils.abi_io import abi_cache
+from ctc.evm.abi_utils.abi_io import contract_abi_io
+from ctc.evm.erc20_utils import erc20_spec
+
+
+contract_abi = list(erc20_spec.erc20_function_abis.values())
+contract_address = '0x6B175474E89094C44Da98b954EedeAC495271d0F'
+
+
+@pytest.fixture
+def cached_contract_abi(monkeypatch):
+    abi_cache.clear_contract_abi_cache()
+
+    async def async_get_contract_abi(**kwargs):
+        raise Exception('contract abi should be served from cache')
+
+    monkeypatch.setattr(
+        contract_abi_io, 'async_get_contract_abi', async_get_contract_abi
+    )
+    abi_cache.cache_contract_abi(contract_address, contract_abi, network=1)
+    yield
+    abi_cache.clear_contract_abi_cache()
+
+
+@pytest.mark.asyncio
+async def test_function_abi_lookups_use_index(cached_contract_abi):
+    transfer_abi = erc20_spec.erc20_function_abis['transfer']
+
+    by_name = await evm.async_get_function_abi(
+        contract_address=contract_address.lower(),
+        function_name='transfer',
+        network=1,
+    )
+    assert by_name == transfer_abi
+
+    by_signature = await evm.async_get_function_abi(
+        contract_address=contract_address,
+        function_name='transfer(address,uint256)',
+        network=1,
+    )
+    assert by_signature == transfer_abi
+
+    by_selector = await evm.async_get_function_abi(
+        contract_address=contract_address,
+        function_selector='0x' + binary.get_function_selector(transfer_abi),
+        network='mainnet',
+    )
+    assert by_selector == transfer_abi
+
+
+def test_contract_abi_cache_expiry_and_eviction(cached_contract_abi):
+    assert abi_cache.get_cached_contract_abi_index(
+        contract_address, network=1
+    ) is not None
+
+    abi_cache.configure_contract_abi_cache(ttl=-1)
+    try:
+        assert abi_cache.get_cached_contract_abi_index(
+            contract_address, network=1
+        ) is None
+    finally:
+        abi_cache.configure_contract_abi_cache(ttl=3600)
+
+    abi_cache.configure_contract_abi_cache(max_entries=2)
+    try:
+        addresses = ['0x' + str(i) * 40 for i in range(3)]
+        for address in addresses:
+            abi_cache.cache_contract_abi(address, contract_abi, network=1)
+        assert abi_cache.get_cached_contract_abi_index(
+            addresses[0], network=1
+        ) is None
+        assert abi_cache.get_cached_contract_abi_index(
+            addresses[2], network=1
+        ) is not None
+    finally:
+        abi_cache.configure_contract_abi_cache(max_entries=10000)
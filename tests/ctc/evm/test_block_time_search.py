@@ -0,0 +1,161 @@
+import bisect
+import random
+
+import pytest
+
+from ctc import evm
+from ctc.evm.block_utils import block_crud
+from ctc.evm.block_utils.block_times.timestamp_to_block import (
+    block_time_search,
+)
+
+
+def _use_simulated_chain(monkeypatch, n_blocks):
+    rng = random.Random(0)
+    chain_timestamps = [0, 1438269988]
+    for i in range(n_blocks - 2):
+        chain_timestamps.append(chain_timestamps[-1] + rng.randint(1, 30))
+
+    fetched = []
+
+    async def async_get_blocks(blocks, provider=None):
+        fetched.extend(blocks)
+        return [
+            {'number': block, 'timestamp': chain_timestamps[block]}
+            for block in blocks
+        ]
+
+    async def async_get_block(block, provider=None):
+        return (await async_get_blocks([block]))[0]
+
+    async def async_get_latest_block_number(provider=None):
+        return len(chain_timestamps) - 1
+
+    monkeypatch.setattr(block_crud, 'async_get_blocks', async_get_blocks)
+    monkeypatch.setattr(block_crud, 'async_get_block', async_get_block)
+    monkeypatch.setattr(
+        block_crud,
+        'async_get_latest_block_number',
+        async_get_latest_block_number,
+    )
+    return chain_timestamps, fetched
+
+
+@pytest.mark.asyncio
+async def test_batch_search_matches_exhaustive_search(monkeypatch):
+    chain_timestamps, fetched = _use_simulated_chain(monkeypatch, 100000)
+
+    rng = random.Random(1)
+    targets = [
+        rng.randint(chain_timestamps[1] + 1, chain_timestamps[-1])
+        for i in range(200)
+    ]
+    targets += [chain_timestamps[500], chain_timestamps[-1]]
+
+    for mode in ['>=', '<=']:
+        blocks = (
+            await block_time_search._async_get_blocks_of_timestamps_from_node(
+                targets, mode=mode
+            )
+        )
+        for target, block in zip(targets, blocks):
+            if mode == '>=':
+                expected = bisect.bisect_left(chain_timestamps, target)
+            else:
+                expected = bisect.bisect_right(chain_timestamps, target) - 1
+            assert block == expected
+
+    blocks = await block_time_search._async_get_blocks_of_timestamps_from_node(
+        [chain_timestamps[500]], mode='=='
+    )
+    assert blocks == [500]
+
+
+@pytest.mark.asyncio
+async def test_batch_search_shares_probes(monkeypatch):
+    chain_timestamps, fetched = _use_simulated_chain(monkeypatch, 1000000)
+
+    # dense grid of targets, as used for charting
+    start = chain_timestamps[1] + 1
+    targets = list(range(start, chain_timestamps[-1], 3600))
+
+    blocks = await evm.async_get_blocks_of_timestamps(targets, use_db=False)
+    for target, block in zip(targets[::50], blocks[::50]):
+        assert block == bisect.bisect_left(chain_timestamps, target)
+    assert len(fetched) == len(set(fetched))
+    assert len(fetched) < 10 * len(targets)
+
+
+@pytest.mark.asyncio
+async def test_batch_search_past_latest_block(monkeypatch):
+    chain_timestamps, fetched = _use_simulated_chain(monkeypatch, 1000)
+
+    with pytest.raises(Exception):
+        await block_time_search._async_get_blocks_of_timestamps_from_node(
+            [chain_timestamps[-1] + 1]
+        )
+    blocks = await block_time_search._async_get_blocks_of_timestamps_from_node(
+        [chain_timestamps[-1] + 1], mode='<='
+    )
+    assert blocks == [len(chain_timestamps) - 1]
+
+
+@pytest.mark.asyncio
+async def test_blocks_of_timestamps_from_arrays(monkeypatch):
+    chain_timestamps, fetched = _use_simulated_chain(monkeypatch, 1000)
+    block_timestamps = {
+        block: chain_timestamps[block] for block in range(100, 200)
+    }
+
+    def get_expected(target, mode):
+        if mode == '>=':
+            return bisect.bisect_left(chain_timestamps, target)
+        else:
+            return bisect.bisect_right(chain_timestamps, target) - 1
+
+    # timestamps inside arrays are resolved without the node
+    rng = random.Random(2)
+    inside = [
+        rng.randint(chain_timestamps[100] + 1, chain_timestamps[198])
+        for i in range(50)
+    ]
+    inside.append(chain_timestamps[150])
+    for mode in ['>=', '<=']:
+        blocks = await evm.async_get_blocks_of_timestamps(
+            inside, block_timestamps=block_timestamps, use_db=False, mode=mode
+        )
+        assert blocks == [get_expected(target, mode) for target in inside]
+        for target in inside[-3:]:
+            block = await evm.async_get_block_of_timestamp(
+                target,
+                block_timestamps=block_timestamps,
+                use_db=False,
+                mode=mode,
+            )
+            assert block == get_expected(target, mode)
+    blocks = await evm.async_get_blocks_of_timestamps(
+        [chain_timestamps[150]],
+        block_timestamps=block_timestamps,
+        use_db=False,
+        mode='==',
+    )
+    assert blocks == [150]
+    assert fetched == []
+
+    # timestamps outside of arrays fall back to the node
+    outside = [chain_timestamps[50], chain_timestamps[500] + 1]
+    outside.append(chain_timestamps[199])
+    for mode in ['>=', '<=']:
+        blocks = await evm.async_get_blocks_of_timestamps(
+            outside, block_timestamps=block_timestamps, use_db=False, mode=mode
+        )
+        assert blocks == [get_expected(target, mode) for target in outside]
+        for target in outside:
+            block = await evm.async_get_block_of_timestamp(
+                target,
+                block_timestamps=block_timestamps,
+                use_db=False,
+                use_db_assist=False,
+                mode=mode,
+            )
+            assert block == get_expected(target, mode)
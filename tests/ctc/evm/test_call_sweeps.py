@@ -0,0 +1,162 @@
+import eth_abi_lite
+import pytest
+
+from ctc import evm
+from ctc import rpc
+from ctc import spec
+from ctc.evm.erc20_utils import erc20_spec
+
+wallet = '0x' + 'ab' * 20
+tokens = ['0x' + hex(i)[2:].zfill(40) for i in range(1, 4)]
+balance_of_abi = erc20_spec.erc20_function_abis['balanceOf']
+total_supply_abi = erc20_spec.erc20_function_abis['totalSupply']
+
+
+def _get_output(target, call_data, block):
+    if call_data.startswith('70a08231'):
+        return int(target, 16) * 1000 + block % 1000
+    elif call_data.startswith('18160ddd'):
+        return block
+    else:
+        raise Exception('unknown function')
+
+
+def _use_simulated_node(monkeypatch, revert_multicalls=False):
+    """simulate Multicall3 and erc20 calls, recording each JSON-RPC batch
+
+    if revert_multicalls, every aggregate Multicall3 call reverts
+    """
+
+    batches = []
+
+    async def async_send(request, provider=None):
+        batches.append((provider['url'], request))
+        results = []
+        for subrequest in request:
+            call_object, block_number = subrequest['params']
+            block = int(block_number, 16)
+            if call_object['to'] == rpc.multicall3_address and (
+                revert_multicalls
+            ):
+                if not provider['convert_reverts_to_none']:
+                    raise spec.RpcException('RPC ERROR: execution reverted')
+                results.append(None)
+                continue
+            elif call_object['to'] == rpc.multicall3_address:
+                assert block >= 14353601
+                require_success, calls = eth_abi_lite.decode_single(
+                    '(bool,(address,bytes)[])',
+                    bytes.fromhex(call_object['data'][10:]),
+                )
+                outputs = [
+                    (
+                        True,
+                        eth_abi_lite.encode_single(
+                            'uint256',
+                            _get_output(address, call_data.hex(), block),
+                        ),
+                    )
+                    for address, call_data in calls
+                ]
+                encoded = eth_abi_lite.encode_single(
+                    '((bool,bytes)[])', [outputs]
+                )
+            else:
+                encoded = eth_abi_lite.encode_single(
+                    'uint256',
+                    _get_output(
+                        call_object['to'], call_object['data'][2:], block
+                    ),
+                )
+            results.append('0x' + encoded.hex())
+        return results
+
+    monkeypatch.setattr(rpc, 'async_send', async_send)
+    return batches
+
+
+@pytest.mark.asyncio
+async def test_sweep_calls_grid(monkeypatch, create_provider):
+    batches = _use_simulated_node(monkeypatch)
+
+    calls = [(token, balance_of_abi, [wallet]) for token in tokens]
+    calls.append({'contract': tokens[0], 'function': total_supply_abi})
+    calls.append(
+        {
+            'contract': tokens[0],
+            'function': balance_of_abi,
+            'function_parameters': [wallet],
+            'name': 'duplicate',
+        }
+    )
+    blocks = [16000000, 14000000, 16000001, 16000000]
+
+    df = await evm.async_sweep_calls(
+        calls, blocks=blocks, provider=create_provider('http://a/')
+    )
+    assert list(df.index) == blocks
+    assert df.shape == (4, 5)
+    assert df.columns[-1] == 'duplicate'
+    for block in blocks:
+        row = df.loc[block]
+        if isinstance(row, type(df)):
+            row = row.iloc[0]
+        expected = [_get_output(token, '70a08231', block) for token in tokens]
+        expected += [block, expected[0]]
+        assert list(row) == expected
+
+    # one batch: a multicall for each new enough block, plain calls otherwise
+    assert len(batches) == 1
+    targets = [request['params'][0]['to'] for request in batches[0][1]]
+    assert targets.count(rpc.multicall3_address) == 2
+    assert len(targets) == 2 + 4
+
+
+@pytest.mark.asyncio
+async def test_sweep_calls_across_providers(monkeypatch, create_provider):
+    batches = _use_simulated_node(monkeypatch)
+
+    blocks = list(range(16000000, 16000006))
+    array = await evm.async_sweep_calls(
+        [(tokens[1], total_supply_abi)],
+        blocks=blocks,
+        output_format='array',
+        providers=[create_provider('http://a/'), create_provider('http://b/')],
+        blocks_per_chunk=2,
+    )
+    assert array.shape == (6, 1)
+    assert list(array[:, 0]) == blocks
+    assert sorted(url for url, request in batches) == ['http://a/'] * 2 + [
+        'http://b/'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_sweep_calls_reverted_multicall_falls_back(
+    monkeypatch, create_provider
+):
+    batches = _use_simulated_node(monkeypatch, revert_multicalls=True)
+
+    blocks = [16000000, 16000001]
+    calls = [(token, balance_of_abi, [wallet]) for token in tokens]
+    for convert_reverts_to_none in [True, False]:
+        batches.clear()
+        array = await evm.async_sweep_calls(
+            calls,
+            blocks=blocks,
+            output_format='array',
+            provider=create_provider(
+                'http://a/', convert_reverts_to_none=convert_reverts_to_none
+            ),
+        )
+        for block, row in zip(blocks, array):
+            expected = [
+                _get_output(token, '70a08231', block) for token in tokens
+            ]
+            assert list(row) == expected
+
+        # aggregate calls are retried as plain calls
+        assert len(batches) == 2
+        targets = [request['params'][0]['to'] for request in batches[1][1]]
+        assert rpc.multicall3_address not in targets
+        assert len(targets) == len(blocks) * len(tokens)
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from ctc import binary
+from ctc import evm
+from ctc import spec
+from ctc.rpc import rpc_request
+from ctc.evm.erc20_utils import erc20_spec
+
+
+token = '0x6b175474e89094c44da98b954eedeac495271d0f'
+supplies = [0, 10 ** 18, 3 * 10 ** 24, 2 ** 200 + 1]
+
+
+def _use_simulated_responses(monkeypatch, responses):
+    async def async_send(request, provider=None):
+        assert len(request) == len(responses)
+        return list(responses)
+
+    monkeypatch.setattr(rpc_request, 'async_send', async_send)
+
+
+def test_decode_outputs_array():
+    codec = binary.get_function_codec(
+        erc20_spec.erc20_function_abis['totalSupply']
+    )
+    outputs = ['0x' + value.to_bytes(32, 'big').hex() for value in supplies]
+
+    as_objects = binary.decode_codec_outputs_array(
+        codec, outputs + ['0x'], empty_token=0
+    )
+    assert as_objects.dtype == object
+    assert list(as_objects) == supplies + [0]
+    assert list(binary.decode_codec_outputs_array(codec, outputs[:3])) == (
+        supplies[:3]
+    )
+
+    as_floats = binary.decode_codec_outputs_array(
+        codec, outputs + ['0x'], as_float=True, fill_empty=True
+    )
+    assert as_floats.dtype == np.float64
+    assert np.allclose(as_floats[:4], [float(value) for value in supplies])
+    assert np.isnan(as_floats[4])
+
+    with pytest.raises(Exception):
+        binary.decode_codec_outputs_array(codec, outputs + ['0x'])
+
+    # reverted calls decode like empty outputs
+    reverted = binary.decode_codec_outputs_array(
+        codec, outputs + [None], as_float=True, fill_empty=True
+    )
+    assert np.isnan(reverted[4])
+    reverted = binary.decode_codec_outputs_array(
+        codec, [None] + outputs, empty_token=0
+    )
+    assert list(reverted) == [0] + supplies
+    with pytest.raises(spec.RpcException):
+        binary.decode_codec_outputs_array(codec, outputs + [None])
+
+    # values that overflow the output type are rejected
+    decimals_codec = binary.get_function_codec(
+        erc20_spec.erc20_function_abis['decimals']
+    )
+    with pytest.raises(Exception):
+        binary.decode_codec_outputs_array(decimals_codec, outputs)
+
+
+@pytest.mark.asyncio
+async def test_erc20_by_block_array_output(monkeypatch):
+    outputs = ['0x' + value.to_bytes(32, 'big').hex() for value in supplies]
+    blocks = [15000000 + i for i in range(len(supplies))]
+    _use_simulated_responses(monkeypatch, outputs)
+
+    raw = await evm.async_get_erc20_total_supply_by_block(
+        token, blocks, normalize=False, output_format='array'
+    )
+    assert list(raw) == supplies
+
+    as_list = await evm.async_get_erc20_total_supply_by_block(
+        token, blocks, normalize=False
+    )
+    assert as_list == supplies
+
+    normalized = await evm.async_normalize_erc20_quantities_array_by_block(
+        np.array(supplies, dtype=object),
+        blocks,
+        decimals=[18, 18, 6, 18],
+    )
+    assert normalized.dtype == np.float64
+    assert np.allclose(
+        normalized, [0, 1, 3 * 10 ** 18, (2 ** 200 + 1) / 10 ** 18]
+    )
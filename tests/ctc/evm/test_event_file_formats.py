@@ -0,0 +1,126 @@
+import pandas as pd
+import pytest
+
+from ctc.evm.event_utils import event_backends
+
+
+event_abi = {
+    'anonymous': False,
+    'inputs': [
+        {'indexed': True, 'name': 'from', 'type': 'address'},
+        {'indexed': True, 'name': 'to', 'type': 'address'},
+        {'indexed': False, 'name': 'amount', 'type': 'uint256'},
+        {'indexed': False, 'name': 'delta', 'type': 'int256'},
+        {'indexed': False, 'name': 'salt', 'type': 'bytes32'},
+    ],
+    'name': 'Example',
+    'type': 'event',
+}
+
+
+def _create_events(amounts):
+    rows = []
+    for i, amount in enumerate(amounts):
+        rows.append(
+            {
+                'block_number': 100 + i,
+                'transaction_index': 0,
+                'log_index': i,
+                'block_hash': '0x' + ('%064x' % i),
+                'transaction_hash': '0x' + ('%064x' % (i + 1000)),
+                'contract_address': '0x' + 'ab' * 20,
+                'event_name': 'Example',
+                'arg__from': '0x' + ('%040x' % i),
+                'arg__to': '0x' + ('%040x' % (i + 1)),
+                'arg__amount': amount,
+                'arg__delta': -amount,
+                'arg__salt': bytes([i]) * 32,
+            }
+        )
+    df = pd.DataFrame(rows)
+    return df.set_index(['block_number', 'transaction_index', 'log_index'])
+
+
+def test_events_file_format_is_csv_unless_configured(monkeypatch):
+    from ctc.config import config_read
+
+    monkeypatch.setattr(
+        config_read, 'get_config', lambda **kwargs: {'db_configs': {}}
+    )
+    assert event_backends.get_events_file_format() == 'csv'
+
+    monkeypatch.setattr(
+        config_read,
+        'get_config',
+        lambda **kwargs: {'db_configs': {}, 'events_file_format': 'parquet'},
+    )
+    assert event_backends.get_events_file_format() == 'parquet'
+
+
+@pytest.mark.parametrize('file_format', ['parquet', 'feather'])
+def test_columnar_round_trip(tmp_path, file_format):
+    pytest.importorskip('pyarrow')
+
+    amounts = [0, 5, 2 ** 255 - 1, 10 ** 30]
+    events = _create_events(amounts)
+    path = str(tmp_path / ('100__to__103.' + file_format))
+    event_backends.write_columnar_events_file(
+        events, path, file_format=file_format, event_abi=event_abi
+    )
+
+    loaded = event_backends.read_events_file(path)
+    assert list(loaded.index.names) == list(events.index.names)
+    assert list(loaded['arg__amount']) == amounts
+    assert list(loaded['arg__delta']) == [-amount for amount in amounts]
+    assert list(loaded['arg__from']) == list(events['arg__from'])
+    assert loaded['arg__salt'].iloc[1] == '0x' + '01' * 32
+    assert list(loaded['block_hash']) == list(events['block_hash'])
+
+    # small integers are loaded as int64, like events from a node
+    small = _create_events([1, 2, 3])
+    event_backends.write_columnar_events_file(
+        small, path, file_format=file_format, event_abi=event_abi
+    )
+    loaded = event_backends.read_events_file(path)
+    assert loaded['arg__amount'].dtype == 'int64'
+    assert list(loaded['arg__delta']) == [-1, -2, -3]
+
+
+def test_columnar_projection_and_block_range(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    events = _create_events(list(range(10)))
+    path = str(tmp_path / '100__to__109.parquet')
+    event_backends.write_columnar_events_file(
+        events, path, file_format='parquet', event_abi=event_abi
+    )
+
+    loaded = event_backends.read_events_file(
+        path, columns=['arg__amount'], start_block=103, end_block=105
+    )
+    assert list(loaded.columns) == ['arg__amount']
+    assert list(loaded.index.get_level_values('block_number')) == [
+        103,
+        104,
+        105,
+    ]
+    assert list(loaded['arg__amount']) == [3, 4, 5]
+
+
+def test_csv_and_parquet_load_identically(tmp_path):
+    pytest.importorskip('pyarrow')
+
+    events = _create_events([1, 2 ** 200])
+    csv_path = str(tmp_path / '100__to__101.csv')
+    events.to_csv(csv_path)
+    from_csv = event_backends.read_events_file(csv_path, event_abi=event_abi)
+
+    parquet_path = str(tmp_path / '100__to__101.parquet')
+    event_backends.write_columnar_events_file(
+        from_csv, parquet_path, file_format='parquet', event_abi=event_abi
+    )
+    from_parquet = event_backends.read_events_file(parquet_path)
+
+    assert list(from_parquet['arg__salt']) == list(from_csv['arg__salt'])
+    assert list(from_parquet['arg__to']) == list(from_csv['arg__to'])
+    assert list(from_parquet['arg__amount']) == [1, 2 ** 200]
@@ -0,0 +1,136 @@
+import os
+
+from ctc.evm.event_utils import event_backends
+
+
+def _touch(path):
+    with open(path, 'w'):
+        pass
+
+
+def test_block_range_queries():
+    block_ranges = [(100, 199), (300, 399), (200, 249)]
+    assert event_backends.get_block_ranges_bounds(block_ranges) == (100, 399)
+    assert event_backends.get_block_ranges_gaps(block_ranges) == [(250, 299)]
+    assert event_backends.get_block_ranges_gaps(
+        block_ranges, start_block=50, end_block=500
+    ) == [(50, 99), (250, 299), (400, 500)]
+    assert event_backends.get_block_ranges_gaps(
+        block_ranges, start_block=120, end_block=240
+    ) == []
+    assert event_backends.get_block_ranges_overlaps(block_ranges) == []
+    assert event_backends.get_block_ranges_overlaps(
+        block_ranges + [(390, 410)]
+    ) == [(390, 399)]
+    assert event_backends.get_superseded_chunks(
+        {'a.csv': (100, 199), 'b.csv': (100, 149), 'c.csv': (200, 249)}
+    ) == ['b.csv']
+
+
+def test_event_index_tracks_directory_changes(tmp_path):
+    event_dir = str(tmp_path / 'event__0xabc')
+    os.makedirs(event_dir)
+    _touch(os.path.join(event_dir, '100__to__199.csv'))
+
+    chunk_ranges = event_backends.get_event_chunk_ranges(event_dir)
+    assert chunk_ranges == {'100__to__199.csv': (100, 199)}
+    assert os.path.isfile(event_backends.get_event_index_path(event_dir))
+
+    # chunks recorded on save are served from manifest
+    path = os.path.join(event_dir, '200__to__299.parquet')
+    _touch(path)
+    event_backends.record_event_chunk(
+        path, start_block=200, end_block=299, previous_ranges=chunk_ranges
+    )
+    assert event_backends.get_event_chunk_ranges(event_dir) == {
+        '100__to__199.csv': (100, 199),
+        '200__to__299.parquet': (200, 299),
+    }
+
+    # changes made outside of ctc invalidate the manifest
+    os.remove(path)
+    _touch(os.path.join(event_dir, '.partial.tmp'))
+    assert event_backends.get_event_chunk_ranges(event_dir) == {
+        '100__to__199.csv': (100, 199),
+    }
+
+
+async def test_append_events_extends_previous_chunk(tmp_path, monkeypatch):
+    import ctc.config
+    import pandas as pd
+    from ctc.evm.event_utils.event_backends import filesystem_events
+
+    monkeypatch.setattr(ctc.config, 'get_data_dir', lambda: str(tmp_path))
+    contract_address = '0x' + 'ab' * 20
+    event_abi = {
+        'anonymous': False,
+        'inputs': [
+            {'indexed': False, 'name': 'amount', 'type': 'uint256'},
+            {'indexed': False, 'name': 'salt', 'type': 'bytes32'},
+        ],
+        'name': 'Example',
+        'type': 'event',
+    }
+    events = pd.DataFrame(
+        {
+            'block_number': [100 + 2 * i for i in range(6)],
+            'transaction_index': 0,
+            'log_index': 0,
+            'contract_address': contract_address,
+            'event_name': 'Example',
+            'arg__amount': list(range(6)),
+            'arg__salt': [bytes([i]) * 32 for i in range(6)],
+        }
+    )
+    events = events.set_index(['block_number', 'transaction_index', 'log_index'])
+    block_numbers = events.index.get_level_values('block_number')
+
+    for start_block, end_block in [(100, 104), (105, 105), (106, 110)]:
+        mask = (block_numbers >= start_block) & (block_numbers <= end_block)
+        await filesystem_events.async_append_events_to_filesystem(
+            events[mask],
+            contract_address,
+            start_block=start_block,
+            end_block=end_block,
+            event_abi=event_abi,
+            file_format='csv',
+            network='mainnet',
+            verbose=False,
+        )
+
+    listed = filesystem_events.list_events(
+        contract_address, event_abi=event_abi, network='mainnet'
+    )
+    assert list(listed['paths'].values()) == [(100, 110)]
+
+    loaded = await filesystem_events.async_get_events_from_filesystem(
+        contract_address,
+        event_abi=event_abi,
+        start_block=100,
+        end_block=110,
+        network='mainnet',
+        verbose=False,
+    )
+    assert list(loaded['arg__amount']) == list(range(6))
+    assert list(loaded['arg__salt']) == [
+        '0x' + ('%02x' % i) * 32 for i in range(6)
+    ]
+
+    # a chunk left behind by an interrupted merge is not listed or loaded
+    leftover = os.path.join(
+        os.path.dirname(list(listed['paths'].keys())[0]), '100__to__104.csv'
+    )
+    loaded.iloc[:3].to_csv(leftover)
+    listed = filesystem_events.list_events(
+        contract_address, event_abi=event_abi, network='mainnet'
+    )
+    assert list(listed['paths'].values()) == [(100, 110)]
+    reloaded = await filesystem_events.async_get_events_from_filesystem(
+        contract_address,
+        event_abi=event_abi,
+        start_block=100,
+        end_block=110,
+        network='mainnet',
+        verbose=False,
+    )
+    assert list(reloaded['arg__amount']) == list(range(6))
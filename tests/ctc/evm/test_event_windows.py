@@ -0,0 +1,493 @@
+from ctc import spec
+from ctc.evm.event_utils.event_backends import node_events
+
+
+def _create_fake_node(blocks_with_logs, max_logs, requests):
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        start_block, end_block = block_range
+        requests.append((start_block, end_block))
+        logs = [
+            {'block_number': block}
+            for block in blocks_with_logs
+            if start_block <= block <= end_block
+        ]
+        if len(logs) > max_logs:
+            raise spec.RpcException(
+                'RPC ERROR: query returned more than 10000 results'
+            )
+        return logs
+
+    return fake_get_chunk
+
+
+async def _async_get_logs(monkeypatch, blocks_with_logs, max_logs, **kwargs):
+    requests = []
+    fake = _create_fake_node(blocks_with_logs, max_logs, requests)
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake
+    )
+    logs = await node_events._async_get_logs_adaptively(
+        event_hash='0x00',
+        contract_address=None,
+        verbose=False,
+        provider=None,
+        **kwargs,
+    )
+    return logs, requests
+
+
+async def test_sparse_events_use_few_large_windows(monkeypatch):
+    blocks_with_logs = [5, 5000, 2000000, 2999999]
+    logs, requests = await _async_get_logs(
+        monkeypatch,
+        blocks_with_logs,
+        max_logs=10000,
+        start_block=0,
+        end_block=2999999,
+        blocks_per_chunk=1000,
+        max_concurrent_chunks=1,
+    )
+    assert [log['block_number'] for log in logs] == blocks_with_logs
+    assert len(requests) < 20
+
+
+async def test_dense_events_are_split_on_limit_errors(monkeypatch):
+    blocks_with_logs = list(range(0, 10000, 2)) * 3
+    blocks_with_logs.sort()
+    logs, requests = await _async_get_logs(
+        monkeypatch,
+        blocks_with_logs,
+        max_logs=500,
+        start_block=0,
+        end_block=9999,
+        blocks_per_chunk=100000,
+        max_concurrent_chunks=4,
+    )
+    assert [log['block_number'] for log in logs] == blocks_with_logs
+
+    # windows cover range exactly once, excluding windows that failed
+    succeeded = sorted(
+        (start, end)
+        for start, end in requests
+        if sum(start <= block <= end for block in blocks_with_logs) <= 500
+    )
+    covered = [
+        block for start, end in succeeded for block in range(start, end + 1)
+    ]
+    assert covered == list(range(10000))
+
+
+async def test_single_block_over_limit_raises(monkeypatch):
+    import pytest
+
+    with pytest.raises(spec.RpcException):
+        await _async_get_logs(
+            monkeypatch,
+            [7] * 20,
+            max_logs=10,
+            start_block=0,
+            end_block=100,
+            blocks_per_chunk=100,
+            max_concurrent_chunks=2,
+        )
+
+
+async def test_non_limit_errors_are_not_split(monkeypatch):
+    import pytest
+
+    requests = []
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        requests.append(tuple(block_range))
+        raise spec.RpcException('RPC ERROR: rate limit exceeded')
+
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    with pytest.raises(spec.RpcException, match='rate limit'):
+        await node_events._async_get_logs_adaptively(
+            event_hash='0x00',
+            contract_address=None,
+            verbose=False,
+            provider=None,
+            start_block=0,
+            end_block=999,
+            blocks_per_chunk=1000,
+            max_concurrent_chunks=1,
+        )
+    assert requests == [(0, 999)]
+
+
+async def test_persistent_limit_errors_stop_splitting(monkeypatch):
+    import pytest
+
+    requests = []
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        requests.append(tuple(block_range))
+        raise spec.RpcException(
+            'RPC ERROR: query returned more than 10000 results'
+            + str(len(requests))
+        )
+
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    with pytest.raises(spec.RpcException, match='10000 results1$'):
+        await node_events._async_get_logs_adaptively(
+            event_hash='0x00',
+            contract_address=None,
+            verbose=False,
+            provider=None,
+            start_block=0,
+            end_block=999999,
+            blocks_per_chunk=1000000,
+            max_concurrent_chunks=1,
+        )
+    assert len(requests) <= node_events._max_split_depth + 1
+
+
+ping_abi = {
+    'anonymous': False,
+    'inputs': [{'indexed': False, 'name': 'value', 'type': 'uint256'}],
+    'name': 'Ping',
+    'type': 'event',
+}
+pong_abi = {
+    'anonymous': False,
+    'inputs': [{'indexed': False, 'name': 'value', 'type': 'uint256'}],
+    'name': 'Pong',
+    'type': 'event',
+}
+
+
+def _create_log(block_number, address, event_abi, value):
+    from ctc import binary
+
+    return {
+        'removed': False,
+        'log_index': 0,
+        'transaction_index': 0,
+        'transaction_hash': '0x' + '11' * 32,
+        'block_hash': '0x' + '22' * 32,
+        'block_number': block_number,
+        'address': address,
+        'data': '0x' + '%064x' % value,
+        'topics': [binary.get_event_hash(event_abi)],
+    }
+
+
+async def test_contract_events_are_fetched_in_one_sweep(monkeypatch):
+    from ctc import binary
+
+    addresses = ['0x' + 'aa' * 20, '0x' + 'bb' * 20]
+    event_abis = [ping_abi, pong_abi]
+    logs = [
+        _create_log(
+            block, addresses[block % 2], event_abis[block % 3 % 2], block
+        )
+        for block in range(0, 100, 5)
+    ]
+    requests = []
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        requests.append((list(contract_address), list(event_hash)))
+        start_block, end_block = block_range
+        return [
+            log
+            for log in logs
+            if start_block <= log['block_number'] <= end_block
+        ]
+
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    contract_event_abis = {
+        (address, binary.get_event_hash(event_abi)): event_abi
+        for address in addresses
+        for event_abi in [ping_abi, pong_abi]
+    }
+    dfs = await node_events.async_get_contract_events_from_node(
+        contract_event_abis,
+        start_block=0,
+        end_block=99,
+        verbose=False,
+        provider=None,
+    )
+
+    assert len(requests) == 1
+    assert sorted(requests[0][0]) == addresses
+    assert len(requests[0][1]) == 2
+    for (address, event_hash), df in dfs.items():
+        expected = [
+            log['block_number']
+            for log in logs
+            if log['address'] == address and log['topics'][0] == event_hash
+        ]
+        assert list(df['arg__value']) == expected
+        assert list(df.index.get_level_values('block_number')) == expected
+
+
+def test_merge_block_ranges():
+    from ctc.evm.event_utils import event_crud
+
+    ranges = [(10, 20), (0, 4), (5, 8), (15, 30), (40, 50)]
+    assert event_crud._merge_block_ranges(ranges) == [
+        (0, 8),
+        (10, 30),
+        (40, 50),
+    ]
+
+
+async def test_event_chunks_are_streamed_in_block_order(monkeypatch):
+    import asyncio
+    import random
+
+    address = '0x' + 'aa' * 20
+    logs = [
+        _create_log(block, address, ping_abi, block)
+        for block in range(0, 200, 3)
+    ]
+    requests = []
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        requests.append(block_range)
+        await asyncio.sleep(random.random() * 0.01)
+        start_block, end_block = block_range
+        return [
+            log
+            for log in logs
+            if start_block <= log['block_number'] <= end_block
+        ]
+
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    chunks = node_events.async_iterate_event_chunks_from_node(
+        address,
+        event_abi=ping_abi,
+        start_block=0,
+        end_block=199,
+        blocks_per_chunk=10,
+        max_concurrent_chunks=4,
+        max_buffered_chunks=2,
+        verbose=False,
+    )
+
+    next_block = 0
+    values = []
+    n_chunks = 0
+    async for chunk_start, chunk_end, df in chunks:
+        assert chunk_start == next_block
+        next_block = chunk_end + 1
+        values.extend(df['arg__value'])
+        n_chunks += 1
+
+        # workers do not run ahead of consumer by more than buffer allows
+        assert len(requests) <= n_chunks + 2 + 4
+        await asyncio.sleep(0.01)
+
+    assert next_block == 200
+    assert values == [log['block_number'] for log in logs]
+
+
+async def test_iterate_events_uses_filesystem_and_node(tmp_path, monkeypatch):
+    import ctc.config
+    import pandas as pd
+    from ctc import rpc
+    from ctc.evm.event_utils import event_crud
+    from ctc.evm.event_utils.event_backends import filesystem_events
+
+    address = '0x' + 'aa' * 20
+    logs = [
+        _create_log(block, address, ping_abi, block)
+        for block in range(0, 100, 3)
+    ]
+    requests = []
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        requests.append(tuple(block_range))
+        start_block, end_block = block_range
+        return [
+            log
+            for log in logs
+            if start_block <= log['block_number'] <= end_block
+        ]
+
+    async def fake_get_max_confirmed_block(provider):
+        return 79
+
+    monkeypatch.setattr(ctc.config, 'get_data_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(
+        rpc, 'get_provider', lambda provider: {'network': 'mainnet'}
+    )
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    monkeypatch.setattr(
+        event_crud,
+        '_async_get_max_confirmed_block',
+        fake_get_max_confirmed_block,
+    )
+    monkeypatch.setattr(event_crud, 'max_unsaved_stream_rows', 4)
+
+    async def async_iterate(start_block, end_block):
+        chunks = []
+        async for chunk in event_crud.async_iterate_events(
+            address,
+            event_abi=ping_abi,
+            start_block=start_block,
+            end_block=end_block,
+            verbose=False,
+        ):
+            chunks.append(chunk)
+        return pd.concat(chunks)
+
+    first = await async_iterate(20, 39)
+    assert list(first['arg__value']) == list(range(21, 40, 3))
+
+    requests.clear()
+    events = await async_iterate(0, 99)
+    assert list(events['arg__value']) == list(range(0, 100, 3))
+    assert all(end < 20 or start > 39 for start, end in requests)
+
+    listed = filesystem_events.list_events(
+        address, event_abi=ping_abi, network='mainnet'
+    )
+    assert listed['block_range'] == (0, 79)
+    assert not listed['missing_blocks']
+
+
+async def test_events_decoded_in_process_pool(monkeypatch):
+    from ctc import rpc
+
+    address = '0x' + 'aa' * 20
+    logs = [
+        _create_log(block, address, ping_abi, 2 ** 200 + block)
+        for block in range(0, 1000, 7)
+    ]
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        start_block, end_block = block_range
+        return [
+            log
+            for log in logs
+            if start_block <= log['block_number'] <= end_block
+        ]
+
+    monkeypatch.setattr(
+        rpc, 'get_provider', lambda provider: {'network': 'mainnet'}
+    )
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+
+    kwargs = dict(
+        contract_address=address,
+        event_abi=ping_abi,
+        start_block=0,
+        end_block=999,
+        blocks_per_chunk=50,
+        verbose=False,
+    )
+    try:
+        in_pool = await node_events.async_get_events_from_node(
+            decode_processes=2, **kwargs
+        )
+    finally:
+        node_events.shutdown_decode_pools()
+    in_process = await node_events.async_get_events_from_node(**kwargs)
+
+    assert in_pool.equals(in_process)
+    assert list(in_pool['arg__value']) == [
+        2 ** 200 + block for block in range(0, 1000, 7)
+    ]
+
+
+async def test_event_crud_forwards_decode_processes(tmp_path, monkeypatch):
+    import concurrent.futures
+    import ctc.config
+    import pandas as pd
+    from ctc import rpc
+    from ctc.evm.event_utils import event_crud
+
+    address = '0x' + 'aa' * 20
+    logs = [
+        _create_log(block, address, ping_abi, block)
+        for block in range(0, 100, 3)
+    ]
+
+    async def fake_get_chunk(
+        block_range, event_hash, *, contract_address, verbose, provider
+    ):
+        start_block, end_block = block_range
+        return [
+            log
+            for log in logs
+            if start_block <= log['block_number'] <= end_block
+        ]
+
+    async def fake_get_max_confirmed_block(provider):
+        return 79
+
+    # decode in threads so that pool usage can be observed
+    requested_pools = []
+    thread_pool = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
+    def get_decode_pool(n_processes):
+        requested_pools.append(n_processes)
+        return thread_pool
+
+    monkeypatch.setattr(ctc.config, 'get_data_dir', lambda: str(tmp_path))
+    monkeypatch.setattr(
+        rpc, 'get_provider', lambda provider: {'network': 'mainnet'}
+    )
+    monkeypatch.setattr(
+        node_events, '_async_get_chunk_of_events_from_node', fake_get_chunk
+    )
+    monkeypatch.setattr(node_events, 'get_decode_pool', get_decode_pool)
+    monkeypatch.setattr(
+        event_crud,
+        '_async_get_max_confirmed_block',
+        fake_get_max_confirmed_block,
+    )
+
+    chunks = []
+    async for chunk in event_crud.async_iterate_events(
+        address,
+        event_abi=ping_abi,
+        start_block=0,
+        end_block=49,
+        decode_processes=2,
+        verbose=False,
+    ):
+        chunks.append(chunk)
+    assert list(pd.concat(chunks)['arg__value']) == list(range(0, 50, 3))
+    assert len(requested_pools) > 0 and set(requested_pools) == {2}
+
+    requested_pools.clear()
+    events = await event_crud.async_download_events(
+        address,
+        event_abi=ping_abi,
+        start_block=50,
+        end_block=99,
+        decode_processes=2,
+        verbose=False,
+    )
+    assert list(events['arg__value']) == list(range(51, 100, 3))
+    assert len(requested_pools) > 0 and set(requested_pools) == {2}
+    thread_pool.shutdown()
@@ -0,0 +1,146 @@
+import os
+import tempfile
+
+from ctc import rpc
+
+
+def _get_handler(calls):
+    from aiohttp import web
+
+    async def handler(http_request):
+        data = await http_request.json()
+        subrequests = data if isinstance(data, list) else [data]
+        responses = []
+        for subrequest in subrequests:
+            calls.append(subrequest['method'])
+            if subrequest['method'] == 'eth_blockNumber':
+                result = hex(10000)
+            else:
+                result = '0x' + subrequest['params'][-1][2:].zfill(64)
+            responses.append(
+                {'jsonrpc': '2.0', 'id': subrequest['id'], 'result': result}
+            )
+        if isinstance(data, list):
+            return web.json_response(responses)
+        else:
+            return web.json_response(responses[0])
+
+    return handler
+
+
+def _create_call(block_number):
+    return rpc.construct_eth_call(
+        to_address='0x956F47F50A910163D8BF957Cf5846D573E7f87CA',
+        call_data='0x18160ddd',
+        block_number=block_number,
+    )
+
+
+async def test_response_cache_only_reuses_finalized_calls(
+    create_provider, start_server
+):
+    calls = []
+    runner, url = await start_server(_get_handler(calls))
+    rpc.configure_response_cache(
+        path=os.path.join(tempfile.mkdtemp(), 'responses.db')
+    )
+    rpc.clear_response_cache()
+    rpc.reset_response_cache_stats()
+    provider = create_provider(url, cache_responses=True)
+    try:
+        # finalized blocks are fetched once
+        for i in range(3):
+            result = await rpc.async_send(_create_call(100), provider=provider)
+            assert result == '0x' + hex(100)[2:].zfill(64)
+        assert calls.count('eth_call') == 1
+
+        # unfinalized blocks are always fetched
+        for i in range(2):
+            await rpc.async_send(_create_call(9999), provider=provider)
+        assert calls.count('eth_call') == 3
+
+        # plural requests only send uncached subrequests
+        request = [_create_call(block) for block in [100, 101, 102]]
+        result = await rpc.async_send(request, provider=provider)
+        assert result == ['0x' + hex(b)[2:].zfill(64) for b in [100, 101, 102]]
+        assert calls.count('eth_call') == 5
+
+        # disk tier survives clearing memory tier
+        rpc.clear_response_cache()
+        await rpc.async_send(_create_call(101), provider=provider)
+        assert calls.count('eth_call') == 5
+
+        stats = rpc.get_response_cache_stats()
+        assert stats['disk_hits'] == 1
+        assert stats['memory_hits'] == 3
+
+    finally:
+        await rpc.async_close_http_session(provider)
+        rpc.close_response_cache()
+        await runner.cleanup()
+
+
+async def test_response_cache_disk_io_runs_off_event_loop(
+    monkeypatch, create_provider, start_server
+):
+    import threading
+
+    from ctc.rpc import rpc_cache
+
+    calls = []
+    runner, url = await start_server(_get_handler(calls))
+    rpc.configure_response_cache(
+        path=os.path.join(tempfile.mkdtemp(), 'responses.db')
+    )
+    rpc.clear_response_cache()
+    provider = create_provider(url, cache_responses=True)
+
+    disk_threads = []
+    get_disk_connection = rpc_cache._get_disk_connection
+
+    def recorded_get_disk_connection():
+        disk_threads.append(threading.current_thread())
+        return get_disk_connection()
+
+    monkeypatch.setattr(
+        rpc_cache, '_get_disk_connection', recorded_get_disk_connection
+    )
+    try:
+        request = [_create_call(block) for block in [100, 101]]
+        await rpc.async_send(request, provider=provider)
+        rpc.clear_response_cache()
+        await rpc.async_send(request, provider=provider)
+        assert calls.count('eth_call') == 2
+
+        assert len(disk_threads) > 0
+        assert threading.current_thread() not in disk_threads
+
+    finally:
+        await rpc.async_close_http_session(provider)
+        rpc.close_response_cache()
+        await runner.cleanup()
+
+
+def test_response_cache_size_counts_only_inserted_rows():
+    from ctc.rpc import rpc_cache
+
+    rpc.configure_response_cache(
+        path=os.path.join(tempfile.mkdtemp(), 'responses.db')
+    )
+    try:
+        entries = [('key1', 'eth_call', '0x1234'), ('key2', 'eth_call', '0x56')]
+        rpc_cache._put_disk_entries(entries, network=1)
+        rpc_cache._put_disk_entries(entries, network=1)
+        rpc_cache._put_disk_entries(
+            [('key2', 'eth_call', '0x56'), ('key3', 'eth_call', '0x7890')],
+            network=1,
+        )
+
+        connection = rpc_cache._get_disk_connection()
+        (n_bytes,) = connection.execute(
+            'SELECT SUM(size) FROM responses'
+        ).fetchone()
+        assert n_bytes == 16
+        assert rpc_cache._disk_state['n_bytes'] == n_bytes
+    finally:
+        rpc.close_response_cache()
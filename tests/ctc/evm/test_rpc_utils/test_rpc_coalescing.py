@@ -0,0 +1,105 @@
+import asyncio
+
+from ctc import rpc
+
+
+def _get_handler(posts):
+    from aiohttp import web
+
+    async def handler(http_request):
+        data = await http_request.json()
+        posts.append(data)
+        await asyncio.sleep(0.01)
+        subrequests = data if isinstance(data, list) else [data]
+        responses = [
+            {
+                'jsonrpc': '2.0',
+                'id': subrequest['id'],
+                'result': subrequest['params'],
+            }
+            for subrequest in subrequests
+        ]
+        if isinstance(data, list):
+            return web.json_response(responses)
+        else:
+            return web.json_response(responses[0])
+
+    return handler
+
+
+async def test_identical_concurrent_requests_share_one_request(
+    create_provider, start_server
+):
+    posts = []
+    runner, url = await start_server(_get_handler(posts))
+    provider = create_provider(url)
+    try:
+        requests = [
+            rpc.create('eth_getBalance', ['0x1', '0x2']) for i in range(10)
+        ]
+        results = await asyncio.gather(
+            *[
+                rpc.async_send(request, provider=provider)
+                for request in requests
+            ]
+        )
+        assert results == [['0x1', '0x2']] * 10
+        assert len(posts) == 1
+
+        # results are not shared between callers
+        assert len({id(result) for result in results}) == 10
+
+    finally:
+        await rpc.async_close_http_session(provider)
+        await runner.cleanup()
+
+
+async def test_microbatch_window_merges_independent_requests(
+    create_provider, start_server
+):
+    posts = []
+    runner, url = await start_server(_get_handler(posts))
+    provider = create_provider(url, microbatch_window=0.01, chunk_size=4)
+    try:
+        requests = [rpc.create('eth_getBalance', [hex(i)]) for i in range(6)]
+        results = await asyncio.gather(
+            *[
+                rpc.async_send(request, provider=provider)
+                for request in requests
+            ]
+        )
+        assert results == [[hex(i)] for i in range(6)]
+        assert [len(post) for post in posts] == [4, 2]
+
+    finally:
+        await rpc.async_close_http_session(provider)
+        await runner.cleanup()
+
+
+async def test_coalesced_callers_can_modify_their_results(
+    monkeypatch, create_provider
+):
+    from ctc.rpc import rpc_coalescing
+
+    async def async_send_microbatched(request, provider):
+        await asyncio.sleep(0.01)
+        return {'jsonrpc': '2.0', 'id': request['id'], 'result': {'a': [1]}}
+
+    monkeypatch.setattr(
+        rpc_coalescing, '_async_send_microbatched', async_send_microbatched
+    )
+    provider = create_provider()
+
+    async def async_send_and_modify(request):
+        response = await rpc_coalescing.async_send_coalesced(request, provider)
+        result = response['result']
+        assert result == {'a': [1]}
+        result['a'].append(2)
+        response['result'] = None
+        return result
+
+    requests = [rpc.create('eth_getBalance', ['0x1']) for i in range(2)]
+    results = await asyncio.gather(
+        *[async_send_and_modify(request) for request in requests]
+    )
+    assert results == [{'a': [1, 2]}] * 2
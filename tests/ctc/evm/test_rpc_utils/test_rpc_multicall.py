@@ -0,0 +1,145 @@
+import eth_abi_lite
+import pytest
+
+from ctc import rpc
+from ctc import spec
+from ctc.rpc import rpc_request
+from ctc.evm.erc20_utils import erc20_spec
+
+balance_of_abi = erc20_spec.erc20_function_abis['balanceOf']
+wallet = '0x' + 'ab' * 20
+tokens = ['0x' + hex(i)[2:].zfill(40) for i in range(1, 501)]
+reverting_token = tokens[7]
+out_of_gas_token = tokens[3]
+multicall_block = 16000000
+
+
+def _get_balance(token):
+    return int(token, 16) * 10**18
+
+
+def _use_simulated_node(monkeypatch):
+    """simulate Multicall3 and erc20 balanceOf calls"""
+
+    requests = []
+
+    async def async_send(request, provider=None):
+        if isinstance(request, dict):
+            requests.append(request)
+            if request['params'][0]['to'] == reverting_token:
+                if provider['convert_reverts_to_none']:
+                    return None
+                raise spec.RpcException('RPC ERROR: execution reverted')
+            output = eth_abi_lite.encode_single(
+                'uint256', _get_balance(request['params'][0]['to'])
+            )
+            return '0x' + output.hex()
+
+        requests.extend(request)
+        results = []
+        for subrequest in request:
+            call_object, block_number = subrequest['params']
+            target = call_object['to']
+            if target == rpc.multicall3_address:
+                assert int(block_number, 16) >= 14353601
+                assert int(call_object['gas'], 16) == (rpc.multicall_gas_budget)
+                require_success, calls = eth_abi_lite.decode_single(
+                    '(bool,(address,bytes)[])',
+                    bytes.fromhex(call_object['data'][10:]),
+                )
+                outputs = []
+                for address, call_data in calls:
+                    # out of gas subcalls fail only inside a multicall
+                    if address in (reverting_token, out_of_gas_token):
+                        outputs.append((False, b''))
+                    else:
+                        output = eth_abi_lite.encode_single(
+                            'uint256', _get_balance(address)
+                        )
+                        outputs.append((True, output))
+                encoded = eth_abi_lite.encode_single(
+                    '((bool,bytes)[])', [outputs]
+                )
+                results.append('0x' + encoded.hex())
+            else:
+                output = eth_abi_lite.encode_single(
+                    'uint256', _get_balance(target)
+                )
+                results.append('0x' + output.hex())
+        return results
+
+    monkeypatch.setattr(rpc_request, 'async_send', async_send)
+    return requests
+
+
+@pytest.mark.asyncio
+async def test_batch_eth_call_uses_multicall(monkeypatch, create_provider):
+    requests = _use_simulated_node(monkeypatch)
+
+    balances = await rpc.async_batch_eth_call(
+        function_abi=balance_of_abi,
+        to_addresses=tokens,
+        function_parameters=[wallet],
+        block_number=multicall_block,
+        provider=create_provider(convert_reverts_to_none=True),
+    )
+    # two multicalls, then a retry of each failed subcall
+    assert len(requests) == 4
+    assert sorted(request['params'][0]['to'] for request in requests[2:]) == [
+        out_of_gas_token,
+        reverting_token,
+    ]
+    assert len(balances) == len(tokens)
+    for token, balance in zip(tokens, balances):
+        if token == reverting_token:
+            assert balance is None
+        else:
+            assert balance == _get_balance(token)
+
+    with pytest.raises(spec.RpcException):
+        await rpc.async_batch_eth_call(
+            function_abi=balance_of_abi,
+            to_addresses=tokens[:10],
+            function_parameters=[wallet],
+            block_number=multicall_block,
+            provider=create_provider(convert_reverts_to_none=False),
+        )
+
+
+@pytest.mark.asyncio
+async def test_batch_eth_call_without_multicall(monkeypatch, create_provider):
+    requests = _use_simulated_node(monkeypatch)
+    provider = create_provider(convert_reverts_to_none=False)
+
+    # blocks before Multicall3 deployment use a plain batch
+    balances = await rpc.async_batch_eth_call(
+        function_abi=balance_of_abi,
+        to_addresses=tokens[:5],
+        function_parameters=[wallet],
+        block_number=14000000,
+        provider=provider,
+    )
+    assert balances == [_get_balance(token) for token in tokens[:5]]
+    assert [request['params'][0]['to'] for request in requests] == tokens[:5]
+
+    requests.clear()
+    balances = await rpc.async_batch_eth_call(
+        function_abi=balance_of_abi,
+        to_addresses=tokens[:5],
+        function_parameters=[wallet],
+        block_number=multicall_block,
+        provider=provider,
+        multicall=False,
+    )
+    assert balances == [_get_balance(token) for token in tokens[:5]]
+    assert len(requests) == 5
+
+    with pytest.raises(Exception):
+        await rpc.async_batch_eth_call(
+            function_abi=balance_of_abi,
+            to_addresses=tokens[:5],
+            function_parameters=[wallet],
+            block_number=14000000,
+            provider=provider,
+            multicall=True,
+        )
@@ -0,0 +1,47 @@
+import asyncio
+
+from ctc import rpc
+
+
+async def test_scheduler_bounds_requests_in_flight(create_provider):
+    provider = create_provider(
+        'http://scheduler_bound', max_concurrent_requests=4
+    )
+    state = {'in_flight': 0, 'max_in_flight': 0}
+
+    async def async_fake_request():
+        t_start = await rpc.async_acquire_request_slot(provider)
+        state['in_flight'] += 1
+        state['max_in_flight'] = max(state['max_in_flight'], state['in_flight'])
+        await asyncio.sleep(0.001)
+        state['in_flight'] -= 1
+        rpc.release_request_slot(provider, t_start=t_start, success=True)
+
+    await asyncio.gather(*[async_fake_request() for i in range(50)])
+    assert state['max_in_flight'] == 4
+    assert rpc.get_request_window(provider) == 4
+
+
+async def test_scheduler_shrinks_window_on_errors(create_provider):
+    provider = create_provider('http://scheduler_shrink')
+    initial_window = rpc.get_request_window(provider)
+
+    t_start = await rpc.async_acquire_request_slot(provider)
+    rpc.release_request_slot(provider, t_start=t_start, success=False)
+    assert rpc.get_request_window(provider) == initial_window // 2
+
+    # failures of requests sent before the last decrease are not recounted
+    rpc.release_request_slot(provider, t_start=t_start - 1, success=False)
+    assert rpc.get_request_window(provider) == initial_window // 2
+
+
+async def test_scheduler_rate_limits_requests(create_provider):
+    provider = create_provider(
+        'http://scheduler_rate', max_requests_per_second=100
+    )
+    loop = asyncio.get_running_loop()
+    t_start = loop.time()
+    for i in range(10):
+        t_request = await rpc.async_acquire_request_slot(provider)
+        rpc.release_request_slot(provider, t_start=t_request, success=True)
+    assert loop.time() - t_start >= 0.08
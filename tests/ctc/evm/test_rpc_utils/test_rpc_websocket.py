@@ -0,0 +1,137 @@
+import asyncio
+import json
+
+import pytest
+
+from ctc import rpc
+
+
+def _get_handler(delays, connection_counter):
+    from aiohttp import web
+
+    async def respond(websocket, request):
+        await asyncio.sleep(delays.get(request['method'], 0))
+        response = {
+            'jsonrpc': '2.0',
+            'id': request['id'],
+            'result': request['method'],
+        }
+        await websocket.send_str(json.dumps(response))
+
+    async def handler(http_request):
+        connection_counter.append(1)
+        websocket = web.WebSocketResponse()
+        await websocket.prepare(http_request)
+        async for message in websocket:
+            data = json.loads(message.data)
+            if isinstance(data, list):
+                responses = [
+                    {
+                        'jsonrpc': '2.0',
+                        'id': item['id'],
+                        'result': item['method'],
+                    }
+                    for item in data
+                ]
+                await websocket.send_str(json.dumps(responses[::-1]))
+            else:
+                asyncio.create_task(respond(websocket, data))
+        return websocket
+
+    return handler
+
+
+async def test_websocket_multiplexes_requests_on_one_connection(
+    create_provider, start_server
+):
+    connection_counter = []
+    delays = {'slow_method': 0.2}
+    runner, url = await start_server(
+        _get_handler(delays, connection_counter), websocket=True
+    )
+    provider = create_provider(url, protocol='wss')
+    try:
+        requests = [
+            rpc.create('slow_method', []),
+            rpc.create('fast_method', []),
+            rpc.create('fast_method', []),
+        ]
+
+        # identical ids across concurrent requests should not collide
+        requests[2]['id'] = requests[1]['id']
+
+        results = await asyncio.gather(
+            *[
+                rpc.async_send(request, provider=provider)
+                for request in requests
+            ]
+        )
+        assert results == ['slow_method', 'fast_method', 'fast_method']
+
+        plural_request = [rpc.create('method_' + str(i), []) for i in range(5)]
+        result = await rpc.async_send(plural_request, provider=provider)
+        assert result == ['method_' + str(i) for i in range(5)]
+
+        assert len(connection_counter) == 1
+
+    finally:
+        await rpc.async_close_websocket_connection(provider)
+        await runner.cleanup()
+
+
+async def test_websocket_reconnects_after_close(create_provider, start_server):
+    connection_counter = []
+    runner, url = await start_server(
+        _get_handler({}, connection_counter), websocket=True
+    )
+    provider = create_provider(url, protocol='wss')
+    try:
+        request = rpc.create('some_method', [])
+        assert await rpc.async_send(request, provider=provider) == 'some_method'
+        await rpc.async_close_websocket_connection(provider)
+
+        request = rpc.create('some_method', [])
+        assert await rpc.async_send(request, provider=provider) == 'some_method'
+        assert len(connection_counter) == 2
+
+    finally:
+        await rpc.async_close_websocket_connection(provider)
+        await runner.cleanup()
+
+
+async def test_websocket_request_times_out_without_response(
+    create_provider, start_server
+):
+    import aiohttp
+    from ctc.rpc.rpc_protocols import rpc_websocket_async
+
+    connection_counter = []
+    delays = {'stuck_method': 60}
+    runner, url = await start_server(
+        _get_handler(delays, connection_counter), websocket=True
+    )
+    provider = create_provider(url, protocol='wss')
+    timeout = aiohttp.ClientTimeout(total=0.2)
+    provider['session_kwargs'] = {'timeout': timeout}
+    try:
+        assert rpc_websocket_async._get_request_timeout(provider) == 0.2
+        connection = await rpc_websocket_async._async_get_websocket_connection(
+            provider
+        )
+        request = rpc.create('stuck_method', [])
+        with pytest.raises(asyncio.TimeoutError):
+            await rpc_websocket_async._async_send_over_connection(
+                request, connection, timeout=0.2
+            )
+        assert connection['pending'] == {}
+
+        # connection is still usable for requests that get responses
+        request = rpc.create('some_method', [])
+        result = await rpc_websocket_async._async_send_over_connection(
+            request, connection, timeout=0.2
+        )
+        assert result['result'] == 'some_method'
+
+    finally:
+        await rpc.async_close_websocket_connection(provider)
+        await runner.cleanup()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+
+import pytest
+
+from ctc.protocols import fei_utils
+from ctc.protocols.fei_utils.analytics import metric_crud
+from ctc.protocols.fei_utils.analytics import timestamp_crud
+
+
+start_time = 1650000000
+timescale = {'window_size': '1h', 'interval_size': '5 minutes'}
+
+
+def _use_simulated_metrics(monkeypatch):
+    """simulate block lookups and metrics, recording what is requested"""
+
+    requested = {'timestamps': [], 'blocks': []}
+
+    async def async_get_timestamps_blocks(timestamps, *, provider):
+        requested['timestamps'].extend(timestamps)
+        return [(timestamp - start_time) // 12 for timestamp in timestamps]
+
+    async def async_get_metrics(blocks, verbose=False):
+        requested['blocks'].extend(blocks)
+        return {
+            'pcv_stats': {
+                'name': 'PCV Statistics',
+                'metrics': {
+                    'pcv_total': {
+                        'name': 'PCV Total',
+                        'values': [block * 2.0 for block in blocks],
+                    },
+                    'cr': {
+                        'name': 'Collateralization Ratio',
+                        'values': [block / 10.0 for block in blocks],
+                    },
+                },
+            },
+        }
+
+    monkeypatch.setattr(
+        timestamp_crud,
+        'async_get_timestamps_blocks',
+        async_get_timestamps_blocks,
+    )
+    monkeypatch.setattr(metric_crud, 'async_get_metrics', async_get_metrics)
+    return requested
+
+
+def _without_creation_time(payload):
+    return {k: v for k, v in payload.items() if k != 'created_at_timestamp'}
+
+
+@pytest.mark.asyncio
+async def test_update_payload_computes_only_new_samples(monkeypatch):
+    requested = _use_simulated_metrics(monkeypatch)
+
+    old_payload = await fei_utils.async_create_payload(
+        timescale=timescale, end_time=start_time + 7200
+    )
+    assert old_payload['n_samples'] == 12
+
+    requested['timestamps'].clear()
+    requested['blocks'].clear()
+    payload = await fei_utils.async_update_payload(
+        old_payload, end_time=start_time + 7200 + 600
+    )
+
+    # only two new timestamps plus the previous last sample are resolved
+    new_timestamps = payload['timestamps'][-3:]
+    assert requested['timestamps'] == new_timestamps
+    assert requested['blocks'] == payload['block_numbers'][-4:]
+
+    expected = await fei_utils.async_create_payload(
+        timescale=timescale, end_time=start_time + 7200 + 600
+    )
+    assert _without_creation_time(payload) == _without_creation_time(expected)
+
+
+@pytest.mark.asyncio
+async def test_refresh_payload_store(monkeypatch):
+    requested = _use_simulated_metrics(monkeypatch)
+    path = os.path.join(tempfile.mkdtemp(), 'payload.json')
+
+    created = await fei_utils.async_refresh_payload(
+        timescale, path=path, end_time=start_time + 7200
+    )
+    assert fei_utils.load_payload(path) == created
+    assert len(requested['timestamps']) == 12
+
+    # a window with no overlap is rebuilt from scratch
+    requested['timestamps'].clear()
+    refreshed = await fei_utils.async_refresh_payload(
+        timescale, path=path, end_time=start_time + 7200 * 3
+    )
+    assert fei_utils.load_payload(path) == refreshed
+    assert len(requested['timestamps']) == 12
+    assert refreshed['timestamps'][0] > created['timestamps'][-1]
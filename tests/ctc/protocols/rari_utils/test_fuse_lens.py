@@ -0,0 +1,129 @@
+import eth_abi_lite
+
+from ctc import rpc
+from ctc import spec
+from ctc.rpc import rpc_request
+from ctc.protocols.rari_utils import fuse_queries
+from ctc.protocols.rari_utils.fuse_lens import primary_lens
+
+lens_address = '0x6dc585ad66a10214ef0502492b0cc02f0e836eec'
+
+
+async def test_pool_summaries_use_single_batch(monkeypatch, create_provider):
+    provider = create_provider()
+    comptrollers = ['0x' + str(i) * 40 for i in range(1, 4)]
+    all_pools = [
+        ['pool ' + str(i), '0x' + '0' * 40, comptroller, 0, 0]
+        for i, comptroller in enumerate(comptrollers)
+    ]
+
+    async def async_get_all_pools(block=None, provider=None):
+        return all_pools
+
+    batches = []
+
+    async def async_batch_eth_call(**kwargs):
+        batches.append(kwargs)
+        return [
+            None if parameters[0] == comptrollers[1] else [1, 2, [], [], True]
+            for parameters in kwargs['function_parameter_list']
+        ]
+
+    monkeypatch.setattr(
+        fuse_queries, 'async_get_all_pools', async_get_all_pools
+    )
+    monkeypatch.setattr(rpc, 'async_batch_eth_call', async_batch_eth_call)
+
+    result = await primary_lens.async_get_public_pools_with_data(
+        lens_address=lens_address, provider=provider, block=15000000
+    )
+
+    # one batch for all pools, with a revert only failing its own pool
+    assert len(batches) == 1
+    assert batches[0]['to_address'] == lens_address
+    assert batches[0]['function_parameter_list'] == [
+        [comptroller] for comptroller in comptrollers
+    ]
+    assert batches[0]['provider']['convert_reverts_to_none']
+    assert not provider['convert_reverts_to_none']
+    assert result['errored'] == [False, True, False]
+    assert result['data'][1] is None
+    assert result['data'][0]['whitelisted_admin'] is True
+
+
+async def test_pool_summaries_retry_failed_multicall_subcalls(
+    monkeypatch, create_provider
+):
+    provider = create_provider()
+    comptrollers = ['0x' + str(i) * 40 for i in range(1, 4)]
+    heavy_comptroller = comptrollers[0]
+    reverting_comptroller = comptrollers[2]
+    all_pools = [
+        ['pool ' + str(i), '0x' + '0' * 40, comptroller, 0, 0]
+        for i, comptroller in enumerate(comptrollers)
+    ]
+    summary_types = '(uint256,uint256,address[],string[],bool)'
+
+    async def async_get_all_pools(block=None, provider=None):
+        return all_pools
+
+    def _get_summary(comptroller):
+        comptroller = '0x' + comptroller[-40:].lower()
+        if comptroller == reverting_comptroller:
+            return None
+        encoded = eth_abi_lite.encode_single(
+            summary_types, (int(comptroller, 16) % 1000, 0, [], [], True)
+        )
+        return encoded
+
+    # simulate Multicall3, where heavy lens calls run out of shared gas
+    requests = []
+
+    async def async_send(request, provider=None):
+        if isinstance(request, dict):
+            requests.append(request)
+            summary = _get_summary(request['params'][0]['data'][-40:])
+            if summary is None:
+                if provider['convert_reverts_to_none']:
+                    return None
+                raise spec.RpcException('RPC ERROR: execution reverted')
+            return '0x' + summary.hex()
+
+        requests.extend(request)
+        results = []
+        for subrequest in request:
+            call_object, block_number = subrequest['params']
+            assert call_object['to'] == rpc.multicall3_address
+            _, calls = eth_abi_lite.decode_single(
+                '(bool,(address,bytes)[])',
+                bytes.fromhex(call_object['data'][10:]),
+            )
+            outputs = []
+            for address, call_data in calls:
+                summary = _get_summary(call_data.hex())
+                if summary is None or call_data.hex().endswith(
+                    heavy_comptroller[2:]
+                ):
+                    outputs.append((False, b''))
+                else:
+                    outputs.append((True, summary))
+            encoded = eth_abi_lite.encode_single('((bool,bytes)[])', [outputs])
+            results.append('0x' + encoded.hex())
+        return results
+
+    monkeypatch.setattr(
+        fuse_queries, 'async_get_all_pools', async_get_all_pools
+    )
+    monkeypatch.setattr(rpc_request, 'async_send', async_send)
+
+    result = await primary_lens.async_get_public_pools_with_data(
+        lens_address=lens_address, provider=provider, block=15000000
+    )
+
+    # one multicall, then separate retries of the two failed subcalls
+    assert len(requests) == 3
+    assert requests[0]['params'][0]['to'] == rpc.multicall3_address
+    assert result['errored'] == [False, False, True]
+    total_supply = int(heavy_comptroller, 16) % 1000
+    assert result['data'][0]['total_supply'] == total_supply
+    assert result['data'][2] is None
@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from ctc import binary
+from ctc import evm
+from ctc.protocols.uniswap_v2_utils import uniswap_v2_deltas
+from ctc.protocols.uniswap_v2_utils import uniswap_v2_events
+
+
+pool = '0x' + 'AB' * 20
+
+
+def _events(rows):
+    index = pd.MultiIndex.from_tuples(
+        [row[0] for row in rows],
+        names=['block_number', 'transaction_index', 'log_index'],
+    )
+    return pd.DataFrame([row[1] for row in rows], index=index)
+
+
+@pytest.mark.asyncio
+async def test_log_deltas_use_single_event_sweep(monkeypatch):
+    events = {
+        'Mint': _events(
+            [((100, 0, 0), {'arg__amount0': '1000', 'arg__amount1': '2000'})]
+        ),
+        'Burn': _events(
+            [((102, 0, 0), {'arg__amount0': '100', 'arg__amount1': '200'})]
+        ),
+        'Swap': _events(
+            [
+                (
+                    (101, 3, 1),
+                    {
+                        'arg__amount0In': '10',
+                        'arg__amount1In': '0',
+                        'arg__amount0Out': '0',
+                        'arg__amount1Out': '19',
+                    },
+                )
+            ]
+        ),
+    }
+    sweeps = []
+
+    async def async_get_multi_events(contract_addresses, **kwargs):
+        sweeps.append(contract_addresses)
+        return {
+            (pool.lower(), binary.get_event_hash(event_abi)): events[name]
+            for name, event_abi in uniswap_v2_events.pool_event_abis.items()
+        }
+
+    async def async_get_events(**kwargs):
+        raise Exception('events should come from the multi event sweep')
+
+    async def async_parse_block_range(*, start_block, end_block, **kwargs):
+        return start_block, end_block
+
+    monkeypatch.setattr(evm, 'async_get_multi_events', async_get_multi_events)
+    monkeypatch.setattr(evm, 'async_get_events', async_get_events)
+    monkeypatch.setattr(
+        evm, 'async_parse_block_range', async_parse_block_range
+    )
+
+    deltas = await uniswap_v2_deltas.async_get_pool_log_deltas(
+        pool,
+        start_block=100,
+        end_block=110,
+        normalize=False,
+        include_initial_state=False,
+    )
+    assert sweeps == [[pool]]
+    assert list(deltas['event']) == ['Mint', 'Swap', 'Burn']
+    assert list(deltas['delta_token0']) == [1000, 10, -100]
+    assert list(deltas['delta_token1']) == [2000, -19, -200]
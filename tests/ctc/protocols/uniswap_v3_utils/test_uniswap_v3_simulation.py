@@ -0,0 +1,381 @@
+import math
+
+import pandas as pd
+import pytest
+
+from ctc import binary
+from ctc import evm
+from ctc import rpc
+from ctc.protocols import uniswap_v3_utils
+from ctc.protocols.uniswap_v3_utils import uniswap_v3_spec
+
+
+token0 = '0x' + '11' * 20
+token1 = '0x' + '22' * 20
+
+
+def _get_pool_state():
+    """pool at tick 0 with a wide position and a concentrated position"""
+
+    pool_state = {
+        'pool': '0x' + '33' * 20,
+        'block_number': 16000000,
+        'token0': token0,
+        'token1': token1,
+        'fee': 3000,
+        'tick_spacing': 60,
+        'sqrt_price_x96': 2**96,
+        'tick': 0,
+        'liquidity': 0,
+        'liquidity_gross_by_tick': {},
+        'liquidity_net_by_tick': {},
+    }
+    for tick_lower, tick_upper, liquidity in [
+        (-887220, 887220, 10**18),
+        (-600, 600, 5 * 10**18),
+    ]:
+        uniswap_v3_utils.apply_liquidity_event(
+            pool_state,
+            tick_lower=tick_lower,
+            tick_upper=tick_upper,
+            liquidity_delta=liquidity,
+        )
+    return pool_state
+
+
+def _reference_amount1_out(pool_state, amount_in):
+    """swap token0 for token1 with floats, range by range"""
+
+    amount_remaining = amount_in * (1 - pool_state['fee'] / 1e6)
+    sqrt_price = pool_state['sqrt_price_x96'] / 2**96
+    liquidity = pool_state['liquidity']
+    amount_out = 0
+    for tick in sorted(pool_state['liquidity_net_by_tick'], reverse=True):
+        if tick > pool_state['tick']:
+            continue
+        sqrt_price_next = 1.0001 ** (tick / 2)
+        needed = liquidity * (1 / sqrt_price_next - 1 / sqrt_price)
+        if needed >= amount_remaining:
+            break
+        amount_remaining -= needed
+        amount_out += liquidity * (sqrt_price - sqrt_price_next)
+        sqrt_price = sqrt_price_next
+        liquidity -= pool_state['liquidity_net_by_tick'][tick]
+    new_sqrt_price = 1 / (1 / sqrt_price + amount_remaining / liquidity)
+    return amount_out + liquidity * (sqrt_price - new_sqrt_price)
+
+
+def test_tick_math():
+    assert uniswap_v3_utils.get_sqrt_ratio_at_tick(0) == 2**96
+    assert (
+        uniswap_v3_utils.get_sqrt_ratio_at_tick(uniswap_v3_spec.min_tick)
+        == uniswap_v3_spec.min_sqrt_ratio
+    )
+    assert (
+        uniswap_v3_utils.get_sqrt_ratio_at_tick(uniswap_v3_spec.max_tick)
+        == uniswap_v3_spec.max_sqrt_ratio
+    )
+    for tick in [-524288, -50, 1, 3, 127, 2**12 + 5, 150000, 887271]:
+        sqrt_ratio = uniswap_v3_utils.get_sqrt_ratio_at_tick(tick)
+        assert math.isclose(sqrt_ratio / 2**96, 1.0001 ** (tick / 2))
+        assert uniswap_v3_utils.get_tick_at_sqrt_ratio(sqrt_ratio) == tick
+        assert (
+            uniswap_v3_utils.get_tick_at_sqrt_ratio(sqrt_ratio - 1) == tick - 1
+        )
+
+
+def test_compute_swap_step():
+    # capped at price target, both as exact input and as exact output
+    sqrt_price_target = 79623317895830914510639640423
+    for amount_remaining in [10**18, -(10**18)]:
+        assert uniswap_v3_utils.compute_swap_step(
+            2**96,
+            sqrt_price_target,
+            liquidity=2 * 10**18,
+            amount_remaining=amount_remaining,
+            fee=600,
+        ) == (
+            sqrt_price_target,
+            9975124224178055,
+            9925619580021728,
+            5988667735148,
+        )
+
+    # input fully spent before reaching price target
+    sqrt_price_next, amount_in, amount_out, fee = (
+        uniswap_v3_utils.compute_swap_step(
+            2**96,
+            250541448375047931186413801569,
+            liquidity=2 * 10**18,
+            amount_remaining=10**18,
+            fee=600,
+        )
+    )
+    assert sqrt_price_next < 250541448375047931186413801569
+    assert (amount_in, amount_out, fee) == (
+        999400000000000000,
+        666399946655997866,
+        600000000000000,
+    )
+
+
+def test_simulate_swap_across_ticks():
+    pool_state = _get_pool_state()
+    assert pool_state['liquidity'] == 6 * 10**18
+
+    amount_in = 10**18
+    result = uniswap_v3_utils.simulate_swap(
+        pool_state, zero_for_one=True, amount_in=amount_in
+    )
+    assert result['amount0'] == amount_in
+    assert result['tick'] < -600
+    assert result['liquidity'] == 10**18
+    assert math.isclose(
+        -result['amount1'],
+        _reference_amount1_out(pool_state, amount_in),
+        rel_tol=1e-9,
+    )
+
+    # an exact output swap for the same output needs the same input
+    exact_output = uniswap_v3_utils.simulate_swap(
+        pool_state, zero_for_one=True, amount_out=-result['amount1']
+    )
+    assert exact_output['amount1'] == result['amount1']
+    assert abs(exact_output['amount0'] - amount_in) <= 2
+
+
+def test_depth_and_price_impact_curves():
+    pool_state = _get_pool_state()
+
+    price_changes = [-0.1, -0.02, 0.02, 0.1]
+    depths = uniswap_v3_utils.get_depth_curve(
+        pool_state, price_changes=price_changes
+    )
+    for price_change, depth in zip(price_changes, depths):
+        new_price = uniswap_v3_utils.sqrt_price_x96_to_price(
+            depth['sqrt_price_x96']
+        )
+        assert math.isclose(new_price, 1 + price_change, rel_tol=1e-12)
+        if price_change < 0:
+            assert depth['amount0'] > 0 and depth['amount1'] < 0
+        else:
+            assert depth['amount0'] < 0 and depth['amount1'] > 0
+
+    # selling the depth amount moves price to the target price
+    impacts = uniswap_v3_utils.get_price_impact_curve(
+        pool_state,
+        amounts_in=[depths[0]['amount0'], depths[1]['amount0']],
+        zero_for_one=True,
+    )
+    assert math.isclose(impacts[0], -0.1, rel_tol=1e-9)
+    assert math.isclose(impacts[1], -0.02, rel_tol=1e-9)
+
+
+@pytest.mark.asyncio
+async def test_liquidity_depth_from_pool_state():
+    pool_state = _get_pool_state()
+
+    # price after fees of token0 in token1, 5% below current price
+    new_price = 0.95 * (1 - pool_state['fee'] / 1e6)
+    depth = await uniswap_v3_utils.async_get_liquidity_depth(
+        new_price=new_price,
+        token_in=token0,
+        token_out=token1,
+        fee=3000,
+        token_in_decimals=18,
+        token_out_decimals=18,
+        pool_state=pool_state,
+    )
+    (expected,) = uniswap_v3_utils.get_depth_curve(
+        pool_state, price_changes=[-0.05]
+    )
+    assert math.isclose(depth, expected['amount0'], rel_tol=1e-9)
+
+    # price already past target
+    depth = await uniswap_v3_utils.async_get_liquidity_depth(
+        new_price=2.0,
+        token_in=token0,
+        token_out=token1,
+        fee=3000,
+        token_in_decimals=18,
+        token_out_decimals=18,
+        pool_state=pool_state,
+    )
+    assert depth == 0
+
+
+@pytest.mark.asyncio
+async def test_update_pool_state_from_events(monkeypatch):
+    pool_state = _get_pool_state()
+    swap = uniswap_v3_utils.simulate_swap(
+        pool_state, zero_for_one=True, amount_in=10**17
+    )
+
+    def _events(rows):
+        index = pd.MultiIndex.from_tuples(
+            [row[0] for row in rows],
+            names=['block_number', 'transaction_index', 'log_index'],
+        )
+        return pd.DataFrame([row[1] for row in rows], index=index)
+
+    events = {
+        'Swap': _events(
+            [
+                (
+                    (16000002, 0, 0),
+                    {
+                        'arg__sqrtPriceX96': swap['sqrt_price_x96'],
+                        'arg__liquidity': swap['liquidity'],
+                        'arg__tick': swap['tick'],
+                    },
+                )
+            ]
+        ),
+        'Mint': _events(
+            [
+                (
+                    (16000001, 3, 7),
+                    {
+                        'arg__tickLower': -120,
+                        'arg__tickUpper': 60,
+                        'arg__amount': 10**18,
+                    },
+                )
+            ]
+        ),
+        'Burn': _events(
+            [
+                (
+                    (16000003, 1, 2),
+                    {
+                        'arg__tickLower': -600,
+                        'arg__tickUpper': 600,
+                        'arg__amount': 5 * 10**18,
+                    },
+                )
+            ]
+        ),
+    }
+
+    async def async_get_event_abi(event_name, contract):
+        return {'name': event_name}
+
+    async def async_get_events(*, event_abi, start_block, end_block, **kwargs):
+        assert (start_block, end_block) == (16000001, 16000005)
+        return events[event_abi['name']]
+
+    async def async_block_number_to_int(block, provider=None):
+        return 16000005
+
+    monkeypatch.setattr(
+        uniswap_v3_spec, 'async_get_event_abi', async_get_event_abi
+    )
+    monkeypatch.setattr(evm, 'async_get_events', async_get_events)
+    monkeypatch.setattr(
+        evm, 'async_block_number_to_int', async_block_number_to_int
+    )
+
+    new_state = await uniswap_v3_utils.async_update_pool_state(pool_state)
+
+    # events replay in log order, so the burn applies after the swap
+    assert new_state['block_number'] == 16000005
+    assert new_state['sqrt_price_x96'] == swap['sqrt_price_x96']
+    assert new_state['tick'] == swap['tick']
+    assert new_state['liquidity'] == swap['liquidity'] - 5 * 10**18
+    assert sorted(new_state['liquidity_net_by_tick']) == [
+        -887220,
+        -120,
+        60,
+        887220,
+    ]
+    assert new_state['liquidity_net_by_tick'][-120] == 10**18
+
+    # input state is not modified
+    assert pool_state == _get_pool_state()
+
+
+tick_lens_abi = {
+    'name': 'getPopulatedTicksInWord',
+    'type': 'function',
+    'stateMutability': 'view',
+    'inputs': [
+        {'name': 'pool', 'type': 'address'},
+        {'name': 'tickBitmapIndex', 'type': 'int16'},
+    ],
+    'outputs': [
+        {
+            'name': 'populatedTicks',
+            'type': 'tuple[]',
+            'components': [
+                {'name': 'tick', 'type': 'int24'},
+                {'name': 'liquidityNet', 'type': 'int128'},
+                {'name': 'liquidityGross', 'type': 'uint128'},
+            ],
+        }
+    ],
+}
+
+
+@pytest.mark.asyncio
+async def test_get_pool_state_from_batch_responses(monkeypatch):
+    pool = '0x' + '33' * 20
+    populated_ticks = {
+        -58: [(-887220, 10**18, 10**18)],
+        -1: [(-600, 5 * 10**18, 5 * 10**18)],
+        0: [(600, -5 * 10**18, 5 * 10**18)],
+        57: [(887220, -(10**18), 10**18)],
+    }
+
+    async def async_get_function_abi(function_name, contract):
+        if function_name == 'getPopulatedTicksInWord':
+            return tick_lens_abi
+        return {'name': function_name}
+
+    async def async_eth_call(*, to_address, function_abi, **kwargs):
+        assert to_address == pool
+        return {
+            'slot0': (2**96, 0, 0, 1, 1, 0, True),
+            'liquidity': 6 * 10**18,
+            'fee': 3000,
+            'tickSpacing': 60,
+            'token0': token0,
+            'token1': token1,
+        }[function_abi['name']]
+
+    async def async_batch_eth_call(
+        *, function_abi, function_parameter_list, **kwargs
+    ):
+        if function_abi['name'] == 'tickBitmap':
+            return [
+                int(word_position in populated_ticks)
+                for (word_position,) in function_parameter_list
+            ]
+
+        # decode tick lens outputs as they come from the node
+        results = []
+        for _, word_position in function_parameter_list:
+            encoded = binary.encode_types(
+                [populated_ticks[word_position]],
+                '((int24,int128,uint128)[])',
+            )
+            results.append(
+                binary.decode_function_output(
+                    encoded_output=encoded, function_abi=function_abi
+                )
+            )
+        return results
+
+    async def async_block_number_to_int(block, provider=None):
+        return 16000000
+
+    monkeypatch.setattr(
+        uniswap_v3_spec, 'async_get_function_abi', async_get_function_abi
+    )
+    monkeypatch.setattr(rpc, 'async_eth_call', async_eth_call)
+    monkeypatch.setattr(rpc, 'async_batch_eth_call', async_batch_eth_call)
+    monkeypatch.setattr(
+        evm, 'async_block_number_to_int', async_block_number_to_int
+    )
+
+    pool_state = await uniswap_v3_utils.async_get_pool_state(pool)
+    assert pool_state == _get_pool_state()
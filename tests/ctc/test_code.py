@@ -85,7 +85,9 @@ def test_async_function_names():
                 named_as_async = attr_name.startswith(
                     'async'
                 ) or attr_name.startswith('_async')
-                if inspect.iscoroutinefunction(module_attr):
+                if inspect.iscoroutinefunction(
+                    module_attr
+                ) or inspect.isasyncgenfunction(module_attr):
                     if not named_as_async:
                         should_have_async_in_name.append(
                             modname + '.' + attr_name
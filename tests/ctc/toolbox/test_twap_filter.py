@@ -0,0 +1,118 @@
+import numpy as np
+
+from ctc.toolbox.defi_utils.twap_utils import twap_filter
+
+
+def _get_samples(n, seed=0):
+    rng = np.random.default_rng(seed)
+    timestamps = 1600000000 + np.cumsum(rng.integers(1, 30, size=n))
+    values = rng.uniform(0.9, 1.1, size=n)
+    return timestamps, values
+
+
+def _reference_twap(values, timestamps, filter_seconds):
+    twap_times = timestamps[timestamps > timestamps[0] + filter_seconds]
+    twap_values = []
+    for twap_time in twap_times:
+        mask = (timestamps > twap_time - filter_seconds) & (
+            timestamps <= twap_time
+        )
+        twap_values.append(values[mask].mean())
+    return twap_times, np.array(twap_values)
+
+
+def _reference_time_weighted_twap(values, timestamps, filter_seconds):
+    twap_times = timestamps[timestamps > timestamps[0] + filter_seconds]
+    twap_values = []
+    for twap_time in twap_times:
+        start = twap_time - filter_seconds
+        total = 0
+        for i in range(len(timestamps)):
+            segment_start = max(timestamps[i], start)
+            if i + 1 < len(timestamps):
+                segment_end = min(timestamps[i + 1], twap_time)
+            else:
+                segment_end = twap_time
+            if segment_end > segment_start:
+                total += values[i] * (segment_end - segment_start)
+        twap_values.append(total / filter_seconds)
+    return twap_times, np.array(twap_values)
+
+
+def test_filter_twap_matches_masked_mean():
+    timestamps, values = _get_samples(500)
+    twap = twap_filter.filter_twap(
+        raw_values=values, timestamps=timestamps, filter_duration=300
+    )
+    twap_times, expected = _reference_twap(values, timestamps, 300)
+    assert list(twap.index) == list(twap_times)
+    assert np.allclose(twap.values, expected)
+
+
+def test_filter_twap_time_weighted():
+    timestamps, values = _get_samples(200, seed=1)
+    twap = twap_filter.filter_twap(
+        raw_values=values,
+        timestamps=timestamps,
+        filter_duration=300,
+        time_weighted=True,
+    )
+    twap_times, expected = _reference_time_weighted_twap(
+        values, timestamps, 300
+    )
+    assert list(twap.index) == list(twap_times)
+    assert np.allclose(twap.values, expected)
+
+
+def test_incremental_twap_matches_batch():
+    timestamps, values = _get_samples(1000, seed=2)
+    for time_weighted in [False, True]:
+        batch = twap_filter.filter_twap(
+            raw_values=values,
+            timestamps=timestamps,
+            filter_duration=600,
+            time_weighted=time_weighted,
+        )
+
+        state = twap_filter.create_twap_filter_state(
+            600, time_weighted=time_weighted
+        )
+        chunks = []
+        for start in range(0, len(timestamps), 37):
+            chunks.append(
+                twap_filter.update_twap_filter(
+                    state,
+                    raw_values=values[start : start + 37],
+                    timestamps=timestamps[start : start + 37],
+                )
+            )
+        incremental = np.concatenate([chunk.values for chunk in chunks])
+        index = np.concatenate([chunk.index for chunk in chunks])
+        assert list(index) == list(batch.index)
+        assert np.allclose(incremental, batch.values)
+        assert len(state['timestamps']) < 100
+
+
+def test_incremental_twap_allows_equal_timestamps():
+    timestamps, values = _get_samples(200, seed=3)
+    timestamps[100] = timestamps[99]
+    for time_weighted in [False, True]:
+        batch = twap_filter.filter_twap(
+            raw_values=values,
+            timestamps=timestamps,
+            filter_duration=300,
+            time_weighted=time_weighted,
+        )
+
+        # second update starts at the last timestamp of the first update
+        state = twap_filter.create_twap_filter_state(
+            300, time_weighted=time_weighted
+        )
+        twap_filter.update_twap_filter(
+            state, raw_values=values[:100], timestamps=timestamps[:100]
+        )
+        second = twap_filter.update_twap_filter(
+            state, raw_values=values[100:], timestamps=timestamps[100:]
+        )
+        assert list(second.index) == list(batch.index[-len(second) :])
+        assert np.allclose(second.values, batch.values[-len(second) :])